@@ -2,22 +2,86 @@
 Chat and RAG API endpoints
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+import asyncio
 import uuid
 from datetime import datetime
 import os
 import traceback
+from typing import Awaitable, Optional
 
 from app.schemas import ChatRequest, ChatResponse
 from app.services.rag_service import rag_service
 from app.services.transcription_service import transcription_service
+from app.services.audio_upload import AudioUploadError, receive_audio_upload
 from app.services.rag.chat_service import RateLimitError
+from app.services.rag.conversation_memory import ConversationHistory, conversation_memory
+from app.services.rag.fallback_responses import generate_basic_response
+from app.core.config import settings
+from app.core.deadline import Deadline
 from app.core.logging import get_logger
-from app.core.exceptions import RAGServiceError, ConfigurationError
+from app.core.sse import SSE_HEADERS, ClosingStreamingResponse, sse_event
+from app.core.exceptions import RAGServiceError, ConfigurationError, DatabaseError, DeadlineExceededError
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Fraction of the chat budget the database may take for setup and history
+HISTORY_SHARE = 0.2
+
+
+async def _prepare_rag(conversation_id: str, is_new: bool) -> ConversationHistory:
+    """Make sure the vector store is connected, and load the conversation so far"""
+    await rag_service.initialize()
+    return await conversation_memory.get_history(conversation_id, is_new=is_new)
+
+
+async def _history_within(
+    preparation: Awaitable[ConversationHistory],
+    deadline: Deadline
+) -> ConversationHistory:
+    """
+    Await RAG setup and history within their share of the budget
+
+    Args:
+        preparation: _prepare_rag coroutine or task; cancelled if it runs out of time
+        deadline: Request deadline
+
+    Returns:
+        The conversation history, or an empty one if the database was too slow
+    """
+    try:
+        return await deadline.run(preparation, "history", fraction=HISTORY_SHARE)
+    except DeadlineExceededError as e:
+        logger.warning(f"Answering without history: {e.message}")
+        return ConversationHistory(summary="", messages=[])
+
+
+def _rag_enabled(use_rag: bool) -> bool:
+    """Whether RAG is requested, switched on and has an LLM API key"""
+    return bool(
+        use_rag and
+        os.getenv("RAG_ENABLED", "false").lower() == "true" and
+        (os.getenv("GROQ_API_KEY") or os.getenv("OPENAI_API_KEY"))
+    )
+
+
+def _rate_limit_message(e: RateLimitError) -> str:
+    """User-friendly message for an LLM rate limit"""
+    if e.limit_type in ["TPD", "RPD"]:
+        return (
+            "🕐 I've reached my daily usage limit for AI responses. "
+            "Please come back tomorrow, and I'll be happy to help! "
+            "In the meantime, feel free to explore Robert's portfolio or reach out via email."
+        )
+    # TPM or RPM
+    wait_time = e.retry_after or 60
+    return (
+        f"⏳ I'm getting too many requests right now. "
+        f"Please wait about {wait_time} seconds and try again. "
+        f"Thanks for your patience!"
+    )
+
 
 @router.post("/message", response_model=ChatResponse)
 async def chat_message(request: ChatRequest):
@@ -26,17 +90,20 @@ async def chat_message(request: ChatRequest):
     """
     logger.info(f"Chat request received: message='{request.message[:50]}...'")
 
+    # The SLO covers the whole request, including history lookup
+    deadline = Deadline(
+        settings.CHAT_SLO_SECONDS,
+        reserve=settings.CHAT_DEADLINE_RESERVE_MS / 1000
+    )
+
     try:
         # Generate conversation ID if not provided
+        is_new_conversation = not request.conversation_id
         conversation_id = request.conversation_id or str(uuid.uuid4())
         logger.debug(f"Conversation ID: {conversation_id}")
 
         # Check if RAG is enabled and API keys are available
-        rag_enabled = (
-            request.use_rag and
-            os.getenv("RAG_ENABLED", "false").lower() == "true" and
-            (os.getenv("GROQ_API_KEY") or os.getenv("OPENAI_API_KEY"))
-        )
+        rag_enabled = _rag_enabled(request.use_rag)
 
         logger.debug(f"RAG enabled: {rag_enabled} (request.use_rag={request.use_rag}, "
                     f"GROQ={bool(os.getenv('GROQ_API_KEY'))}, "
@@ -44,42 +111,42 @@ async def chat_message(request: ChatRequest):
 
         if rag_enabled:
             try:
-                logger.info("Initializing RAG service...")
-                await rag_service.initialize()
+                history = await _history_within(
+                    _prepare_rag(conversation_id, is_new_conversation),
+                    deadline
+                )
 
                 logger.info(f"Processing RAG query: '{request.message[:100]}...'")
-                rag_result = await rag_service.chat(request.message)
+                rag_result = await rag_service.chat(
+                    request.message,
+                    history=history.to_chat_messages(),
+                    deadline=deadline
+                )
 
                 logger.info(f"RAG response generated: {len(rag_result.get('response', ''))} chars, "
                            f"{len(rag_result.get('sources', []))} sources")
 
+                conversation_memory.append_exchange(
+                    conversation_id,
+                    request.message,
+                    rag_result["response"],
+                    rag_result.get("sources")
+                )
+
                 response = ChatResponse(
                     message=rag_result["response"],
                     conversation_id=conversation_id,
                     sources=rag_result.get("sources", []),
+                    fast_path=rag_result.get("fast_path", False),
+                    degraded=rag_result.get("degraded"),
                     timestamp=datetime.now()
                 )
                 return response
 
             except RateLimitError as e:
                 logger.warning(f"Rate limit hit: {e.limit_type}")
-                # Create user-friendly message based on limit type
-                if e.limit_type in ["TPD", "RPD"]:
-                    user_message = (
-                        "🕐 I've reached my daily usage limit for AI responses. "
-                        "Please come back tomorrow, and I'll be happy to help! "
-                        "In the meantime, feel free to explore Robert's portfolio or reach out via email."
-                    )
-                else:  # TPM or RPM
-                    wait_time = e.retry_after or 60
-                    user_message = (
-                        f"⏳ I'm getting too many requests right now. "
-                        f"Please wait about {wait_time} seconds and try again. "
-                        f"Thanks for your patience!"
-                    )
-
                 raise RAGServiceError(
-                    message=user_message,
+                    message=_rate_limit_message(e),
                     details={
                         "error_type": "rate_limit",
                         "limit_type": e.limit_type,
@@ -97,6 +164,7 @@ async def chat_message(request: ChatRequest):
         else:
             logger.info("Using basic response (RAG disabled)")
             response_text = generate_basic_response(request.message)
+            conversation_memory.append_exchange(conversation_id, request.message, response_text)
 
         response = ChatResponse(
             message=response_text,
@@ -122,16 +190,31 @@ async def chat_message(request: ChatRequest):
 
 @router.get("/context/{conversation_id}")
 async def get_conversation_context(conversation_id: str):
-    """Get conversation context (placeholder for now)"""
+    """Get conversation context: rolling summary and recent messages"""
+    history = await conversation_memory.get_history(conversation_id)
     return {
         "conversation_id": conversation_id,
-        "message": "Conversation context endpoint - to be implemented with RAG"
+        "summary": history.summary,
+        "messages": [
+            {"role": turn.role, "content": turn.content, "timestamp": turn.timestamp}
+            for turn in history.messages
+        ],
+        "total": len(history.messages)
     }
 
 
 @router.delete("/context/{conversation_id}")
 async def clear_conversation_context(conversation_id: str):
-    """Clear conversation context (placeholder for now)"""
+    """Clear conversation context from memory and the database"""
+    try:
+        await conversation_memory.clear(conversation_id)
+    except Exception as e:
+        logger.error(f"Failed to delete conversation {conversation_id}: {e}")
+        raise DatabaseError(
+            message="Failed to clear conversation history",
+            details={"conversation_id": conversation_id, "error": str(e)}
+        )
+
     return {
         "conversation_id": conversation_id,
         "message": "Conversation context cleared"
@@ -195,91 +278,236 @@ async def get_rag_status():
         }
 
 
-@router.post("/transcribe")
-async def transcribe_audio(file: UploadFile = File(...)):
+AUDIO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}}
+                }
+            }
+        }
+    }
+}
+
+
+@router.post("/transcribe", openapi_extra=AUDIO_UPLOAD_OPENAPI)
+async def transcribe_audio(request: Request):
     """
     Transcribe audio file using Groq's Whisper API
 
     Accepts audio files in formats: flac, mp3, mp4, mpeg, mpga, m4a, ogg, wav, webm
+    The upload is streamed: oversized files are rejected while reading and
+    anything beyond a small threshold is spooled to disk, not held in memory.
     """
-    logger.info(f"Transcription request received: filename={file.filename}, content_type={file.content_type}")
-
-    # Validate file type
-    allowed_types = ['audio/flac', 'audio/mp3', 'audio/mpeg', 'audio/mp4', 'audio/x-m4a', 'audio/ogg', 'audio/wav', 'audio/webm']
-    allowed_extensions = ['.flac', '.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.ogg', '.wav', '.webm']
-
-    file_ext = os.path.splitext(file.filename or '')[1].lower()
-    if file.content_type not in allowed_types and file_ext not in allowed_extensions:
-        logger.warning(f"Invalid file type: {file.content_type}, extension: {file_ext}")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Supported formats: {', '.join(allowed_extensions)}"
-        )
+    logger.info(f"Transcription request received: content_length={request.headers.get('content-length')}")
 
     try:
-        # Read file content
-        audio_data = await file.read()
-
-        # Check file size (25 MB for free tier)
-        max_size = 25 * 1024 * 1024  # 25 MB
-        if len(audio_data) > max_size:
+        upload = await receive_audio_upload(request)
+    except AudioUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+    async with upload:
+        logger.info(f"Audio file: filename={upload.filename}, content_type={upload.content_type}, "
+                    f"size={upload.size} bytes")
+
+        try:
+            # Streams from the spooled file, no in-memory copy
+            transcribed_text = await transcription_service.transcribe_audio(
+                upload.file,
+                filename=upload.filename or "audio.webm",
+                language="en",
+                content_hash=upload.content_hash
+            )
+        except Exception as e:
+            logger.error(f"Transcription failed: {e.__class__.__name__}: {str(e)}")
+            logger.debug(f"Transcription traceback: {traceback.format_exc()}")
             raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {max_size / (1024 * 1024):.0f} MB"
+                status_code=500,
+                detail=f"Transcription failed: {str(e)}"
             )
 
-        logger.info(f"Audio file size: {len(audio_data)} bytes")
+    logger.info(f"Transcription successful: {len(transcribed_text)} characters")
 
-        # Transcribe audio
-        import io
-        audio_file = io.BytesIO(audio_data)
-        transcribed_text = await transcription_service.transcribe_audio(
-            audio_file,
-            filename=file.filename or "audio.webm",
-            language="en"
-        )
-
-        logger.info(f"Transcription successful: {len(transcribed_text)} characters")
-
-        return {
-            "text": transcribed_text,
-            "filename": file.filename,
-            "size_bytes": len(audio_data)
-        }
+    return {
+        "text": transcribed_text,
+        "filename": upload.filename,
+        "size_bytes": upload.size
+    }
 
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Transcription failed: {e.__class__.__name__}: {str(e)}")
-        logger.debug(f"Transcription traceback: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Transcription failed: {str(e)}"
-        )
 
+@router.post("/transcribe/stream", openapi_extra=AUDIO_UPLOAD_OPENAPI)
+async def transcribe_audio_stream(request: Request):
+    """
+    Transcribe audio, streaming partial results as server-sent events
 
-def generate_basic_response(message: str) -> str:
+    Long WAV/FLAC recordings are transcribed in parallel segments; each
+    segment is sent as soon as it is ready ("segment" events, in completion
+    order), followed by a "done" event with the stitched transcript.
     """
-    Generate a basic response without LLM (temporary implementation)
+    try:
+        upload = await receive_audio_upload(request)
+    except AudioUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+    logger.info(f"Streaming transcription request: filename={upload.filename}, size={upload.size} bytes")
+
+    async def event_stream():
+        try:
+            async for event in transcription_service.transcribe_audio_stream(
+                upload.file,
+                filename=upload.filename or "audio.webm",
+                language="en",
+                content_hash=upload.content_hash
+            ):
+                yield sse_event(event)
+        except Exception as e:
+            logger.error(f"Streaming transcription failed: {e.__class__.__name__}: {str(e)}")
+            yield sse_event({"type": "error", "detail": f"Transcription failed: {str(e)}"})
+
+    # The upload's memory budget and temp file are released even if the stream never starts
+    return ClosingStreamingResponse(
+        event_stream(),
+        on_close=upload.close,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/voice", openapi_extra=AUDIO_UPLOAD_OPENAPI)
+async def voice_chat(
+    request: Request,
+    conversation_id: Optional[str] = None,
+    use_rag: bool = True
+):
     """
-    message_lower = message.lower()
-
-    # Simple keyword-based responses
-    if any(word in message_lower for word in ['hello', 'hi', 'hey']):
-        return "Hi! I'm Robert's AI assistant. I can help answer questions about his background, skills, and projects. What would you like to know?"
-
-    elif any(word in message_lower for word in ['skills', 'technologies', 'tech stack']):
-        return "Robert specializes in AI/ML technologies including TensorFlow, PyTorch, and scikit-learn. He also works with React, FastAPI, Kubernetes, and various cloud platforms. Would you like to know more about any specific area?"
-
-    elif any(word in message_lower for word in ['projects', 'work', 'portfolio']):
-        return "Robert's featured projects include Transcriptomatic (a speech-to-text evaluation platform) and a custom AI server build. Both showcase his skills in AI/ML, full-stack development, and infrastructure. Would you like details about either project?"
-
-    elif any(word in message_lower for word in ['contact', 'email', 'linkedin', 'github']):
-        return "You can reach Robert via email at robert.zeijlon.92@gmail.com, LinkedIn (robert-zeijlon-14015928b), or GitHub (@RZeijlon). He's also available by phone at 072-233 16 26."
+    Answer a spoken question in one request, as server-sent events
+
+    Replaces the /transcribe then /message round-trip: the transcript is
+    sent as soon as it is ready and retrieval starts immediately, with the
+    answer streamed back over the same response. Conversation history is
+    loaded while the audio is being transcribed.
+
+    Events, in order:
+        transcript_segment: partial transcript of a segmented recording
+        transcript: the full transcript
+        sources: retrieved context (RAG only)
+        token: a piece of the answer
+        done: the full answer, as /message would return it, plus the transcript
+        error: transcription or answering failed; ends the stream
+    """
+    try:
+        upload = await receive_audio_upload(request)
+    except AudioUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+    logger.info(f"Voice chat request: filename={upload.filename}, size={upload.size} bytes")
+
+    is_new_conversation = not conversation_id
+    conversation_id = conversation_id or str(uuid.uuid4())
+    rag_enabled = _rag_enabled(use_rag)
+
+    async def event_stream():
+        # Overlaps with transcription
+        history_task = asyncio.create_task(_prepare_rag(conversation_id, is_new_conversation)) if rag_enabled else None
+        if history_task:
+            # Failures surface when awaited; don't warn about unawaited ones after an early exit
+            history_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        try:
+            transcript = None
+            cached = False
+            try:
+                async for event in transcription_service.transcribe_audio_stream(
+                    upload.file,
+                    filename=upload.filename or "audio.webm",
+                    language="en",
+                    content_hash=upload.content_hash
+                ):
+                    if event["type"] == "segment" and event["segments"] > 1:
+                        yield sse_event({**event, "type": "transcript_segment"})
+                    elif event["type"] == "done":
+                        if event["failed_segments"]:
+                            raise Exception(f"segments {event['failed_segments']} of {event['segments']} failed")
+                        transcript = event["text"]
+                        cached = event.get("cached", False)
+            except Exception as e:
+                logger.error(f"Voice transcription failed: {e.__class__.__name__}: {str(e)}")
+                yield sse_event({"type": "error", "detail": f"Transcription failed: {str(e)}"})
+                return
+            finally:
+                # Done with the audio; free the memory budget before answering
+                upload.close()
+
+            yield sse_event({"type": "transcript", "text": transcript, "cached": cached})
+            if not transcript or not transcript.strip():
+                yield sse_event({"type": "error", "detail": "No speech detected in the recording"})
+                return
+
+            # The chat SLO starts once the question is known
+            deadline = Deadline(
+                settings.CHAT_SLO_SECONDS,
+                reserve=settings.CHAT_DEADLINE_RESERVE_MS / 1000
+            )
 
-    elif any(word in message_lower for word in ['experience', 'background', 'about']):
-        return "Robert is a recent AI Developer graduate specializing in artificial intelligence and machine learning. He's passionate about local AI models and self-hosted solutions, with a focus on building robust AI solutions from research to production."
+            result = {"sources": [], "fast_path": False, "degraded": None}
+            if rag_enabled:
+                history = await _history_within(history_task, deadline)
+                async for event in rag_service.chat_stream(
+                    transcript,
+                    history=history.to_chat_messages(),
+                    deadline=deadline
+                ):
+                    if event["type"] == "done":
+                        result = event
+                    else:
+                        yield sse_event(event)
+                response_text = result["response"]
+            else:
+                response_text = generate_basic_response(transcript)
+                yield sse_event({"type": "token", "text": response_text})
+
+            conversation_memory.append_exchange(
+                conversation_id,
+                transcript,
+                response_text,
+                result.get("sources") or None
+            )
 
-    else:
-        return "I'd be happy to help! I can answer questions about Robert's background, skills, projects, and experience. Feel free to ask about his AI/ML expertise, development projects, or how to get in touch with him."
\ No newline at end of file
+            yield sse_event({
+                "type": "done",
+                "message": response_text,
+                "transcript": transcript,
+                "conversation_id": conversation_id,
+                "sources": result["sources"],
+                "fast_path": result["fast_path"],
+                "degraded": result["degraded"],
+                "timestamp": datetime.now().isoformat()
+            })
+
+        except RateLimitError as e:
+            logger.warning(f"Rate limit hit: {e.limit_type}")
+            yield sse_event({
+                "type": "error",
+                "detail": _rate_limit_message(e),
+                "error_type": "rate_limit",
+                "limit_type": e.limit_type,
+                "retry_after": e.retry_after
+            })
+        except Exception as e:
+            logger.error(f"Voice chat failed: {e.__class__.__name__}: {str(e)}")
+            logger.debug(f"Voice chat traceback: {traceback.format_exc()}")
+            yield sse_event({"type": "error", "detail": f"Failed to answer: {str(e)}"})
+        finally:
+            if history_task and not history_task.done():
+                history_task.cancel()
+
+    # The upload's memory budget and temp file are released even if the stream never starts
+    return ClosingStreamingResponse(
+        event_stream(),
+        on_close=upload.close,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -2,105 +2,223 @@
 Content management API endpoints
 """
 
-from fastapi import APIRouter, Query
+from contextlib import aclosing
+
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from typing import List, Optional
 
 from app.models.content import (
-    ContentResponse, ContentListResponse, ConfigResponse,
-    ContentItem, SiteConfig, ThemeConfig, LayoutConfig, PersonalInfo
+    ContentResponse, ContentBatchResponse, ConfigResponse,
+    ContentItem, SiteConfig, ThemeConfig, LayoutConfig, PersonalInfo,
+    SearchHit, SearchResponse
+)
+from app.services.content_service import (
+    LAYOUT_CONFIG, PERSONAL_INFO, SITE_CONFIG, THEME_CONFIG, content_service
 )
-from app.services.content_service import content_service
+from app.services.cache_bus import CONTENT_REFRESHED, cache_bus
+from app.services.cache_refresh import refresh_caches
+from app.services.content.content_search import SearchMode, content_search
+from app.services.content.content_watcher import content_watcher
 from app.core.exceptions import ContentNotFoundException, ValidationError
+from app.core.http_cache import (
+    IMMUTABLE_CACHE_CONTROL, accepts_encoding, conditional_response, is_not_modified
+)
+from app.core.config import settings
+from app.core.sse import SSE_HEADERS, ClosingStreamingResponse, sse_event
+from app.core.tiered_cache import get_tier_stats, l2_store
 
 router = APIRouter()
 
 
 @router.get("/site-config", response_model=ConfigResponse)
-async def get_site_config():
+async def get_site_config(request: Request):
     """Get site configuration"""
     try:
-        config = content_service.get_site_config()
-        return ConfigResponse(data=config.dict())
+        config = await content_service.get_config_async(SITE_CONFIG, SiteConfig)
+        return await conditional_response(request, config.etag, config.last_modified, config.response)
     except ValueError as e:
-        raise ContentNotFoundException("config/site.json", details={"error": str(e)})
+        raise ContentNotFoundException(SITE_CONFIG, details={"error": str(e)})
 
 
 @router.get("/theme-config", response_model=ConfigResponse)
-async def get_theme_config():
+async def get_theme_config(request: Request):
     """Get theme configuration"""
     try:
-        config = content_service.get_theme_config()
-        return ConfigResponse(data=config.dict())
+        config = await content_service.get_config_async(THEME_CONFIG, ThemeConfig)
+        return await conditional_response(request, config.etag, config.last_modified, config.response)
     except ValueError as e:
-        raise ContentNotFoundException("config/theme.json", details={"error": str(e)})
+        raise ContentNotFoundException(THEME_CONFIG, details={"error": str(e)})
 
 
 @router.get("/layout-config", response_model=ConfigResponse)
-async def get_layout_config():
+async def get_layout_config(request: Request):
     """Get layout configuration"""
     try:
-        config = content_service.get_layout_config()
-        return ConfigResponse(data=config.dict())
+        config = await content_service.get_config_async(LAYOUT_CONFIG, LayoutConfig)
+        return await conditional_response(request, config.etag, config.last_modified, config.response)
     except ValueError as e:
-        raise ContentNotFoundException("config/layout.json", details={"error": str(e)})
+        raise ContentNotFoundException(LAYOUT_CONFIG, details={"error": str(e)})
 
 
 @router.get("/personal-info", response_model=ConfigResponse)
-async def get_personal_info():
+async def get_personal_info(request: Request):
     """Get personal information"""
     try:
-        info = content_service.get_personal_info()
-        return ConfigResponse(data=info.dict())
+        config = await content_service.get_config_async(PERSONAL_INFO, PersonalInfo)
+        return await conditional_response(request, config.etag, config.last_modified, config.response)
     except ValueError as e:
-        raise ContentNotFoundException("config/personal/contact-info.json", details={"error": str(e)})
+        raise ContentNotFoundException(PERSONAL_INFO, details={"error": str(e)})
 
 
 @router.get("/item/{file_path:path}", response_model=ContentResponse)
-async def get_content_item(file_path: str):
+async def get_content_item(file_path: str, request: Request):
     """Get single content item by file path"""
     try:
-        item = content_service.get_content_item(file_path)
-        return ContentResponse(data=item.dict())
+        version = await content_service.file_version_async(file_path)
+
+        async def build() -> ContentResponse:
+            item = await content_service.get_content_item_async(file_path)
+            return ContentResponse(data=item.dict())
+
+        return await conditional_response(request, version.etag, version.last_modified, build)
     except ValueError as e:
         raise ContentNotFoundException(file_path, details={"error": str(e)})
 
 
-@router.post("/items", response_model=ContentListResponse)
-async def get_content_items(file_paths: List[str]):
-    """Get multiple content items by file paths"""
+@router.post("/items", response_model=ContentBatchResponse)
+async def get_content_items(
+    file_paths: List[str],
+    stream: bool = Query(False, description="Stream one server-sent event per path as it loads")
+):
+    """
+    Get multiple content items by file paths
+
+    Files are loaded concurrently and repeated paths once. Every distinct
+    path gets a status: found, missing or error. With stream=true, an
+    "item" event is sent per path as soon as it loads, followed by a
+    "done" event with the counts.
+    """
     if not file_paths:
         raise ValidationError("file_paths cannot be empty")
-
-    try:
-        items = content_service.get_content_items(file_paths)
-        return ContentListResponse(data=items, total=len(items))
-    except ValueError as e:
-        raise ValidationError(str(e), details={"file_paths": file_paths})
+    distinct = len(set(file_paths))
+    if distinct > settings.CONTENT_BATCH_MAX_PATHS:
+        raise ValidationError(
+            f"Too many file_paths: {distinct} (max {settings.CONTENT_BATCH_MAX_PATHS})",
+            details={"max_paths": settings.CONTENT_BATCH_MAX_PATHS}
+        )
+
+    if stream:
+        async def event_stream():
+            counts = {"found": 0, "missing": 0, "error": 0}
+            # Closed explicitly, so pending loads are cancelled as soon as the client leaves
+            async with aclosing(content_service.iter_content_items(file_paths)) as results:
+                async for status, item in results:
+                    counts[status.status] += 1
+                    yield sse_event({"type": "item", **status.model_dump(), "item": jsonable_encoder(item)})
+            yield sse_event({"type": "done", "total": counts["found"], **counts})
+
+        events = event_stream()
+        return ClosingStreamingResponse(
+            events, on_close=events.aclose, media_type="text/event-stream", headers=SSE_HEADERS
+        )
+
+    items, statuses = await content_service.get_content_items_async(file_paths)
+    return ContentBatchResponse(data=items, total=len(items), statuses=statuses)
 
 
 @router.get("/all", response_model=ContentResponse)
-async def get_all_content():
+async def get_all_content(request: Request):
     """Get all content organized by type"""
-    content = content_service.get_all_content()
-    return ContentResponse(data=content)
-
-
-@router.get("/search", response_model=ContentListResponse)
+    snapshot = await content_service.get_snapshot_async()
+    return await conditional_response(
+        request, snapshot.etag, snapshot.last_modified,
+        lambda: ContentResponse(data=snapshot.as_dict())
+    )
+
+
+@router.get("/bundle", response_model=ContentResponse)
+async def get_bundle_manifest(request: Request):
+    """
+    Get the current version of the initial-render bundle
+
+    Revalidated on every use; the bundle it points to is immutable.
+    """
+    bundle = await content_service.get_bundle_async()
+    return await conditional_response(
+        request, bundle.etag, bundle.last_modified,
+        lambda: ContentResponse(data=bundle.manifest())
+    )
+
+
+@router.get("/bundle/{version}")
+async def get_bundle(version: str, request: Request):
+    """
+    Get all configs and markdown files needed for the first render, in one response
+
+    The URL is addressed by a hash of the content, so responses are cached
+    for good. The body is precompressed and sent gzipped when accepted.
+    """
+    bundle = content_service.get_bundle(version)
+    if bundle is None:
+        current = await content_service.get_bundle_async()
+        if current.version != version:
+            raise ContentNotFoundException(
+                f"bundle/{version}",
+                details={"current_version": current.version}
+            )
+        bundle = current
+
+    headers = {"ETag": bundle.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if is_not_modified(request, bundle.etag):
+        return Response(status_code=304, headers=headers)
+    return bundle.response(accepts_encoding(request, "gzip"), headers)
+
+
+@router.get("/search", response_model=SearchResponse)
 async def search_content(
     q: str = Query(..., min_length=1, description="Search query"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Maximum results")
+    mode: SearchMode = Query("lexical", description="Keyword (lexical), meaning (semantic) or both (hybrid)"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Maximum results"),
+    prefix: bool = Query(True, description="Match the last word as a prefix (typeahead)")
 ):
-    """Search through content"""
-    results = content_service.search_content(q)
-
-    if limit:
-        results = results[:limit]
-
-    return ContentListResponse(data=results, total=len(results))
+    """Search through content, ranked by relevance and grouped by source file"""
+    hits, used_mode = await content_search.search(q, mode=mode, limit=limit, prefix=prefix)
+
+    return SearchResponse(
+        data=[hit.item for hit in hits],
+        total=len(hits),
+        mode=used_mode,
+        hits=[
+            SearchHit(
+                id=hit.item.id,
+                file_path=hit.item.file_path,
+                score=hit.score,
+                snippet=hit.snippet,
+                matched_terms=hit.matched_terms
+            )
+            for hit in hits
+        ]
+    )
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get content, document, search and tiered cache counters, and the state of the content watcher and cache bus"""
+    return {
+        "cache": content_service.cache.get_stats(),
+        "documents": content_service.loader.documents.get_stats(),
+        "watcher": content_watcher.get_stats(),
+        "search": content_search.get_stats(),
+        "bus": cache_bus.get_stats(),
+        "tiers": get_tier_stats(),
+        "l2": l2_store.get_stats() if l2_store is not None else None
+    }
 
 
 @router.post("/refresh")
 async def refresh_content():
-    """Refresh content cache"""
-    content_service.clear_cache()
+    """Refresh content, resume and PDF caches, on every worker"""
+    refresh_caches()
+    await cache_bus.publish(CONTENT_REFRESHED)
     return ContentResponse(message="Content cache refreshed successfully")
\ No newline at end of file
@@ -2,10 +2,11 @@
 Resume generation endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import Response
 from typing import Literal
 
+from app.core.http_cache import conditional_response
 from app.core.logging import get_logger
 from app.services.pdf_generator import pdf_generator
 
@@ -16,6 +17,7 @@ router = APIRouter()
 
 @router.get("/generate", response_class=Response)
 async def generate_resume(
+    request: Request,
     format: Literal["technical", "executive", "onepage"] = Query(
         default="technical",
         description="Resume template format"
@@ -31,34 +33,37 @@ async def generate_resume(
     - **format**: Choose template type (technical/executive/onepage)
     - **portfolio_url**: URL to encode in QR code
 
-    Returns PDF file for download
+    Returns PDF file for download, or 304 if the client already has this
+    rendering of the current resume content
     """
     try:
-        logger.info(f"Generating {format} resume PDF")
-
-        # Generate PDF
-        pdf_bytes = pdf_generator.generate_resume_pdf(
-            portfolio_url=portfolio_url,
-            template_name=format
-        )
-
-        if not pdf_bytes:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate resume PDF"
+        resume = await pdf_generator.prepare(portfolio_url=portfolio_url, template_name=format)
+
+        async def build() -> Response:
+            logger.info(f"Generating {format} resume PDF")
+
+            # Render in the process pool, or reuse a PDF any worker rendered for this content
+            pdf_bytes = await pdf_generator.render(resume)
+
+            if not pdf_bytes:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to generate resume PDF"
+                )
+
+            # Prepare filename
+            filename = f"Robert_Zeijlon_Resume_{format.capitalize()}.pdf"
+
+            # Return PDF as downloadable file
+            return Response(
+                content=pdf_bytes,
+                media_type="application/pdf",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{filename}"'
+                }
             )
 
-        # Prepare filename
-        filename = f"Robert_Zeijlon_Resume_{format.capitalize()}.pdf"
-
-        # Return PDF as downloadable file
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
-        )
+        return await conditional_response(request, resume.etag, None, build)
 
     except HTTPException:
         raise
@@ -70,6 +75,12 @@ async def generate_resume(
         )
 
 
+@router.get("/stats")
+async def get_render_stats():
+    """Get PDF render, cache and process pool counters"""
+    return pdf_generator.get_stats()
+
+
 @router.get("/data")
 async def get_resume_data():
     """
@@ -2,31 +2,32 @@
 Theme management API endpoints
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from typing import Dict, Any
 
-from app.models.content import ContentResponse
-from app.services.content_service import content_service
+from app.models.content import ContentResponse, ThemeConfig
+from app.services.content_service import THEME_CONFIG, content_service
 from app.core.exceptions import ContentNotFoundException
+from app.core.http_cache import conditional_response
 
 router = APIRouter()
 
 
 @router.get("/config", response_model=ContentResponse)
-async def get_theme_config():
+async def get_theme_config(request: Request):
     """Get theme configuration"""
     try:
-        config = content_service.get_theme_config()
-        return ContentResponse(data=config.dict())
+        config = await content_service.get_config_async(THEME_CONFIG, ThemeConfig)
+        return await conditional_response(request, config.etag, config.last_modified, config.response)
     except ValueError as e:
-        raise ContentNotFoundException("config/theme.json", details={"error": str(e)})
+        raise ContentNotFoundException(THEME_CONFIG, details={"error": str(e)})
 
 
 @router.get("/list", response_model=ContentResponse)
-async def list_available_themes():
+async def list_available_themes(request: Request):
     """List all available themes"""
-    try:
-        config = content_service.get_theme_config()
+    async def build() -> ContentResponse:
+        config = (await content_service.get_config_async(THEME_CONFIG, ThemeConfig)).model
         themes = []
 
         for theme_id, theme_data in config.themes.items():
@@ -38,15 +39,19 @@ async def list_available_themes():
             })
 
         return ContentResponse(data={"themes": themes, "total": len(themes)})
+
+    try:
+        version = await content_service.file_version_async(THEME_CONFIG)
+        return await conditional_response(request, version.etag, version.last_modified, build)
     except ValueError as e:
-        raise ContentNotFoundException("config/theme.json", details={"error": str(e)})
+        raise ContentNotFoundException(THEME_CONFIG, details={"error": str(e)})
 
 
 @router.get("/{theme_id}", response_model=ContentResponse)
-async def get_theme_details(theme_id: str):
+async def get_theme_details(theme_id: str, request: Request):
     """Get details for a specific theme"""
-    try:
-        config = content_service.get_theme_config()
+    async def build() -> ContentResponse:
+        config = (await content_service.get_config_async(THEME_CONFIG, ThemeConfig)).model
 
         if theme_id not in config.themes:
             raise ContentNotFoundException(
@@ -56,7 +61,11 @@ async def get_theme_details(theme_id: str):
 
         theme_data = config.themes[theme_id]
         return ContentResponse(data=theme_data)
+
+    try:
+        version = await content_service.file_version_async(THEME_CONFIG)
+        return await conditional_response(request, version.etag, version.last_modified, build)
     except ContentNotFoundException:
         raise
     except ValueError as e:
-        raise ContentNotFoundException("config/theme.json", details={"error": str(e)})
\ No newline at end of file
+        raise ContentNotFoundException(THEME_CONFIG, details={"error": str(e)})
\ No newline at end of file
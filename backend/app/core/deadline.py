@@ -0,0 +1,86 @@
+"""
+Per-request time budgets
+
+A Deadline is created once per request and passed down the call chain.
+Each stage asks for its share of whatever budget is left, so a slow early
+stage automatically leaves less time for later ones instead of pushing the
+whole request past its SLO.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """Absolute point in time by which a request must be answered"""
+
+    def __init__(
+        self,
+        budget: float,
+        reserve: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            budget: Total time budget in seconds
+            reserve: Seconds held back at the end for building a fallback answer
+            clock: Monotonic clock, injectable for tests
+        """
+        self.budget = budget
+        self.reserve = reserve
+        self._clock = clock
+        self._expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """Seconds left for work, excluding the reserve (never negative)"""
+        return max(0.0, self._expires_at - self._clock() - self.reserve)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return self.budget - (self._expires_at - self._clock())
+
+    def share(self, fraction: float, cap: Optional[float] = None) -> float:
+        """
+        Time budget for the next stage
+
+        Args:
+            fraction: Fraction of the remaining budget the stage may use
+            cap: Optional upper bound in seconds (e.g. a per-call timeout)
+
+        Returns:
+            Seconds the stage may take
+        """
+        seconds = self.remaining() * fraction
+        return min(seconds, cap) if cap is not None else seconds
+
+    async def run(
+        self,
+        awaitable: Awaitable[T],
+        stage: str,
+        fraction: float = 1.0,
+        cap: Optional[float] = None
+    ) -> T:
+        """
+        Await `awaitable` within the stage's share of the budget
+
+        Raises:
+            DeadlineExceededError: If the stage did not finish in time
+        """
+        timeout = self.share(fraction, cap)
+        if timeout <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceededError(stage, details={"timeout": 0.0})
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(stage, details={"timeout": round(timeout, 3)})
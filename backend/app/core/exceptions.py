@@ -81,3 +81,12 @@ class DatabaseError(PortfolioException):
 
     def __init__(self, message: str = "Database error", details: Optional[Dict[str, Any]] = None):
         super().__init__(message, status_code=500, details=details)
+
+
+class DeadlineExceededError(PortfolioException):
+    """Exception raised when a request stage runs past its time budget"""
+
+    def __init__(self, stage: str, details: Optional[Dict[str, Any]] = None):
+        self.stage = stage
+        message = f"Deadline exceeded during {stage}"
+        super().__init__(message, status_code=504, details=details)
@@ -0,0 +1,146 @@
+"""
+HTTP conditional caching for read endpoints
+
+Routes pass validators they already hold (content hashes and modification
+times) before building anything. A request whose If-None-Match or
+If-Modified-Since matches gets an empty 304, so the response body is never
+built or sent. Cache-Control policies come from settings, per URL prefix.
+"""
+
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+
+# For URLs whose content never changes, such as content-hashed bundles
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def accepts_encoding(request: Request, coding: str) -> bool:
+    """
+    Whether Accept-Encoding allows a content coding
+
+    Args:
+        request: Incoming request
+        coding: Content coding, e.g. "gzip"
+
+    Returns:
+        True if the coding (or *) is listed without q=0
+    """
+    for entry in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if name.strip().lower() not in (coding, "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def cache_control_for(path: str) -> str:
+    """
+    Cache-Control policy of a URL path
+
+    The longest matching prefix in HTTP_CACHE_CONTROL_ROUTES wins, falling
+    back to HTTP_CACHE_CONTROL.
+    """
+    best = None
+    for prefix in settings.HTTP_CACHE_CONTROL_ROUTES:
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return settings.HTTP_CACHE_CONTROL_ROUTES[best] if best is not None else settings.HTTP_CACHE_CONTROL
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether the client's cached copy is current
+
+    If-Modified-Since is only considered without If-None-Match (RFC 9110).
+
+    Args:
+        request: Incoming GET or HEAD request
+        etag: Current strong ETag, quoted
+        last_modified: Current modification time (timezone-aware)
+
+    Returns:
+        True if a 304 should be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(request: Request, etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """Validator and Cache-Control headers for a response"""
+    headers = {"ETag": etag, "Cache-Control": cache_control_for(request.url.path)}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+async def conditional_response(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime],
+    build: Callable[[], Any]
+) -> Response:
+    """
+    Answer with 304 if the client is current, otherwise build the response
+
+    Args:
+        request: Incoming request
+        etag: Current strong ETag, quoted
+        last_modified: Current modification time
+        build: Returns the body (model or JSON-compatible data) or a ready Response,
+            or an awaitable of either; only called when the client's copy is stale
+
+    Returns:
+        304 with validators, or the built response with validators
+    """
+    headers = cache_headers(request, etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    body = build()
+    if inspect.isawaitable(body):
+        body = await body
+    response = body if isinstance(body, Response) else JSONResponse(content=jsonable_encoder(body))
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,82 @@
+"""
+Bounded thread pool for blocking file I/O
+
+Async endpoints hand stat(), open() and read() calls to this pool instead of
+running them on the event loop, where a slow disk or cold page cache would
+stall every other request and chat stream. The pool is separate from the
+default executor so a burst of file reads cannot starve other offloaded
+work (embeddings, audio splitting), and vice versa.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class IOPool:
+    """Lazily started thread pool for blocking filesystem calls"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Threads in the pool, defaults to CONTENT_IO_THREADS
+        """
+        self.max_workers = max_workers or settings.CONTENT_IO_THREADS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.in_flight = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function in the pool
+
+        Args:
+            func: Function doing blocking I/O
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's result; its exceptions propagate
+        """
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; the pool restarts on next use"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "submitted": self.submitted,
+            "in_flight": self.in_flight
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="content-io"
+                    )
+        return self._executor
+
+
+# Global instance
+io_pool = IOPool()
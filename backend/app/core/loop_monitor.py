@@ -0,0 +1,114 @@
+"""
+Event loop lag monitor
+
+A background task sleeps for a fixed interval and measures how late it
+wakes up. Any callback that holds the loop (blocking I/O, heavy CPU work)
+delays the wake-up by as long as it runs, so the lag distribution shows
+whether and how long the loop is being blocked.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LoopLagMonitor:
+    """Samples event loop scheduling delay"""
+
+    def __init__(
+        self,
+        interval_ms: Optional[float] = None,
+        threshold_ms: Optional[float] = None,
+        warn_ms: Optional[float] = None,
+        window: int = 1000,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        """
+        Args:
+            interval_ms: Time between samples
+            threshold_ms: Lag counted as the loop having been blocked
+            warn_ms: Lag that is logged as a warning
+            window: Recent samples kept for percentiles
+            clock: High-resolution clock, injectable for tests
+        """
+        self.interval_ms = interval_ms if interval_ms is not None else settings.LOOP_MONITOR_INTERVAL_MS
+        self.threshold_ms = threshold_ms if threshold_ms is not None else settings.LOOP_LAG_THRESHOLD_MS
+        self.warn_ms = warn_ms if warn_ms is not None else settings.LOOP_LAG_WARN_MS
+        self._clock = clock
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.reset()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reset(self) -> None:
+        """Forget all samples"""
+        self._samples.clear()
+        self.count = 0
+        self.blocked = 0
+        self.max_lag_ms = 0.0
+
+    def record(self, lag_ms: float) -> None:
+        """Add one lag sample"""
+        self._samples.append(lag_ms)
+        self.count += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms > self.threshold_ms:
+            self.blocked += 1
+        if lag_ms > self.warn_ms:
+            logger.warning(f"Event loop blocked for {lag_ms:.1f} ms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._samples)
+
+        def percentile(pct: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)], 3)
+
+        return {
+            "running": self.running,
+            "samples": self.count,
+            "interval_ms": self.interval_ms,
+            "p50_lag_ms": percentile(50),
+            "p99_lag_ms": percentile(99),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "threshold_ms": self.threshold_ms,
+            "blocked": self.blocked
+        }
+
+    async def _run(self) -> None:
+        interval = self.interval_ms / 1000
+        while True:
+            started = self._clock()
+            await asyncio.sleep(interval)
+            self.record(max(0.0, (self._clock() - started - interval) * 1000))
+
+
+# Global instance
+loop_monitor = LoopLagMonitor()
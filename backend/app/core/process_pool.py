@@ -0,0 +1,102 @@
+"""
+Bounded process pool for CPU-heavy rendering
+
+A WeasyPrint render holds the GIL for a second or more; in a thread it would
+still slow every request this worker serves. Renders run in a small pool of
+spawned processes instead, started on first use. A pool whose process died
+(e.g. killed for memory) is replaced and the call retried once.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ProcessPool:
+    """Lazily started pool of spawned worker processes"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Processes in the pool, defaults to PDF_RENDER_PROCESSES;
+                0 runs calls in the I/O thread pool instead
+        """
+        self.max_workers = settings.PDF_RENDER_PROCESSES if max_workers is None else max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.in_flight = 0
+        self.restarts = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a function in a worker process
+
+        Args:
+            func: Module-level function; it and its arguments must be picklable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's result; its exceptions propagate
+        """
+        if self.max_workers <= 0:
+            return await io_pool.run(func, *args, **kwargs)
+
+        call = functools.partial(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        self.in_flight += 1
+        try:
+            try:
+                return await loop.run_in_executor(self._get_executor(), call)
+            except BrokenProcessPool:
+                logger.warning("Render process died, restarting the pool")
+                self.shutdown()
+                self.restarts += 1
+                return await loop.run_in_executor(self._get_executor(), call)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "submitted": self.submitted,
+            "in_flight": self.in_flight,
+            "restarts": self.restarts
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Spawned, not forked: the parent runs an event loop and threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+
+# Global instance
+render_pool = ProcessPool()
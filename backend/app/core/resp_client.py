@@ -0,0 +1,211 @@
+"""
+Minimal asyncio client for the Redis serialization protocol (RESP2)
+
+Speaks just enough of the protocol for a shared cache - GET/MGET/SET/INCR/DEL
+and pipelines of them - over a small pool of connections. Works against
+Redis, Valkey, KeyDB, Dragonfly and anything else speaking RESP, without
+adding a client library to the image.
+"""
+
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+Argument = Union[str, bytes, int, float]
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RespError(Exception):
+    """Error reply from the server, e.g. WRONGTYPE or NOAUTH"""
+
+
+def encode_command(args: Sequence[Argument]) -> bytes:
+    """
+    Encode one command as a RESP array of bulk strings
+
+    Args:
+        args: Command name and arguments
+
+    Returns:
+        Bytes to write to the connection
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one reply; error replies are returned, not raised, so a pipeline stays in sync
+
+    Returns:
+        str, int, bytes, None, RespError or a list of those
+
+    Raises:
+        ConnectionError: If the connection closed or the reply is malformed
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by server")
+    prefix, body = line[:1], line[1:-2]
+
+    if prefix == b"$":
+        length = _parse_int(line)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b":":
+        return _parse_int(line)
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        return RespError(body.decode("utf-8", "replace"))
+    if prefix == b"*":
+        length = _parse_int(line)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected reply: {line[:32]!r}")
+
+
+def _parse_int(line: bytes) -> int:
+    """Integer of a length or integer reply line; a garbled one ends the connection"""
+    try:
+        return int(line[1:-2])
+    except ValueError:
+        raise ConnectionError(f"Malformed reply: {line[:32]!r}")
+
+
+class RespClient:
+    """Pooled RESP2 connections with per-call timeouts"""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        ssl: bool = False,
+        pool_size: int = 4,
+        timeout: float = 0.2
+    ):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            db: Database selected on each new connection
+            username: ACL user; AUTH with the password only if None
+            password: Password; no AUTH if None
+            ssl: Connect over TLS
+            pool_size: Connections kept open at most
+            timeout: Seconds a call may take, connecting included
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.username = username
+        self.password = password
+        self.ssl = ssl
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: List[Connection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RespClient":
+        """
+        Client for a redis://[user:password@]host[:port][/db] URL (rediss:// for TLS)
+
+        Raises:
+            ValueError: If the scheme is not redis or rediss
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported cache URL scheme: {parts.scheme}")
+        path = parts.path.strip("/")
+        return cls(
+            host=parts.hostname or "localhost",
+            port=parts.port or 6379,
+            db=int(path) if path else 0,
+            username=unquote(parts.username) if parts.username else None,
+            password=unquote(parts.password) if parts.password else None,
+            ssl=parts.scheme == "rediss",
+            **kwargs
+        )
+
+    async def execute(self, *args: Argument) -> Any:
+        """
+        Run one command
+
+        Raises:
+            RespError: If the server answered with an error
+            ConnectionError, OSError, asyncio.TimeoutError: If the server is unreachable or slow
+        """
+        return (await self.pipeline([args]))[0]
+
+    async def pipeline(self, commands: Sequence[Sequence[Argument]]) -> List[Any]:
+        """
+        Send several commands in one write and read their replies in order
+
+        Raises:
+            RespError: If the server answered any command with an error
+            ConnectionError, OSError, asyncio.TimeoutError: If the server is unreachable or slow
+        """
+        replies = await asyncio.wait_for(self._pipeline(commands), self.timeout)
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def close(self) -> None:
+        """Close idle connections"""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    async def _pipeline(self, commands: Sequence[Sequence[Argument]]) -> List[Any]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            reader, writer = await self._acquire()
+            try:
+                writer.write(b"".join(encode_command(command) for command in commands))
+                await writer.drain()
+                replies = [await read_reply(reader) for _ in commands]
+            except BaseException:
+                # Replies may be half read; the connection cannot be reused
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+            return replies
+
+    async def _acquire(self) -> Connection:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing():
+                return reader, writer
+
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        try:
+            if setup:
+                writer.write(b"".join(encode_command(command) for command in setup))
+                await writer.drain()
+                for _ in setup:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, RespError):
+                        raise reply
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
@@ -0,0 +1,48 @@
+"""
+Server-sent event formatting for streaming endpoints
+"""
+
+import inspect
+import json
+from typing import Any, Callable, Dict
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """Format an event dict with a "type" key as a server-sent event"""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+# Headers that keep proxies from buffering or caching an event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that releases a resource however the response ends
+
+    A generator's own finally never runs if iteration never started, e.g.
+    when the client left before the first event or sending the response
+    start failed; closing here covers those cases too.
+    """
+
+    def __init__(self, content: Any, on_close: Callable[[], Any], **kwargs: Any):
+        """
+        Args:
+            content: Body iterator
+            on_close: Called once the response is done, sent or not, and awaited if it
+                returns an awaitable (e.g. a generator's aclose); must be idempotent
+            **kwargs: StreamingResponse arguments
+        """
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            result = self.on_close()
+            if inspect.isawaitable(result):
+                await result
@@ -0,0 +1,446 @@
+"""
+Static file serving for /page_content
+
+Text files (markdown, JSON, SVG) are sent brotli or gzip compressed when the
+client accepts it. A "<file>.br" / "<file>.gz" written at build time is used
+when it is at least as new as the file; otherwise the file is compressed once,
+on first request and at a faster brotli quality, and kept in a bounded memory
+cache. Files too large for that cache are sent uncompressed unless
+precompressed. Every representation
+has a strong ETag derived from the file's content, files with a content hash
+in their name are served as immutable, and uncompressed responses support
+single byte ranges, so images and media can be resumed and seeked.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL, accepts_encoding, cache_control_for
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+logger = get_logger(__name__)
+
+# Media types worth compressing; images other than SVG already are
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+# Content coding -> suffix of the precompressed file, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+# Names like logo.3f2a9c1b.svg or app-3f2a9c1b0d.js never change content
+HASHED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$")
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Brotli quality: the smallest output at build time; on request, a level about as fast as gzip
+BROTLI_BUILD_QUALITY = 11
+BROTLI_REQUEST_QUALITY = 5
+
+# (st_mtime_ns, st_size) of a file
+Stamp = Tuple[int, int]
+
+
+def compress(data: bytes, encoding: str, on_request: bool = False) -> bytes:
+    """
+    Compress with the given content coding
+
+    Args:
+        data: Bytes to compress
+        encoding: "br" or "gzip"
+        on_request: Trade some size for speed, as a client is waiting
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_REQUEST_QUALITY if on_request else BROTLI_BUILD_QUALITY)
+    # mtime=0 so every process produces identical bytes for the same content
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_range(header: str, size: int) -> Union[Tuple[int, int], None, bool]:
+    """
+    Parse a single byte range
+
+    Args:
+        header: Range header value
+        size: File size
+
+    Returns:
+        Inclusive (start, end), None if the header is invalid or asks for
+        several ranges (the whole file is sent), or False if unsatisfiable
+    """
+    match = RANGE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last) if last else size - 1, size - 1)
+
+
+@dataclass(frozen=True)
+class _Variant:
+    """A compressed representation, from a file on disk or from memory"""
+    encoding: str
+    path: Optional[str] = None
+    stat_result: Optional[os.stat_result] = None
+    body: Optional[bytes] = None
+
+
+class FileRangeResponse(Response):
+    """206 response with one byte range of a file"""
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        size: int,
+        headers: Dict[str, str],
+        media_type: str,
+        method: str
+    ):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.status_code = 206
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = method.upper() == "HEAD"
+        self.init_headers({
+            **headers,
+            "content-range": f"bytes {start}-{end}/{size}",
+            "content-length": str(end - start + 1)
+        })
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # The file shrank while being sent
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles with content negotiation, strong ETags and byte ranges"""
+
+    def __init__(
+        self,
+        *,
+        directory: Union[str, Path],
+        compress_min_bytes: Optional[int] = None,
+        cache_max_bytes: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            directory: Directory to serve
+            compress_min_bytes: Smaller files are always sent uncompressed,
+                defaults to STATIC_COMPRESS_MIN_BYTES
+            cache_max_bytes: Memory kept for files compressed on request,
+                defaults to STATIC_COMPRESS_CACHE_BYTES
+            **kwargs: Passed to StaticFiles
+        """
+        super().__init__(directory=directory, **kwargs)
+        self.compress_min_bytes = (
+            compress_min_bytes if compress_min_bytes is not None else settings.STATIC_COMPRESS_MIN_BYTES
+        )
+        self.cache_max_bytes = cache_max_bytes if cache_max_bytes is not None else settings.STATIC_COMPRESS_CACHE_BYTES
+        # Full path -> (stamp, ETag) of the file as last hashed
+        self._etags: Dict[str, Tuple[Stamp, str]] = {}
+        self._compressed: "OrderedDict[Tuple[str, Stamp, str], bytes]" = OrderedDict()
+        self._compressed_bytes = 0
+        self._lock = threading.Lock()
+        # Variant lookups in progress by key; concurrent first requests for a file share one
+        self._inflight: Dict[Tuple[str, Stamp, str], "asyncio.Future[Optional[_Variant]]"] = {}
+
+        self.compressions = 0
+        self.shared_compressions = 0
+        self.precompressed_hits = 0
+        self.memory_hits = 0
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        try:
+            full_path, stat_result = await io_pool.run(self.lookup_path, path)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            # Directories, html mode and 404s as usual
+            return await super().get_response(path, scope)
+        return await self.serve(full_path, stat_result, scope)
+
+    async def serve(self, full_path: str, stat_result: os.stat_result, scope: Scope) -> Response:
+        """
+        Response for a regular file
+
+        Args:
+            full_path: Path of the file
+            stat_result: Its stat() result
+            scope: ASGI scope of the request
+
+        Returns:
+            304, 206, 416 or 200 response, compressed when negotiated
+        """
+        request = Request(scope)
+        method = scope["method"]
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+        media_type = guess_type(full_path)[0] or "text/plain"
+        etag = await self._etag(full_path, stamp)
+        headers = {
+            "etag": f'"{etag}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": self._cache_control(full_path, scope)
+        }
+
+        variant = None
+        compressible = is_compressible(media_type) and stat_result.st_size >= self.compress_min_bytes
+        if compressible:
+            headers["vary"] = "Accept-Encoding"
+            if "range" not in request.headers:
+                for encoding in self._accepted_encodings(request):
+                    # Compressed before: no stat() of a precompressed file, no thread hop
+                    body = self._lookup((full_path, stamp, encoding))
+                    if body is not None:
+                        variant = _Variant(encoding=encoding, body=body) if len(body) < stamp[1] else None
+                    else:
+                        variant = await self._variant_once(full_path, stamp, encoding)
+                    if variant is not None:
+                        headers["etag"] = f'"{etag}-{encoding}"'
+                        headers["content-encoding"] = encoding
+                        break
+
+        if self._not_modified(request.headers, headers["etag"], stat_result.st_mtime):
+            return NotModifiedResponse(Headers(headers))
+
+        if variant is not None:
+            if variant.path is not None:
+                return FileResponse(
+                    variant.path,
+                    stat_result=variant.stat_result,
+                    headers=headers,
+                    media_type=media_type,
+                    method=method
+                )
+            return Response(
+                content=b"" if method == "HEAD" else variant.body,
+                media_type=media_type,
+                headers={**headers, "content-length": str(len(variant.body))}
+            )
+
+        headers["accept-ranges"] = "bytes"
+        range_header = request.headers.get("range")
+        if range_header is not None and self._if_range_matches(request.headers, headers):
+            byte_range = parse_range(range_header, stat_result.st_size)
+            if byte_range is False:
+                return Response(
+                    status_code=416,
+                    headers={**headers, "content-range": f"bytes */{stat_result.st_size}"}
+                )
+            if byte_range is not None:
+                start, end = byte_range
+                return FileRangeResponse(full_path, start, end, stat_result.st_size, headers, media_type, method)
+
+        return FileResponse(full_path, stat_result=stat_result, headers=headers, media_type=media_type, method=method)
+
+    def _accepted_encodings(self, request: Request) -> List[str]:
+        return [
+            encoding for encoding in ENCODINGS
+            if accepts_encoding(request, encoding)
+        ]
+
+    def _cache_control(self, full_path: str, scope: Scope) -> str:
+        if HASHED_NAME.search(os.path.basename(full_path)):
+            return IMMUTABLE_CACHE_CONTROL
+        return cache_control_for(scope.get("root_path", "") + scope["path"])
+
+    @staticmethod
+    def _not_modified(request_headers: Headers, etag: str, mtime: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison, as for GET/HEAD
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            since = parsedate(if_modified_since)
+            modified = parsedate(formatdate(mtime, usegmt=True))
+            return since is not None and modified is not None and since >= modified
+        return False
+
+    @staticmethod
+    def _if_range_matches(request_headers: Headers, headers: Dict[str, str]) -> bool:
+        """Whether a Range request may be answered partially; If-Range needs a strong match"""
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith(('"', "W/")):
+            return if_range == headers["etag"]
+        return if_range == headers["last-modified"]
+
+    async def _etag(self, full_path: str, stamp: Stamp) -> str:
+        cached = self._etags.get(full_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        return await io_pool.run(self._hash, full_path, stamp)
+
+    def _hash(self, full_path: str, stamp: Stamp) -> str:
+        """Strong ETag: hash of the file's content"""
+        digest = hashlib.sha256()
+        with open(full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+        self._etags[full_path] = (stamp, etag)
+        return etag
+
+    async def _variant_once(self, full_path: str, stamp: Stamp, encoding: str) -> Optional[_Variant]:
+        """Look up or make a compressed variant in the I/O pool, once for concurrent requests"""
+        key = (full_path, stamp, encoding)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(io_pool.run(self._variant, full_path, stamp, encoding))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared_compressions += 1
+        # A request that goes away does not cancel the work for the others
+        return await asyncio.shield(future)
+
+    def _variant(self, full_path: str, stamp: Stamp, encoding: str) -> Optional[_Variant]:
+        """
+        The file compressed with `encoding`, or None if it is sent uncompressed
+
+        A precompressed file next to it is used when at least as new;
+        otherwise the file is compressed and kept in memory. Files larger
+        than the memory cache are not compressed on request, as they would
+        be compressed again on every request.
+        """
+        precompressed = full_path + ENCODINGS[encoding]
+        try:
+            precompressed_stat = os.stat(precompressed)
+            if stat.S_ISREG(precompressed_stat.st_mode) and precompressed_stat.st_mtime_ns >= stamp[0]:
+                self.precompressed_hits += 1
+                return _Variant(encoding=encoding, path=precompressed, stat_result=precompressed_stat)
+        except OSError:
+            pass
+
+        if (encoding == "br" and brotli is None) or stamp[1] > self.cache_max_bytes:
+            return None
+
+        key = (full_path, stamp, encoding)
+        body = self._lookup(key)
+        if body is None:
+            with open(full_path, "rb") as f:
+                body = compress(f.read(), encoding, on_request=True)
+            self.compressions += 1
+            logger.debug(f"Compressed {full_path} with {encoding}: {stamp[1]} -> {len(body)} bytes")
+            self._remember(key, body)
+        return _Variant(encoding=encoding, body=body) if len(body) < stamp[1] else None
+
+    def _lookup(self, key: Tuple[str, Stamp, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._compressed.get(key)
+            if body is not None:
+                self._compressed.move_to_end(key)
+                self.memory_hits += 1
+            return body
+
+    def _remember(self, key: Tuple[str, Stamp, str], body: bytes) -> None:
+        if len(body) > self.cache_max_bytes:
+            return
+        with self._lock:
+            previous = self._compressed.pop(key, None)
+            if previous is not None:
+                self._compressed_bytes -= len(previous)
+            self._compressed[key] = body
+            self._compressed_bytes += len(body)
+            while self._compressed_bytes > self.cache_max_bytes:
+                _, evicted = self._compressed.popitem(last=False)
+                self._compressed_bytes -= len(evicted)
+
+
+def precompress_directory(directory: Union[str, Path], min_bytes: Optional[int] = None) -> int:
+    """
+    Write "<file>.br" and "<file>.gz" next to every compressible file, e.g. at build time
+
+    Args:
+        directory: Directory to walk
+        min_bytes: Smaller files are skipped, defaults to STATIC_COMPRESS_MIN_BYTES
+
+    Returns:
+        Number of compressed files written
+    """
+    min_bytes = min_bytes if min_bytes is not None else settings.STATIC_COMPRESS_MIN_BYTES
+    written = 0
+    for path in sorted(Path(directory).rglob("*")):
+        media_type, coding = guess_type(path.name)
+        if coding is not None or not is_compressible(media_type or "") or not path.is_file():
+            continue
+        if path.stat().st_size < min_bytes:
+            continue
+        data = path.read_bytes()
+        for encoding, suffix in ENCODINGS.items():
+            if encoding == "br" and brotli is None:
+                continue
+            body = compress(data, encoding)
+            if len(body) < len(data):
+                path.with_name(path.name + suffix).write_bytes(body)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    # python -m app.core.static_files <directory>
+    target = sys.argv[1] if len(sys.argv) > 1 else settings.CONTENT_PATH
+    print(f"Wrote {precompress_directory(target)} precompressed files in {target}")
@@ -0,0 +1,478 @@
+"""
+Two-tier cache: an in-process LRU (L1) in front of a store shared by all workers (L2)
+
+Each worker answers repeat lookups from its own memory; what one worker
+computed - embeddings, retrieval results, LLM responses, transcripts,
+rendered PDFs - is found by the others and by freshly started workers in
+L2. L2 is a Redis-protocol server (CACHE_L2_URL=redis://...), or an
+in-memory stand-in (memory://) for tests and single-process runs.
+
+Values are encoded by a per-cache codec and zlib-compressed when that makes
+them smaller. Lookups of several keys are one MGET, and L2 is always
+optional: an unreachable server counts as a miss and is retried after a
+pause, never failing the request.
+"""
+
+import array
+import hashlib
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.resp_client import RespClient, RespError
+
+logger = get_logger(__name__)
+
+# First byte of every L2 value
+RAW = b"\x00"
+ZLIB = b"\x01"
+
+
+class L2UnavailableError(Exception):
+    """The shared store could not be reached; the lookup counts as a miss"""
+
+
+class Codec(Protocol):
+    """Converts cached values to bytes and back"""
+
+    def encode(self, value: Any) -> bytes: ...
+
+    def decode(self, data: bytes) -> Any: ...
+
+
+class JsonCodec:
+    """JSON-compatible values (dicts, lists, numbers, strings) via orjson"""
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class TextCodec:
+    """Strings as UTF-8"""
+
+    def encode(self, value: str) -> bytes:
+        return value.encode("utf-8")
+
+    def decode(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+
+class BytesCodec:
+    """Bytes as they are, e.g. PDFs"""
+
+    def encode(self, value: bytes) -> bytes:
+        return bytes(value)
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+
+class VectorCodec:
+    """Float vectors as little-endian float32: 4 bytes a dimension instead of ~20 as JSON"""
+
+    def encode(self, value: List[float]) -> bytes:
+        packed = array.array("f", value)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tobytes()
+
+    def decode(self, data: bytes) -> List[float]:
+        packed = array.array("f")
+        packed.frombytes(data)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tolist()
+
+
+JSON_CODEC = JsonCodec()
+TEXT_CODEC = TextCodec()
+BYTES_CODEC = BytesCodec()
+VECTOR_CODEC = VectorCodec()
+
+
+def hash_key(*parts: Any) -> str:
+    """
+    Fixed-length cache key for arbitrary JSON-compatible parts
+
+    Returns:
+        Hex SHA-256 of the parts
+    """
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class L2Store(Protocol):
+    """What TieredCache needs from a shared store"""
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]: ...
+
+    async def mset(self, items: Dict[str, bytes], ttl_seconds: float) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def close(self) -> None: ...
+
+    def get_stats(self) -> Dict[str, Any]: ...
+
+
+class InMemoryStore:
+    """Process-local stand-in for the shared store, for tests and single-worker setups"""
+
+    backend = "memory"
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.round_trips = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.round_trips += 1
+        now = self._clock()
+        values = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+            values.append(entry[0] if entry else None)
+        return values
+
+    async def mset(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        self.round_trips += 1
+        expires_at = self._clock() + ttl_seconds
+        for key, value in items.items():
+            self._entries[key] = (value, expires_at)
+
+    async def incr(self, key: str) -> int:
+        self.round_trips += 1
+        value = int(self._entries.get(key, (b"0", None))[0]) + 1
+        self._entries[key] = (str(value).encode(), None)
+        return value
+
+    async def close(self) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "keys": len(self._entries), "round_trips": self.round_trips}
+
+
+class RespStore:
+    """Shared store on a Redis-protocol server, backing off after a failure"""
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        client: RespClient,
+        retry_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            client: Connection pool to the server
+            retry_seconds: Pause after a failure before the server is tried again
+            clock: Monotonic clock, injectable for tests
+        """
+        self.client = client
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._down_until = 0.0
+        self.round_trips = 0
+        self.errors = 0
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self._call([("MGET", *keys)], single=True)
+
+    async def mset(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        await self._call([("SET", key, value, "PX", ttl_ms) for key, value in items.items()])
+
+    async def incr(self, key: str) -> int:
+        return await self._call([("INCR", key)], single=True)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "server": f"{self.client.host}:{self.client.port}/{self.client.db}",
+            "available": self._down_until <= self._clock(),
+            "round_trips": self.round_trips,
+            "errors": self.errors
+        }
+
+    async def _call(self, commands: List[Tuple[Any, ...]], single: bool = False) -> Any:
+        if self._down_until > self._clock():
+            raise L2UnavailableError("Shared cache unavailable")
+        self.round_trips += 1
+        try:
+            replies = await self.client.pipeline(commands)
+        except (OSError, ConnectionError, RespError, EOFError, TimeoutError) as e:
+            # asyncio.TimeoutError and IncompleteReadError are among these
+            self.errors += 1
+            self._down_until = self._clock() + self.retry_seconds
+            logger.warning(f"Shared cache unavailable, retrying in {self.retry_seconds}s: {e!r}")
+            raise L2UnavailableError(str(e)) from e
+        return replies[0] if single else replies
+
+
+def build_l2_store(url: str) -> Optional[L2Store]:
+    """
+    Shared store for a CACHE_L2_URL
+
+    Args:
+        url: redis://... or rediss://... for a server, memory:// for the
+            in-process stand-in, empty for no L2
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemoryStore()
+    client = RespClient.from_url(url, timeout=settings.CACHE_L2_TIMEOUT_MS / 1000)
+    return RespStore(client, retry_seconds=settings.CACHE_L2_RETRY_SECONDS)
+
+
+# Every TieredCache by name, for /cache-stats
+_tiers: Dict[str, "TieredCache"] = {}
+
+
+def get_tier_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters of every tiered cache, by name"""
+    return {name: cache.get_stats() for name, cache in _tiers.items()}
+
+
+class TieredCache:
+    """In-process LRU (L1) in front of an optional shared store (L2)"""
+
+    def __init__(
+        self,
+        name: str,
+        codec: Codec,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        l2: Optional[L2Store] = None,
+        versioned: bool = False,
+        compress_min_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name: Cache name, also the L2 key namespace
+            codec: Encodes values for L2
+            max_entries: Entries kept in L1; 0 makes this a front for L2 only
+            ttl_seconds: Lifetime of an entry, in L1 and L2
+            l2: Shared store; L1 only if None
+            versioned: Keys live under a generation that clear() advances in L2,
+                for values that go stale without their key changing
+            compress_min_bytes: Encoded values at least this large are zlib-compressed;
+                CACHE_L2_COMPRESS_MIN_BYTES if None
+            clock: Monotonic clock, injectable for tests
+        """
+        self.name = name
+        self.codec = codec
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.l2 = l2
+        self.versioned = versioned
+        self.compress_min_bytes = (
+            settings.CACHE_L2_COMPRESS_MIN_BYTES if compress_min_bytes is None else compress_min_bytes
+        )
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.l2_errors = 0
+        _tiers[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up one value, in L1 then L2
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up several values; those not in L1 are fetched from L2 in one round trip
+
+        Returns:
+            Values found, by key
+        """
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.get_local(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        self.l1_hits += len(found)
+        if not missing:
+            return found
+
+        from_l2 = 0
+        if self.l2 is not None:
+            for key, data in zip(missing, await self._fetch(missing)):
+                if data is None:
+                    continue
+                try:
+                    value = self._decode(data)
+                except Exception as e:
+                    logger.warning(f"Undecodable {self.name} cache entry: {e}")
+                    self.l2_errors += 1
+                    continue
+                self.set_local(key, value)
+                found[key] = value
+                from_l2 += 1
+        self.l2_hits += from_l2
+        self.misses += len(missing) - from_l2
+        return found
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a value in L1 and L2"""
+        await self.set_many({key: value})
+
+    async def set_many(self, items: Dict[str, Any]) -> None:
+        """Store several values; L2 gets them in one round trip"""
+        for key, value in items.items():
+            self.set_local(key, value)
+        if self.l2 is None or not items:
+            return
+        encoded = {self._l2_key(key): self._encode(value) for key, value in items.items()}
+        try:
+            await self.l2.mset(encoded, self.ttl_seconds)
+        except L2UnavailableError:
+            self.l2_errors += 1
+
+    def get_local(self, key: str) -> Optional[Any]:
+        """Look up a value in L1 only; safe to call from worker threads"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set_local(self, key: str, value: Any) -> None:
+        """Store a value in L1 only; safe to call from worker threads"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_local(self, *_: Any) -> None:
+        """Drop L1, e.g. when another worker reported a change; L2 is left as it is"""
+        with self._lock:
+            self._entries.clear()
+
+    async def clear(self) -> None:
+        """
+        Drop L1 and, for a versioned cache, every worker's L2 entries
+
+        The generation is advanced in L2; other workers find out on their
+        next L2 lookup, and drop their L1 when told over the cache bus.
+        """
+        self.invalidate_local()
+        if self.versioned and self.l2 is not None:
+            try:
+                self._generation = await self.l2.incr(self._generation_key)
+            except L2UnavailableError:
+                self.l2_errors += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        l2_lookups = self.l2_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l2_errors": self.l2_errors,
+            "l1_hit_rate": round(self.l1_hits / lookups, 3) if lookups else 0.0,
+            "l2_hit_rate": round(self.l2_hits / l2_lookups, 3) if l2_lookups and self.l2 else 0.0,
+            "hit_rate": round((self.l1_hits + self.l2_hits) / lookups, 3) if lookups else 0.0,
+            "l2": self.l2.backend if self.l2 is not None else None
+        }
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{settings.CACHE_L2_PREFIX}:{self.name}:generation"
+
+    def _l2_key(self, key: str, generation: Optional[int] = None) -> str:
+        if not self.versioned:
+            return f"{settings.CACHE_L2_PREFIX}:{self.name}:{key}"
+        generation = self._generation if generation is None else generation
+        return f"{settings.CACHE_L2_PREFIX}:{self.name}:{generation}:{key}"
+
+    async def _fetch(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Values for keys from L2, None where missing or if L2 is unavailable"""
+        try:
+            if not self.versioned:
+                return await self.l2.mget([self._l2_key(key) for key in keys])
+
+            # The generation travels in the same MGET; on a mismatch, ask again under the new one
+            for _ in range(2):
+                generation = self._generation
+                replies = await self.l2.mget(
+                    [self._generation_key, *(self._l2_key(key, generation) for key in keys)]
+                )
+                current = int(replies[0] or 0)
+                if current == generation:
+                    return replies[1:]
+                self._generation = current
+                self.invalidate_local()
+        except L2UnavailableError:
+            self.l2_errors += 1
+        return [None] * len(keys)
+
+    def _encode(self, value: Any) -> bytes:
+        data = self.codec.encode(value)
+        if len(data) >= self.compress_min_bytes:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                return ZLIB + compressed
+        return RAW + data
+
+    def _decode(self, data: bytes) -> Any:
+        flag, payload = data[:1], data[1:]
+        if flag == ZLIB:
+            payload = zlib.decompress(payload)
+        elif flag != RAW:
+            raise ValueError(f"Unknown encoding flag {flag!r}")
+        return self.codec.decode(payload)
+
+
+# Global instance
+l2_store = build_l2_store(settings.CACHE_L2_URL)
@@ -3,8 +3,8 @@ FastAPI main application entry point for Portfolio CMS & RAG System
 """
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -13,6 +13,23 @@ from app.api.v1.chat import router as chat_router
 from app.api.v1.theme import router as theme_router
 from app.api.v1.resume import router as resume_router
 from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.loop_monitor import loop_monitor
+from app.core.process_pool import render_pool
+from app.core.static_files import PrecompressedStaticFiles
+from app.core.tiered_cache import l2_store
+from app.services.rag.conversation_memory import conversation_memory
+from app.services.cache_bus import (
+    CONFIG_CHANGED, CONTENT_CHANGED, CONTENT_REFRESHED, INGESTION_COMPLETED, cache_bus
+)
+from app.services.cache_refresh import apply_remote_changes, apply_remote_ingestion, refresh_caches
+from app.services.content.content_watcher import content_watcher
+from app.services.content.document_store import document_store
+from app.services.content_service import content_service
+from app.services.rag_service import rag_service
+from app.services.resume_service import resume_aggregator
+from app.services.pdf_generator import pdf_generator
+from app.services.warmup import startup_warmup
 from app.core.logging import setup_logging, get_logger
 from app.core.error_handlers import register_exception_handlers
 from app.middleware import ErrorLoggingMiddleware
@@ -37,10 +54,55 @@ async def lifespan(app: FastAPI):
     else:
         logger.info(f"Content directory found: {content_path}")
 
+    # Pick up content edits without a restart or manual refresh
+    if settings.CONTENT_WATCH_ENABLED:
+        # The shared document store first, so every consumer below re-reads fresh documents
+        content_watcher.subscribe(document_store.apply_changes)
+        content_watcher.subscribe(content_service.apply_changes)
+        content_watcher.subscribe(resume_aggregator.reload)
+        content_watcher.subscribe(pdf_generator.clear_cache)
+        content_watcher.subscribe(rag_service.schedule_reindex)
+        if settings.CACHE_BUS_ENABLED:
+            content_watcher.subscribe(cache_bus.publish_changes)
+        await content_watcher.start()
+        # Change notifications replace the content index's periodic scans
+        content_service.index.watched = content_watcher.running
+
+    # Apply the invalidations other workers publish
+    if settings.CACHE_BUS_ENABLED:
+        cache_bus.subscribe([CONTENT_CHANGED, CONFIG_CHANGED], apply_remote_changes)
+        cache_bus.subscribe(CONTENT_REFRESHED, refresh_caches)
+        cache_bus.subscribe(INGESTION_COMPLETED, apply_remote_ingestion)
+        await cache_bus.start()
+
+    # Report when anything holds the event loop
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+    # Fill caches in the background; /health reports not ready until done
+    if settings.STARTUP_WARMUP_ENABLED and content_path.exists():
+        stages = {
+            "content": content_service.warm_content,
+            "configs": content_service.warm_configs,
+            "resume": resume_aggregator.warm
+        }
+        if settings.STARTUP_WARMUP_PDF:
+            stages["pdf"] = pdf_generator.warm
+        startup_warmup.start(stages)
+
     yield
 
     # Shutdown
     logger.info("Portfolio Backend shutting down...")
+    await startup_warmup.stop()
+    await content_watcher.stop()
+    await cache_bus.stop()
+    await loop_monitor.stop()
+    await conversation_memory.close()
+    if l2_store is not None:
+        await l2_store.close()
+    render_pool.shutdown()
+    io_pool.shutdown()
 
 
 # Create FastAPI app
@@ -75,7 +137,7 @@ register_exception_handlers(app)
 
 # Mount static files for page_content
 if Path(settings.CONTENT_PATH).exists():
-    app.mount("/page_content", StaticFiles(directory=settings.CONTENT_PATH), name="page_content")
+    app.mount("/page_content", PrecompressedStaticFiles(directory=settings.CONTENT_PATH), name="page_content")
 
 # Include API routers
 app.include_router(content_router, prefix="/api/v1/content", tags=["content"])
@@ -104,11 +166,18 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint; 503 while startup warm-up is still running"""
     content_exists = Path(settings.CONTENT_PATH).exists()
-    return {
+    body = {
         "status": "healthy" if content_exists else "warning",
+        "ready": startup_warmup.ready,
         "content_directory": str(settings.CONTENT_PATH),
         "content_exists": content_exists,
+        "warmup": startup_warmup.get_stats(),
+        "event_loop": loop_monitor.get_stats(),
         "timestamp": settings.startup_time.isoformat()
-    }
\ No newline at end of file
+    }
+    if not startup_warmup.ready:
+        body["status"] = "starting"
+        return JSONResponse(status_code=503, content=body)
+    return body
\ No newline at end of file
@@ -3,7 +3,7 @@ Pydantic models for content management
 """
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 from datetime import datetime
 
 
@@ -81,6 +81,33 @@ class ContentListResponse(ContentResponse):
     total: int = Field(..., description="Total number of items")
 
 
+class ContentBatchStatus(BaseModel):
+    """Outcome of loading one path of a batch request"""
+    file_path: str = Field(..., description="Requested file path")
+    status: Literal["found", "missing", "error"]
+    error: Optional[str] = Field(None, description="Why the file could not be loaded, for status \"error\"")
+
+
+class ContentBatchResponse(ContentListResponse):
+    """API response for a batch of content items, with the outcome of every path"""
+    statuses: List[ContentBatchStatus] = Field(..., description="One entry per distinct requested path, in request order")
+
+
+class SearchHit(BaseModel):
+    """Ranking details of one search result"""
+    id: str = Field(..., description="Content item ID")
+    file_path: str = Field(..., description="Content item file path")
+    score: float = Field(..., description="BM25 score (lexical), cosine similarity (semantic) or fused rank score (hybrid)")
+    snippet: str = Field(..., description="HTML-escaped excerpt; lexical matches are wrapped in <mark>")
+    matched_terms: List[str] = Field(default_factory=list, description="Indexed terms the query matched")
+
+
+class SearchResponse(ContentListResponse):
+    """API response for content search, best match first"""
+    hits: List[SearchHit] = Field(default_factory=list, description="Score and snippet per result, in the same order as data")
+    mode: str = Field("lexical", description="Search mode used; semantic and hybrid fall back to lexical when unavailable")
+
+
 class ConfigResponse(ContentResponse):
     """API response for configuration"""
     data: Dict[str, Any]
\ No newline at end of file
@@ -1,5 +1,13 @@
 """Data access layer - Repositories"""
 
 from app.repositories.vector_repository import VectorRepository, vector_repository
+from app.repositories.conversation_repository import (
+    ConversationRepository, conversation_repository
+)
 
-__all__ = ["VectorRepository", "vector_repository"]
+__all__ = [
+    "VectorRepository",
+    "vector_repository",
+    "ConversationRepository",
+    "conversation_repository"
+]
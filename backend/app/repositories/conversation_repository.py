@@ -0,0 +1,139 @@
+"""
+Conversation repository for persisting chat history
+Uses the conversations/chat_messages tables and the vector repository's pool
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from app.core.logging import get_logger
+from app.repositories.vector_repository import VectorRepository, vector_repository
+
+logger = get_logger(__name__)
+
+# Namespace for mapping client-supplied, non-UUID conversation IDs to UUIDs
+CONVERSATION_NAMESPACE = uuid.UUID("6f1c8a52-3d0e-4b8e-9a57-2b1f0c4d7e91")
+
+ConversationRow = Tuple[uuid.UUID, str, Optional[str]]
+MessageRow = Tuple[uuid.UUID, str, str, Optional[str], datetime]
+
+
+def conversation_uuid(conversation_id: str) -> uuid.UUID:
+    """
+    Map a conversation ID to the UUID used as primary key
+
+    Args:
+        conversation_id: Client-facing conversation ID
+
+    Returns:
+        The ID itself if it is a UUID, otherwise a stable UUIDv5 derived from it
+    """
+    try:
+        return uuid.UUID(conversation_id)
+    except ValueError:
+        return uuid.uuid5(CONVERSATION_NAMESPACE, conversation_id)
+
+
+class ConversationRepository:
+    """Repository for conversation and chat message storage"""
+
+    def __init__(self, vector_repo: VectorRepository):
+        self.vector_repo = vector_repo
+
+    async def _pool(self) -> asyncpg.Pool:
+        if not self.vector_repo.connection_pool:
+            await self.vector_repo.initialize()
+        return self.vector_repo.connection_pool
+
+    async def save_batch(
+        self,
+        conversations: List[ConversationRow],
+        messages: List[MessageRow]
+    ) -> None:
+        """
+        Persist a batch of conversations and messages in one transaction
+
+        Args:
+            conversations: (id, session_id, summary) rows to upsert
+            messages: (conversation_id, role, content, sources_json, timestamp) rows
+        """
+        pool = await self._pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany("""
+                    INSERT INTO conversations (id, session_id, metadata)
+                    VALUES ($1, $2, $3::jsonb)
+                    ON CONFLICT (id) DO UPDATE SET
+                        metadata = COALESCE(EXCLUDED.metadata, conversations.metadata),
+                        updated_at = NOW()
+                """, [
+                    (conv_id, session_id, json.dumps({"summary": summary}) if summary else None)
+                    for conv_id, session_id, summary in conversations
+                ])
+
+                if messages:
+                    await conn.executemany("""
+                        INSERT INTO chat_messages
+                        (conversation_id, role, content, sources, timestamp)
+                        VALUES ($1, $2, $3, $4::jsonb, $5)
+                    """, messages)
+
+        logger.debug(f"Persisted {len(messages)} chat messages for {len(conversations)} conversations")
+
+    async def load_recent(
+        self,
+        conv_id: uuid.UUID,
+        limit: int,
+        timeout: Optional[float] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Load the rolling summary and most recent messages of a conversation
+
+        Args:
+            conv_id: Conversation UUID
+            limit: Maximum number of messages to return
+            timeout: Optional query timeout in seconds
+
+        Returns:
+            (summary, messages) with messages in chronological order
+        """
+        pool = await self._pool()
+        async with pool.acquire() as conn:
+            metadata = await conn.fetchval(
+                "SELECT metadata FROM conversations WHERE id = $1",
+                conv_id,
+                timeout=timeout
+            )
+            rows = await conn.fetch("""
+                SELECT role, content, timestamp FROM (
+                    SELECT id, role, content, timestamp
+                    FROM chat_messages
+                    WHERE conversation_id = $1
+                    ORDER BY id DESC
+                    LIMIT $2
+                ) recent
+                ORDER BY id
+            """, conv_id, limit, timeout=timeout)
+
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        summary = (metadata or {}).get("summary", "")
+
+        return summary, [
+            {"role": row["role"], "content": row["content"], "timestamp": row["timestamp"]}
+            for row in rows
+        ]
+
+    async def delete(self, conv_id: uuid.UUID) -> None:
+        """Delete a conversation and (by cascade) its messages"""
+        pool = await self._pool()
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM conversations WHERE id = $1", conv_id)
+
+
+# Global instance
+conversation_repository = ConversationRepository(vector_repository)
@@ -2,6 +2,7 @@
 Vector database repository for embeddings storage and retrieval
 """
 
+import asyncio
 import asyncpg
 from typing import List, Dict, Any, Optional
 import json
@@ -18,25 +19,32 @@ class VectorRepository:
 
     def __init__(self):
         self.connection_pool: Optional[asyncpg.Pool] = None
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
-        """Initialize database connection pool"""
-        try:
-            self.connection_pool = await asyncpg.create_pool(
-                settings.VECTOR_DB_URL,
-                min_size=1,
-                max_size=10,
-                command_timeout=60
-            )
-            logger.info("Vector repository initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize vector repository: {e}")
-            raise
+        """Initialize database connection pool, once; later calls return at once"""
+        if self.connection_pool is not None:
+            return
+        async with self._init_lock:
+            if self.connection_pool is not None:
+                return
+            try:
+                self.connection_pool = await asyncpg.create_pool(
+                    settings.VECTOR_DB_URL,
+                    min_size=1,
+                    max_size=10,
+                    command_timeout=60
+                )
+                logger.info("Vector repository initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize vector repository: {e}")
+                raise
 
     async def close(self) -> None:
         """Close database connections"""
         if self.connection_pool:
             await self.connection_pool.close()
+            self.connection_pool = None
             logger.info("Vector repository connections closed")
 
     async def store_embedding(
@@ -84,7 +92,8 @@ class VectorRepository:
         self,
         query_embedding: List[float],
         limit: int = 5,
-        threshold: float = 0.7
+        threshold: float = 0.7,
+        timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform similarity search for relevant content
@@ -93,6 +102,7 @@ class VectorRepository:
             query_embedding: Query vector
             limit: Maximum number of results
             threshold: Minimum similarity score
+            timeout: Seconds allowed for acquiring a connection and running the query
 
         Returns:
             List of matching content with similarity scores
@@ -100,8 +110,11 @@ class VectorRepository:
         if not self.connection_pool:
             await self.initialize()
 
+        if timeout is None:
+            timeout = settings.VECTOR_SEARCH_TIMEOUT
+
         try:
-            async with self.connection_pool.acquire() as conn:
+            async with self.connection_pool.acquire(timeout=timeout) as conn:
                 # Convert query embedding to pgvector format
                 query_embedding_str = f"[{','.join(map(str, query_embedding))}]"
 
@@ -112,7 +125,7 @@ class VectorRepository:
                     WHERE 1 - (embedding <=> $1::vector) > $3
                     ORDER BY embedding <=> $1::vector
                     LIMIT $2
-                """, query_embedding_str, limit, threshold)
+                """, query_embedding_str, limit, threshold, timeout=timeout)
 
                 return [
                     {
@@ -163,6 +176,38 @@ class VectorRepository:
             logger.error(f"Error fetching content by type {content_type}: {e}")
             return []
 
+    async def delete_file_embeddings(
+        self,
+        file_path: str,
+        keep_ids: Optional[List[str]] = None
+    ) -> int:
+        """
+        Delete the stored chunks of one file
+
+        Args:
+            file_path: File path as stored with the chunks
+            keep_ids: Content IDs to keep, e.g. chunks just re-stored for the file
+
+        Returns:
+            Number of deleted chunks
+        """
+        if not self.connection_pool:
+            await self.initialize()
+
+        try:
+            async with self.connection_pool.acquire() as conn:
+                status = await conn.execute("""
+                    DELETE FROM content_embeddings
+                    WHERE file_path = $1 AND NOT (content_id = ANY($2::text[]))
+                """, file_path, keep_ids or [])
+
+            deleted = int(status.split()[-1])
+            logger.debug(f"Deleted {deleted} embeddings for {file_path}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting embeddings for {file_path}: {e}")
+            return 0
+
 
 # Global instance
 vector_repository = VectorRepository()
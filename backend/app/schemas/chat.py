@@ -79,6 +79,15 @@ class ChatResponse(BaseModel):
     message: str = Field(..., description="Assistant response", min_length=1)
     conversation_id: str = Field(..., description="Conversation ID")
     sources: Optional[List[RAGSource]] = Field(None, description="RAG sources used")
+    fast_path: bool = Field(
+        False,
+        description="Answered directly from a curated Q&A pair without an LLM call"
+    )
+    degraded: Optional[str] = Field(
+        None,
+        description="Fallback step taken to stay within the response deadline "
+                    "(retrieval_skipped, context_answer, basic_response, partial_response)"
+    )
     timestamp: datetime = Field(default_factory=datetime.now)
 
     class Config:
@@ -0,0 +1,384 @@
+"""
+Pure-Python splitting of WAV and FLAC audio into overlapping segments
+
+Segments are cut on sample (WAV) or frame (FLAC) boundaries without
+decoding or re-encoding, and each one is a complete, playable file of the
+same format. Other formats are not split.
+"""
+
+import io
+import os
+import struct
+import wave
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Tuple
+
+FLAC_MARKER = b"fLaC"
+FLAC_SCAN_WINDOW = 1024 * 1024
+# Longest possible FLAC frame header, sync code through CRC-8
+FLAC_MAX_HEADER = 16
+# Marker, STREAMINFO block header and STREAMINFO written before each segment's frames
+FLAC_SEGMENT_HEADER_SIZE = 4 + 4 + 34
+# Canonical PCM header written by the wave module
+WAV_HEADER_SIZE = 44
+
+FLAC_BLOCK_SIZES = {1: 192, 2: 576, 3: 1152, 4: 2304, 5: 4608}
+FLAC_BLOCK_SIZES.update({code: 256 << (code - 8) for code in range(8, 16)})
+
+
+@dataclass
+class SegmentPlan:
+    """Where one segment starts and ends in the source audio"""
+    index: int
+    start: float
+    end: float
+
+
+@dataclass
+class AudioSegment:
+    """One segment of audio, ready to upload"""
+    index: int
+    start: float
+    end: float
+    data: bytes
+    filename: str
+
+
+def plan_segments(duration: float, segment_seconds: float, overlap_seconds: float) -> List[SegmentPlan]:
+    """
+    Lay out overlapping segments covering `duration` seconds
+
+    The last segment is merged into the previous one when it would be
+    shorter than the overlap, so no segment is a sliver.
+    """
+    if duration <= segment_seconds:
+        return [SegmentPlan(0, 0.0, duration)]
+
+    step = segment_seconds - overlap_seconds
+    plans = []
+    start = 0.0
+    while start < duration:
+        end = min(start + segment_seconds, duration)
+        plans.append(SegmentPlan(len(plans), start, end))
+        if end >= duration:
+            break
+        start += step
+
+    if len(plans) > 1 and plans[-1].end - plans[-1].start <= overlap_seconds:
+        plans.pop()
+        plans[-1].end = duration
+    return plans
+
+
+def detect_format(audio_file: BinaryIO) -> Optional[str]:
+    """Return "wav" or "flac" when the audio can be split, else None"""
+    position = audio_file.tell()
+    header = audio_file.read(12)
+    audio_file.seek(position)
+
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == FLAC_MARKER:
+        return "flac"
+    return None
+
+
+class WavSplitter:
+    """Split PCM WAV audio on sample boundaries"""
+
+    def __init__(self, audio_file: BinaryIO, filename: str = "audio.wav"):
+        self.audio_file = audio_file
+        self.filename = filename
+        audio_file.seek(0)
+        with wave.open(audio_file, "rb") as reader:
+            self.params = reader.getparams()
+        self.duration = self.params.nframes / self.params.framerate
+
+    def segment_size(self, plan: SegmentPlan) -> int:
+        """Bytes read_segment() will return for a segment"""
+        _, count = self._frame_range(plan)
+        return WAV_HEADER_SIZE + count * self.params.sampwidth * self.params.nchannels
+
+    def read_segment(self, plan: SegmentPlan) -> AudioSegment:
+        """Read one segment as a standalone WAV file"""
+        first, count = self._frame_range(plan)
+
+        self.audio_file.seek(0)
+        with wave.open(self.audio_file, "rb") as reader:
+            reader.setpos(first)
+            frames = reader.readframes(count)
+
+        output = io.BytesIO()
+        with wave.open(output, "wb") as writer:
+            writer.setparams(self.params)
+            writer.writeframes(frames)
+
+        return AudioSegment(plan.index, plan.start, plan.end, output.getvalue(),
+                            _segment_filename(self.filename, plan.index))
+
+    def _frame_range(self, plan: SegmentPlan) -> Tuple[int, int]:
+        """First sample frame and frame count of a segment"""
+        rate = self.params.framerate
+        first = int(plan.start * rate)
+        return first, int(plan.end * rate) - first
+
+
+def _crc8(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def _utf8_coded_length(first_byte: int) -> int:
+    """Length of FLAC's UTF-8-style coded frame/sample number"""
+    if first_byte < 0x80:
+        return 1
+    for length in range(2, 8):
+        if first_byte & (0xFF << (7 - length)) & 0xFF == (0xFF << (8 - length)) & 0xFF:
+            return length
+    return 0
+
+
+class FlacSplitter:
+    """
+    Split FLAC audio on frame boundaries
+
+    Frames are located by their sync code and validated with the header
+    CRC-8 plus consistency with STREAMINFO, then grouped into segments.
+    Each segment gets a fresh STREAMINFO with unknown length and MD5.
+    """
+
+    def __init__(self, audio_file: BinaryIO, filename: str = "audio.flac"):
+        self.audio_file = audio_file
+        self.filename = filename
+        self.streaminfo, audio_offset = self._read_metadata()
+        self.sample_rate = (struct.unpack(">I", self.streaminfo[10:14])[0] >> 12)
+        self.max_block_size = struct.unpack(">H", self.streaminfo[2:4])[0]
+        self.min_frame_size = int.from_bytes(self.streaminfo[4:7], "big")
+        # (byte offset, first sample) per frame, plus the end of the last frame
+        self.frames: List[Tuple[int, int]] = self._index_frames(audio_offset)
+        self.duration = self.frames[-1][1] / self.sample_rate if self.frames else 0.0
+
+    def _read_metadata(self) -> Tuple[bytes, int]:
+        self.audio_file.seek(0)
+        if self.audio_file.read(4) != FLAC_MARKER:
+            raise ValueError("Not a FLAC stream")
+
+        streaminfo = None
+        while True:
+            header = self.audio_file.read(4)
+            if len(header) < 4:
+                raise ValueError("Truncated FLAC metadata")
+            is_last, block_type = header[0] & 0x80, header[0] & 0x7F
+            length = int.from_bytes(header[1:4], "big")
+            body = self.audio_file.read(length)
+            if block_type == 0:
+                streaminfo = body
+            if is_last:
+                break
+
+        if not streaminfo or len(streaminfo) != 34:
+            raise ValueError("FLAC stream has no STREAMINFO block")
+        return streaminfo, self.audio_file.tell()
+
+    def _frame_block_size(self, header: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Validate a candidate frame header
+
+        Returns:
+            (block size, header length) or None if this is not a real frame
+        """
+        if len(header) < 6 or header[0] != 0xFF or header[1] & 0xFE != 0xF8:
+            return None
+        block_code, rate_code = header[2] >> 4, header[2] & 0x0F
+        if block_code == 0 or rate_code == 0x0F or header[3] & 0x01:
+            return None
+
+        position = 4
+        coded = _utf8_coded_length(header[position])
+        if not coded:
+            return None
+        position += coded
+
+        if position + 4 > len(header):
+            return None
+        if block_code == 6:
+            block_size = header[position] + 1
+            position += 1
+        elif block_code == 7:
+            block_size = int.from_bytes(header[position:position + 2], "big") + 1
+            position += 2
+        else:
+            block_size = FLAC_BLOCK_SIZES[block_code]
+
+        if rate_code == 12:
+            position += 1
+        elif rate_code in (13, 14):
+            position += 2
+
+        if position >= len(header) or _crc8(header[:position]) != header[position]:
+            return None
+        if self.max_block_size and block_size > self.max_block_size:
+            return None
+        return block_size, position + 1
+
+    def _index_frames(self, audio_offset: int) -> List[Tuple[int, int]]:
+        frames: List[Tuple[int, int]] = []
+        sample = 0
+        pending_block = 0
+        window_start = audio_offset
+        buffer = b""
+        search_from = 0
+
+        self.audio_file.seek(audio_offset)
+        while True:
+            chunk = self.audio_file.read(FLAC_SCAN_WINDOW)
+            buffer += chunk
+            at_end = not chunk
+
+            while True:
+                found = buffer.find(b"\xff", search_from)
+                if found < 0:
+                    search_from = len(buffer)
+                    break
+                if not at_end and found + FLAC_MAX_HEADER > len(buffer):
+                    # Header may continue in the next window
+                    search_from = found
+                    break
+                parsed = self._frame_block_size(buffer[found:found + FLAC_MAX_HEADER])
+                if parsed is None:
+                    search_from = found + 1
+                    continue
+                sample += pending_block
+                frames.append((window_start + found, sample))
+                pending_block = parsed[0]
+                search_from = found + max(self.min_frame_size, 1)
+
+            if at_end:
+                break
+            # Drop what has been scanned; search_from may point past the buffer
+            keep_from = min(search_from, len(buffer))
+            window_start += keep_from
+            buffer = buffer[keep_from:]
+            search_from -= keep_from
+
+        end_offset = self.audio_file.seek(0, os.SEEK_END)
+        if frames:
+            frames.append((end_offset, sample + pending_block))
+        return frames
+
+    def segment_size(self, plan: SegmentPlan) -> int:
+        """Bytes read_segment() will return for a segment"""
+        start_offset, end_offset = self._byte_range(plan)
+        return FLAC_SEGMENT_HEADER_SIZE + end_offset - start_offset
+
+    def read_segment(self, plan: SegmentPlan) -> AudioSegment:
+        """Read the frames covering a segment as a standalone FLAC file"""
+        start_offset, end_offset = self._byte_range(plan)
+        self.audio_file.seek(start_offset)
+        frames = self.audio_file.read(end_offset - start_offset)
+
+        # STREAMINFO with total samples and MD5 left unknown (zero)
+        streaminfo = bytearray(self.streaminfo)
+        streaminfo[13] &= 0xF0
+        streaminfo[14:18] = b"\x00\x00\x00\x00"
+        streaminfo[18:34] = bytes(16)
+        header = FLAC_MARKER + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + bytes(streaminfo)
+
+        return AudioSegment(plan.index, plan.start, plan.end, header + frames,
+                            _segment_filename(self.filename, plan.index))
+
+    def _byte_range(self, plan: SegmentPlan) -> Tuple[int, int]:
+        """Start and end offsets of the frames covering a segment"""
+        first_sample = int(plan.start * self.sample_rate)
+        last_sample = int(plan.end * self.sample_rate)
+
+        samples = [sample for _, sample in self.frames]
+        first = min(max(0, bisect_right(samples, first_sample) - 1), len(self.frames) - 2)
+        last = min(max(bisect_left(samples, last_sample), first + 1), len(self.frames) - 1)
+        return self.frames[first][0], self.frames[last][0]
+
+
+def _segment_filename(filename: str, index: int) -> str:
+    stem, ext = os.path.splitext(os.path.basename(filename or "audio"))
+    return f"{stem}.part{index}{ext}"
+
+
+def open_splitter(audio_file: BinaryIO, filename: str):
+    """
+    Splitter for the audio, or None if the format cannot be split
+
+    Returns:
+        WavSplitter, FlacSplitter or None
+    """
+    audio_format = detect_format(audio_file)
+    try:
+        if audio_format == "wav":
+            return WavSplitter(audio_file, filename)
+        if audio_format == "flac":
+            return FlacSplitter(audio_file, filename)
+    except (ValueError, EOFError, wave.Error):
+        # Compressed WAV or a malformed stream: send it whole
+        pass
+    finally:
+        audio_file.seek(0)
+    return None
+
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int = 40, min_match_words: int = 2) -> str:
+    """
+    Join transcripts of overlapping segments, dropping the repeated words
+
+    The tail of the text so far and the head of the next segment are
+    compared word by word (case and punctuation ignored). The longest common
+    run is treated as the overlap: text before it comes from the earlier
+    segment, text after it from the later one. Words at segment edges are
+    often cut mid-word, so the run does not have to touch either edge.
+
+    Args:
+        texts: Segment transcripts in order
+        max_overlap_words: Words compared on each side of a seam
+        min_match_words: Shortest run accepted as an overlap
+
+    Returns:
+        Stitched transcript
+    """
+    words: List[str] = []
+    for text in texts:
+        next_words = text.split()
+        if not next_words:
+            continue
+        if not words:
+            words = next_words
+            continue
+
+        tail_start = max(0, len(words) - max_overlap_words)
+        tail = [_normalize(w) for w in words[tail_start:]]
+        head = [_normalize(w) for w in next_words[:max_overlap_words]]
+
+        best_length, best_tail_end, best_head_end = 0, 0, 0
+        # Longest common substring over words, by dynamic programming
+        previous = [0] * (len(head) + 1)
+        for i in range(1, len(tail) + 1):
+            current = [0] * (len(head) + 1)
+            for j in range(1, len(head) + 1):
+                if tail[i - 1] and tail[i - 1] == head[j - 1]:
+                    current[j] = previous[j - 1] + 1
+                    if current[j] > best_length or (current[j] == best_length and i > best_tail_end):
+                        best_length, best_tail_end, best_head_end = current[j], i, j
+            previous = current
+
+        if best_length >= min_match_words:
+            words = words[:tail_start + best_tail_end] + next_words[best_head_end:]
+        else:
+            words = words + next_words
+
+    return " ".join(words)
+
+
+def _normalize(word: str) -> str:
+    return "".join(ch for ch in word.lower() if ch.isalnum())
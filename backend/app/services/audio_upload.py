@@ -0,0 +1,354 @@
+"""
+Streaming receiver for audio uploads
+
+Reads a multipart request body chunk by chunk instead of buffering the
+whole upload. The size limit is enforced while reading, data beyond a small
+threshold spills to a temp file, and a global byte budget caps how much
+audio is held in memory across concurrent uploads.
+"""
+
+import asyncio
+import hashlib
+import os
+from collections import deque
+from tempfile import SpooledTemporaryFile
+from typing import Deque, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.exceptions import PortfolioException
+from app.core.logging import get_logger
+
+try:
+    import multipart
+    from multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # pragma: no cover
+    multipart = None
+    parse_options_header = None
+
+logger = get_logger(__name__)
+
+ALLOWED_AUDIO_TYPES = [
+    'audio/flac', 'audio/mp3', 'audio/mpeg', 'audio/mp4', 'audio/x-m4a',
+    'audio/ogg', 'audio/wav', 'audio/webm'
+]
+ALLOWED_AUDIO_EXTENSIONS = [
+    '.flac', '.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.ogg', '.wav', '.webm'
+]
+
+# Room for multipart boundaries and part headers on top of the audio itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class AudioUploadError(PortfolioException):
+    """Exception raised when an audio upload is rejected"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message, status_code=status_code)
+
+
+class ByteBudget:
+    """
+    Async semaphore counted in bytes
+
+    Waiters are served in arrival order, so a large reservation is not
+    starved by a stream of small ones.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._available = capacity
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    @property
+    def available(self) -> int:
+        return self._available
+
+    @property
+    def in_use(self) -> int:
+        return self.capacity - self._available
+
+    async def acquire(self, nbytes: int) -> int:
+        """
+        Reserve `nbytes`, waiting until enough of the budget is free
+
+        Reservations larger than the whole budget are clamped to it.
+
+        Returns:
+            Number of bytes actually reserved, to pass back to release()
+        """
+        nbytes = max(0, min(nbytes, self.capacity))
+        if not self._waiters and self._available >= nbytes:
+            self._available -= nbytes
+            return nbytes
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (nbytes, future)
+        self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; hand it back
+                self.release(nbytes)
+            else:
+                self._waiters.remove(waiter)
+                self._wake()
+            raise
+        return nbytes
+
+    def release(self, nbytes: int) -> None:
+        self._available = min(self.capacity, self._available + nbytes)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            nbytes, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._available < nbytes:
+                break
+            self._waiters.popleft()
+            self._available -= nbytes
+            future.set_result(None)
+
+
+class AudioUpload:
+    """
+    Received audio, in memory up to the spill threshold and on disk beyond it
+
+    Holds a reservation on the memory budget while the data is in memory;
+    the reservation is returned as soon as the file spills or is closed.
+    A SHA-256 of the content is computed as the data arrives.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        content_type: str,
+        spill_threshold: int,
+        budget: ByteBudget,
+        reserved: int
+    ):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.spill_threshold = spill_threshold
+        self.file = SpooledTemporaryFile(max_size=spill_threshold)
+        self._hash = hashlib.sha256()
+        self._budget = budget
+        self._reserved = reserved
+
+    @property
+    def in_memory(self) -> bool:
+        return self.size <= self.spill_threshold
+
+    @property
+    def content_hash(self) -> str:
+        """Hex SHA-256 of the data received so far"""
+        return self._hash.hexdigest()
+
+    async def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        was_in_memory = self.in_memory
+        self.size += len(data)
+        if was_in_memory and self.in_memory:
+            self.file.write(data)
+            return
+
+        if was_in_memory:
+            # Spilling now: move to disk and give the memory back
+            await run_in_threadpool(self.file.rollover)
+            self._release_budget()
+        await run_in_threadpool(self.file.write, data)
+
+    def close(self) -> None:
+        self.file.close()
+        self._release_budget()
+
+    def _release_budget(self) -> None:
+        if self._reserved:
+            self._budget.release(self._reserved)
+            self._reserved = 0
+
+    async def __aenter__(self) -> "AudioUpload":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+def validate_audio_type(filename: str, content_type: Optional[str]) -> None:
+    """
+    Raises:
+        AudioUploadError: If neither the content type nor the extension is a supported audio format
+    """
+    file_ext = os.path.splitext(filename or '')[1].lower()
+    if content_type not in ALLOWED_AUDIO_TYPES and file_ext not in ALLOWED_AUDIO_EXTENSIONS:
+        logger.warning(f"Invalid file type: {content_type}, extension: {file_ext}")
+        raise AudioUploadError(
+            f"Invalid file type. Supported formats: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}"
+        )
+
+
+def _too_large(max_bytes: int) -> AudioUploadError:
+    return AudioUploadError(
+        f"File too large. Maximum size is {max_bytes / (1024 * 1024):.0f} MB",
+        status_code=413
+    )
+
+
+class _AudioPartReceiver:
+    """python-multipart callbacks that route the audio part into an AudioUpload"""
+
+    def __init__(self, field_name: str, max_bytes: int, create_upload):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.create_upload = create_upload
+        self.upload: Optional[AudioUpload] = None
+        self.pending: List[bytes] = []
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._in_audio_part = False
+        self._pending_upload: Optional[Tuple[str, str]] = None
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+        self._in_audio_part = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._header_name.lower(), self._header_value))
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        headers = dict(self._headers)
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        if name != self.field_name or b"filename" not in options or self.upload or self._pending_upload:
+            return
+
+        filename = options[b"filename"].decode("utf-8", errors="replace")
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        # Reject unsupported formats before any audio is read
+        validate_audio_type(filename, content_type)
+        self._pending_upload = (filename, content_type)
+        self._in_audio_part = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_audio_part:
+            return
+        self.pending.append(data[start:end])
+        size = (self.upload.size if self.upload else 0) + sum(len(chunk) for chunk in self.pending)
+        if size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+
+    async def flush(self) -> None:
+        """Write data collected by the sync callbacks to the upload"""
+        if self._pending_upload:
+            self.upload = await self.create_upload(*self._pending_upload)
+            self._pending_upload = None
+        if self.upload:
+            for chunk in self.pending:
+                await self.upload.write(chunk)
+        self.pending.clear()
+
+
+async def receive_audio_upload(
+    request: Request,
+    field_name: str = "file",
+    max_bytes: Optional[int] = None,
+    spill_threshold: Optional[int] = None,
+    budget: Optional[ByteBudget] = None
+) -> AudioUpload:
+    """
+    Stream the audio part of a multipart request into an AudioUpload
+
+    Args:
+        request: Incoming request with a multipart/form-data body
+        field_name: Form field holding the audio file
+        max_bytes: Maximum audio size, defaults to AUDIO_MAX_UPLOAD_BYTES
+        spill_threshold: Bytes kept in memory before spilling to disk
+        budget: Memory budget shared by concurrent uploads
+
+    Returns:
+        The received upload, positioned at the start. Close it when done.
+
+    Raises:
+        AudioUploadError: On a malformed, unsupported or oversized upload
+    """
+    max_bytes = max_bytes if max_bytes is not None else settings.AUDIO_MAX_UPLOAD_BYTES
+    spill_threshold = spill_threshold if spill_threshold is not None else settings.AUDIO_SPILL_THRESHOLD_BYTES
+    budget = budget or audio_memory_budget
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise AudioUploadError("Expected a multipart/form-data upload with an audio file")
+
+    # Reject on the declared length before reading anything
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    in_memory_limit = spill_threshold
+    if content_length and content_length.isdigit():
+        in_memory_limit = min(spill_threshold, int(content_length))
+
+    async def create_upload(filename: str, part_content_type: str) -> AudioUpload:
+        reserved = await budget.acquire(in_memory_limit)
+        return AudioUpload(filename, part_content_type, spill_threshold, budget, reserved)
+
+    receiver = _AudioPartReceiver(field_name, max_bytes, create_upload)
+    parser = multipart.MultipartParser(params[b"boundary"], receiver.callbacks())
+    received = 0
+
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise _too_large(max_bytes)
+            parser.write(chunk)
+            await receiver.flush()
+        parser.finalize()
+        await receiver.flush()
+    except BaseException as e:
+        # Includes cancellation on client disconnect: never leak the budget
+        if receiver.upload:
+            receiver.upload.close()
+        if isinstance(e, Exception) and not isinstance(e, AudioUploadError):
+            logger.warning(f"Audio upload failed: {e.__class__.__name__}: {e}")
+            raise AudioUploadError("Malformed or interrupted multipart upload")
+        raise
+
+    if receiver.upload is None:
+        raise AudioUploadError(f"No audio file provided in form field '{field_name}'")
+
+    upload = receiver.upload
+    upload.file.seek(0)
+    logger.info(f"Received audio upload: {upload.filename}, {upload.size} bytes, "
+                f"{'in memory' if upload.in_memory else 'spilled to disk'}")
+    return upload
+
+
+# Global instance
+audio_memory_budget = ByteBudget(settings.AUDIO_MEMORY_BUDGET_BYTES)
@@ -0,0 +1,390 @@
+"""
+Cross-worker cache invalidation bus
+
+Every uvicorn worker and replica keeps its own content, search and Q&A
+caches. When one of them refreshes content, re-embeds files or sees a config
+change, it publishes an invalidation event; the others drop just the
+affected entries. Events go over Postgres LISTEN/NOTIFY on the vector
+repository's connection pool, so no extra infrastructure is needed. Each
+event carries the publishing worker and a per-worker version number, so
+duplicates and a worker's own events are ignored, and the time it was sent,
+so the delay between workers can be measured.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.repositories.vector_repository import VectorRepository, vector_repository
+from app.services.content.content_watcher import ContentChanges
+
+logger = get_logger(__name__)
+
+# Event kinds
+CONTENT_CHANGED = "content"
+CONFIG_CHANGED = "config"
+CONTENT_REFRESHED = "refresh"
+INGESTION_COMPLETED = "ingestion"
+
+# NOTIFY payloads must stay below 8000 bytes; larger path lists become "everything"
+MAX_PAYLOAD_BYTES = 7500
+# Longest wait between attempts to listen again
+MAX_RECONNECT_SECONDS = 60.0
+# Config files, as opposed to content, among changed paths
+CONFIG_PREFIXES = ("config/", "personal/")
+
+PayloadCallback = Callable[[str], Any]
+EventHandler = Callable[["InvalidationEvent"], Union[None, Awaitable[Any]]]
+
+
+@dataclass(frozen=True)
+class InvalidationEvent:
+    """One invalidation, as published by a worker"""
+    kind: str
+    # Affected paths relative to CONTENT_PATH; None means everything of this kind
+    paths: Optional[Tuple[str, ...]]
+    origin: str
+    version: int
+    # Wall-clock time.time() when published
+    sent_at: float
+
+    def to_payload(self) -> str:
+        payload = json.dumps({
+            "kind": self.kind,
+            "paths": list(self.paths) if self.paths is not None else None,
+            "origin": self.origin,
+            "version": self.version,
+            "sent_at": self.sent_at
+        }, separators=(",", ":"))
+        if self.paths is not None and len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+            return InvalidationEvent(self.kind, None, self.origin, self.version, self.sent_at).to_payload()
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "InvalidationEvent":
+        """
+        Raises:
+            ValueError: If the payload is not an event
+        """
+        try:
+            data = json.loads(payload)
+            paths = data.get("paths")
+            return cls(
+                kind=str(data["kind"]),
+                paths=tuple(paths) if paths is not None else None,
+                origin=str(data["origin"]),
+                version=int(data["version"]),
+                sent_at=float(data["sent_at"])
+            )
+        except (TypeError, KeyError, ValueError) as e:
+            raise ValueError(f"Invalid invalidation event: {e}")
+
+    def changes(self) -> ContentChanges:
+        """The affected paths as a batch of modified files"""
+        return ContentChanges(modified=set(self.paths or ()))
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY on a connection held from the vector repository's pool"""
+
+    name = "postgres"
+
+    def __init__(self, repository: VectorRepository, reconnect_seconds: Optional[float] = None):
+        """
+        Args:
+            repository: VectorRepository whose pool is used; initialized if needed
+            reconnect_seconds: Wait before listening again after the connection was lost,
+                defaults to CACHE_BUS_RECONNECT_SECONDS
+        """
+        self.repository = repository
+        self.reconnect_seconds = (
+            reconnect_seconds if reconnect_seconds is not None else settings.CACHE_BUS_RECONNECT_SECONDS
+        )
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    async def start(
+        self,
+        channel: str,
+        on_payload: PayloadCallback,
+        on_reconnect: Callable[[], Any]
+    ) -> None:
+        """
+        Listen on `channel` in the background, reconnecting when the connection drops
+
+        Args:
+            channel: Notification channel
+            on_payload: Called with every payload received
+            on_reconnect: Called after listening resumed, as notifications may have been missed
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(channel, on_payload, on_reconnect))
+
+    async def publish(self, channel: str, payload: str) -> None:
+        pool = await self._pool()
+        async with pool.acquire() as conn:
+            await conn.execute("SELECT pg_notify($1, $2)", channel, payload)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _pool(self) -> Any:
+        if not self.repository.connection_pool:
+            await self.repository.initialize()
+        return self.repository.connection_pool
+
+    async def _listen(self, channel: str, on_payload: PayloadCallback, on_reconnect: Callable[[], Any]) -> None:
+        def listener(_connection: Any, _pid: int, _channel: str, payload: str) -> None:
+            on_payload(payload)
+
+        listened_before = False
+        delay = self.reconnect_seconds
+        while True:
+            lost = asyncio.Event()
+            pool = None
+            connection = None
+            try:
+                pool = await self._pool()
+                connection = await pool.acquire()
+                connection.add_termination_listener(lambda *_: lost.set())
+                await connection.add_listener(channel, listener)
+                self.connected = True
+                logger.info(f"Cache bus listening on '{channel}'")
+                if listened_before:
+                    on_reconnect()
+                listened_before = True
+                delay = self.reconnect_seconds
+                await lost.wait()
+                logger.warning("Cache bus connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache bus cannot listen on '{channel}': {e}")
+            finally:
+                self.connected = False
+                if connection is not None:
+                    await self._release(pool, connection, channel, listener)
+            await asyncio.sleep(delay)
+            # Back off while the database stays unreachable
+            delay = min(delay * 2, MAX_RECONNECT_SECONDS)
+
+    @staticmethod
+    async def _release(pool: Any, connection: Any, channel: str, listener: Callable[..., None]) -> None:
+        try:
+            if not connection.is_closed():
+                await connection.remove_listener(channel, listener)
+            await pool.release(connection)
+        except Exception as e:
+            logger.debug(f"Cache bus connection not released cleanly: {e}")
+
+
+class InMemoryHub:
+    """Stands in for Postgres: delivers every payload to all transports of the hub"""
+
+    def __init__(self):
+        self._listeners: Dict[str, List[PayloadCallback]] = {}
+
+    def transport(self) -> "InMemoryTransport":
+        return InMemoryTransport(self)
+
+
+class InMemoryTransport:
+    """Transport for workers in one process, e.g. tests; asynchronous delivery like NOTIFY"""
+
+    name = "memory"
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        self.hub = hub if hub is not None else InMemoryHub()
+        self._listening: Optional[Tuple[str, PayloadCallback]] = None
+        self.connected = False
+
+    async def start(self, channel: str, on_payload: PayloadCallback, on_reconnect: Callable[[], Any]) -> None:
+        self._listening = (channel, on_payload)
+        self.hub._listeners.setdefault(channel, []).append(on_payload)
+        self.connected = True
+
+    async def publish(self, channel: str, payload: str) -> None:
+        loop = asyncio.get_running_loop()
+        for on_payload in list(self.hub._listeners.get(channel, [])):
+            loop.call_soon(on_payload, payload)
+
+    async def stop(self) -> None:
+        if self._listening is not None:
+            channel, on_payload = self._listening
+            self.hub._listeners[channel].remove(on_payload)
+            self._listening = None
+        self.connected = False
+
+
+class CacheBus:
+    """Publishes invalidation events and applies those of other workers"""
+
+    def __init__(
+        self,
+        transport: Any,
+        channel: Optional[str] = None,
+        origin: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            transport: PostgresTransport or InMemoryTransport
+            channel: Notification channel, defaults to CACHE_BUS_CHANNEL
+            origin: Identity of this worker, unique by default
+            clock: Wall clock shared by all workers, injectable for tests
+        """
+        self.transport = transport
+        self.channel = channel or settings.CACHE_BUS_CHANNEL
+        self.origin = origin or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._clock = clock
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._version = 0
+        # Origin -> highest version applied
+        self._applied: Dict[str, int] = {}
+        self._delays_ms: Deque[float] = deque(maxlen=256)
+        self._tasks: "set[asyncio.Task]" = set()
+        self.running = False
+
+        self.published = 0
+        self.received = 0
+        self.applied = 0
+        self.ignored = 0
+        self.failed = 0
+
+    def subscribe(self, kinds: Union[str, Iterable[str]], handler: EventHandler) -> None:
+        """Call `handler(event)` (sync or async) for events of other workers of the given kinds"""
+        for kind in [kinds] if isinstance(kinds, str) else kinds:
+            self._handlers.setdefault(kind, []).append(handler)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        await self.transport.start(self.channel, self._on_payload, self._on_reconnect)
+        self.running = True
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        await self.transport.stop()
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def publish(self, kind: str, paths: Optional[Iterable[str]] = None) -> Optional[InvalidationEvent]:
+        """
+        Tell the other workers to invalidate
+
+        Never raises: a failed publish is logged, as the other workers still
+        revalidate their caches on their own.
+
+        Args:
+            kind: Event kind
+            paths: Affected paths relative to CONTENT_PATH; None for everything
+
+        Returns:
+            The published event, or None if the bus is not running or publishing failed
+        """
+        if not self.running:
+            return None
+        self._version += 1
+        event = InvalidationEvent(
+            kind=kind,
+            paths=tuple(sorted(paths)) if paths is not None else None,
+            origin=self.origin,
+            version=self._version,
+            sent_at=self._clock()
+        )
+        try:
+            await self.transport.publish(self.channel, event.to_payload())
+        except Exception as e:
+            logger.warning(f"Failed to publish {kind} invalidation: {e}")
+            return None
+        self.published += 1
+        return event
+
+    async def publish_changes(self, changes: ContentChanges) -> None:
+        """Publish a batch of content watcher changes, configs and content separately"""
+        configs = {path for path in changes.paths if path.startswith(CONFIG_PREFIXES)}
+        content = changes.paths - configs
+        if configs:
+            await self.publish(CONFIG_CHANGED, configs)
+        if content:
+            await self.publish(CONTENT_CHANGED, content)
+
+    def get_stats(self) -> Dict[str, Any]:
+        delays = sorted(self._delays_ms)
+        return {
+            "running": self.running,
+            "transport": self.transport.name,
+            "connected": self.transport.connected,
+            "origin": self.origin,
+            "published": self.published,
+            "received": self.received,
+            "applied": self.applied,
+            "ignored": self.ignored,
+            "failed": self.failed,
+            "delay_ms": {
+                "p50": round(delays[len(delays) // 2], 2) if delays else None,
+                "max": round(delays[-1], 2) if delays else None
+            }
+        }
+
+    def _on_payload(self, payload: str) -> None:
+        self.received += 1
+        try:
+            event = InvalidationEvent.from_payload(payload)
+        except ValueError as e:
+            logger.warning(str(e))
+            self.ignored += 1
+            return
+        if event.origin == self.origin or event.version <= self._applied.get(event.origin, 0):
+            self.ignored += 1
+            return
+        self._applied[event.origin] = event.version
+        self._delays_ms.append(max(self._clock() - event.sent_at, 0.0) * 1000)
+        self._dispatch(event)
+
+    def _on_reconnect(self) -> None:
+        """Notifications sent while disconnected are lost; refresh everything locally"""
+        logger.info("Cache bus reconnected; refreshing local caches")
+        self._dispatch(InvalidationEvent(CONTENT_REFRESHED, None, self.origin, 0, self._clock()))
+
+    def _dispatch(self, event: InvalidationEvent) -> None:
+        for handler in self._handlers.get(event.kind, []):
+            try:
+                result = handler(event)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Cache bus handler failed for {event.kind}: {e}")
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._task_done)
+        self.applied += 1
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+            logger.error(f"Cache bus handler failed: {task.exception()}")
+
+
+# Global instance
+cache_bus = CacheBus(PostgresTransport(vector_repository))
@@ -0,0 +1,38 @@
+"""
+Dropping content-derived caches, locally or as told by another worker
+
+The same functions serve the refresh endpoint on the worker that received
+it and the cache bus handlers on every other worker, so a refresh clears
+the same caches everywhere.
+"""
+
+from app.services.cache_bus import InvalidationEvent
+from app.services.content.document_store import document_store
+from app.services.content_service import content_service
+from app.services.pdf_generator import pdf_generator
+from app.services.rag_service import rag_service
+from app.services.resume_service import resume_aggregator
+
+
+def refresh_caches(*_) -> None:
+    """Drop all content-derived caches"""
+    content_service.clear_cache()
+    resume_aggregator.reload()
+    pdf_generator.clear_cache()
+
+
+def apply_remote_changes(event: InvalidationEvent) -> None:
+    """Drop what another worker reported as changed"""
+    if event.paths is None:
+        refresh_caches(event)
+        return
+    changes = event.changes()
+    document_store.apply_changes(changes)
+    content_service.apply_changes(changes)
+    resume_aggregator.reload(changes)
+    pdf_generator.clear_cache(changes)
+
+
+def apply_remote_ingestion(event: InvalidationEvent) -> None:
+    """Drop retrieval caches after another worker re-embedded the files in the event"""
+    rag_service.invalidate_retrieval_caches(event.paths)
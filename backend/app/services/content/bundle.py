@@ -0,0 +1,203 @@
+"""
+Content-hashed bundle of the frontend's initial-render data
+
+The frontend renders its first page from five config files and the
+markdown files the layout and chat widget reference. The bundle packs all
+of them into one JSON document whose version is a hash of its content,
+served gzip-compressed in advance from an immutable URL. Clients ask a
+small manifest for the current version, then fetch the bundle once per
+content release.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import dumps
+
+logger = get_logger(__name__)
+
+# Bundle key -> config file, as the frontend loads them
+CONFIG_FILES = {
+    "site": "config/site.json",
+    "theme": "config/theme.json",
+    "layout": "config/layout.json",
+    "design": "config/design.json",
+    "personal": "personal/contact-info.json"
+}
+
+
+@dataclass(frozen=True)
+class ContentBundle:
+    """One immutable version of the bundle"""
+    version: str
+    body: bytes
+    gzip_body: bytes
+    last_modified: Optional[datetime]
+    # (relative path, ETag) of every file the bundle was built from
+    inputs: Tuple[Tuple[str, str], ...]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def manifest(self, url_prefix: str = "/api/v1/content/bundle") -> Dict[str, Any]:
+        """Current version and where to fetch it"""
+        return {
+            "version": self.version,
+            "url": f"{url_prefix}/{self.version}",
+            "files": len(self.inputs),
+            "size": len(self.body),
+            "gzip_size": len(self.gzip_body)
+        }
+
+    def response(self, gzipped: bool, headers: Dict[str, str]) -> Response:
+        """The bundle as stored, compressed if the client accepts gzip"""
+        if gzipped:
+            return Response(
+                content=self.gzip_body,
+                media_type="application/json",
+                headers={**headers, "Content-Encoding": "gzip"}
+            )
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class BundleBuilder:
+    """Builds the bundle when one of its files changes, keeping recent versions"""
+
+    def __init__(self, content_path: Path, loader: ContentLoader, keep: int = 4):
+        """
+        Args:
+            content_path: Content root directory
+            loader: Loader whose cache and file versions the bundle is built from
+            keep: Versions still served after being replaced, for clients
+                that fetched the manifest just before a content change
+        """
+        self.content_path = content_path
+        self.loader = loader
+        self.keep = keep
+        self._bundles: "OrderedDict[str, ContentBundle]" = OrderedDict()
+        self._current: Optional[ContentBundle] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self) -> ContentBundle:
+        """
+        Get the current bundle, rebuilding it if any of its files changed
+
+        Returns:
+            Bundle for the current content
+        """
+        configs: Dict[str, Any] = {}
+        versions: List[Tuple[str, str]] = []
+        modified: List[datetime] = []
+
+        def track(relative_path: str) -> None:
+            version = self.loader.file_version(self.content_path / relative_path)
+            versions.append((relative_path, version.etag))
+            if version.last_modified is not None:
+                modified.append(version.last_modified)
+
+        for name, relative_path in CONFIG_FILES.items():
+            try:
+                configs[name] = self.loader.load_json_file(self.content_path / relative_path)
+                track(relative_path)
+            except ValueError:
+                configs[name] = None
+
+        content: Dict[str, Any] = {}
+        for relative_path in self._content_paths(configs):
+            try:
+                content[relative_path] = self.loader.load_markdown_file(self.content_path / relative_path)
+                track(relative_path)
+            except ValueError as e:
+                logger.warning(f"Leaving {relative_path} out of the content bundle: {e}")
+
+        inputs = tuple(versions)
+        current = self._current
+        if current is not None and current.inputs == inputs:
+            return current
+
+        with self._lock:
+            if self._current is not None and self._current.inputs == inputs:
+                return self._current
+            bundle = self._build(configs, content, inputs, max(modified, default=None))
+            self._current = bundle
+            self._bundles[bundle.version] = bundle
+            self._bundles.move_to_end(bundle.version)
+            while len(self._bundles) > self.keep:
+                self._bundles.popitem(last=False)
+            return bundle
+
+    async def get_async(self) -> ContentBundle:
+        """
+        Get the current bundle without blocking the event loop
+
+        Returns the built bundle directly while all of its files are trusted
+        by the content cache; otherwise checks and rebuilds in the I/O pool.
+        """
+        current = self._current
+        if current is not None and all(
+            self.loader.cache.is_fresh(self.loader.cache_key(self.content_path / relative_path))
+            for relative_path, _ in current.inputs
+        ):
+            return current
+        return await io_pool.run(self.get)
+
+    def get_version(self, version: str) -> Optional[ContentBundle]:
+        """A recently built bundle by version, or None"""
+        return self._bundles.get(version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bundles.clear()
+            self._current = None
+
+    def _content_paths(self, configs: Dict[str, Any]) -> List[str]:
+        """Markdown files of the layout's sections and the chat welcome message"""
+        paths: List[str] = []
+        layout = configs.get("layout") or {}
+        for section in layout.get("layout", {}).get("sections", []):
+            if section.get("file"):
+                paths.append(section["file"])
+            paths.extend(section.get("files") or [])
+
+        chat = ((configs.get("site") or {}).get("features") or {}).get("chatBot") or {}
+        if chat.get("enabled") and chat.get("welcomeFile"):
+            paths.append(chat["welcomeFile"])
+        return list(dict.fromkeys(paths))
+
+    def _build(
+        self,
+        configs: Dict[str, Any],
+        content: Dict[str, Any],
+        inputs: Tuple[Tuple[str, str], ...],
+        last_modified: Optional[datetime]
+    ) -> ContentBundle:
+        payload = dumps({
+            "configs": configs,
+            "content": {path: item.model_dump(mode="json") for path, item in content.items()}
+        })
+        version = hashlib.sha256(payload).hexdigest()[:16]
+        body = b'{"version":"' + version.encode() + b'",' + payload[1:]
+        # mtime=0 so every process produces identical bytes for the same content
+        gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        self.builds += 1
+        logger.info(f"Built content bundle {version}: {len(inputs)} files, {len(body)} bytes, {len(gzip_body)} gzipped")
+        return ContentBundle(
+            version=version,
+            body=body,
+            gzip_body=gzip_body,
+            last_modified=last_modified,
+            inputs=inputs
+        )
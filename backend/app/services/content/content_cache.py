@@ -1,22 +1,95 @@
 """
 Content caching service for improved performance
+
+A bounded LRU with entry and byte limits. Freshness checks against the
+source file are throttled: after a successful check an entry is trusted for
+a revalidation interval without another stat() call, unless it is
+invalidated explicitly (e.g. by a change notification).
 """
 
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class CacheEntry:
+    """A cached value with its accounting and freshness data"""
+    value: Any
+    size: int
+    cached_at: datetime
+    # Monotonic time of the last successful freshness check; None until checked
+    verified_at: Optional[float] = None
+
+
+def estimate_size(content: Any) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes
+
+    Text and pydantic models are measured by their serialized length, other
+    values by their JSON encoding.
+    """
+    if isinstance(content, (str, bytes)):
+        return len(content)
+    if hasattr(content, "model_dump_json"):
+        return len(content.model_dump_json())
+    try:
+        return len(json.dumps(content, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(content)
+
+
 class ContentCache:
     """Service for caching loaded content and configurations"""
 
-    def __init__(self):
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        revalidate_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used are evicted
+            max_bytes: Approximate total size kept before evicting
+            revalidate_seconds: How long a checked entry is trusted without a stat() call
+            clock: Monotonic clock, injectable for tests
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.CONTENT_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.CONTENT_CACHE_MAX_BYTES
+        self.revalidate_seconds = (
+            revalidate_seconds if revalidate_seconds is not None
+            else settings.CONTENT_CACHE_REVALIDATE_SECONDS
+        )
+        self._clock = clock
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        # Loads run in Starlette's threadpool as well as on the event loop
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, cache_key: str) -> bool:
+        return cache_key in self._cache
 
     def _get_file_modified_time(self, file_path: Path) -> Optional[datetime]:
         """
@@ -38,6 +111,9 @@ class ContentCache:
         """
         Check if cached content is still valid
 
+        Entries checked within the revalidation interval are trusted without
+        touching the filesystem. Stale entries are dropped.
+
         Args:
             cache_key: Cache key
             file_path: Path to source file
@@ -45,15 +121,56 @@ class ContentCache:
         Returns:
             True if cache is valid, False otherwise
         """
-        if cache_key not in self._cache_timestamps:
-            return False
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return False
+            if entry.verified_at is not None and self._clock() - entry.verified_at < self.revalidate_seconds:
+                self.hits += 1
+                return True
 
+        # stat() outside the lock so one slow filesystem call does not block other readers
         file_time = self._get_file_modified_time(file_path)
-        if not file_time:
-            return False
 
-        cache_time = self._cache_timestamps[cache_key]
-        return file_time <= cache_time
+        with self._lock:
+            self.revalidations += 1
+            if self._cache.get(cache_key) is not entry:
+                # Replaced or evicted while we were checking
+                self.misses += 1
+                return False
+            if not file_time or file_time > entry.cached_at:
+                self._remove(cache_key)
+                self.stale += 1
+                self.misses += 1
+                return False
+
+            entry.verified_at = self._clock()
+            self.hits += 1
+            return True
+
+    def is_fresh(self, cache_key: str) -> bool:
+        """
+        Check if an entry is trusted without touching the filesystem
+
+        Unlike is_cache_valid, never calls stat(): a False means the entry is
+        missing or due for a freshness check, which callers on the event loop
+        should run in a worker thread.
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            True if the entry was verified within the revalidation interval
+        """
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is None or entry.verified_at is None:
+                return False
+            if self._clock() - entry.verified_at >= self.revalidate_seconds:
+                return False
+            self.hits += 1
+            return True
 
     def get(self, cache_key: str) -> Optional[Any]:
         """
@@ -65,26 +182,81 @@ class ContentCache:
         Returns:
             Cached content or None
         """
-        return self._cache.get(cache_key)
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return None
+            self._cache.move_to_end(cache_key)
+            return entry.value
 
-    def set(self, cache_key: str, content: Any) -> None:
+    def set(self, cache_key: str, content: Any, size: Optional[int] = None) -> None:
         """
         Set cached content
 
         Args:
             cache_key: Cache key
             content: Content to cache
+            size: Size in bytes if known, else estimated
         """
-        self._cache[cache_key] = content
-        self._cache_timestamps[cache_key] = datetime.now()
+        size = size if size is not None else estimate_size(content)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {cache_key}: {size} bytes exceeds the cache size")
+            with self._lock:
+                self._remove(cache_key)
+            return
+
+        with self._lock:
+            self._remove(cache_key)
+            self._cache[cache_key] = CacheEntry(value=content, size=size, cached_at=datetime.now())
+            self._bytes += size
+            while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, _ = next(iter(self._cache.items()))
+                self._remove(evicted_key)
+                self.evictions += 1
+                logger.debug(f"Evicted cached content: {evicted_key}")
         logger.debug(f"Cached content with key: {cache_key}")
 
+    def invalidate(self, cache_key: str) -> bool:
+        """
+        Drop one entry, e.g. when its source file is known to have changed
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            return self._remove(cache_key)
+
     def clear(self) -> None:
         """Clear all cached content"""
-        self._cache.clear()
-        self._cache_timestamps.clear()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
         logger.info("Content cache cleared")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "revalidations": self.revalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def _remove(self, cache_key: str) -> bool:
+        entry = self._cache.pop(cache_key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
 
 # Global cache instance
 content_cache = ContentCache()
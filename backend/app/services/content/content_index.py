@@ -0,0 +1,216 @@
+"""
+In-memory index of all content items, categorized and pre-sorted
+
+Rebuilt only when the content directory changes: either on a change
+notification from the content watcher, or, when no watcher is running,
+when a throttled scan finds files added, removed or modified. Readers get
+an immutable snapshot and never touch the filesystem in between.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+from app.models.content import ContentItem
+from app.services.content.content_loader import ContentLoader
+
+logger = get_logger(__name__)
+
+CATEGORIES = ("sections", "components", "projects", "skills")
+
+# Relative path -> mtime in nanoseconds
+DirectorySignature = Dict[str, int]
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+    """Immutable view of all content at one point in time"""
+    categories: Mapping[str, Tuple[ContentItem, ...]]
+    version: int
+    built_at: datetime
+    # Strong ETag over the listed files' content hashes, stable across processes
+    etag: str = ""
+    last_modified: Optional[datetime] = None
+
+    def as_dict(self) -> Dict[str, List[ContentItem]]:
+        """Categories as fresh lists, safe for callers to modify"""
+        return {name: list(items) for name, items in self.categories.items()}
+
+    def items(self) -> Iterator[ContentItem]:
+        """All items, category by category"""
+        for category in self.categories.values():
+            yield from category
+
+
+def categorize(relative_path: str) -> Optional[str]:
+    """Category of a content file, or None if it is not listed content"""
+    if not relative_path.endswith(".md"):
+        return None
+    if relative_path.startswith("sections/") and relative_path.count("/") == 1:
+        return "sections"
+    if relative_path.startswith("components/"):
+        if "project" in relative_path:
+            return "projects"
+        if "skill" in relative_path:
+            return "skills"
+        return "components"
+    return None
+
+
+class ContentIndex:
+    """Cached, categorized listing of all content items"""
+
+    def __init__(
+        self,
+        content_path: Path,
+        loader: ContentLoader,
+        revalidate_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            content_path: Content root directory
+            loader: Loader used to parse changed files
+            revalidate_seconds: Interval between directory scans when not watched
+            clock: Monotonic clock, injectable for tests
+        """
+        self.content_path = content_path
+        self.loader = loader
+        self.revalidate_seconds = (
+            revalidate_seconds if revalidate_seconds is not None
+            else settings.CONTENT_CACHE_REVALIDATE_SECONDS
+        )
+        # Set when a watcher delivers change notifications; scans are then skipped
+        self.watched = False
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._signature: DirectorySignature = {}
+        self._checked_at = 0.0
+        # Bumped by invalidate(); a snapshot is fresh only if built after the latest bump
+        self._invalidations = 0
+        self._built_for = -1
+        self.builds = 0
+        self.scans = 0
+
+    def snapshot(self) -> ContentSnapshot:
+        """
+        Get the current content snapshot, rebuilding it if the directory changed
+
+        Returns:
+            Immutable snapshot of all content
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._fresh():
+            return snapshot
+
+        with self._lock:
+            # Another thread may have refreshed it while we waited
+            if self._snapshot is not None and self._fresh():
+                return self._snapshot
+            return self._refresh()
+
+    async def snapshot_async(self) -> ContentSnapshot:
+        """
+        Get the current content snapshot without blocking the event loop
+
+        Returns:
+            Immutable snapshot of all content; rescans run in the I/O thread pool
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._fresh():
+            return snapshot
+        return await io_pool.run(self.snapshot)
+
+    def invalidate(self) -> None:
+        """Mark the index stale; the next read rescans the directory"""
+        self._invalidations += 1
+
+    def _fresh(self) -> bool:
+        return self._built_for == self._invalidations and (
+            self.watched or self._clock() - self._checked_at < self.revalidate_seconds
+        )
+
+    def _refresh(self) -> ContentSnapshot:
+        # Taken before scanning, so an invalidate() during the rebuild is not lost
+        invalidations = self._invalidations
+        self.scans += 1
+        signature = self._scan()
+        self._checked_at = self._clock()
+        if self._snapshot is not None and signature == self._signature:
+            self._built_for = invalidations
+            return self._snapshot
+
+        # Changed files may still be trusted by the content cache; drop them first
+        changed = {
+            path for path in signature.keys() | self._signature.keys()
+            if signature.get(path) != self._signature.get(path)
+        }
+        for relative_path in changed:
+            self.loader.cache.invalidate(self.loader.cache_key(self.content_path / relative_path))
+
+        self._snapshot = self._build(signature)
+        self._signature = signature
+        self._built_for = invalidations
+        return self._snapshot
+
+    def _scan(self) -> DirectorySignature:
+        signature: DirectorySignature = {}
+        patterns = (("sections", "*.md", False), ("components", "*.md", True))
+        for directory, pattern, recursive in patterns:
+            root = self.content_path / directory
+            if not root.exists():
+                continue
+            files = root.rglob(pattern) if recursive else root.glob(pattern)
+            for file_path in files:
+                try:
+                    signature[file_path.relative_to(self.content_path).as_posix()] = file_path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return signature
+
+    def _build(self, signature: DirectorySignature) -> ContentSnapshot:
+        started = time.perf_counter()
+        categories: Dict[str, List[ContentItem]] = {name: [] for name in CATEGORIES}
+        digest = hashlib.sha256()
+        last_modified: Optional[datetime] = None
+
+        for relative_path in sorted(signature):
+            category = categorize(relative_path)
+            if category is None:
+                continue
+            file_path = self.content_path / relative_path
+            try:
+                item = self.loader.load_markdown_file(file_path)
+                file_version = self.loader.file_version(file_path)
+            except ValueError:
+                continue
+            categories[category].append(item)
+            digest.update(f"{relative_path}:{file_version.etag}\n".encode("utf-8"))
+            if file_version.last_modified and (last_modified is None or file_version.last_modified > last_modified):
+                last_modified = file_version.last_modified
+
+        # Sort by order metadata where available
+        for items in categories.values():
+            items.sort(key=lambda x: x.metadata.order or 999)
+
+        self.builds += 1
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        snapshot = ContentSnapshot(
+            categories=MappingProxyType({name: tuple(items) for name, items in categories.items()}),
+            version=version,
+            built_at=datetime.now(),
+            etag=f'"{digest.hexdigest()[:32]}"',
+            last_modified=last_modified
+        )
+        logger.info(f"Content index v{version} built: {len(signature)} files "
+                    f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return snapshot
@@ -2,24 +2,51 @@
 Content loader service for loading files from disk
 """
 
+import hashlib
 import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from app.core.io_pool import io_pool
 from app.core.logging import get_logger
 from app.models.content import ContentItem, ContentMetadata
-from app.utils.markdown import parse_frontmatter
 from app.services.content.content_cache import ContentCache
+from app.services.content.document_store import ContentFileNotFoundError, Document, DocumentStore
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class FileVersion:
+    """Validators of one loaded file, for HTTP conditional requests"""
+    etag: str
+    last_modified: Optional[datetime]
+
+
 class ContentLoader:
     """Service for loading content from files"""
 
-    def __init__(self, content_path: Path, cache: ContentCache):
+    def __init__(self, content_path: Path, cache: ContentCache, documents: Optional[DocumentStore] = None):
+        """
+        Args:
+            content_path: Content root directory
+            cache: Cache of parsed items and JSON data
+            documents: Parsed markdown shared with other consumers; a private store if None
+        """
         self.content_path = content_path
         self.cache = cache
+        self.documents = documents if documents is not None else DocumentStore(content_path)
+        # Cache key -> version of the file as last loaded
+        self.versions: Dict[str, FileVersion] = {}
+
+    @staticmethod
+    def cache_key(file_path: Path) -> str:
+        """Cache key a file is stored under"""
+        if file_path.suffix == ".json":
+            return f"json_{file_path.name}"
+        return f"md_{file_path}"
 
     def load_json_file(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -34,7 +61,7 @@ class ContentLoader:
         Raises:
             ValueError: If file cannot be loaded or parsed
         """
-        cache_key = f"json_{file_path.name}"
+        cache_key = self.cache_key(file_path)
 
         if self.cache.is_cache_valid(cache_key, file_path):
             cached = self.cache.get(cache_key)
@@ -44,15 +71,17 @@ class ContentLoader:
 
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                text = f.read()
+            data = json.loads(text)
 
-            self.cache.set(cache_key, data)
+            self.versions[cache_key] = self._version(file_path, text)
+            self.cache.set(cache_key, data, size=len(text))
             logger.info(f"Loaded JSON file: {file_path.name}")
             return data
 
         except FileNotFoundError:
             logger.error(f"JSON file not found: {file_path}")
-            raise ValueError(f"Failed to load {file_path}: File not found")
+            raise ContentFileNotFoundError(f"Failed to load {file_path}: File not found")
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in {file_path}: {e}")
             raise ValueError(f"Failed to load {file_path}: Invalid JSON - {str(e)}")
@@ -70,7 +99,7 @@ class ContentLoader:
         Raises:
             ValueError: If file cannot be loaded or parsed
         """
-        cache_key = f"md_{file_path}"
+        cache_key = self.cache_key(file_path)
 
         if self.cache.is_cache_valid(cache_key, file_path):
             cached = self.cache.get(cache_key)
@@ -78,28 +107,107 @@ class ContentLoader:
                 logger.debug(f"Using cached markdown: {file_path}")
                 return cached
 
+        # The cached item is stale or missing, so the document must be checked too
+        document = self.documents.get(file_path, revalidate=True)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_content = f.read()
-
-            parsed = parse_frontmatter(raw_content)
-
             item = ContentItem(
                 id=file_path.stem,
-                content=parsed['content'],
-                metadata=ContentMetadata(**parsed['data']),
-                raw_content=raw_content,
+                content=document.body,
+                metadata=ContentMetadata(**document.metadata),
+                raw_content=document.raw,
                 file_path=str(file_path.relative_to(self.content_path)),
-                last_modified=self.cache._get_file_modified_time(file_path)
+                last_modified=document.modified_at
             )
-
-            self.cache.set(cache_key, item)
-            logger.info(f"Loaded markdown file: {file_path}")
-            return item
-
-        except FileNotFoundError:
-            logger.error(f"Markdown file not found: {file_path}")
-            raise ValueError(f"Failed to load {file_path}: File not found")
-        except (OSError, KeyError, TypeError) as e:
+        except (KeyError, TypeError) as e:
             logger.error(f"Error parsing markdown {file_path}: {e}")
             raise ValueError(f"Failed to load {file_path}: {str(e)}")
+
+        self.versions[cache_key] = self._document_version(document)
+        # Raw and parsed copies of the text
+        self.cache.set(cache_key, item, size=len(document.raw) + len(item.content))
+        logger.info(f"Loaded markdown file: {file_path}")
+        return item
+
+    def file_version(self, file_path: Path) -> FileVersion:
+        """
+        Get the validators of a file, loading it if it changed
+
+        Args:
+            file_path: Path to a JSON or markdown file
+
+        Returns:
+            Strong ETag from the file's content hash and its modification time
+
+        Raises:
+            ValueError: If file cannot be loaded or parsed
+        """
+        load = self.load_json_file if file_path.suffix == ".json" else self.load_markdown_file
+        load(file_path)
+        cache_key = self.cache_key(file_path)
+        version = self.versions.get(cache_key)
+        if version is None:
+            # Cached by another loader sharing the cache; load it ourselves
+            self.cache.invalidate(cache_key)
+            load(file_path)
+            version = self.versions[cache_key]
+        return version
+
+    async def load_json_file_async(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Load a JSON file without blocking the event loop
+
+        Trusted cache entries are returned directly; freshness checks and
+        reads run in the I/O thread pool.
+
+        Raises:
+            ValueError: If file cannot be loaded or parsed
+        """
+        cache_key = self.cache_key(file_path)
+        if self.cache.is_fresh(cache_key):
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        return await io_pool.run(self.load_json_file, file_path)
+
+    async def load_markdown_file_async(self, file_path: Path) -> ContentItem:
+        """
+        Load a markdown file without blocking the event loop
+
+        Raises:
+            ValueError: If file cannot be loaded or parsed
+        """
+        cache_key = self.cache_key(file_path)
+        if self.cache.is_fresh(cache_key):
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        return await io_pool.run(self.load_markdown_file, file_path)
+
+    async def file_version_async(self, file_path: Path) -> FileVersion:
+        """
+        Get the validators of a file without blocking the event loop
+
+        Raises:
+            ValueError: If file cannot be loaded or parsed
+        """
+        cache_key = self.cache_key(file_path)
+        version = self.versions.get(cache_key)
+        if version is not None and self.cache.is_fresh(cache_key):
+            return version
+        return await io_pool.run(self.file_version, file_path)
+
+    @staticmethod
+    def _document_version(document: Document) -> FileVersion:
+        return FileVersion(
+            etag=f'"{document.content_hash[:32]}"',
+            last_modified=document.modified_at.astimezone(timezone.utc)
+        )
+
+    @staticmethod
+    def _version(file_path: Path, text: str) -> FileVersion:
+        try:
+            last_modified = datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc)
+        except OSError:
+            last_modified = None
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+        return FileVersion(etag=f'"{digest}"', last_modified=last_modified)
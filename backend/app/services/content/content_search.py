@@ -0,0 +1,245 @@
+"""
+Content search in lexical, semantic and hybrid modes
+
+Lexical search ranks items with the BM25 index of the content service.
+Semantic search embeds the query and ranks the chunks in the vector store,
+grouped by source file into content items. Hybrid fuses both rankings with
+reciprocal rank fusion. Results are cached per query and content version.
+"""
+
+import html
+import os
+import textwrap
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.content import ContentItem
+from app.repositories.vector_repository import VectorRepository, vector_repository
+from app.services.content.content_index import ContentSnapshot
+from app.services.content.search_index import SearchHit, plain_text
+from app.services.content_service import ContentService, content_service
+from app.services.embedding_service import EmbeddingService, embedding_service
+
+logger = get_logger(__name__)
+
+SearchMode = Literal["lexical", "semantic", "hybrid"]
+
+
+class QueryCache:
+    """Bounded LRU of search results with a TTL"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Queries kept before the least recently used are evicted
+            ttl_seconds: Lifetime of an entry
+            clock: Monotonic clock, injectable for tests
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.CONTENT_SEARCH_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CONTENT_SEARCH_CACHE_TTL_SECONDS
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up cached results
+
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store results, evicting the least recently used entries"""
+        self._entries[key] = (value, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class ContentSearch:
+    """Search content items by keywords, meaning, or both"""
+
+    # Vector chunks fetched per requested item, since several chunks of one file may match
+    CHUNKS_PER_ITEM = 4
+    # Reciprocal rank fusion constant; damps the influence of top ranks
+    RRF_K = 60
+    DEFAULT_LIMIT = 10
+
+    def __init__(
+        self,
+        content: Optional[ContentService] = None,
+        vector_repo: Optional[VectorRepository] = None,
+        embedder: Optional[EmbeddingService] = None,
+        cache: Optional[QueryCache] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Args:
+            content: Content service providing items and the lexical index
+            vector_repo: Vector store with the content chunk embeddings
+            embedder: Service embedding queries
+            cache: Per-query result cache
+            threshold: Minimum cosine similarity of a semantic match
+        """
+        self.content = content or content_service
+        self.vector_repo = vector_repo or vector_repository
+        self.embedder = embedder or embedding_service
+        self.cache = cache if cache is not None else QueryCache()
+        self.threshold = threshold if threshold is not None else settings.CONTENT_SEARCH_SEMANTIC_THRESHOLD
+        self._items_by_path: Dict[str, ContentItem] = {}
+        self._items_version = 0
+
+    async def search(
+        self,
+        query: str,
+        mode: SearchMode = "lexical",
+        limit: Optional[int] = None,
+        prefix: bool = True
+    ) -> Tuple[List[SearchHit], SearchMode]:
+        """
+        Search content items, best first
+
+        Semantic and hybrid searches fall back to lexical results when the
+        vector store or query embedding is unavailable; the mode actually
+        used is returned. Fallback results are not cached.
+
+        Args:
+            query: Search text
+            mode: "lexical", "semantic" or "hybrid"
+            limit: Maximum items returned; lexical search returns all matches if None
+            prefix: Let the last word match as a prefix in lexical ranking
+
+        Returns:
+            (hits, mode used)
+        """
+        version = (await self.content.get_snapshot_async()).version
+        normalized = " ".join(query.casefold().split())
+        key = f"{mode}:{limit}:{prefix}:{version}:{normalized}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if mode == "lexical":
+            result = (await self.content.search_async(query, limit=limit, prefix=prefix), "lexical")
+            self.cache.set(key, result)
+            return result
+
+        limit = limit or self.DEFAULT_LIMIT
+        semantic = await self._semantic(query, limit * (3 if mode == "hybrid" else 1))
+        if not semantic:
+            return await self.content.search_async(query, limit=limit, prefix=prefix), "lexical"
+
+        if mode == "semantic":
+            result = (semantic[:limit], "semantic")
+        else:
+            lexical = await self.content.search_async(query, limit=limit * 3, prefix=prefix)
+            result = (self._fuse(lexical, semantic)[:limit], "hybrid")
+        self.cache.set(key, result)
+        return result
+
+    def invalidate(self, *_: Any) -> None:
+        """Drop cached results, e.g. after content was re-embedded"""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.cache.get_stats()
+
+    async def _semantic(self, query: str, limit: int) -> List[SearchHit]:
+        """Vector search grouped by source file; empty if unavailable"""
+        if os.getenv("RAG_ENABLED", "false").lower() != "true":
+            return []
+        try:
+            embedding = await self.embedder.generate_embedding(query)
+            if not embedding:
+                return []
+            chunks = await self.vector_repo.similarity_search(
+                embedding,
+                limit=min(100, limit * self.CHUNKS_PER_ITEM),
+                threshold=self.threshold
+            )
+        except Exception as e:
+            logger.warning(f"Semantic search unavailable, using lexical: {e}")
+            return []
+
+        items = self._items(await self.content.get_snapshot_async())
+        hits: Dict[str, SearchHit] = {}
+        # Chunks arrive most similar first, so a file's first chunk is its best
+        for chunk in chunks:
+            file_path = chunk["file_path"]
+            item = items.get(file_path)
+            if item is None or file_path in hits:
+                continue
+            hits[file_path] = SearchHit(
+                item=item,
+                score=round(chunk["similarity"], 4),
+                snippet=html.escape(textwrap.shorten(plain_text(chunk["content"]), width=160, placeholder="…")),
+                matched_terms=[]
+            )
+        return list(hits.values())[:limit]
+
+    def _fuse(self, lexical: List[SearchHit], semantic: List[SearchHit]) -> List[SearchHit]:
+        """Reciprocal rank fusion; lexical snippets win since they highlight matches"""
+        fused: Dict[str, SearchHit] = {}
+        scores: Dict[str, float] = {}
+        for ranking in (lexical, semantic):
+            for rank, hit in enumerate(ranking, 1):
+                file_path = hit.item.file_path
+                scores[file_path] = scores.get(file_path, 0.0) + 1 / (self.RRF_K + rank)
+                fused.setdefault(file_path, hit)
+
+        ordered = sorted(scores, key=lambda path: (-scores[path], path))
+        return [
+            SearchHit(
+                item=fused[path].item,
+                score=round(scores[path], 6),
+                snippet=fused[path].snippet,
+                matched_terms=fused[path].matched_terms
+            )
+            for path in ordered
+        ]
+
+    def _items(self, snapshot: ContentSnapshot) -> Dict[str, ContentItem]:
+        if snapshot.version != self._items_version:
+            self._items_by_path = {item.file_path: item for item in snapshot.items()}
+            self._items_version = snapshot.version
+        return self._items_by_path
+
+
+# Global instance
+content_search = ContentSearch()
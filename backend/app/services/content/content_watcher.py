@@ -0,0 +1,241 @@
+"""
+Filesystem watcher for the content directory
+
+Detects edits under CONTENT_PATH and hands each debounced batch of changes
+to subscribers, which invalidate caches and re-index only what changed.
+Uses watchfiles (inotify and friends) when available and falls back to
+polling file modification times.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+try:
+    import watchfiles
+except ModuleNotFoundError:  # pragma: no cover
+    watchfiles = None
+
+logger = get_logger(__name__)
+
+# Editor swap and backup files are not content
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~")
+
+
+@dataclass
+class ContentChanges:
+    """One debounced batch of changes, as paths relative to the content directory"""
+    modified: Set[str] = field(default_factory=set)
+    deleted: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.modified or self.deleted)
+
+    @property
+    def paths(self) -> Set[str]:
+        return self.modified | self.deleted
+
+    def markdown(self) -> Tuple[List[str], List[str]]:
+        """Changed and deleted markdown files"""
+        return (
+            sorted(p for p in self.modified if p.endswith(".md")),
+            sorted(p for p in self.deleted if p.endswith(".md"))
+        )
+
+    def merge(self, other: "ContentChanges") -> None:
+        """Fold a later batch into this one; the latest change to a path wins"""
+        self.modified = (self.modified - other.deleted) | other.modified
+        self.deleted = (self.deleted - other.modified) | other.deleted
+
+
+ChangeCallback = Callable[[ContentChanges], Union[None, Awaitable[Any]]]
+FileStamp = Tuple[int, int]
+
+
+def _ignored(relative_path: str) -> bool:
+    name = relative_path.rsplit("/", 1)[-1]
+    return name.startswith(".") or name.endswith(IGNORED_SUFFIXES)
+
+
+class ContentWatcher:
+    """Background task turning filesystem events into debounced change batches"""
+
+    def __init__(
+        self,
+        content_path: Optional[Path] = None,
+        debounce_ms: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        force_polling: Optional[bool] = None
+    ):
+        """
+        Args:
+            content_path: Directory to watch, defaults to CONTENT_PATH
+            debounce_ms: Quiet period before a burst of edits is handed on
+            poll_interval: Seconds between scans when polling
+            force_polling: Poll even when watchfiles is available
+        """
+        self.content_path = Path(content_path or settings.CONTENT_PATH)
+        self.debounce_ms = debounce_ms if debounce_ms is not None else settings.CONTENT_WATCH_DEBOUNCE_MS
+        self.poll_interval = poll_interval or settings.CONTENT_WATCH_POLL_INTERVAL_SECONDS
+        if force_polling is None:
+            force_polling = settings.CONTENT_WATCH_FORCE_POLLING
+        self.backend = "polling" if force_polling or watchfiles is None else "watchfiles"
+
+        self._callbacks: List[ChangeCallback] = []
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.batches = 0
+        self.last_batch_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        """Call `callback` (sync or async) with every batch of changes"""
+        self._callbacks.append(callback)
+
+    async def start(self) -> None:
+        """Start watching in the background"""
+        if self.running:
+            return
+        if not self.content_path.exists():
+            logger.warning(f"Not watching missing content directory: {self.content_path}")
+            return
+
+        self._stop_event = asyncio.Event()
+        if self.backend == "polling":
+            # Baseline before returning, so edits made right after start are seen
+            snapshot = await run_in_threadpool(self._scan)
+            self._task = asyncio.create_task(self._poll(snapshot))
+        else:
+            self._task = asyncio.create_task(self._watch())
+        logger.info(f"Watching {self.content_path} for changes ({self.backend})")
+
+    async def stop(self) -> None:
+        """Stop watching and wait for the background task to finish"""
+        if not self._task:
+            return
+        self._stop_event.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+        self._task = None
+        logger.info("Content watcher stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "backend": self.backend,
+            "batches": self.batches,
+            "last_batch_at": self.last_batch_at
+        }
+
+    async def _watch(self) -> None:
+        """Receive events from watchfiles, which debounces them itself"""
+        root = self.content_path.resolve()
+        try:
+            async for raw_changes in watchfiles.awatch(
+                root,
+                debounce=self.debounce_ms,
+                step=min(50, self.debounce_ms or 50),
+                stop_event=self._stop_event,
+                recursive=True
+            ):
+                changes = ContentChanges()
+                for change, path in raw_changes:
+                    relative_path = Path(path).relative_to(root).as_posix()
+                    if _ignored(relative_path):
+                        continue
+                    if change == watchfiles.Change.deleted:
+                        changes.merge(ContentChanges(deleted={relative_path}))
+                    else:
+                        changes.merge(ContentChanges(modified={relative_path}))
+                await self._dispatch(changes)
+        except Exception as e:
+            logger.error(f"Content watcher failed, falling back to polling: {e}")
+            self.backend = "polling"
+            await self._poll(await run_in_threadpool(self._scan))
+
+    async def _poll(self, snapshot: Dict[str, FileStamp]) -> None:
+        """Scan modification times, handing on changes once edits go quiet"""
+        pending = ContentChanges()
+        last_change = 0.0
+
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                current = await run_in_threadpool(self._scan)
+            except OSError as e:
+                logger.warning(f"Content scan failed: {e}")
+                continue
+
+            changes = self._diff(snapshot, current)
+            snapshot = current
+            if changes:
+                pending.merge(changes)
+                last_change = time.monotonic()
+            elif pending and (time.monotonic() - last_change) * 1000 >= self.debounce_ms:
+                await self._dispatch(pending)
+                pending = ContentChanges()
+
+    def _scan(self) -> Dict[str, FileStamp]:
+        stamps = {}
+        for path in self.content_path.rglob("*"):
+            relative_path = path.relative_to(self.content_path).as_posix()
+            if _ignored(relative_path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                stamps[relative_path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    @staticmethod
+    def _diff(before: Dict[str, FileStamp], after: Dict[str, FileStamp]) -> ContentChanges:
+        return ContentChanges(
+            modified={path for path, stamp in after.items() if before.get(path) != stamp},
+            deleted=set(before) - set(after)
+        )
+
+    async def _dispatch(self, changes: ContentChanges) -> None:
+        # Atomic saves (write temp, rename over) can report a delete of a file that exists
+        for relative_path in list(changes.deleted):
+            if (self.content_path / relative_path).is_file():
+                changes.deleted.discard(relative_path)
+                changes.modified.add(relative_path)
+        changes.modified = {p for p in changes.modified if (self.content_path / p).is_file()}
+        if not changes:
+            return
+
+        self.batches += 1
+        self.last_batch_at = time.time()
+        logger.info(f"Content changed: {len(changes.modified)} modified, {len(changes.deleted)} deleted")
+
+        for callback in self._callbacks:
+            try:
+                result = callback(changes)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Content change handler {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+# Global instance
+content_watcher = ContentWatcher()
@@ -0,0 +1,246 @@
+"""
+Parse-once store of markdown documents
+
+Content items, resume data and RAG ingestion all read the same markdown
+files. The store reads and parses each file once per version (using the
+frontmatter parser shared with the frontend) and hands every consumer the
+same immutable Document, so they agree on metadata and the disk is read
+once. Consumers can subscribe to hear when a document changes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+from app.utils.markdown import parse_frontmatter
+
+logger = get_logger(__name__)
+
+# Called with the path relative to the content directory of a changed or removed document
+DocumentCallback = Callable[[str], Any]
+
+
+class ContentFileNotFoundError(ValueError):
+    """A requested content file does not exist"""
+
+
+@dataclass(frozen=True)
+class Document:
+    """One version of a markdown file, read and parsed"""
+    path: str
+    raw: str
+    body: str
+    metadata: Mapping[str, Any]
+    content_hash: str
+    modified_at: datetime
+    # (st_mtime_ns, st_size) the document was read at
+    stamp: Tuple[int, int]
+
+
+@dataclass
+class _Entry:
+    document: Document
+    verified_at: float
+
+
+class DocumentStore:
+    """Reads and parses markdown files once per version, shared by all consumers"""
+
+    def __init__(
+        self,
+        content_path: Path,
+        max_entries: Optional[int] = None,
+        revalidate_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            content_path: Content root; document paths are relative to it
+            max_entries: Documents kept before the least recently used are evicted
+            revalidate_seconds: How long a checked document is trusted without a stat() call
+            clock: Monotonic clock, injectable for tests
+        """
+        # Absolute, so every spelling of a path maps to one entry
+        self.content_path = Path(os.path.abspath(content_path))
+        self.max_entries = max_entries if max_entries is not None else settings.CONTENT_CACHE_MAX_ENTRIES
+        self.revalidate_seconds = (
+            revalidate_seconds if revalidate_seconds is not None
+            else settings.CONTENT_CACHE_REVALIDATE_SECONDS
+        )
+        self._clock = clock
+        self._entries: "OrderedDict[Path, _Entry]" = OrderedDict()
+        self._callbacks: List[DocumentCallback] = []
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.reads = 0
+        self.changes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def subscribe(self, callback: DocumentCallback) -> None:
+        """Call `callback(relative_path)` whenever a document changes or is removed"""
+        self._callbacks.append(callback)
+
+    def get(self, file_path: Union[Path, str], revalidate: bool = False) -> Document:
+        """
+        Get the current version of a markdown document
+
+        Args:
+            file_path: Absolute path, or path relative to the content directory
+            revalidate: Check the file even if it was checked recently
+
+        Returns:
+            Parsed, immutable document
+
+        Raises:
+            ContentFileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be read
+        """
+        path = self._resolve(file_path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and not revalidate and self._clock() - entry.verified_at < self.revalidate_seconds:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.document
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._forget(path)
+            raise ContentFileNotFoundError(f"Failed to load {path}: File not found")
+        except OSError as e:
+            raise ValueError(f"Failed to load {path}: {e}")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        if entry is not None and entry.document.stamp == stamp:
+            with self._lock:
+                entry.verified_at = self._clock()
+                self.hits += 1
+            return entry.document
+
+        document = self._read(path, stamp)
+        changed = entry is not None and entry.document.content_hash != document.content_hash
+        with self._lock:
+            self._entries[path] = _Entry(document=document, verified_at=self._clock())
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if changed:
+            self._notify(document.path)
+        return document
+
+    async def get_async(self, file_path: Union[Path, str]) -> Document:
+        """
+        Get a document without blocking the event loop
+
+        Raises:
+            ContentFileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be read
+        """
+        path = self._resolve(file_path)
+        entry = self._entries.get(path)
+        if entry is not None and self._clock() - entry.verified_at < self.revalidate_seconds:
+            self.hits += 1
+            return entry.document
+        return await io_pool.run(self.get, path)
+
+    def apply_changes(self, changes: Any) -> int:
+        """
+        Forget changed and deleted files reported by the content watcher
+
+        Subscribers are told about each file; the next get() reads it again.
+
+        Args:
+            changes: ContentChanges batch
+
+        Returns:
+            Number of documents forgotten
+        """
+        modified, deleted = changes.markdown()
+        forgotten = 0
+        for relative_path in [*modified, *deleted]:
+            if self._forget(self._resolve(relative_path), notify=False):
+                forgotten += 1
+            self._notify(relative_path)
+        return forgotten
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "reads": self.reads,
+            "changes": self.changes
+        }
+
+    def _resolve(self, file_path: Union[Path, str]) -> Path:
+        """Absolute path of a file given absolutely, relative to the working directory, or to the content root"""
+        path = Path(os.path.abspath(file_path))
+        if Path(file_path).is_absolute() or path.is_relative_to(self.content_path):
+            return path
+        return Path(os.path.abspath(self.content_path / file_path))
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.content_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _read(self, path: Path, stamp: Tuple[int, int]) -> Document:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            self._forget(path)
+            raise ContentFileNotFoundError(f"Failed to load {path}: File not found")
+        except (OSError, UnicodeDecodeError) as e:
+            raise ValueError(f"Failed to load {path}: {e}")
+
+        parsed = parse_frontmatter(raw)
+        self.reads += 1
+        logger.debug(f"Parsed document: {path}")
+        return Document(
+            path=self._relative(path),
+            raw=raw,
+            body=parsed["content"],
+            metadata=MappingProxyType(parsed["data"]),
+            content_hash=hashlib.sha256(raw.encode("utf-8")).hexdigest(),
+            modified_at=datetime.fromtimestamp(stamp[0] / 1e9),
+            stamp=stamp
+        )
+
+    def _forget(self, path: Path, notify: bool = True) -> bool:
+        with self._lock:
+            removed = self._entries.pop(path, None) is not None
+        if removed and notify:
+            self._notify(self._relative(path))
+        return removed
+
+    def _notify(self, relative_path: str) -> None:
+        self.changes += 1
+        for callback in self._callbacks:
+            try:
+                callback(relative_path)
+            except Exception as e:
+                logger.error(f"Document change subscriber failed for {relative_path}: {e}")
+
+
+# Global instance
+document_store = DocumentStore(Path(settings.CONTENT_PATH))
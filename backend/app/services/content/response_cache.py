@@ -0,0 +1,117 @@
+"""
+Pre-serialized configuration responses
+
+Config files change rarely but are read on every page load. Each file is
+validated into its model once per file version and serialized to JSON
+bytes right away; requests then get those bytes wrapped in the response
+envelope, skipping model construction, response_model validation and
+re-encoding.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+from app.services.content.content_loader import ContentLoader
+
+logger = get_logger(__name__)
+
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON bytes"""
+    return orjson.dumps(data)
+
+
+@dataclass(frozen=True)
+class SerializedConfig:
+    """A validated config model and its JSON encoding, for one file version"""
+    etag: str
+    last_modified: Optional[datetime]
+    model: BaseModel
+    data_json: bytes
+
+    def body(self) -> bytes:
+        """ContentResponse envelope around the cached data, stamped now"""
+        # Same shape and timestamp format as ContentResponse serialized by FastAPI
+        return (
+            b'{"success":true,"data":' + self.data_json
+            + b',"message":"Success","timestamp":"' + datetime.now().isoformat().encode() + b'"}'
+        )
+
+    def response(self) -> Response:
+        return Response(content=self.body(), media_type="application/json")
+
+
+class ConfigResponseCache:
+    """Validated, serialized config files, rebuilt only when a file's content changes"""
+
+    def __init__(self, loader: ContentLoader):
+        """
+        Args:
+            loader: Loader whose file versions decide when entries are rebuilt
+        """
+        self.loader = loader
+        self._entries: Dict[str, SerializedConfig] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, file_path: Path, model: Type[BaseModel]) -> SerializedConfig:
+        """
+        Get a config file as a validated model and serialized JSON
+
+        Args:
+            file_path: Path to the JSON file
+            model: Model the file is validated into
+
+        Returns:
+            Cached entry for the file's current version
+
+        Raises:
+            ValueError: If file cannot be loaded or does not validate
+        """
+        version = self.loader.file_version(file_path)
+        key = f"{model.__name__}:{file_path}"
+        entry = self._entries.get(key)
+        if entry is not None and entry.etag == version.etag:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.etag == version.etag:
+                return entry
+            validated = model(**self.loader.load_json_file(file_path))
+            entry = SerializedConfig(
+                etag=version.etag,
+                last_modified=version.last_modified,
+                model=validated,
+                data_json=dumps(validated.model_dump(mode="json"))
+            )
+            self._entries[key] = entry
+            self.builds += 1
+            logger.debug(f"Serialized {file_path.name} ({len(entry.data_json)} bytes)")
+            return entry
+
+    async def get_async(self, file_path: Path, model: Type[BaseModel]) -> SerializedConfig:
+        """
+        Get a config file as a validated model and serialized JSON, off the event loop
+
+        Raises:
+            ValueError: If file cannot be loaded or does not validate
+        """
+        version = await self.loader.file_version_async(file_path)
+        entry = self._entries.get(f"{model.__name__}:{file_path}")
+        if entry is not None and entry.etag == version.etag:
+            return entry
+        return await io_pool.run(self.get, file_path, model)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,307 @@
+"""
+Inverted-index full-text search over content items
+
+Items are tokenized once when indexed. Queries are ranked with BM25 over
+title, tech and body, weighted per field, and only touch the postings of
+their own terms. The last query word also matches as a prefix, for
+typeahead. Snippets with highlighted matches are built for the returned
+hits only.
+"""
+
+import heapq
+import html
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.content import ContentItem
+
+TOKEN_PATTERN = re.compile(r"\w+(?:[+#]+)?")
+MARKDOWN_NOISE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)|[#*_`|~]+|^\s*>+", re.MULTILINE)
+WHITESPACE = re.compile(r"\s+")
+
+# Term frequency weight of each field
+FIELD_WEIGHTS = (("title", 3), ("tech", 2), ("content", 1))
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded word tokens in any script; keeps c++ and c# intact"""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def plain_text(markdown: str) -> str:
+    """Markdown with link targets and formatting characters removed, for snippets"""
+    text = MARKDOWN_NOISE.sub(lambda m: m.group(1) or " ", markdown)
+    return WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result"""
+    item: ContentItem
+    score: float
+    snippet: str
+    matched_terms: List[str]
+
+
+@dataclass
+class _Document:
+    item: ContentItem
+    length: float
+    terms: Set[str]
+    text: str
+
+
+class SearchIndex:
+    """BM25-ranked inverted index with prefix matching and incremental updates"""
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_prefix_expansions: int = 50,
+        prefix_weight: float = 0.8,
+        snippet_chars: int = 160
+    ):
+        """
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+            max_prefix_expansions: Indexed terms a prefix may expand to
+            prefix_weight: Score weight of a prefix match relative to an exact match
+            snippet_chars: Approximate snippet length
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_prefix_expansions = max_prefix_expansions
+        self.prefix_weight = prefix_weight
+        self.snippet_chars = snippet_chars
+
+        # term -> {doc id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._documents: Dict[str, _Document] = {}
+        self._total_length = 0.0
+        # Sorted vocabulary for prefix lookups, rebuilt lazily after updates
+        self._vocabulary: List[str] = []
+        self._vocabulary_stale = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, doc_id: str, item: ContentItem) -> None:
+        """Index an item, replacing any previous version with the same ID"""
+        frequencies: Counter = Counter()
+        length = 0.0
+        for field_name, weight in FIELD_WEIGHTS:
+            if field_name == "content":
+                text = item.content
+            else:
+                text = getattr(item.metadata, field_name, None) or ""
+            tokens = tokenize(text)
+            length += weight * len(tokens)
+            for token in tokens:
+                frequencies[token] += weight
+
+        with self._lock:
+            self._remove(doc_id)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._vocabulary_stale = True
+                postings[doc_id] = frequency
+            self._documents[doc_id] = _Document(
+                item=item,
+                length=length,
+                terms=set(frequencies),
+                text=plain_text(item.content)
+            )
+            self._total_length += length
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Drop an item from the index
+
+        Returns:
+            True if the item was indexed
+        """
+        with self._lock:
+            return self._remove(doc_id)
+
+    def sync(self, items: Iterable[ContentItem]) -> Tuple[int, int]:
+        """
+        Bring the index in line with a set of items, re-indexing only what changed
+
+        Items are keyed by file path; an item is re-indexed when its object
+        differs from the indexed one (the loader returns the cached object
+        for unchanged files).
+
+        Returns:
+            (items indexed, items removed)
+        """
+        with self._lock:
+            seen = set()
+            indexed = 0
+            for item in items:
+                seen.add(item.file_path)
+                document = self._documents.get(item.file_path)
+                if document is None or document.item is not item:
+                    self.add(item.file_path, item)
+                    indexed += 1
+            stale = [doc_id for doc_id in self._documents if doc_id not in seen]
+            for doc_id in stale:
+                self._remove(doc_id)
+            return indexed, len(stale)
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[SearchHit]:
+        """
+        Find items matching every query word, best first
+
+        Args:
+            query: Search words
+            limit: Maximum hits returned
+            prefix: Let the last word match as a prefix (typeahead)
+
+        Returns:
+            Ranked hits with highlighted snippets
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+
+        with self._lock:
+            # Each query word becomes a group of (term, weight) alternatives
+            groups = [[(word, 1.0)] for word in words]
+            if prefix:
+                groups[-1] = self._expand_prefix(words[-1])
+
+            scores = self._score(groups)
+            rank_key = lambda entry: (-entry[1], entry[0])  # noqa: E731
+            if limit is not None:
+                ranked = heapq.nsmallest(limit, scores.items(), key=rank_key)
+            else:
+                ranked = sorted(scores.items(), key=rank_key)
+
+            hits = []
+            for doc_id, score in ranked:
+                document = self._documents[doc_id]
+                matched = self._matched_terms(doc_id, groups)
+                hits.append(SearchHit(
+                    item=document.item,
+                    score=round(score, 4),
+                    snippet=self._snippet(document.text, matched),
+                    matched_terms=sorted(matched)
+                ))
+            return hits
+
+    def _remove(self, doc_id: str) -> bool:
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return False
+        for term in document.terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_stale = True
+        self._total_length -= document.length
+        return True
+
+    def _expand_prefix(self, word: str) -> List[Tuple[str, float]]:
+        if self._vocabulary_stale:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_stale = False
+
+        alternatives = [(word, 1.0)] if word in self._postings else []
+        position = bisect_left(self._vocabulary, word)
+        while position < len(self._vocabulary) and len(alternatives) < self.max_prefix_expansions:
+            term = self._vocabulary[position]
+            if not term.startswith(word):
+                break
+            if term != word:
+                alternatives.append((term, self.prefix_weight))
+            position += 1
+        return alternatives
+
+    def _score(self, groups: List[List[Tuple[str, float]]]) -> Dict[str, float]:
+        """BM25 over documents matching at least one alternative of every group"""
+        total_documents = len(self._documents)
+        if not total_documents:
+            return {}
+        average_length = self._total_length / total_documents or 1.0
+        k1, b = self.k1, self.b
+        documents = self._documents
+
+        # Start from the rarest group so the candidate set is small from the outset
+        groups = sorted(groups, key=lambda group: sum(len(self._postings.get(t, ())) for t, _ in group))
+        results: Optional[Dict[str, float]] = None
+
+        for group in groups:
+            group_scores: Dict[str, float] = {}
+            for term, weight in group:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = weight * (k1 + 1) * math.log(1 + (total_documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                if results is None:
+                    candidates = postings.items()
+                else:
+                    candidates = ((d, postings[d]) for d in results if d in postings)
+                for doc_id, frequency in candidates:
+                    norm = k1 * (1 - b + b * documents[doc_id].length / average_length)
+                    term_score = idf * frequency / (frequency + norm)
+                    # A word scores by its best alternative, not the sum of its prefix expansions
+                    if term_score > group_scores.get(doc_id, 0.0):
+                        group_scores[doc_id] = term_score
+
+            if results is not None:
+                group_scores = {doc_id: results[doc_id] + score for doc_id, score in group_scores.items()}
+            results = group_scores
+            if not results:
+                return {}
+        return results or {}
+
+    def _matched_terms(self, doc_id: str, groups: List[List[Tuple[str, float]]]) -> Set[str]:
+        return {
+            term for group in groups for term, _ in group
+            if doc_id in self._postings.get(term, ())
+        }
+
+    def _snippet(self, text: str, terms: Set[str]) -> str:
+        """HTML-escaped excerpt around the first match, with matches wrapped in <mark>"""
+        pattern = re.compile(
+            r"(?<!\w)(" + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r")(?!\w)",
+            re.IGNORECASE
+        )
+        match = pattern.search(text)
+        start = 0
+        if match:
+            start = max(0, match.start() - self.snippet_chars // 3)
+            # Begin at a word boundary
+            space = text.find(" ", start)
+            if start and 0 <= space < match.start():
+                start = space + 1
+        end = min(len(text), start + self.snippet_chars)
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space
+
+        excerpt = text[start:end]
+        highlighted = []
+        position = 0
+        for found in pattern.finditer(excerpt):
+            highlighted.append(html.escape(excerpt[position:found.start()]))
+            highlighted.append(f"<mark>{html.escape(found.group(0))}</mark>")
+            position = found.end()
+        highlighted.append(html.escape(excerpt[position:]))
+
+        return ("…" if start else "") + "".join(highlighted) + ("…" if end < len(text) else "")
@@ -3,16 +3,33 @@ Content management service
 Refactored to use modular components
 """
 
+import asyncio
+import threading
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.io_pool import io_pool
 from app.models.content import (
-    ContentItem, SiteConfig, ThemeConfig,
+    ContentBatchStatus, ContentItem, SiteConfig, ThemeConfig,
     LayoutConfig, PersonalInfo
 )
+from app.services.content.bundle import BundleBuilder, ContentBundle
 from app.services.content.content_cache import content_cache
-from app.services.content.content_loader import ContentLoader
+from app.services.content.content_index import ContentIndex, ContentSnapshot, categorize
+from app.services.content.content_loader import ContentLoader, FileVersion
+from app.services.content.document_store import ContentFileNotFoundError, document_store
+from app.services.content.response_cache import ConfigResponseCache, SerializedConfig
+from app.services.content.search_index import SearchHit, SearchIndex
+from app.services.content.content_watcher import ContentChanges
+
+
+SITE_CONFIG = "config/site.json"
+THEME_CONFIG = "config/theme.json"
+LAYOUT_CONFIG = "config/layout.json"
+PERSONAL_INFO = "config/personal/contact-info.json"
 
 
 class ContentService:
@@ -21,37 +38,61 @@ class ContentService:
     def __init__(self):
         self.content_path = Path(settings.CONTENT_PATH)
         self.cache = content_cache
-        self.loader = ContentLoader(self.content_path, self.cache)
+        self.loader = ContentLoader(self.content_path, self.cache, document_store)
+        self.index = ContentIndex(self.content_path, self.loader)
+        self.configs = ConfigResponseCache(self.loader)
+        self.bundles = BundleBuilder(self.content_path, self.loader)
+        self.search_index = SearchIndex()
+        self._search_version = 0
+        self._search_lock = threading.Lock()
+
+    def get_config(self, file_path: str, model: Type[BaseModel]) -> SerializedConfig:
+        """
+        Get a config file validated into its model, with its serialized JSON
+
+        Validation and serialization happen once per version of the file.
+
+        Args:
+            file_path: Path relative to the content directory
+            model: Model the file is validated into
+
+        Returns:
+            Cached model, JSON bytes and HTTP validators
+
+        Raises:
+            ValueError: If file cannot be loaded or does not validate
+        """
+        return self.configs.get(self.content_path / file_path, model)
+
+    async def get_config_async(self, file_path: str, model: Type[BaseModel]) -> SerializedConfig:
+        """Get a validated, serialized config file without blocking the event loop"""
+        return await self.configs.get_async(self.content_path / file_path, model)
 
     def get_site_config(self) -> SiteConfig:
         """Get site configuration"""
-        config_path = self.content_path / "config" / "site.json"
-        data = self.loader.load_json_file(config_path)
-        return SiteConfig(**data)
+        return self.get_config(SITE_CONFIG, SiteConfig).model
 
     def get_theme_config(self) -> ThemeConfig:
         """Get theme configuration"""
-        config_path = self.content_path / "config" / "theme.json"
-        data = self.loader.load_json_file(config_path)
-        return ThemeConfig(**data)
+        return self.get_config(THEME_CONFIG, ThemeConfig).model
 
     def get_layout_config(self) -> LayoutConfig:
         """Get layout configuration"""
-        config_path = self.content_path / "config" / "layout.json"
-        data = self.loader.load_json_file(config_path)
-        return LayoutConfig(**data)
+        return self.get_config(LAYOUT_CONFIG, LayoutConfig).model
 
     def get_personal_info(self) -> PersonalInfo:
         """Get personal information"""
-        info_path = self.content_path / "config" / "personal" / "contact-info.json"
-        data = self.loader.load_json_file(info_path)
-        return PersonalInfo(**data)
+        return self.get_config(PERSONAL_INFO, PersonalInfo).model
 
     def get_content_item(self, file_path: str) -> ContentItem:
         """Get single content item by file path"""
         full_path = self.content_path / file_path
         return self.loader.load_markdown_file(full_path)
 
+    async def get_content_item_async(self, file_path: str) -> ContentItem:
+        """Get single content item by file path without blocking the event loop"""
+        return await self.loader.load_markdown_file_async(self.content_path / file_path)
+
     def get_content_items(self, file_paths: List[str]) -> List[ContentItem]:
         """Get multiple content items"""
         items = []
@@ -64,67 +105,213 @@ class ContentService:
                 continue
         return items
 
-    def get_all_content(self) -> Dict[str, List[ContentItem]]:
-        """Get all content organized by type"""
-        content = {
-            'sections': [],
-            'components': [],
-            'projects': [],
-            'skills': []
-        }
-
-        # Load sections
-        sections_path = self.content_path / "sections"
-        if sections_path.exists():
-            for file_path in sections_path.glob("*.md"):
-                try:
-                    item = self.loader.load_markdown_file(file_path)
-                    content['sections'].append(item)
-                except ValueError:
-                    continue
-
-        # Load components
-        components_path = self.content_path / "components"
-        if components_path.exists():
-            for file_path in components_path.rglob("*.md"):
+    async def iter_content_items(
+        self,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[ContentBatchStatus, Optional[ContentItem]]]:
+        """
+        Load several content items concurrently, yielding each as it completes
+
+        Repeated paths are loaded once. Cached items return immediately;
+        the rest are read in the I/O thread pool, at most max_concurrency at
+        a time, so a batch takes about as long as its slowest read. Stopping
+        the iteration early cancels the loads still pending.
+
+        Args:
+            file_paths: Paths relative to the content directory
+            max_concurrency: Loads in flight at once, defaults to CONTENT_BATCH_CONCURRENCY
+
+        Yields:
+            (status, item) per distinct path in completion order; item is None unless found
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.CONTENT_BATCH_CONCURRENCY)
+
+        async def load(file_path: str) -> Tuple[ContentBatchStatus, Optional[ContentItem]]:
+            async with semaphore:
                 try:
-                    item = self.loader.load_markdown_file(file_path)
-
-                    # Categorize components
-                    if "project" in str(file_path):
-                        content['projects'].append(item)
-                    elif "skill" in str(file_path):
-                        content['skills'].append(item)
-                    else:
-                        content['components'].append(item)
-                except ValueError:
-                    continue
-
-        # Sort by order metadata where available
-        for category in content.values():
-            category.sort(key=lambda x: x.metadata.order or 999)
-
-        return content
-
-    def search_content(self, query: str) -> List[ContentItem]:
-        """Simple text search through content"""
-        query_lower = query.lower()
-        all_content = self.get_all_content()
-        results = []
-
-        for category in all_content.values():
-            for item in category:
-                # Search in title, content, and metadata
-                if (query_lower in item.content.lower() or
-                    (item.metadata.title and query_lower in item.metadata.title.lower()) or
-                    (item.metadata.tech and query_lower in item.metadata.tech.lower())):
-                    results.append(item)
-
-        return results
+                    item = await self.get_content_item_async(file_path)
+                except ContentFileNotFoundError:
+                    return ContentBatchStatus(file_path=file_path, status="missing"), None
+                except ValueError as e:
+                    return ContentBatchStatus(file_path=file_path, status="error", error=str(e)), None
+            return ContentBatchStatus(file_path=file_path, status="found"), item
+
+        tasks = [asyncio.create_task(load(file_path)) for file_path in dict.fromkeys(file_paths)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_content_items_async(
+        self,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> Tuple[List[ContentItem], List[ContentBatchStatus]]:
+        """
+        Load several content items concurrently, reporting the outcome of every path
+
+        Args:
+            file_paths: Paths relative to the content directory
+            max_concurrency: Loads in flight at once, defaults to CONTENT_BATCH_CONCURRENCY
+
+        Returns:
+            (found items, status per distinct path), both in request order
+        """
+        results: Dict[str, Tuple[ContentBatchStatus, Optional[ContentItem]]] = {}
+        async for status, item in self.iter_content_items(file_paths, max_concurrency):
+            results[status.file_path] = (status, item)
+
+        ordered = [results[file_path] for file_path in dict.fromkeys(file_paths)]
+        items = [item for _, item in ordered if item is not None]
+        return items, [status for status, _ in ordered]
+
+    def get_all_content(self) -> Dict[str, List[ContentItem]]:
+        """Get all content organized by type, from the cached content index"""
+        return self.index.snapshot().as_dict()
+
+    def get_snapshot(self) -> ContentSnapshot:
+        """Get the current content snapshot with its ETag and modification time"""
+        return self.index.snapshot()
+
+    async def get_snapshot_async(self) -> ContentSnapshot:
+        """Get the current content snapshot without blocking the event loop"""
+        return await self.index.snapshot_async()
+
+    async def get_bundle_async(self) -> ContentBundle:
+        """Get the current initial-render bundle without blocking the event loop"""
+        return await self.bundles.get_async()
+
+    def get_bundle(self, version: str) -> Optional[ContentBundle]:
+        """Get a recently built bundle by version, or None"""
+        return self.bundles.get_version(version)
+
+    def file_version(self, file_path: str) -> FileVersion:
+        """
+        Get the HTTP validators of a content or config file
+
+        Args:
+            file_path: Path relative to the content directory
+
+        Returns:
+            ETag and modification time of the file as currently cached
+
+        Raises:
+            ValueError: If file cannot be loaded or parsed
+        """
+        return self.loader.file_version(self.content_path / file_path)
+
+    async def file_version_async(self, file_path: str) -> FileVersion:
+        """Get the HTTP validators of a file without blocking the event loop"""
+        return await self.loader.file_version_async(self.content_path / file_path)
+
+    def search(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[SearchHit]:
+        """
+        Full-text search through titles, tech and content
+
+        The search index follows the content index: when a new snapshot is
+        built, only the items that changed are re-indexed.
+
+        Args:
+            query: Search words; the last one also matches as a prefix
+            limit: Maximum results
+            prefix: Enable prefix matching of the last word
+
+        Returns:
+            Hits ranked by BM25 score, with highlighted snippets
+        """
+        self._sync_search_index(self.index.snapshot())
+        return self.search_index.search(query, limit=limit, prefix=prefix)
+
+    async def search_async(self, query: str, limit: Optional[int] = None, prefix: bool = True) -> List[SearchHit]:
+        """Full-text search without blocking the event loop; re-indexing runs in the I/O pool"""
+        snapshot = await self.index.snapshot_async()
+        if snapshot.version != self._search_version:
+            await io_pool.run(self._sync_search_index, snapshot)
+        return self.search_index.search(query, limit=limit, prefix=prefix)
+
+    def _sync_search_index(self, snapshot: ContentSnapshot) -> None:
+        if snapshot.version != self._search_version:
+            with self._search_lock:
+                if snapshot.version != self._search_version:
+                    self.search_index.sync(snapshot.items())
+                    self._search_version = snapshot.version
+
+    def search_content(self, query: str, limit: Optional[int] = None) -> List[ContentItem]:
+        """Search through content, best match first"""
+        return [hit.item for hit in self.search(query, limit=limit)]
+
+    def apply_changes(self, changes: ContentChanges) -> int:
+        """
+        Invalidate the cache entries of changed files
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for relative_path in changes.paths:
+            cache_key = self.loader.cache_key(self.content_path / relative_path)
+            removed += self.cache.invalidate(cache_key)
+        if any(categorize(path) for path in changes.paths):
+            self.index.invalidate()
+        return removed
+
+    def warm_content(self) -> int:
+        """
+        Load every markdown file into the cache and build the content and search indexes
+
+        Returns:
+            Number of markdown files loaded
+        """
+        snapshot = self.index.snapshot()
+        self._sync_search_index(snapshot)
+
+        # Files outside the listed categories are still served by /item
+        loaded = 0
+        for markdown_file in self.content_path.rglob("*.md"):
+            try:
+                self.loader.load_markdown_file(markdown_file)
+                loaded += 1
+            except ValueError:
+                continue
+        return loaded
+
+    def warm_configs(self) -> int:
+        """
+        Load every JSON file into the cache, pre-serialize the config responses
+        and build the initial-render bundle
+
+        Returns:
+            Number of JSON files loaded
+        """
+        for file_path, model in (
+            (SITE_CONFIG, SiteConfig), (THEME_CONFIG, ThemeConfig),
+            (LAYOUT_CONFIG, LayoutConfig), (PERSONAL_INFO, PersonalInfo)
+        ):
+            if (self.content_path / file_path).exists():
+                self.get_config(file_path, model)
+
+        loaded = 0
+        for json_file in self.content_path.rglob("*.json"):
+            try:
+                self.loader.load_json_file(json_file)
+                loaded += 1
+            except ValueError:
+                # Logged by the loader; requests for it will fail the same way
+                continue
+        self.bundles.get()
+        return loaded
 
     def clear_cache(self):
         """Clear the content cache"""
         self.cache.clear()
+        self.loader.documents.clear()
+        self.configs.clear()
+        self.bundles.clear()
+        self.index.invalidate()
 
 
 # Global content service instance
@@ -5,7 +5,7 @@ Embedding service for generating and managing content embeddings
 import os
 import asyncio
 import hashlib
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from pathlib import Path
 import aiohttp
 import json
@@ -14,6 +14,8 @@ from dataclasses import dataclass
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.tiered_cache import VECTOR_CODEC, TieredCache, hash_key, l2_store
+from app.utils.markdown import parse_frontmatter
 
 logger = get_logger(__name__)
 
@@ -31,11 +33,19 @@ class ContentChunk:
 class EmbeddingService:
     """Service for generating and managing embeddings"""
     
-    def __init__(self):
+    # Local model tried first; part of the cache key with the OpenAI model
+    MINILM_MODEL = "BAAI/bge-small-en-v1.5"
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        """
+        Args:
+            cache: Embeddings by model and text, shared across workers; not cached if None
+        """
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.groq_api_key = os.getenv("GROQ_API_KEY")
         self.embedding_model = "text-embedding-3-small"  # OpenAI's latest embedding model
         self.embedding_dimension = 1536
+        self.cache = cache
         
     def chunk_content(self, content: str, file_path: str, metadata: Dict[str, Any]) -> List[ContentChunk]:
         """
@@ -159,6 +169,22 @@ class EmbeddingService:
         return chunks
     
     async def generate_embedding(self, text: str) -> Optional[List[float]]:
+        """Generate embedding using MiniLM or OpenAI API as fallback, reusing cached ones"""
+        if self.cache is None:
+            return await self._embed(text)
+
+        key = self._cache_key(text)
+        embedding = await self.cache.get(key)
+        if embedding is None:
+            embedding = await self._embed(text)
+            if embedding is not None:
+                await self.cache.set(key, embedding)
+        return embedding
+
+    def _cache_key(self, text: str) -> str:
+        return hash_key(self.MINILM_MODEL, self.embedding_model, text)
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
         """Generate embedding using MiniLM or OpenAI API as fallback"""
         # Try MiniLM local model first
         minilm_embedding = await self._generate_minilm_embedding(text)
@@ -171,7 +197,8 @@ class EmbeddingService:
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            timeout = aiohttp.ClientTimeout(total=settings.EMBEDDING_REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
                 headers = {
                     "Authorization": f"Bearer {self.openai_api_key}",
                     "Content-Type": "application/json"
@@ -208,13 +235,13 @@ class EmbeddingService:
             
             # Initialize model if not already done
             if not hasattr(self, '_minilm_model'):
-                logger.info("Loading FastEmbed MiniLM model: BAAI/bge-small-en-v1.5")
+                logger.info(f"Loading FastEmbed MiniLM model: {self.MINILM_MODEL}")
                 loop = asyncio.get_event_loop()
                 
                 # Use a lighter model available in FastEmbed
                 self._minilm_model = await loop.run_in_executor(
                     None, 
-                    lambda: TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+                    lambda: TextEmbedding(model_name=self.MINILM_MODEL)
                 )
                 self.embedding_dimension = 384  # BGE-small dimension
                 logger.info("FastEmbed model loaded successfully")
@@ -250,34 +277,51 @@ class EmbeddingService:
             return None
     
     async def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts"""
-        tasks = [self.generate_embedding(text) for text in texts]
-        return await asyncio.gather(*tasks)
+        """Generate embeddings for multiple texts, looking all of them up in the cache at once"""
+        if self.cache is None:
+            tasks = [self.generate_embedding(text) for text in texts]
+            return await asyncio.gather(*tasks)
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = await self.cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        generated = await asyncio.gather(*(self._embed(text) for text in missing.values()))
+        new = {key: embedding for key, embedding in zip(missing, generated) if embedding is not None}
+        if new:
+            await self.cache.set_many(new)
+            embeddings.update(new)
+        return [embeddings.get(key) for key in keys]
     
     def generate_content_hash(self, content: str) -> str:
         """Generate a hash for content to detect changes"""
         return hashlib.md5(content.encode()).hexdigest()
     
-    def extract_metadata_from_content(self, content: str, file_path: str) -> Dict[str, Any]:
-        """Extract metadata from markdown content"""
+    def extract_metadata_from_content(
+        self,
+        content: str,
+        file_path: str,
+        frontmatter: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract metadata from markdown content
+
+        Args:
+            content: Raw markdown, frontmatter included
+            file_path: Path relative to the content directory
+            frontmatter: Already parsed frontmatter, e.g. from the document store;
+                parsed from content if not given
+
+        Returns:
+            Frontmatter fields plus file path, content hash and inferred type
+        """
+        if frontmatter is None:
+            frontmatter = parse_frontmatter(content)["data"]
         metadata = {
+            **frontmatter,
             "file_path": file_path,
             "content_hash": self.generate_content_hash(content)
         }
-        
-        # Extract frontmatter if present
-        if content.startswith('---'):
-            try:
-                end_index = content.find('---', 3)
-                if end_index != -1:
-                    frontmatter = content[3:end_index].strip()
-                    for line in frontmatter.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            metadata[key.strip()] = value.strip().strip('"\'')
-            except Exception as e:
-                logger.warning(f"Error parsing frontmatter in {file_path}: {e}")
-        
+
         # Infer section type from file path
         if 'sections/' in file_path:
             metadata['type'] = 'section'
@@ -298,4 +342,11 @@ class EmbeddingService:
 
 
 # Global instance
-embedding_service = EmbeddingService()
\ No newline at end of file
+embedding_cache = TieredCache(
+    "embeddings",
+    VECTOR_CODEC,
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+    l2=l2_store
+)
+embedding_service = EmbeddingService(cache=embedding_cache)
\ No newline at end of file
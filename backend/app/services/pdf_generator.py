@@ -2,31 +2,209 @@
 PDF Generation service using WeasyPrint
 """
 
+import asyncio
+import hashlib
 import io
 import base64
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
 import qrcode
 
+from app.core.config import settings
+from app.core.io_pool import io_pool
 from app.core.logging import get_logger
+from app.core.process_pool import ProcessPool, render_pool
+from app.core.tiered_cache import BYTES_CODEC, TieredCache, hash_key, l2_store
 from app.services.resume_service import resume_aggregator
 
 logger = get_logger(__name__)
 
+DEFAULT_PORTFOLIO_URL = "https://robert-zeijlon.com"
+DEFAULT_TEMPLATE = "technical"
+
+
+def resume_version(resume_data: Dict[str, Any]) -> str:
+    """
+    Hash of the resume content a PDF is rendered from
+
+    Returns:
+        Hex digest; equal for equal content whichever worker aggregated it
+    """
+    return hash_key({key: value for key, value in resume_data.items() if key != "generated_at"})
+
+
+def templates_version(templates_dir: Path) -> str:
+    """
+    Hash of the templates and stylesheet PDFs are rendered with
+
+    Returns:
+        Hex digest over every file's name and contents; changes when any template or the CSS does
+    """
+    digest = hashlib.sha256()
+    if templates_dir.is_dir():
+        for path in sorted(p for p in templates_dir.iterdir() if p.is_file()):
+            digest.update(path.name.encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ResumeRender:
+    """One resume PDF: what it is rendered from, and the key it is cached under"""
+    template_name: str
+    portfolio_url: str
+    key: str
+    resume_data: Dict[str, Any] = field(compare=False, repr=False)
+
+    @property
+    def etag(self) -> str:
+        """
+        Weak ETag: renders for the same key are equivalent, not byte-identical
+
+        Known before rendering, so a client holding this PDF gets a 304
+        without it being rendered or fetched from the cache.
+        """
+        return f'W/"{self.key[:32]}"'
+
 
 class PDFGenerator:
     """Generates PDF resumes from HTML templates"""
 
-    def __init__(self, templates_dir: str = "/app/app/templates"):
+    # Rendered PDFs kept in memory, least recently used evicted first
+    MAX_RENDERED = 16
+
+    def __init__(
+        self,
+        templates_dir: str = "/app/app/templates",
+        cache: Optional[TieredCache] = None,
+        pool: Optional[ProcessPool] = None
+    ):
+        """
+        Args:
+            templates_dir: Directory of the resume_<template>.html templates
+            cache: Rendered PDFs, shared across workers; in memory only if None
+            pool: Processes cache misses are rendered in; the global render pool if None
+        """
         self.templates_dir = Path(templates_dir)
+        # Templates ship with the image, so they are hashed once; a deploy that edits them changes every key
+        self.templates_version = templates_version(self.templates_dir)
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.templates_dir)),
             autoescape=True
         )
+        self.cache = cache if cache is not None else TieredCache("pdf", BYTES_CODEC, max_entries=self.MAX_RENDERED)
+        self.pool = pool or render_pool
+        # Renders in progress by key; concurrent requests for a key share one
+        self._inflight: Dict[str, "asyncio.Task[Optional[bytes]]"] = {}
+        self.renders = 0
+        self.shared_renders = 0
+
+    async def prepare(
+        self,
+        portfolio_url: str = DEFAULT_PORTFOLIO_URL,
+        template_name: str = DEFAULT_TEMPLATE
+    ) -> ResumeRender:
+        """
+        Read the resume content and derive the cache key of its PDF
+
+        Args:
+            portfolio_url: URL to encode in QR code
+            template_name: Template type ('technical', 'executive', 'onepage')
+
+        Returns:
+            Render description with key and ETag
+        """
+        resume_data = await io_pool.run(resume_aggregator.get_complete_resume_data)
+        # The PDF shows its generation date, so a new day means a new render
+        key = hash_key(
+            template_name,
+            portfolio_url,
+            datetime.now().strftime('%Y-%m-%d'),
+            resume_version(resume_data),
+            self.templates_version
+        )
+        return ResumeRender(template_name, portfolio_url, key, resume_data)
+
+    async def render(self, resume: ResumeRender) -> Optional[bytes]:
+        """
+        Get a prepared resume PDF from the cache, or render it in the process pool
+
+        Concurrent calls for the same key wait for one render; a caller that
+        goes away does not cancel it for the others.
+
+        Returns:
+            PDF bytes or None if generation fails
+        """
+        pdf_bytes = await self.cache.get(resume.key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+        task = self._inflight.get(resume.key)
+        if task is None:
+            task = asyncio.ensure_future(self._render(resume))
+            self._inflight[resume.key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(resume.key, None))
+        else:
+            self.shared_renders += 1
+        return await asyncio.shield(task)
+
+    async def get_resume_pdf(
+        self,
+        portfolio_url: str = DEFAULT_PORTFOLIO_URL,
+        template_name: str = DEFAULT_TEMPLATE
+    ) -> Optional[bytes]:
+        """
+        Get a resume PDF, rendering it only if no worker rendered it for this resume content
+
+        Args:
+            portfolio_url: URL to encode in QR code
+            template_name: Template type ('technical', 'executive', 'onepage')
+
+        Returns:
+            PDF bytes or None if generation fails
+        """
+        return await self.render(await self.prepare(portfolio_url, template_name))
+
+    def clear_cache(self, *_: Any) -> None:
+        """Drop rendered PDFs from memory, e.g. after resume content changed"""
+        # Shared entries are keyed by resume content and templates; superseded ones expire unused
+        self.cache.invalidate_local()
+
+    async def warm(self) -> None:
+        """Start the render processes and render the default resume ahead of the first download"""
+        if await self.get_resume_pdf() is None:
+            raise RuntimeError(f"Failed to render the {DEFAULT_TEMPLATE} resume")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "renders": self.renders,
+            "shared_renders": self.shared_renders,
+            "in_flight": len(self._inflight),
+            "cache": self.cache.get_stats(),
+            "pool": self.pool.get_stats()
+        }
+
+    async def _render(self, resume: ResumeRender) -> Optional[bytes]:
+        self.renders += 1
+        try:
+            pdf_bytes = await self.pool.run(
+                render_resume_pdf,
+                str(self.templates_dir),
+                resume.portfolio_url,
+                resume.template_name,
+                resume.resume_data
+            )
+        except Exception as e:
+            logger.error(f"Failed to render resume PDF: {e}", exc_info=True)
+            return None
+        if pdf_bytes is not None:
+            await self.cache.set(resume.key, pdf_bytes)
+        return pdf_bytes
 
     def _generate_qr_code(self, url: str) -> str:
         """Generate QR code as base64 encoded image"""
@@ -65,8 +243,9 @@ class PDFGenerator:
 
     def generate_resume_pdf(
         self,
-        portfolio_url: str = "https://robert-zeijlon.com",
-        template_name: str = "technical"
+        portfolio_url: str = DEFAULT_PORTFOLIO_URL,
+        template_name: str = DEFAULT_TEMPLATE,
+        resume_data: Optional[Dict[str, Any]] = None
     ) -> Optional[bytes]:
         """
         Generate PDF resume
@@ -74,13 +253,15 @@ class PDFGenerator:
         Args:
             portfolio_url: URL to encode in QR code
             template_name: Template type ('technical', 'executive', 'onepage')
+            resume_data: Aggregated resume content; read from the aggregator if None
 
         Returns:
             PDF bytes or None if generation fails
         """
         try:
             # Get resume data
-            resume_data = resume_aggregator.get_complete_resume_data()
+            if resume_data is None:
+                resume_data = resume_aggregator.get_complete_resume_data()
 
             # Generate QR code
             qr_code = self._generate_qr_code(portfolio_url)
@@ -100,7 +281,8 @@ class PDFGenerator:
             template = self.jinja_env.get_template(f'resume_{template_name}.html')
             html_content = template.render(context)
 
-            # Generate PDF using WeasyPrint
+            # Generate PDF using WeasyPrint; only render processes load it
+            from weasyprint import HTML
             pdf_bytes = HTML(string=html_content).write_pdf()
 
             logger.info(f"Successfully generated {template_name} resume PDF")
@@ -111,5 +293,33 @@ class PDFGenerator:
             return None
 
 
+# Generators of a render process, by templates directory
+_process_generators: Dict[str, PDFGenerator] = {}
+
+
+def render_resume_pdf(
+    templates_dir: str,
+    portfolio_url: str,
+    template_name: str,
+    resume_data: Dict[str, Any]
+) -> Optional[bytes]:
+    """
+    Render a resume PDF inside a pool process; module-level so it can be pickled
+
+    Returns:
+        PDF bytes or None if generation fails
+    """
+    generator = _process_generators.get(templates_dir)
+    if generator is None:
+        generator = _process_generators[templates_dir] = PDFGenerator(templates_dir)
+    return generator.generate_resume_pdf(portfolio_url, template_name, resume_data)
+
+
 # Global instance
-pdf_generator = PDFGenerator()
+pdf_generator = PDFGenerator(cache=TieredCache(
+    "pdf",
+    BYTES_CODEC,
+    max_entries=PDFGenerator.MAX_RENDERED,
+    ttl_seconds=settings.PDF_CACHE_TTL_SECONDS,
+    l2=l2_store
+))
@@ -3,10 +3,13 @@
 from app.services.rag.context_builder import ContextBuilder
 from app.services.rag.chat_service import ChatService, chat_service
 from app.services.rag.content_processor import ContentProcessor
+from app.services.rag.llm_router import LLMProvider, LLMRouter
 
 __all__ = [
     "ContextBuilder",
     "ChatService",
     "chat_service",
-    "ContentProcessor"
+    "ContentProcessor",
+    "LLMProvider",
+    "LLMRouter"
 ]
@@ -1,34 +1,34 @@
 """
-Chat service for generating AI responses using Groq API
+Chat service for generating AI responses through the LLM provider router
 """
 
-import os
-import re
-from typing import Optional
-import aiohttp
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
 
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError, ExternalAPIError
 from app.core.logging import get_logger
+from app.core.tiered_cache import TEXT_CODEC, TieredCache, hash_key, l2_store
+from app.services.rag.llm_router import (
+    LLMRouter, RateLimitError, build_router_from_settings
+)
 
 logger = get_logger(__name__)
 
 
-class RateLimitError(Exception):
-    """Custom exception for rate limit errors"""
-    def __init__(self, message: str, limit_type: str, retry_after: Optional[int] = None):
-        self.message = message
-        self.limit_type = limit_type  # 'TPM', 'RPM', 'TPD', 'RPD'
-        self.retry_after = retry_after
-        super().__init__(self.message)
-
-
 class ChatService:
     """Service for generating chat responses using LLM"""
 
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    def __init__(self, router: Optional[LLMRouter] = None, cache: Optional[TieredCache] = None):
+        """
+        Args:
+            router: LLM providers; built from settings if None
+            cache: Responses by messages and sampling parameters; not cached if None
+        """
+        self.router = router or build_router_from_settings()
+        self.cache = cache
         self.system_prompt = self._create_system_prompt()
-        self.model = "openai/gpt-oss-120b"
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
 
     def _create_system_prompt(self) -> str:
         """Create the system prompt for the AI assistant"""
@@ -70,111 +70,159 @@ Example of good formatting:
 
 Always base your responses on the provided context about Robert's background and experience."""
 
+    def build_messages(
+        self,
+        query: str,
+        context: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the LLM, including prior turns"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "system", "content": f"Context:\n{context}"},
+            *(history or []),
+            {"role": "user", "content": query}
+        ]
+
     async def generate_response(
         self,
         query: str,
         context: str,
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        history: Optional[List[Dict[str, str]]] = None,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
-        Generate AI response using Groq API
+        Generate AI response using the configured LLM providers
 
         Args:
             query: User query
             context: Formatted context for the LLM
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum response length
+            history: Earlier conversation as chat messages
+            deadline: Request deadline; generation may use all of the remaining budget
 
         Returns:
             AI-generated response
+
+        Raises:
+            RateLimitError: If every provider is rate limited
+            ExternalAPIError: If every provider failed
+            DeadlineExceededError: If no response arrived before the deadline
         """
-        if not self.groq_api_key:
-            logger.error("Groq API key not configured")
+        if not self.router.has_providers:
+            logger.error("No LLM provider configured")
             return "I'm sorry, but the AI service is not configured. Please check the API key settings."
 
+        messages = self.build_messages(query, context, history)
+        cache_key = hash_key(messages, temperature, max_tokens)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Serving cached chat response")
+                return cached
+
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.groq_api_key}",
-                    "Content-Type": "application/json"
-                }
-
-                messages = [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "system", "content": f"Context:\n{context}"},
-                    {"role": "user", "content": query}
-                ]
-
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                }
-
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        response_text = data["choices"][0]["message"]["content"]
-                        logger.info("Successfully generated chat response")
-                        return response_text
-                    elif response.status == 429:
-                        # Rate limit exceeded
-                        error_data = await response.json()
-                        error_message = error_data.get("error", {}).get("message", "")
-                        logger.warning(f"Rate limit exceeded: {error_message}")
-
-                        # Parse the error message to extract limit type and retry time
-                        limit_type = self._parse_rate_limit_type(error_message)
-                        retry_after = self._parse_retry_after(error_message)
-
-                        raise RateLimitError(error_message, limit_type, retry_after)
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Groq API error {response.status}: {error_text}")
-                        return "I'm experiencing technical difficulties. Please try again later."
-
-        except RateLimitError:
-            # Re-raise to be handled by the API endpoint
+            completion = self.router.complete(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=deadline.remaining() if deadline else None
+            )
+            response_text = await deadline.run(completion, "generation") if deadline else await completion
+            logger.info("Successfully generated chat response")
+            if self.cache is not None:
+                await self.cache.set(cache_key, response_text)
+            return response_text
+
+        except (RateLimitError, DeadlineExceededError):
+            # Re-raise to be handled by the caller
+            raise
+        except ExternalAPIError as e:
+            if deadline and deadline.expired:
+                # Providers timed out on the request budget, not a real outage
+                raise DeadlineExceededError("generation", details=e.details)
+            logger.error(f"All LLM providers failed: {e.details}")
             raise
-        except aiohttp.ClientError as e:
-            logger.error(f"HTTP error generating response: {e}")
-            return "I'm sorry, I couldn't connect to the AI service. Please try again."
         except Exception as e:
             logger.error(f"Unexpected error generating response: {e}")
             return "I'm sorry, I encountered an error. Please try again."
 
-    def _parse_rate_limit_type(self, error_message: str) -> str:
-        """
-        Parse the rate limit type from error message
-        Returns: 'TPM', 'RPM', 'TPD', or 'RPD'
-        """
-        if "tokens per minute" in error_message.lower() or "(tpm)" in error_message.lower():
-            return "TPM"
-        elif "requests per minute" in error_message.lower() or "(rpm)" in error_message.lower():
-            return "RPM"
-        elif "tokens per day" in error_message.lower() or "(tpd)" in error_message.lower():
-            return "TPD"
-        elif "requests per day" in error_message.lower() or "(rpd)" in error_message.lower():
-            return "RPD"
-        return "UNKNOWN"
-
-    def _parse_retry_after(self, error_message: str) -> Optional[int]:
+    async def stream_response(
+        self,
+        query: str,
+        context: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        history: Optional[List[Dict[str, str]]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[str]:
         """
-        Parse retry-after time from error message
-        Returns: seconds to wait, or None if not found
+        Stream an AI response token by token
+
+        Provider failover happens before the first token, so errors raised
+        before anything was yielded can be handled like generate_response's.
+
+        Args:
+            query: User query
+            context: Formatted context for the LLM
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum response length
+            history: Earlier conversation as chat messages
+            deadline: Request deadline; the stream is cut off when it expires
+
+        Raises:
+            RateLimitError: If every provider is rate limited
+            ExternalAPIError: If every provider failed or none is configured
+            DeadlineExceededError: If the deadline expired before or during the stream
         """
-        # Look for pattern like "Please try again in 30s" or "try again in 1.5s"
-        match = re.search(r'try again in ([\d.]+)s', error_message)
-        if match:
-            return int(float(match.group(1)))
-        return None
+        if not self.router.has_providers:
+            logger.error("No LLM provider configured")
+            raise ExternalAPIError("LLM", "No LLM provider configured")
+
+        messages = self.build_messages(query, context, history)
+        cache_key = hash_key(messages, temperature, max_tokens)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Serving cached chat response")
+                yield cached
+                return
+
+        tokens = self.router.stream(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=deadline.remaining() if deadline else None
+        )
+        streamed = []
+        try:
+            async for token in tokens:
+                streamed.append(token)
+                yield token
+            logger.info("Successfully streamed chat response")
+            # Only complete responses; an interrupted stream is never cached
+            if self.cache is not None:
+                await self.cache.set(cache_key, "".join(streamed))
+        except ExternalAPIError as e:
+            if deadline and deadline.expired:
+                raise DeadlineExceededError("generation", details=e.details)
+            logger.error(f"All LLM providers failed: {e.details}")
+            raise
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("generation")
+        finally:
+            await tokens.aclose()
 
 
 # Global instance
-chat_service = ChatService()
+llm_response_cache = TieredCache(
+    "llm_responses",
+    TEXT_CODEC,
+    max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+    l2=l2_store
+)
+chat_service = ChatService(cache=llm_response_cache if settings.LLM_RESPONSE_CACHE_TTL_SECONDS > 0 else None)
@@ -4,11 +4,12 @@ Handles content ingestion and embedding generation
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Optional
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.repositories.vector_repository import VectorRepository
+from app.services.content.document_store import document_store
 from app.services.embedding_service import embedding_service
 
 logger = get_logger(__name__)
@@ -52,45 +53,107 @@ class ContentProcessor:
         logger.info(f"Found {len(markdown_files)} markdown files to process")
 
         for file_path in markdown_files:
-            try:
-                relative_path = file_path.relative_to(content_path)
+            await self._process_file(file_path, content_path, stats)
 
-                # Read file content
-                content = file_path.read_text(encoding='utf-8')
+        logger.info(f"Content processing complete: {stats}")
+        return stats
 
-                # Extract metadata
-                metadata = embedding_service.extract_metadata_from_content(
-                    content,
-                    str(relative_path)
-                )
-                metadata['id'] = str(relative_path).replace('/', '_').replace('.md', '')
+    async def process_files(
+        self,
+        changed: Iterable[Path],
+        deleted: Iterable[Path] = ()
+    ) -> Dict[str, Any]:
+        """
+        Re-embed only the given markdown files
 
-                # Chunk content
-                chunks = embedding_service.chunk_content(
-                    content,
-                    str(relative_path),
-                    metadata
-                )
+        Chunks a changed file no longer produces, and all chunks of deleted
+        files, are removed from the vector store.
 
-                # Generate embeddings for each chunk
-                for chunk in chunks:
-                    embedding = await embedding_service.generate_embedding(chunk.content)
-                    if embedding:
-                        success = await self.vector_repo.store_embedding(chunk, embedding)
-                        if success:
-                            stats["generated_embeddings"] += 1
-                        else:
-                            stats["errors"] += 1
-                    else:
-                        stats["skipped"] += 1
-                        logger.warning(f"Skipped embedding for chunk in {relative_path}")
+        Args:
+            changed: Added or modified markdown files
+            deleted: Removed markdown files
+
+        Returns:
+            Processing statistics
+        """
+        content_path = Path(settings.CONTENT_PATH)
+        stats = {
+            "processed_files": 0,
+            "generated_embeddings": 0,
+            "errors": 0,
+            "skipped": 0,
+            "deleted_files": 0,
+            "deleted_embeddings": 0
+        }
 
-                stats["processed_files"] += 1
-                logger.info(f"Processed {relative_path} ({len(chunks)} chunks)")
+        for file_path in changed:
+            chunk_ids = await self._process_file(file_path, content_path, stats)
+            if chunk_ids is not None:
+                relative_path = str(file_path.relative_to(content_path))
+                stats["deleted_embeddings"] += await self.vector_repo.delete_file_embeddings(
+                    relative_path, keep_ids=chunk_ids
+                )
 
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                stats["errors"] += 1
+        for file_path in deleted:
+            relative_path = str(file_path.relative_to(content_path))
+            stats["deleted_embeddings"] += await self.vector_repo.delete_file_embeddings(relative_path)
+            stats["deleted_files"] += 1
 
-        logger.info(f"Content processing complete: {stats}")
+        logger.info(f"Incremental content processing complete: {stats}")
         return stats
+
+    async def _process_file(
+        self,
+        file_path: Path,
+        content_path: Path,
+        stats: Dict[str, Any]
+    ) -> Optional[List[str]]:
+        """
+        Chunk and embed one markdown file, updating stats
+
+        Returns:
+            Content IDs of the file's chunks, or None if the file failed
+        """
+        try:
+            relative_path = file_path.relative_to(content_path)
+
+            # Read and parse once, shared with the content and resume services
+            document = await document_store.get_async(file_path)
+            content = document.raw
+
+            # Extract metadata
+            metadata = embedding_service.extract_metadata_from_content(
+                content,
+                str(relative_path),
+                frontmatter=document.metadata
+            )
+            metadata['id'] = str(relative_path).replace('/', '_').replace('.md', '')
+
+            # Chunk content
+            chunks = embedding_service.chunk_content(
+                content,
+                str(relative_path),
+                metadata
+            )
+
+            # Generate embeddings for each chunk
+            for chunk in chunks:
+                embedding = await embedding_service.generate_embedding(chunk.content)
+                if embedding:
+                    success = await self.vector_repo.store_embedding(chunk, embedding)
+                    if success:
+                        stats["generated_embeddings"] += 1
+                    else:
+                        stats["errors"] += 1
+                else:
+                    stats["skipped"] += 1
+                    logger.warning(f"Skipped embedding for chunk in {relative_path}")
+
+            stats["processed_files"] += 1
+            logger.info(f"Processed {relative_path} ({len(chunks)} chunks)")
+            return [chunk.content_id for chunk in chunks]
+
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            stats["errors"] += 1
+            return None
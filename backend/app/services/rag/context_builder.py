@@ -3,9 +3,12 @@ Context builder service for RAG system
 Handles retrieving and formatting context for LLM queries
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from app.core.config import settings
+from app.core.deadline import Deadline
 from app.core.logging import get_logger
+from app.core.tiered_cache import JSON_CODEC, TieredCache, hash_key, l2_store
 from app.repositories.vector_repository import VectorRepository
 from app.services.embedding_service import embedding_service
 
@@ -15,14 +18,26 @@ logger = get_logger(__name__)
 class ContextBuilder:
     """Service for building context from retrieved content"""
 
-    def __init__(self, vector_repo: VectorRepository):
+    # Fractions of the remaining request budget given to each stage
+    EMBEDDING_SHARE = 0.2
+    RETRIEVAL_SHARE = 0.3
+
+    def __init__(self, vector_repo: VectorRepository, cache: Optional[TieredCache] = None):
+        """
+        Args:
+            vector_repo: Store searched for similar chunks
+            cache: Results by query and search parameters; not cached if None
+        """
         self.vector_repo = vector_repo
+        self.cache = cache
 
     async def retrieve_context(
         self,
         query: str,
         max_results: int = 5,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        query_embedding: Optional[List[float]] = None,
+        deadline: Optional[Deadline] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant context for a query
@@ -31,24 +46,59 @@ class ContextBuilder:
             query: User query
             max_results: Maximum number of results to return
             threshold: Minimum similarity threshold
+            query_embedding: Precomputed query embedding, generated if omitted
+            deadline: Request deadline; retrieval uses its share of the remaining budget
 
         Returns:
             List of relevant content chunks with similarity scores
+
+        Raises:
+            DeadlineExceededError: If retrieval did not finish within its share
         """
+        cache_key = hash_key(query, max_results, threshold)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Retrieved {len(cached)} cached context results for query")
+                return cached
+
         # Generate embedding for the query
-        query_embedding = await embedding_service.generate_embedding(query)
+        if query_embedding is None:
+            embedding = embedding_service.generate_embedding(query)
+            if deadline:
+                query_embedding = await deadline.run(
+                    embedding, "embedding", fraction=self.EMBEDDING_SHARE
+                )
+            else:
+                query_embedding = await embedding
         if not query_embedding:
             logger.warning("Could not generate embedding for query")
             return []
 
         # Search for similar content
-        results = await self.vector_repo.similarity_search(
-            query_embedding,
-            limit=max_results,
-            threshold=threshold
-        )
+        if deadline:
+            timeout = deadline.share(self.RETRIEVAL_SHARE)
+            results = await deadline.run(
+                self.vector_repo.similarity_search(
+                    query_embedding,
+                    limit=max_results,
+                    threshold=threshold,
+                    timeout=timeout
+                ),
+                "retrieval",
+                fraction=self.RETRIEVAL_SHARE
+            )
+        else:
+            results = await self.vector_repo.similarity_search(
+                query_embedding,
+                limit=max_results,
+                threshold=threshold
+            )
 
         logger.info(f"Retrieved {len(results)} context results for query")
+        # Search errors also come back empty; only real results are worth sharing
+        if results and self.cache is not None:
+            await self.cache.set(cache_key, results)
         return results
 
     def format_context(self, context_results: List[Dict[str, Any]]) -> str:
@@ -79,3 +129,15 @@ class ContextBuilder:
             formatted_context += f"{result['content']}\n\n"
 
         return formatted_context
+
+
+# Global instance
+# Versioned: re-embedding content advances the generation, dropping every worker's results
+retrieval_cache = TieredCache(
+    "retrieval",
+    JSON_CODEC,
+    max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS,
+    l2=l2_store,
+    versioned=True
+)
@@ -0,0 +1,341 @@
+"""
+Conversation memory for multi-turn chat
+Keeps recent turns in an in-process LRU and persists them write-behind
+"""
+
+import asyncio
+import json
+import re
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.repositories.conversation_repository import (
+    ConversationRepository, MessageRow, conversation_repository, conversation_uuid
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ConversationTurn:
+    """A single stored chat message"""
+    role: str
+    content: str
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class ConversationState:
+    """In-memory state of one conversation"""
+    recent: Deque[ConversationTurn]
+    summary: str = ""
+
+
+@dataclass
+class ConversationHistory:
+    """Snapshot of a conversation handed to the LLM"""
+    summary: str
+    messages: List[ConversationTurn]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.summary and not self.messages
+
+    def to_chat_messages(self) -> List[Dict[str, str]]:
+        """Format as OpenAI-style chat messages"""
+        chat_messages = []
+        if self.summary:
+            chat_messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{self.summary}"
+            })
+        chat_messages.extend({"role": turn.role, "content": turn.content} for turn in self.messages)
+        return chat_messages
+
+
+class ConversationMemory:
+    """
+    Conversation history with an LRU read path and write-behind persistence
+
+    Appends only touch memory; a background task writes queued messages to
+    the database in batches. Turns that fall out of the recent window are
+    folded into a bounded, extractive rolling summary.
+    """
+
+    def __init__(
+        self,
+        repository: ConversationRepository,
+        max_conversations: int = 1000,
+        recent_messages: int = 6,
+        summary_max_chars: int = 1500,
+        flush_interval: float = 0.5,
+        batch_size: int = 100,
+        max_pending: int = 5000,
+        load_timeout: float = 0.5
+    ):
+        self.repository = repository
+        self.max_conversations = max_conversations
+        self.recent_messages = recent_messages
+        self.summary_max_chars = summary_max_chars
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.load_timeout = load_timeout
+
+        self._conversations: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._pending: List[tuple] = []
+        self._dirty_summaries: Dict[str, Optional[str]] = {}
+        self._cleared: Set[str] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._failures = 0
+
+    async def get_history(self, conversation_id: str, is_new: bool = False) -> ConversationHistory:
+        """
+        Get the summary and recent turns of a conversation
+
+        Args:
+            conversation_id: Conversation ID
+            is_new: Skip the database lookup for freshly created conversations
+
+        Returns:
+            Conversation history snapshot
+        """
+        state = self._conversations.get(conversation_id)
+        if state is None:
+            state = await self._load(conversation_id) if not is_new else self._new_state()
+            # Another request may have populated the entry while we were loading
+            state = self._conversations.setdefault(conversation_id, state)
+            self._evict()
+        self._conversations.move_to_end(conversation_id)
+        return ConversationHistory(summary=state.summary, messages=list(state.recent))
+
+    def append_exchange(
+        self,
+        conversation_id: str,
+        user_message: str,
+        assistant_message: str,
+        sources: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Record a user/assistant exchange without waiting for the database
+
+        Args:
+            conversation_id: Conversation ID
+            user_message: Visitor message
+            assistant_message: Generated response
+            sources: RAG sources used for the response
+        """
+        state = self._conversations.get(conversation_id)
+        if state is None:
+            state = self._new_state()
+            self._conversations[conversation_id] = state
+            self._evict()
+        self._conversations.move_to_end(conversation_id)
+        self._cleared.discard(conversation_id)
+
+        source_refs = json.dumps([
+            {"file_path": source.get("file_path"), "similarity": source.get("similarity")}
+            for source in sources
+        ]) if sources else None
+
+        for role, content, refs in (("user", user_message, None), ("assistant", assistant_message, source_refs)):
+            turn = ConversationTurn(role=role, content=content)
+            state.recent.append(turn)
+            self._pending.append((conversation_id, role, content, refs, turn.timestamp))
+
+        folded = False
+        while len(state.recent) > self.recent_messages:
+            state.summary = self._fold_into_summary(state.summary, state.recent.popleft())
+            folded = True
+        if folded:
+            self._dirty_summaries[conversation_id] = state.summary
+        else:
+            self._dirty_summaries.setdefault(conversation_id, None)
+
+        if len(self._pending) > self.max_pending:
+            dropped = len(self._pending) - self.max_pending
+            del self._pending[:dropped]
+            logger.warning(f"Conversation write buffer full, dropped {dropped} oldest messages")
+
+        self._ensure_flusher()
+        if self._flush_event is not None and len(self._pending) >= self.batch_size:
+            self._flush_event.set()
+
+    async def clear(self, conversation_id: str) -> None:
+        """Remove a conversation from memory, the write buffer and the database"""
+        self._conversations.pop(conversation_id, None)
+        self._dirty_summaries.pop(conversation_id, None)
+        self._pending = [row for row in self._pending if row[0] != conversation_id]
+        self._cleared.add(conversation_id)
+
+        try:
+            async with self._lock():
+                await self.repository.delete(conversation_uuid(conversation_id))
+        finally:
+            self._cleared.discard(conversation_id)
+        logger.info(f"Cleared conversation {conversation_id}")
+
+    async def flush(self) -> int:
+        """
+        Write all buffered messages to the database
+
+        Returns:
+            Number of messages written
+        """
+        async with self._lock():
+            if not self._pending and not self._dirty_summaries:
+                return 0
+
+            pending, self._pending = self._pending, []
+            summaries, self._dirty_summaries = self._dirty_summaries, {}
+
+            conversations = [
+                (conversation_uuid(conv_id), conv_id, summary)
+                for conv_id, summary in summaries.items()
+            ]
+            messages: List[MessageRow] = [
+                (conversation_uuid(conv_id), role, content, refs, timestamp)
+                for conv_id, role, content, refs, timestamp in pending
+            ]
+
+            try:
+                await self.repository.save_batch(conversations, messages)
+            except Exception as e:
+                # Put the batch back in front of anything appended meanwhile,
+                # minus conversations cleared while the write was in flight
+                pending = [row for row in pending if row[0] not in self._cleared]
+                self._pending = pending + self._pending
+                for conv_id, summary in summaries.items():
+                    if conv_id in self._cleared:
+                        continue
+                    if self._dirty_summaries.get(conv_id) is None:
+                        self._dirty_summaries[conv_id] = summary
+                self._failures += 1
+                logger.warning(f"Failed to persist {len(messages)} chat messages: {e}")
+                raise
+
+            self._failures = 0
+            return len(messages)
+
+    async def close(self) -> None:
+        """Stop the background writer and flush what is left"""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+
+        try:
+            await self.flush()
+        except Exception:
+            logger.error("Final conversation flush failed, buffered messages lost")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Memory and write-buffer statistics"""
+        return {
+            "cached_conversations": len(self._conversations),
+            "pending_messages": len(self._pending),
+            "consecutive_flush_failures": self._failures
+        }
+
+    def _new_state(self) -> ConversationState:
+        return ConversationState(recent=deque())
+
+    async def _load(self, conversation_id: str) -> ConversationState:
+        """Load a conversation from the database, degrading to empty on failure"""
+        state = self._new_state()
+        try:
+            summary, rows = await asyncio.wait_for(
+                self.repository.load_recent(
+                    conversation_uuid(conversation_id),
+                    self.recent_messages,
+                    timeout=self.load_timeout
+                ),
+                timeout=self.load_timeout
+            )
+        except Exception as e:
+            logger.warning(f"Could not load conversation {conversation_id}: {e.__class__.__name__}: {e}")
+            return state
+
+        state.summary = summary
+        state.recent.extend(
+            ConversationTurn(role=row["role"], content=row["content"], timestamp=row["timestamp"])
+            for row in rows
+        )
+        return state
+
+    def _evict(self) -> None:
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def _fold_into_summary(self, summary: str, turn: ConversationTurn) -> str:
+        """Append a one-line digest of a turn, dropping the oldest lines past the size cap"""
+        text = re.sub(r'[#*`>_]+', '', turn.content)
+        text = re.sub(r'\s+', ' ', text).strip()
+        if turn.role == "user":
+            line = f"- Visitor asked: {text[:160]}"
+        else:
+            first_sentence = re.split(r'(?<=[.!?])\s', text, maxsplit=1)[0]
+            line = f"- Assistant answered: {first_sentence[:200]}"
+
+        lines = summary.split("\n") if summary else []
+        lines.append(line)
+        while len(lines) > 1 and sum(len(l) + 1 for l in lines) > self.summary_max_chars:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def _bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """(Re)create loop-bound primitives when first used on a new event loop"""
+        if self._loop is not loop:
+            self._loop = loop
+            self._write_lock = asyncio.Lock()
+            self._flush_event = asyncio.Event()
+            self._flusher = None
+
+    def _lock(self) -> asyncio.Lock:
+        self._bind_loop(asyncio.get_running_loop())
+        return self._write_lock
+
+    def _ensure_flusher(self) -> None:
+        """Start the background writer on the running loop if it is not running"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._bind_loop(loop)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            # Back off while the database is unavailable
+            delay = min(30.0, self.flush_interval * (2 ** self._failures))
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                pass
+
+
+# Global instance
+conversation_memory = ConversationMemory(
+    conversation_repository,
+    max_conversations=settings.CONVERSATION_CACHE_SIZE,
+    recent_messages=settings.CONVERSATION_RECENT_MESSAGES,
+    summary_max_chars=settings.CONVERSATION_SUMMARY_MAX_CHARS,
+    flush_interval=settings.CONVERSATION_FLUSH_INTERVAL_MS / 1000
+)
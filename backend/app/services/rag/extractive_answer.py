@@ -0,0 +1,179 @@
+"""
+Extractive answers built from retrieved chunks, without an LLM call
+
+Used when the LLM is rate limited for the day, down, or out of time.
+Sentences from the top chunks are ranked by similarity to the query and
+the best ones are returned as markdown with their sources. Everything runs
+on the CPU in a few milliseconds.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have
+how i in is it its me my of on or our so than that the their them then there
+these they this to was we were what when where which who why will with would
+you your about tell robert robert's he his
+""".split())
+
+
+@dataclass
+class Sentence:
+    """A candidate sentence with where it came from"""
+    text: str
+    file_path: str
+    chunk_rank: int
+    position: int
+    chunk_similarity: float
+
+
+def _stem(word: str) -> str:
+    """Strip a plural or third-person s, so models matches model"""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> List[str]:
+    """Content words and adjacent word pairs"""
+    words = [_stem(w) for w in re.findall(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]", text.lower())
+             if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def split_sentences(content: str) -> List[str]:
+    """
+    Split a markdown chunk into body sentences
+
+    Headings, horizontal rules, bold question lines and italic annotations
+    are dropped; list items count as sentences.
+    """
+    sentences = []
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("#") or line == "---":
+            continue
+        if re.fullmatch(r'\*{1,2}[^*]+\*{1,2}:?', line):
+            continue
+        line = re.sub(r'^(?:[-*+]|\d+\.)\s+', '', line)
+        for sentence in re.split(r'(?<=[.!?])\s+(?=[A-Z0-9*"(])', line):
+            sentence = sentence.strip()
+            if len(sentence) >= 20:
+                sentences.append(sentence)
+    return sentences
+
+
+class ExtractiveAnswerGenerator:
+    """Rank retrieved sentences against the query with hashed term vectors"""
+
+    def __init__(
+        self,
+        dimension: int = 1024,
+        max_sentences: int = 4,
+        max_chunks: int = 5,
+        chunk_weight: float = 0.3
+    ):
+        """
+        Args:
+            dimension: Size of the hashed term vectors
+            max_sentences: Sentences in the answer
+            max_chunks: Retrieved chunks considered
+            chunk_weight: Weight of the chunk's retrieval similarity in a sentence score
+        """
+        self.dimension = dimension
+        self.max_sentences = max_sentences
+        self.max_chunks = max_chunks
+        self.chunk_weight = chunk_weight
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Feature-hashed term vectors, L2-normalised
+
+        Returns:
+            Matrix with one row per text
+        """
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in _terms(text):
+                matrix[row, zlib.crc32(term.encode()) % self.dimension] += 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def select(self, query: str, context_results: List[Dict[str, Any]]) -> List[Sentence]:
+        """
+        Pick the most query-relevant sentences from the top chunks
+
+        Args:
+            query: Visitor's question
+            context_results: Retrieved chunks, best match first
+
+        Returns:
+            Selected sentences in reading order (chunk rank, then position)
+        """
+        candidates: List[Sentence] = []
+        seen = set()
+        for rank, result in enumerate(context_results[:self.max_chunks]):
+            for position, text in enumerate(split_sentences(result.get("content", ""))):
+                if text in seen:
+                    continue
+                seen.add(text)
+                candidates.append(Sentence(
+                    text=text,
+                    file_path=result.get("file_path", ""),
+                    chunk_rank=rank,
+                    position=position,
+                    chunk_similarity=float(result.get("similarity", 0.0))
+                ))
+
+        if not candidates:
+            return []
+
+        vectors = self.embed([query] + [c.text for c in candidates])
+        scores = vectors[1:] @ vectors[0]
+        scores += self.chunk_weight * np.array([c.chunk_similarity for c in candidates], dtype=np.float32)
+        # Break ties towards earlier chunks and the start of a chunk
+        scores -= 1e-3 * np.array([c.chunk_rank + c.position / 100 for c in candidates], dtype=np.float32)
+
+        best = np.argsort(-scores)[:self.max_sentences]
+        selected = [candidates[i] for i in best]
+        return sorted(selected, key=lambda c: (c.chunk_rank, c.position))
+
+    def generate(
+        self,
+        query: str,
+        context_results: List[Dict[str, Any]],
+        note: Optional[str] = None
+    ) -> str:
+        """
+        Build a markdown answer from retrieved chunks
+
+        Args:
+            query: Visitor's question
+            context_results: Retrieved chunks, best match first
+            note: Optional italic note appended to the answer
+
+        Returns:
+            Markdown answer with sources, or an empty string if no chunk has usable text
+        """
+        sentences = self.select(query, context_results)
+        if not sentences:
+            return ""
+
+        sources = list(dict.fromkeys(s.file_path for s in sentences if s.file_path))
+
+        answer = "Here's what I found in Robert's portfolio:\n\n"
+        answer += "\n".join(f"- {s.text}" for s in sentences)
+        if sources:
+            answer += "\n\n**Sources:** " + ", ".join(f"`{source}`" for source in sources)
+        if note:
+            answer += f"\n\n*{note}*"
+        return answer
+
+
+# Global instance
+extractive_answer_generator = ExtractiveAnswerGenerator()
@@ -0,0 +1,603 @@
+"""
+LLM provider routing for OpenAI-compatible chat completion endpoints
+Handles ordered failover, per-provider circuit breakers, latency tracking
+and optional hedged requests
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+)
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError, ExternalAPIError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+class RateLimitError(Exception):
+    """Custom exception for rate limit errors"""
+    def __init__(self, message: str, limit_type: str, retry_after: Optional[int] = None):
+        self.message = message
+        self.limit_type = limit_type  # 'TPM', 'RPM', 'TPD', 'RPD'
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+class ProviderError(Exception):
+    """Raised when a single provider fails to produce a response"""
+    def __init__(self, provider: str, message: str, status: Optional[int] = None):
+        self.provider = provider
+        self.status = status
+        super().__init__(f"{provider}: {message}")
+
+
+def parse_rate_limit_type(error_message: str) -> str:
+    """
+    Parse the rate limit type from error message
+    Returns: 'TPM', 'RPM', 'TPD', 'RPD' or 'UNKNOWN'
+    """
+    message = error_message.lower()
+    if "tokens per minute" in message or "(tpm)" in message:
+        return "TPM"
+    elif "requests per minute" in message or "(rpm)" in message:
+        return "RPM"
+    elif "tokens per day" in message or "(tpd)" in message:
+        return "TPD"
+    elif "requests per day" in message or "(rpd)" in message:
+        return "RPD"
+    return "UNKNOWN"
+
+
+def parse_retry_after(error_message: str) -> Optional[int]:
+    """
+    Parse retry-after time from error message
+    Returns: seconds to wait, or None if not found
+    """
+    # Look for pattern like "Please try again in 30s" or "try again in 1.5s"
+    match = re.search(r'try again in ([\d.]+)s', error_message)
+    if match:
+        return int(float(match.group(1)))
+    return None
+
+
+@dataclass
+class LLMProvider:
+    """An OpenAI-compatible chat completions endpoint"""
+    name: str
+    api_url: str
+    model: str
+    api_key: str = ""
+    timeout: float = 30.0
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker
+
+    Closed until `failure_threshold` consecutive failures, then open for
+    `reset_timeout` seconds. After that a single half-open probe is let
+    through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._open_for = reset_timeout
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'"""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self._open_for:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, claiming the probe slot when half-open"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request"""
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self, open_for: Optional[float] = None) -> None:
+        """
+        Record a failed request
+
+        Args:
+            open_for: Open the circuit immediately for this many seconds
+                (used for rate limits that announce a retry time)
+        """
+        self._failures += 1
+        self._probe_in_flight = False
+        if open_for is not None:
+            self._trip(max(open_for, 1.0))
+        elif self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._trip(self.reset_timeout)
+
+    def release(self) -> None:
+        """Release the probe slot of a request that was cancelled"""
+        self._probe_in_flight = False
+
+    def _trip(self, open_for: float) -> None:
+        self._opened_at = self._clock()
+        self._open_for = open_for
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies (seconds)"""
+
+    def __init__(self, window: int = 50):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample"""
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None without samples"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+
+@dataclass
+class ProviderState:
+    """Runtime health and statistics for one provider"""
+    provider: LLMProvider
+    breaker: CircuitBreaker
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+    last_rate_limit: Optional[RateLimitError] = None
+
+
+class LLMRouter:
+    """Routes chat completion requests across an ordered list of providers"""
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge_enabled: bool = False,
+        hedge_delay: float = 2.5,
+        slow_p95: float = 8.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        min_latency_samples: int = 5
+    ):
+        self.states = [
+            ProviderState(provider, CircuitBreaker(failure_threshold, reset_timeout))
+            for provider in providers
+        ]
+        self.hedge_enabled = hedge_enabled
+        self.hedge_delay = hedge_delay
+        self.slow_p95 = slow_p95
+        self.min_latency_samples = min_latency_samples
+
+    @property
+    def has_providers(self) -> bool:
+        return bool(self.states)
+
+    def ordered_states(self) -> List[ProviderState]:
+        """
+        Providers in routing order
+
+        Configured order is kept, except that open circuits go last and
+        providers whose recent p95 exceeds `slow_p95` are tried after the
+        ones that are currently fast.
+        """
+        def sort_key(item: Tuple[int, ProviderState]) -> Tuple[bool, bool, int]:
+            index, state = item
+            p95 = self._recent_p95(state)
+            slow = p95 is not None and p95 > self.slow_p95
+            return (state.breaker.state == "open", slow, index)
+
+        return [state for _, state in sorted(enumerate(self.states), key=sort_key)]
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Get a complete chat response from the first provider that succeeds
+
+        Args:
+            messages: OpenAI-style chat messages
+            temperature: Sampling temperature
+            max_tokens: Maximum response length
+            timeout: Optional overall timeout in seconds, capped per provider
+
+        Returns:
+            Response text
+
+        Raises:
+            RateLimitError: If every usable provider is rate limited
+            ExternalAPIError: If no provider produced a response
+        """
+        payload = {"messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        _, text = await self._race(
+            lambda state: self._complete_once(state.provider, payload, timeout)
+        )
+        return text
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response tokens from the first provider that produces one
+
+        Failover and hedging apply until the first token arrives; after that
+        the stream is bound to the winning provider.
+        """
+        payload = {"messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        state, (first_token, tokens) = await self._race(
+            lambda state: self._open_stream(state.provider, payload, timeout),
+            discard=lambda opened: opened[1].aclose()
+        )
+
+        try:
+            if first_token:
+                yield first_token
+            async for token in tokens:
+                yield token
+        except Exception as e:
+            logger.warning(f"LLM stream from {state.provider.name} failed mid-response: {e}")
+            state.failures += 1
+            state.breaker.record_failure()
+            raise
+        finally:
+            await tokens.aclose()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Routing statistics per provider"""
+        stats = []
+        for state in self.states:
+            p95 = state.latency.p95
+            stats.append({
+                "name": state.provider.name,
+                "model": state.provider.model,
+                "circuit": state.breaker.state,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "requests": state.requests,
+                "failures": state.failures,
+                "hedges": state.hedges
+            })
+        return stats
+
+    def _recent_p95(self, state: ProviderState) -> Optional[float]:
+        if len(state.latency) < self.min_latency_samples:
+            return None
+        return state.latency.p95
+
+    def _hedge_delay_for(self, state: ProviderState) -> float:
+        """Hedge once the request outlives the provider's p95, within the configured budget"""
+        p95 = self._recent_p95(state)
+        if p95 is None:
+            return self.hedge_delay
+        return max(0.05, min(self.hedge_delay, p95))
+
+    async def _race(
+        self,
+        attempt: Callable[[ProviderState], Awaitable[Any]],
+        discard: Optional[Callable[[Any], Awaitable[Any]]] = None
+    ) -> Tuple[ProviderState, Any]:
+        """
+        Run `attempt` against providers in routing order
+
+        Without hedging, the next provider starts only after the previous one
+        failed. With hedging, a second provider starts when the first has not
+        answered within its hedge delay, and whichever succeeds first wins.
+        """
+        candidates = iter(self.ordered_states())
+        running: Dict[asyncio.Task, ProviderState] = {}
+        errors: List[BaseException] = []
+        can_hedge = self.hedge_enabled
+
+        def launch_next() -> bool:
+            for state in candidates:
+                if state.breaker.allow_request():
+                    task = asyncio.create_task(self._attempt(state, attempt))
+                    running[task] = state
+                    return True
+            return False
+
+        try:
+            launch_next()
+            while running:
+                hedge_delay = None
+                if can_hedge and len(running) == 1:
+                    hedge_delay = self._hedge_delay_for(next(iter(running.values())))
+
+                done, _ = await asyncio.wait(
+                    running, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    slow_state = next(iter(running.values()))
+                    if launch_next():
+                        slow_state.hedges += 1
+                        logger.info(f"Hedging LLM request: {slow_state.provider.name} "
+                                    f"exceeded {hedge_delay:.2f}s")
+                    else:
+                        can_hedge = False
+                    continue
+
+                winner = None
+                for task in done:
+                    state = running.pop(task)
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                    elif winner is None:
+                        winner = (state, task.result())
+                    elif discard:
+                        await discard(task.result())
+
+                if winner:
+                    return winner
+                if not running:
+                    launch_next()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                results = await asyncio.gather(*running, return_exceptions=True)
+                if discard:
+                    for result in results:
+                        if not isinstance(result, BaseException):
+                            await discard(result)
+
+        raise self._exhausted(errors)
+
+    async def _attempt(
+        self,
+        state: ProviderState,
+        attempt: Callable[[ProviderState], Awaitable[Any]]
+    ) -> Any:
+        """Run one attempt, feeding the outcome into the breaker and latency window"""
+        state.requests += 1
+        started = time.monotonic()
+        try:
+            result = await attempt(state)
+        except asyncio.CancelledError:
+            state.breaker.release()
+            raise
+        except RateLimitError as e:
+            logger.warning(f"LLM provider {state.provider.name} rate limited ({e.limit_type})")
+            state.failures += 1
+            state.last_rate_limit = e
+            state.breaker.record_failure(open_for=e.retry_after or state.breaker.reset_timeout)
+            raise
+        except Exception as e:
+            logger.warning(f"LLM provider {state.provider.name} failed: {e.__class__.__name__}: {e}")
+            state.failures += 1
+            state.breaker.record_failure()
+            raise
+
+        state.latency.record(time.monotonic() - started)
+        state.breaker.record_success()
+        return result
+
+    def _exhausted(self, errors: List[BaseException]) -> Exception:
+        """Pick the error to surface once every provider has been tried"""
+        rate_limits = [e for e in errors if isinstance(e, RateLimitError)]
+        if rate_limits:
+            return rate_limits[-1]
+
+        if not errors:
+            # Every circuit is open; surface a pending rate limit if that is why
+            limited = [s.last_rate_limit for s in self.states if s.last_rate_limit]
+            if limited:
+                return limited[-1]
+
+        return ExternalAPIError(
+            "LLM",
+            message="No provider produced a response",
+            details={"errors": [str(e) for e in errors]}
+        )
+
+    @staticmethod
+    def _headers(provider: LLMProvider) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {provider.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    @staticmethod
+    def _timeout(provider: LLMProvider, timeout: Optional[float]) -> float:
+        return min(provider.timeout, timeout) if timeout is not None else provider.timeout
+
+    async def _raise_for_status(self, provider: LLMProvider, response: aiohttp.ClientResponse) -> None:
+        """Translate a non-200 response into RateLimitError or ProviderError"""
+        if response.status == 429:
+            try:
+                error_data = await response.json(content_type=None)
+                error_message = error_data.get("error", {}).get("message", "")
+            except (ValueError, aiohttp.ContentTypeError):
+                error_message = await response.text()
+            raise RateLimitError(
+                error_message,
+                parse_rate_limit_type(error_message),
+                parse_retry_after(error_message)
+            )
+
+        error_text = await response.text()
+        logger.error(f"{provider.name} API error {response.status}: {error_text[:500]}")
+        raise ProviderError(provider.name, f"HTTP {response.status}", status=response.status)
+
+    async def _complete_once(
+        self,
+        provider: LLMProvider,
+        payload: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> str:
+        client_timeout = aiohttp.ClientTimeout(total=self._timeout(provider, timeout))
+        async with aiohttp.ClientSession(timeout=client_timeout) as session:
+            async with session.post(
+                provider.api_url,
+                headers=self._headers(provider),
+                json={**payload, "model": provider.model}
+            ) as response:
+                if response.status != 200:
+                    await self._raise_for_status(provider, response)
+                data = await response.json()
+                return data["choices"][0]["message"]["content"]
+
+    async def _open_stream(
+        self,
+        provider: LLMProvider,
+        payload: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Tuple[str, AsyncIterator[str]]:
+        """Start a streaming request and wait for its first token"""
+        tokens = self._stream_tokens(provider, payload, timeout)
+        try:
+            first_token = await tokens.__anext__()
+        except StopAsyncIteration:
+            first_token = ""
+        except BaseException:
+            await tokens.aclose()
+            raise
+        return first_token, tokens
+
+    async def _stream_tokens(
+        self,
+        provider: LLMProvider,
+        payload: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from an OpenAI-style server-sent event stream"""
+        client_timeout = aiohttp.ClientTimeout(
+            total=timeout,
+            sock_connect=provider.timeout,
+            sock_read=provider.timeout
+        )
+        async with aiohttp.ClientSession(timeout=client_timeout) as session:
+            async with session.post(
+                provider.api_url,
+                headers=self._headers(provider),
+                json={**payload, "model": provider.model, "stream": True}
+            ) as response:
+                if response.status != 200:
+                    await self._raise_for_status(provider, response)
+
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    choices = json.loads(data).get("choices") or []
+                    if not choices:
+                        continue
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+
+def build_providers_from_settings() -> List[LLMProvider]:
+    """
+    Build the provider failover list from settings
+
+    Raises:
+        ConfigurationError: If LLM_PROVIDERS is not valid JSON
+    """
+    if settings.LLM_PROVIDERS:
+        try:
+            entries = json.loads(settings.LLM_PROVIDERS)
+            return [
+                LLMProvider(
+                    name=entry["name"],
+                    api_url=entry["api_url"],
+                    model=entry["model"],
+                    api_key=entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), ""),
+                    timeout=float(entry.get("timeout", settings.LLM_REQUEST_TIMEOUT))
+                )
+                for entry in entries
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ConfigurationError(
+                "Invalid LLM_PROVIDERS configuration",
+                details={"error": str(e)}
+            )
+
+    providers = []
+    if settings.GROQ_API_KEY:
+        providers.append(LLMProvider(
+            name="groq",
+            api_url=GROQ_CHAT_URL,
+            model=settings.GROQ_CHAT_MODEL,
+            api_key=settings.GROQ_API_KEY,
+            timeout=settings.LLM_REQUEST_TIMEOUT
+        ))
+    if settings.OPENAI_API_KEY:
+        providers.append(LLMProvider(
+            name="openai",
+            api_url=OPENAI_CHAT_URL,
+            model=settings.OPENAI_CHAT_MODEL,
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.LLM_REQUEST_TIMEOUT
+        ))
+    return providers
+
+
+def build_router_from_settings() -> LLMRouter:
+    """Create an LLMRouter configured from application settings"""
+    return LLMRouter(
+        build_providers_from_settings(),
+        hedge_enabled=settings.LLM_HEDGE_ENABLED,
+        hedge_delay=settings.LLM_HEDGE_DELAY_MS / 1000,
+        slow_p95=settings.LLM_SLOW_P95_MS / 1000,
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS
+    )
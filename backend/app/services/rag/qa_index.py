@@ -0,0 +1,204 @@
+"""
+Question-only embedding index over the curated knowledge-base Q&A pairs
+Used to answer near-exact matches directly, without an LLM call
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+from app.services.embedding_service import EmbeddingService, embedding_service
+
+logger = get_logger(__name__)
+
+KNOWLEDGE_BASE_DIR = "rag-knowledge-base"
+
+
+@dataclass(frozen=True)
+class QAPair:
+    """A curated question with its answer"""
+    content_id: str
+    file_path: str
+    title: str
+    question: str
+    answer: str
+
+
+@dataclass(frozen=True)
+class QAMatch:
+    """Best matching Q&A pair for a query"""
+    pair: QAPair
+    score: float
+
+
+def parse_qa_pairs(content: str, file_path: str, service: EmbeddingService = embedding_service) -> List[QAPair]:
+    """
+    Extract Q&A pairs from a knowledge-base markdown file
+
+    Reuses the Q&A chunking so pairs line up with the stored embeddings.
+    """
+    stem = Path(file_path).stem
+    chunks = service.chunk_content(content, file_path, {"id": f"{KNOWLEDGE_BASE_DIR}_{stem}"})
+
+    pairs = []
+    for chunk in chunks:
+        header = chunk.metadata.get("question")
+        if not header:
+            continue
+
+        title = re.sub(r'^###\s+Q\d+:\s*', '', header).strip()
+        body = chunk.content[len(header):].strip()
+
+        # The curated question is the bold line right under the header
+        question = title
+        match = re.match(r'\*\*(.+?)\*\*\s*\n', body + "\n")
+        if match:
+            question = match.group(1).strip()
+            body = body[match.end():].strip()
+
+        pairs.append(QAPair(
+            content_id=chunk.content_id,
+            file_path=file_path,
+            title=title,
+            question=question,
+            answer=_clean_answer(body)
+        ))
+
+    return pairs
+
+
+def _clean_answer(body: str) -> str:
+    """Drop trailing section headings and rules that belong to the next part of the file"""
+    lines = body.rstrip().split("\n")
+    while lines and (re.match(r'^#{1,2}\s', lines[-1]) or lines[-1].strip() in ("", "---")):
+        lines.pop()
+    return "\n".join(lines).strip()
+
+
+class QAIndex:
+    """In-memory index of question embeddings (cosine similarity)"""
+
+    def __init__(self, content_path: Path, service: EmbeddingService = embedding_service):
+        self.content_path = content_path
+        self.service = service
+        self._pairs: List[QAPair] = []
+        self._owners: List[int] = []
+        self._matrix: Optional[np.ndarray] = None
+        # Bumped by invalidate(); the index is current only if built after the latest bump
+        self._invalidations = 0
+        self._built_for = -1
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def size(self) -> int:
+        return len(self._pairs)
+
+    @property
+    def built(self) -> bool:
+        return self._built_for == self._invalidations
+
+    def invalidate(self, paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop the index so it is rebuilt on next use
+
+        Args:
+            paths: Changed files relative to the content root; the index is kept
+                unless one is a knowledge-base file. None means anything may have changed
+        """
+        if paths is None or any(path.startswith(f"{KNOWLEDGE_BASE_DIR}/") for path in paths):
+            self._invalidations += 1
+
+    async def build(self) -> int:
+        """
+        (Re)build the index from the knowledge-base files
+
+        Both the question heading and the bold question line are embedded,
+        each pointing at the same pair.
+
+        Returns:
+            Number of indexed Q&A pairs
+        """
+        # Taken before reading, so an invalidate() during the build is not lost
+        invalidations = self._invalidations
+        pairs = await io_pool.run(self._read_pairs)
+
+        texts, owners = [], []
+        for index, pair in enumerate(pairs):
+            for text in dict.fromkeys((pair.title, pair.question)):
+                texts.append(text)
+                owners.append(index)
+
+        embeddings = await self.service.generate_embeddings_batch(texts) if texts else []
+        rows = [(owner, emb) for owner, emb in zip(owners, embeddings) if emb]
+
+        if rows:
+            matrix = np.asarray([emb for _, emb in rows], dtype=np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        else:
+            matrix = None
+
+        self._pairs = pairs
+        self._owners = [owner for owner, _ in rows]
+        self._matrix = matrix
+        self._built_for = invalidations
+
+        logger.info(f"Q&A index built: {len(pairs)} pairs, {len(rows)} question vectors")
+        return len(pairs)
+
+    async def ensure_built(self) -> None:
+        """Build the index once, concurrent callers wait for the same build"""
+        if self.built:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.built:
+                await self.build()
+
+    async def best_match(self, query_embedding: List[float]) -> Optional[QAMatch]:
+        """
+        Find the curated question closest to the query
+
+        Args:
+            query_embedding: Embedding of the visitor's question
+
+        Returns:
+            Best match with its cosine similarity, or None if the index is empty
+        """
+        await self.ensure_built()
+        if self._matrix is None:
+            return None
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape[0] != self._matrix.shape[1]:
+            logger.warning("Query embedding dimension does not match the Q&A index")
+            return None
+        query /= np.linalg.norm(query) + 1e-12
+
+        scores = self._matrix @ query
+        best = int(np.argmax(scores))
+        return QAMatch(pair=self._pairs[self._owners[best]], score=float(scores[best]))
+
+    def _read_pairs(self) -> List[QAPair]:
+        """Parse the Q&A pairs of every knowledge-base file; blocking, runs in the I/O pool"""
+        kb_path = self.content_path / KNOWLEDGE_BASE_DIR
+        pairs: List[QAPair] = []
+        if kb_path.exists():
+            for file_path in sorted(kb_path.glob("*.md")):
+                relative_path = str(file_path.relative_to(self.content_path))
+                try:
+                    pairs.extend(parse_qa_pairs(file_path.read_text(encoding='utf-8'), relative_path, self.service))
+                except OSError as e:
+                    logger.warning(f"Could not read knowledge-base file {file_path}: {e}")
+        return pairs
+
+
+# Global instance
+qa_index = QAIndex(Path(settings.CONTENT_PATH))
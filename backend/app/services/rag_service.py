@@ -3,25 +3,67 @@ RAG (Retrieval Augmented Generation) service for context-aware chat responses
 Refactored to use modular service components
 """
 
-from typing import Dict, Any
+import asyncio
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError, ExternalAPIError
 from app.core.logging import get_logger
 from app.repositories.vector_repository import vector_repository
-from app.services.rag.context_builder import ContextBuilder
+from app.services.cache_bus import INGESTION_COMPLETED, cache_bus
+from app.services.content.content_search import content_search
+from app.services.content.content_watcher import ContentChanges
+from app.services.embedding_service import embedding_service
+from app.services.rag.context_builder import ContextBuilder, retrieval_cache
 from app.services.rag.chat_service import chat_service
+from app.services.rag.llm_router import RateLimitError
 from app.services.rag.content_processor import ContentProcessor
+from app.services.rag.extractive_answer import extractive_answer_generator
+from app.services.rag.fallback_responses import generate_basic_response
+from app.services.rag.qa_index import QAMatch, qa_index
 
 logger = get_logger(__name__)
 
+DAILY_RATE_LIMITS = ("TPD", "RPD")
+RATE_LIMITED_NOTE = (
+    "I've reached my daily limit for AI-written answers, so this is quoted "
+    "directly from Robert's portfolio."
+)
+UNAVAILABLE_NOTE = (
+    "The AI service is unavailable right now, so this is quoted directly "
+    "from Robert's portfolio."
+)
+
+
+@dataclass
+class Retrieval:
+    """Outcome of the retrieval stages of a chat request"""
+    context_results: List[Dict[str, Any]] = field(default_factory=list)
+    fast_path: Optional[QAMatch] = None
+    degraded: Optional[str] = None
+
 
 class RAGService:
     """Main RAG service orchestrating context retrieval and response generation"""
 
+    # Fractions of the remaining request budget given to the early stages;
+    # generation gets whatever is left
+    EMBEDDING_SHARE = 0.2
+    QA_MATCH_SHARE = 0.1
+
     def __init__(self):
         self.vector_repo = vector_repository
-        self.context_builder = ContextBuilder(self.vector_repo)
+        self.context_builder = ContextBuilder(self.vector_repo, cache=retrieval_cache)
         self.chat_service = chat_service
         self.content_processor = ContentProcessor(self.vector_repo)
+        self.qa_index = qa_index
+        self.extractive_answer = extractive_answer_generator
+        self._reindex_task: Optional[asyncio.Task] = None
+        self._pending_changes = ContentChanges()
 
     async def initialize(self) -> None:
         """Initialize the RAG service and its dependencies"""
@@ -41,50 +83,361 @@ class RAGService:
         Returns:
             Processing statistics
         """
-        return await self.content_processor.process_content_directory(force_refresh)
+        stats = await self.content_processor.process_content_directory(force_refresh)
+        await retrieval_cache.clear()
+        self.invalidate_retrieval_caches()
+        await cache_bus.publish(INGESTION_COMPLETED)
+        return stats
+
+    async def process_changed_files(self, changes: ContentChanges) -> Dict[str, Any]:
+        """
+        Re-embed only the markdown files in a batch of content changes
+
+        Args:
+            changes: Changed and deleted files, relative to CONTENT_PATH
+
+        Returns:
+            Processing statistics
+        """
+        content_path = Path(settings.CONTENT_PATH)
+        changed, deleted = changes.markdown()
+        stats = await self.content_processor.process_files(
+            [content_path / path for path in changed],
+            [content_path / path for path in deleted]
+        )
+        await retrieval_cache.clear()
+        self.invalidate_retrieval_caches([*changed, *deleted])
+        await cache_bus.publish(INGESTION_COMPLETED, [*changed, *deleted])
+        return stats
+
+    def invalidate_retrieval_caches(self, paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop what depends on the embeddings of re-embedded files
+
+        The Q&A index is rebuilt only when knowledge-base files changed. Cached
+        search and retrieval results are dropped whole: a changed chunk may now
+        rank for any query, not just those whose results already contained it.
+
+        Args:
+            paths: Re-embedded or deleted files relative to CONTENT_PATH; None means all
+        """
+        if paths is not None:
+            paths = list(paths)
+            if not paths:
+                return
+        self.qa_index.invalidate(paths)
+        content_search.invalidate()
+        retrieval_cache.invalidate_local()
+
+    def schedule_reindex(self, changes: ContentChanges) -> None:
+        """
+        Re-embed changed markdown files in the background
+
+        Batches arriving while a re-index runs are merged and processed
+        next, so the watcher is never blocked on embedding.
+        """
+        if not settings.CONTENT_WATCH_REEMBED or os.getenv("RAG_ENABLED", "false").lower() != "true":
+            return
+        changed, deleted = changes.markdown()
+        if not changed and not deleted:
+            return
+
+        self._pending_changes.merge(changes)
+        if self._reindex_task is None or self._reindex_task.done():
+            self._reindex_task = asyncio.create_task(self._reindex_pending())
+
+    async def _reindex_pending(self) -> None:
+        while self._pending_changes:
+            changes, self._pending_changes = self._pending_changes, ContentChanges()
+            try:
+                await self.initialize()
+                await self.process_changed_files(changes)
+            except Exception as e:
+                logger.error(f"Incremental re-embedding failed: {e}")
 
     async def chat(
         self,
         query: str,
         max_context_results: int = 5,
-        context_threshold: float = 0.3
+        context_threshold: float = 0.3,
+        history: Optional[List[Dict[str, str]]] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         Main chat method with RAG
 
+        Every stage runs within its share of the request deadline. When the
+        budget runs short the pipeline degrades in steps: retrieval is
+        skipped, then the answer is extracted from the retrieved chunks, then
+        taken from keyword responses. Daily rate limits and provider outages
+        fall back the same way. The result's "degraded" field names the step.
+
         Args:
             query: User query
             max_context_results: Maximum number of context results to retrieve
             context_threshold: Minimum similarity threshold for context
+            history: Earlier conversation turns as chat messages
+            deadline: Request deadline, defaults to CHAT_SLO_SECONDS from now
 
         Returns:
             Response with sources and metadata
+
+        Raises:
+            RateLimitError: On a short-window limit, or a daily one with no context to answer from
         """
-        # Retrieve relevant context
-        context_results = await self.context_builder.retrieve_context(
-            query,
-            max_results=max_context_results,
-            threshold=context_threshold
-        )
+        deadline = deadline or self._default_deadline()
+        retrieval = await self._retrieve(query, max_context_results, context_threshold, deadline)
+        if retrieval.fast_path:
+            return self._fast_path_result(retrieval.fast_path)
 
-        # Format context for LLM
+        context_results = retrieval.context_results
         context = self.context_builder.format_context(context_results)
+        degraded = retrieval.degraded
+
+        # Generate response, or degrade if there is no time left for the LLM
+        response = None
+        note = None
+        if deadline.remaining() >= settings.CHAT_MIN_LLM_SECONDS:
+            try:
+                response = await self.chat_service.generate_response(
+                    query, context, history=history, deadline=deadline
+                )
+            except DeadlineExceededError as e:
+                logger.warning(f"LLM response not ready in time: {e.message}")
+            except RateLimitError as e:
+                note = self._rate_limit_note(e, context_results)
+            except ExternalAPIError as e:
+                logger.warning(f"LLM unavailable, answering without it: {e.message}")
+                note = UNAVAILABLE_NOTE
+        else:
+            logger.warning(f"Skipping LLM: {deadline.remaining():.2f}s left of the request budget")
 
-        # Generate response
-        response = await self.chat_service.generate_response(query, context)
+        if response is None:
+            response, degraded = self._fallback_answer(query, context_results, note)
 
         return {
             "response": response,
+            "sources": self._format_sources(context_results),
+            "context_used": len(context_results) > 0,
+            "fast_path": False,
+            "degraded": degraded
+        }
+
+    async def chat_stream(
+        self,
+        query: str,
+        max_context_results: int = 5,
+        context_threshold: float = 0.3,
+        history: Optional[List[Dict[str, str]]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Chat with RAG, streaming the response as it is generated
+
+        Runs the same stages and degradation steps as chat(). Fallback and
+        fast-path answers arrive as a single token.
+
+        Events:
+            {"type": "sources", "sources", "fast_path"}
+                once retrieval is done, before any token
+            {"type": "token", "text"}
+                for each piece of the response
+            {"type": "done", "response", "sources", "context_used", "fast_path", "degraded"}
+                once at the end, with the full response as chat() would return it
+
+        Args:
+            query: User query
+            max_context_results: Maximum number of context results to retrieve
+            context_threshold: Minimum similarity threshold for context
+            history: Earlier conversation turns as chat messages
+            deadline: Request deadline, defaults to CHAT_SLO_SECONDS from now
+
+        Raises:
+            RateLimitError: On a short-window limit, or a daily one with no context to answer from
+        """
+        deadline = deadline or self._default_deadline()
+        retrieval = await self._retrieve(query, max_context_results, context_threshold, deadline)
+        if retrieval.fast_path:
+            result = self._fast_path_result(retrieval.fast_path)
+            yield {"type": "sources", "sources": result["sources"], "fast_path": True}
+            yield {"type": "token", "text": result["response"]}
+            yield {"type": "done", **result}
+            return
+
+        context_results = retrieval.context_results
+        sources = self._format_sources(context_results)
+        degraded = retrieval.degraded
+        yield {"type": "sources", "sources": sources, "fast_path": False}
+
+        parts: List[str] = []
+        interrupted = False
+        note = None
+        if deadline.remaining() >= settings.CHAT_MIN_LLM_SECONDS:
+            context = self.context_builder.format_context(context_results)
+            try:
+                async for token in self.chat_service.stream_response(
+                    query, context, history=history, deadline=deadline
+                ):
+                    parts.append(token)
+                    yield {"type": "token", "text": token}
+            except DeadlineExceededError as e:
+                logger.warning(f"LLM response not ready in time: {e.message}")
+                interrupted = bool(parts)
+            except RateLimitError as e:
+                if parts:
+                    raise
+                note = self._rate_limit_note(e, context_results)
+            except ExternalAPIError as e:
+                logger.warning(f"LLM unavailable, answering without it: {e.message}")
+                note = UNAVAILABLE_NOTE
+                interrupted = bool(parts)
+            except Exception as e:
+                # A provider dropping mid-response: keep what was streamed
+                if not parts:
+                    raise
+                logger.warning(f"LLM stream interrupted: {e.__class__.__name__}: {e}")
+                interrupted = True
+        else:
+            logger.warning(f"Skipping LLM: {deadline.remaining():.2f}s left of the request budget")
+
+        if parts:
+            response = "".join(parts)
+            if interrupted:
+                degraded = "partial_response"
+        else:
+            response, degraded = self._fallback_answer(query, context_results, note)
+            yield {"type": "token", "text": response}
+
+        yield {
+            "type": "done",
+            "response": response,
+            "sources": sources,
+            "context_used": len(context_results) > 0,
+            "fast_path": False,
+            "degraded": degraded
+        }
+
+    def _default_deadline(self) -> Deadline:
+        return Deadline(
+            settings.CHAT_SLO_SECONDS,
+            reserve=settings.CHAT_DEADLINE_RESERVE_MS / 1000
+        )
+
+    async def _retrieve(
+        self,
+        query: str,
+        max_context_results: int,
+        context_threshold: float,
+        deadline: Deadline
+    ) -> Retrieval:
+        """Embed the query, try the curated Q&A fast path, then retrieve context"""
+        degraded = None
+
+        query_embedding = None
+        try:
+            query_embedding = await deadline.run(
+                embedding_service.generate_embedding(query),
+                "embedding",
+                fraction=self.EMBEDDING_SHARE
+            )
+        except DeadlineExceededError as e:
+            logger.warning(f"Skipping retrieval: {e.message}")
+            degraded = "retrieval_skipped"
+
+        # Answer directly when the query is a near-exact curated question
+        fast_path = await self._match_curated_question(query_embedding, deadline)
+        if fast_path:
+            return Retrieval(fast_path=fast_path)
+
+        # Retrieve relevant context
+        context_results = []
+        if query_embedding:
+            try:
+                context_results = await self.context_builder.retrieve_context(
+                    query,
+                    max_results=max_context_results,
+                    threshold=context_threshold,
+                    query_embedding=query_embedding,
+                    deadline=deadline
+                )
+            except DeadlineExceededError as e:
+                logger.warning(f"Skipping retrieval: {e.message}")
+                degraded = "retrieval_skipped"
+
+        return Retrieval(context_results=context_results, degraded=degraded)
+
+    def _rate_limit_note(self, error: RateLimitError, context_results: List[Dict[str, Any]]) -> str:
+        """Note for an extractive answer, or re-raise limits not worth degrading for"""
+        # Short-window limits clear quickly; daily ones are worth an extractive answer
+        if error.limit_type not in DAILY_RATE_LIMITS or not context_results:
+            raise error
+        logger.warning(f"LLM {error.limit_type} limit reached, answering from retrieved context")
+        return RATE_LIMITED_NOTE
+
+    def _fallback_answer(
+        self,
+        query: str,
+        context_results: List[Dict[str, Any]],
+        note: Optional[str]
+    ) -> Tuple[str, str]:
+        """Answer without the LLM: extracted from context, else from keyword responses"""
+        response = self.extractive_answer.generate(query, context_results, note=note)
+        if response:
+            return response, "context_answer"
+        return generate_basic_response(query), "basic_response"
+
+    def _format_sources(self, context_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "content": result.get('content', ''),
+                "file_path": result['file_path'],
+                "similarity": result['similarity'],
+                "metadata": result.get('metadata', {})
+            }
+            for result in context_results
+        ]
+
+    async def _match_curated_question(
+        self,
+        query_embedding: Optional[List[float]],
+        deadline: Deadline
+    ) -> Optional[QAMatch]:
+        """Return the curated Q&A match if it clears the fast-path threshold"""
+        if not settings.QA_FAST_PATH_ENABLED or not query_embedding:
+            return None
+
+        try:
+            # Shielded so a first-use index build finishes for later requests
+            match = await deadline.run(
+                asyncio.shield(self.qa_index.best_match(query_embedding)),
+                "qa_match",
+                fraction=self.QA_MATCH_SHARE
+            )
+        except Exception as e:
+            logger.warning(f"Q&A fast-path lookup failed: {e}")
+            return None
+
+        if match and match.score >= settings.QA_FAST_PATH_THRESHOLD:
+            logger.info(f"Q&A fast path hit: {match.pair.content_id} (score {match.score:.3f})")
+            return match
+        return None
+
+    def _fast_path_result(self, match: QAMatch) -> Dict[str, Any]:
+        """Build a chat result from a curated answer"""
+        pair = match.pair
+        return {
+            "response": pair.answer,
             "sources": [
                 {
-                    "content": result.get('content', ''),
-                    "file_path": result['file_path'],
-                    "similarity": result['similarity'],
-                    "metadata": result.get('metadata', {})
+                    "content": f"{pair.question}\n\n{pair.answer}",
+                    "file_path": pair.file_path,
+                    "similarity": match.score,
+                    "metadata": {"type": "knowledge", "question": pair.title}
                 }
-                for result in context_results
             ],
-            "context_used": len(context_results) > 0
+            "context_used": True,
+            "fast_path": True,
+            "degraded": None
         }
 
 
@@ -5,12 +5,15 @@ Aggregates content from knowledge base and configuration files to create profess
 
 import os
 import json
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import re
 
 from app.core.logging import get_logger
+from app.services.content.content_watcher import ContentChanges
+from app.services.content.document_store import DocumentStore, document_store
 
 logger = get_logger(__name__)
 
@@ -18,9 +21,30 @@ logger = get_logger(__name__)
 class ResumeDataAggregator:
     """Aggregates resume content from knowledge base and config files"""
 
-    def __init__(self, content_dir: str = "/app/page_content"):
+    def __init__(self, content_dir: str = "/app/page_content", documents: Optional[DocumentStore] = None):
         self.content_dir = Path(content_dir)
+        self.documents = documents if documents is not None else document_store
         self.personal_info = self._load_personal_info()
+        # Summary, skills and projects, aggregated once per content version
+        self._sections: Optional[Dict[str, Any]] = None
+        # Markdown files the sections were aggregated from
+        self._inputs: List[Path] = []
+        self._lock = threading.Lock()
+        self.documents.subscribe(self._on_document_changed)
+
+    def reload(self, changes: Optional[ContentChanges] = None) -> None:
+        """Reload cached data after content changed"""
+        self.personal_info = self._load_personal_info()
+        self._sections = None
+        logger.info("Resume data reloaded")
+
+    def warm(self) -> None:
+        """Aggregate the resume sections ahead of the first request"""
+        self._get_sections()
+
+    def _on_document_changed(self, relative_path: str) -> None:
+        """Drop the aggregated sections when one of their documents changes"""
+        self._sections = None
 
     def _load_personal_info(self) -> Dict[str, Any]:
         """Load personal and contact information"""
@@ -33,43 +57,15 @@ class ResumeDataAggregator:
             return {}
 
     def _load_markdown_file(self, file_path: Path) -> Dict[str, Any]:
-        """Load markdown file with frontmatter"""
+        """Load markdown file with frontmatter, from the shared document store"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Parse frontmatter
-            frontmatter = {}
-            body = content
-
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    frontmatter_text = parts[1].strip()
-                    body = parts[2].strip()
-
-                    # Simple YAML-like parsing
-                    for line in frontmatter_text.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-
-                            # Handle boolean and numeric values
-                            if value.lower() == 'true':
-                                value = True
-                            elif value.lower() == 'false':
-                                value = False
-                            elif value.isdigit():
-                                value = int(value)
-
-                            frontmatter[key] = value
-
+            document = self.documents.get(file_path)
+            self._inputs.append(file_path)
             return {
-                "metadata": frontmatter,
-                "content": body
+                "metadata": dict(document.metadata),
+                "content": document.body
             }
-        except Exception as e:
+        except ValueError as e:
             logger.error(f"Failed to load markdown file {file_path}: {e}")
             return {"metadata": {}, "content": ""}
 
@@ -187,6 +183,26 @@ class ResumeDataAggregator:
 
         return achievements
 
+    def _get_sections(self) -> Dict[str, Any]:
+        """Summary, skills and projects, aggregated again only after a document changed"""
+        with self._lock:
+            if self._sections is not None:
+                # Cheap while trusted; an edit found here notifies _on_document_changed
+                for file_path in self._inputs:
+                    try:
+                        self.documents.get(file_path)
+                    except ValueError:
+                        self._sections = None
+                        break
+            if self._sections is None:
+                self._inputs = []
+                self._sections = {
+                    "summary": self.get_professional_summary(),
+                    "skills": self.get_skills(),
+                    "projects": self.get_projects()
+                }
+            return self._sections
+
     def get_complete_resume_data(self) -> Dict[str, Any]:
         """Aggregate all resume data into a structured format"""
         return {
@@ -199,9 +215,7 @@ class ResumeDataAggregator:
                 "linkedin": self.personal_info.get("social", {}).get("linkedin", {}).get("url", ""),
                 "github": self.personal_info.get("social", {}).get("github", {}).get("url", ""),
             },
-            "summary": self.get_professional_summary(),
-            "skills": self.get_skills(),
-            "projects": self.get_projects(),
+            **self._get_sections(),
             "generated_at": datetime.utcnow().isoformat()
         }
 
@@ -0,0 +1,212 @@
+"""
+Cache of transcription results keyed by audio content
+
+Retries, double-clicks and re-submitted recordings upload identical audio;
+a hit returns the stored transcript without calling Whisper. Entries live in
+an LRU in memory, optionally in the cache shared by all workers and on disk
+when evicted, and expire after a TTL.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.tiered_cache import TEXT_CODEC, TieredCache, l2_store
+
+logger = get_logger(__name__)
+
+HASH_CHUNK_BYTES = 64 * 1024
+
+
+def hash_audio_file(audio_file: BinaryIO) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks and rewound afterwards
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    audio_file.seek(0)
+    for chunk in iter(lambda: audio_file.read(HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    audio_file.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, model: str, language: str) -> str:
+    """Key for a transcript: the same audio under another model or language is a different entry"""
+    return hashlib.sha256(f"{content_hash}:{model}:{language}".encode()).hexdigest()
+
+
+class TranscriptionCache:
+    """Bounded LRU of transcripts with TTL and optional disk spill"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 86400,
+        disk_path: Optional[Path] = None,
+        disk_max_entries: int = 5000,
+        shared: Optional[TieredCache] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            max_entries: Transcripts kept in memory
+            ttl_seconds: Lifetime of an entry, in memory or on disk
+            disk_path: Directory evicted entries spill to; no spill if None
+            disk_max_entries: Files kept on disk before the oldest are pruned
+            shared: Cache shared with other workers, looked up before the disk
+            clock: Wall clock, injectable for tests (disk entries outlive the process)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_max_entries = disk_max_entries
+        self.shared = shared
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.shared_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_path:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a transcript, promoting disk entries back into memory
+
+        Returns:
+            Cached transcript, or None on a miss or expired entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            text, expires_at = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            del self._entries[key]
+
+        if self.shared is not None:
+            text = await self.shared.get(key)
+            if text is not None:
+                self._store(key, text, self._clock() + self.ttl_seconds)
+                self.hits += 1
+                self.shared_hits += 1
+                return text
+
+        if self.disk_path:
+            stored = await run_in_threadpool(self._read_disk, key)
+            if stored is not None:
+                text, expires_at = stored
+                self._store(key, text, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                return text
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, text: str) -> None:
+        """Store a transcript, evicting (and spilling) the least recently used ones"""
+        evicted = self._store(key, text, self._clock() + self.ttl_seconds)
+        if self.shared is not None:
+            await self.shared.set(key, text)
+        if evicted and self.disk_path:
+            await run_in_threadpool(self._spill, evicted)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (disk entries expire on their own)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "disk_spill": bool(self.disk_path)
+        }
+
+    def _store(self, key: str, text: str, expires_at: float) -> Dict[str, Tuple[str, float]]:
+        self._entries[key] = (text, expires_at)
+        self._entries.move_to_end(key)
+
+        evicted = {}
+        while len(self._entries) > self.max_entries:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.evictions += 1
+            if old_entry[1] > self._clock():
+                evicted[old_key] = old_entry
+        return evicted
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        path = self._disk_file(key)
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if stored.get("expires_at", 0) <= self._clock():
+            path.unlink(missing_ok=True)
+            return None
+        return stored["text"], stored["expires_at"]
+
+    def _spill(self, entries: Dict[str, Tuple[str, float]]) -> None:
+        for key, (text, expires_at) in entries.items():
+            path = self._disk_file(key)
+            temp_path = path.with_suffix(".tmp")
+            try:
+                temp_path.write_text(json.dumps({"text": text, "expires_at": expires_at}), encoding="utf-8")
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not spill transcription cache entry: {e}")
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        files = list(self.disk_path.glob("*.json"))
+        if len(files) <= self.disk_max_entries:
+            return
+        files.sort(key=lambda path: path.stat().st_mtime)
+        for path in files[:len(files) - self.disk_max_entries]:
+            path.unlink(missing_ok=True)
+
+
+# Global instance
+transcription_cache = TranscriptionCache(
+    max_entries=settings.TRANSCRIPTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TRANSCRIPTION_CACHE_TTL_SECONDS,
+    disk_path=Path(settings.TRANSCRIPTION_CACHE_DIR) if settings.TRANSCRIPTION_CACHE_DIR else None,
+    disk_max_entries=settings.TRANSCRIPTION_CACHE_DISK_MAX_ENTRIES,
+    # L2 only; the LRU above is this cache's L1
+    shared=TieredCache(
+        "transcriptions",
+        TEXT_CODEC,
+        max_entries=0,
+        ttl_seconds=settings.TRANSCRIPTION_CACHE_TTL_SECONDS,
+        l2=l2_store
+    ) if l2_store is not None else None
+)
@@ -2,11 +2,20 @@
 Transcription service using Groq's Whisper API
 """
 
+import asyncio
 import os
 import aiohttp
-from typing import BinaryIO
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Union
 
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.audio_segments import open_splitter, plan_segments, stitch_transcripts
+from app.services.audio_upload import ByteBudget, audio_memory_budget
+from app.services.transcription_cache import (
+    TranscriptionCache, cache_key, hash_audio_file, transcription_cache
+)
 
 logger = get_logger(__name__)
 
@@ -14,36 +23,223 @@ logger = get_logger(__name__)
 class TranscriptionService:
     """Service for transcribing audio using Groq's Whisper API"""
 
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        segment_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        segment_retries: Optional[int] = None,
+        cache: Optional[TranscriptionCache] = None,
+        budget: Optional[ByteBudget] = None
+    ):
+        self.groq_api_key = api_key if api_key is not None else os.getenv("GROQ_API_KEY")
         self.model = "whisper-large-v3-turbo"
-        self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
+        self.api_url = api_url or "https://api.groq.com/openai/v1/audio/transcriptions"
+        self.segment_seconds = segment_seconds or settings.TRANSCRIPTION_SEGMENT_SECONDS
+        self.overlap_seconds = overlap_seconds if overlap_seconds is not None else settings.TRANSCRIPTION_OVERLAP_SECONDS
+        self.max_concurrency = max_concurrency or settings.TRANSCRIPTION_MAX_CONCURRENCY
+        self.segment_retries = segment_retries if segment_retries is not None else settings.TRANSCRIPTION_SEGMENT_RETRIES
+        self.cache = cache
+        # Segments held in memory count against the same budget as uploads
+        self.budget = budget or audio_memory_budget
+        # Transcriptions in progress by cache key, so identical concurrent uploads share one
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def transcribe_audio(
         self,
         audio_file: BinaryIO,
         filename: str,
-        language: str = "en"
+        language: str = "en",
+        content_hash: Optional[str] = None
     ) -> str:
         """
         Transcribe audio file using Groq's Whisper API
 
+        Long WAV/FLAC recordings are split into overlapping segments that are
+        transcribed concurrently and stitched back together. Results are
+        cached by audio content, model and language.
+
         Args:
             audio_file: Audio file binary stream
             filename: Original filename
             language: ISO-639-1 language code (default: "en")
+            content_hash: SHA-256 of the audio if already known, else computed here
 
         Returns:
             Transcribed text
         """
+        result = ""
+        async for event in self.transcribe_audio_stream(audio_file, filename, language, content_hash):
+            if event["type"] == "done":
+                if event["failed_segments"]:
+                    raise Exception(
+                        f"Transcription failed for segments {event['failed_segments']} "
+                        f"of {event['segments']}"
+                    )
+                result = event["text"]
+        return result
+
+    async def transcribe_audio_stream(
+        self,
+        audio_file: BinaryIO,
+        filename: str,
+        language: str = "en",
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Transcribe audio, yielding results as segments finish
+
+        Events:
+            {"type": "segment", "index", "start", "end", "text", "segments"}
+                when a segment is transcribed (in completion order)
+            {"type": "segment_error", "index", "error"}
+                when a segment failed after its retries
+            {"type": "done", "text", "segments", "failed_segments", "cached"}
+                once at the end, with the stitched transcript
+
+        Args:
+            audio_file: Audio file binary stream
+            filename: Original filename
+            language: ISO-639-1 language code (default: "en")
+            content_hash: SHA-256 of the audio if already known, else computed here
+        """
         if not self.groq_api_key:
             logger.error("Groq API key not configured")
             raise ValueError("Transcription service is not configured. Please check the API key settings.")
 
+        if self.cache is None:
+            async for event in self._transcribe_events(audio_file, filename, language):
+                yield event
+            return
+
+        if content_hash is None:
+            content_hash = await run_in_threadpool(hash_audio_file, audio_file)
+        key = cache_key(content_hash, self.model, language)
+
+        cached = await self.cache.get(key)
+        if cached is None and key in self._inflight:
+            # Identical audio is already being transcribed (retry, double-click)
+            cached = await asyncio.shield(self._inflight[key])
+        if cached is not None:
+            logger.info(f"Transcription cache hit: {len(cached)} characters")
+            yield {"type": "segment", "index": 0, "start": 0.0, "end": None, "text": cached, "segments": 1}
+            yield {"type": "done", "text": cached, "segments": 1, "failed_segments": [], "cached": True}
+            return
+
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = inflight
+        try:
+            async for event in self._transcribe_events(audio_file, filename, language):
+                if event["type"] == "done" and not event["failed_segments"]:
+                    await self.cache.set(key, event["text"])
+                    inflight.set_result(event["text"])
+                yield event
+        finally:
+            if self._inflight.get(key) is inflight:
+                del self._inflight[key]
+            if not inflight.done():
+                # Failed or abandoned: waiters transcribe for themselves
+                inflight.set_result(None)
+
+    async def _transcribe_events(
+        self,
+        audio_file: BinaryIO,
+        filename: str,
+        language: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Transcribe without the cache, whole or in parallel segments"""
+        splitter = await run_in_threadpool(open_splitter, audio_file, filename)
+        plans = plan_segments(splitter.duration, self.segment_seconds, self.overlap_seconds) if splitter else []
+
+        if len(plans) <= 1:
+            text = await self._request(audio_file, filename, language)
+            logger.info(f"Successfully transcribed audio: {len(text)} characters")
+            end = round(splitter.duration, 3) if splitter else None
+            yield {"type": "segment", "index": 0, "start": 0.0, "end": end, "text": text, "segments": 1}
+            yield {"type": "done", "text": text, "segments": 1, "failed_segments": [], "cached": False}
+            return
+
+        logger.info(f"Transcribing {filename} ({splitter.duration:.1f}s) in {len(plans)} segments, "
+                    f"up to {self.max_concurrency} at a time")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Segments are cut from the same file object, one reader at a time
+        read_lock = asyncio.Lock()
+
+        async def transcribe_segment(plan):
+            try:
+                async with semaphore:
+                    reserved = await self.budget.acquire(splitter.segment_size(plan))
+                    try:
+                        async with read_lock:
+                            segment = await run_in_threadpool(splitter.read_segment, plan)
+                        return plan, await self._request_with_retry(segment.data, segment.filename, language), None
+                    finally:
+                        self.budget.release(reserved)
+            except Exception as e:
+                return plan, None, e
+
+        tasks = [asyncio.create_task(transcribe_segment(plan)) for plan in plans]
+        texts: Dict[int, str] = {}
+        failed = []
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                plan, text, error = await next_done
+                if error is not None:
+                    logger.error(f"Segment {plan.index} failed: {error}")
+                    failed.append(plan.index)
+                    yield {"type": "segment_error", "index": plan.index, "error": str(error)}
+                    continue
+
+                texts[plan.index] = text
+                yield {
+                    "type": "segment",
+                    "index": plan.index,
+                    "start": round(plan.start, 3),
+                    "end": round(plan.end, 3),
+                    "text": text,
+                    "segments": len(plans)
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        stitched = stitch_transcripts([texts[index] for index in sorted(texts)])
+        logger.info(f"Successfully transcribed audio: {len(stitched)} characters from {len(texts)} segments")
+        yield {
+            "type": "done",
+            "text": stitched,
+            "segments": len(plans),
+            "failed_segments": sorted(failed),
+            "cached": False
+        }
+
+    async def _request_with_retry(self, audio: bytes, filename: str, language: str) -> str:
+        """Transcribe one segment, retrying so one failure does not lose the recording"""
+        for attempt in range(self.segment_retries + 1):
+            try:
+                return await self._request(audio, filename, language)
+            except Exception as e:
+                if attempt == self.segment_retries:
+                    raise
+                logger.warning(f"Retrying {filename} after error: {e}")
+                await asyncio.sleep(0.5 * (attempt + 1))
+
+    async def _request(
+        self,
+        audio: Union[bytes, BinaryIO],
+        filename: str,
+        language: str
+    ) -> str:
+        """Send one transcription request; file objects are streamed, not copied"""
         try:
             # Prepare multipart form data
             form_data = aiohttp.FormData()
-            form_data.add_field('file', audio_file, filename=filename)
+            form_data.add_field('file', audio, filename=filename)
             form_data.add_field('model', self.model)
             form_data.add_field('language', language)
             form_data.add_field('response_format', 'json')
@@ -52,7 +248,8 @@ class TranscriptionService:
                 "Authorization": f"Bearer {self.groq_api_key}"
             }
 
-            async with aiohttp.ClientSession() as session:
+            timeout = aiohttp.ClientTimeout(total=settings.TRANSCRIPTION_REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
                 async with session.post(
                     self.api_url,
                     headers=headers,
@@ -60,9 +257,7 @@ class TranscriptionService:
                 ) as response:
                     if response.status == 200:
                         data = await response.json()
-                        transcribed_text = data.get("text", "")
-                        logger.info(f"Successfully transcribed audio: {len(transcribed_text)} characters")
-                        return transcribed_text
+                        return data.get("text", "")
                     else:
                         error_text = await response.text()
                         logger.error(f"Groq transcription API error {response.status}: {error_text}")
@@ -77,4 +272,6 @@ class TranscriptionService:
 
 
 # Global instance
-transcription_service = TranscriptionService()
+transcription_service = TranscriptionService(
+    cache=transcription_cache if settings.TRANSCRIPTION_CACHE_ENABLED else None
+)
@@ -0,0 +1,172 @@
+"""
+Startup warm-up
+
+Right after a deploy every cache is cold: the first visitors would pay for
+reading and parsing each content file, building the indexes, aggregating
+resume data and rendering the PDF. Warm-up runs those stages concurrently
+in the background, within a time budget, while /health reports the
+service as not ready yet.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.io_pool import io_pool
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class StageResult:
+    """Outcome of one warm-up stage"""
+    status: str = "pending"  # pending, running, done, failed, timed_out
+    duration_ms: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of a warm-up run"""
+    state: str = "idle"  # idle, warming, ready
+    duration_ms: Optional[float] = None
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+
+
+class StartupWarmup:
+    """Runs cache warm-up stages concurrently within a time budget"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            clock: High-resolution clock, injectable for tests
+        """
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+        self.report = WarmupReport()
+
+    @property
+    def ready(self) -> bool:
+        """False only while warm-up is running"""
+        return self.report.state != "warming"
+
+    def start(self, stages: Dict[str, Callable[[], Any]], budget_seconds: Optional[float] = None) -> None:
+        """
+        Start warming up in the background
+
+        Args:
+            stages: Stage name -> callable; blocking callables run in the I/O
+                thread pool, coroutine functions on the loop
+            budget_seconds: Time after which warm-up stops waiting and the
+                service reports ready, defaults to STARTUP_WARMUP_BUDGET_SECONDS
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self.report = WarmupReport(
+            state="warming",
+            stages={name: StageResult() for name in stages}
+        )
+        self._task = asyncio.create_task(self.run(stages, budget_seconds))
+
+    async def wait(self) -> WarmupReport:
+        """Wait for a started warm-up to finish"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+        return self.report
+
+    async def stop(self) -> None:
+        """Stop waiting for warm-up, e.g. at shutdown"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self, stages: Dict[str, Callable[[], Any]], budget_seconds: Optional[float] = None) -> WarmupReport:
+        """
+        Run all stages concurrently and wait for them, at most budget_seconds
+
+        Stages still running when the budget is spent are reported as timed
+        out. Blocking stages cannot be interrupted, so they finish in the
+        background and still fill their caches.
+
+        Returns:
+            Report with the status and duration of every stage
+        """
+        budget = budget_seconds if budget_seconds is not None else settings.STARTUP_WARMUP_BUDGET_SECONDS
+        report = self.report
+        if report.state != "warming":
+            report = self.report = WarmupReport(
+                state="warming",
+                stages={name: StageResult() for name in stages}
+            )
+
+        started = self._clock()
+        tasks = [
+            asyncio.create_task(self._run_stage(name, stage, report.stages[name]))
+            for name, stage in stages.items()
+        ]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, timeout=budget)
+        finally:
+            for task in tasks:
+                task.cancel()
+            report.duration_ms = round((self._clock() - started) * 1000, 1)
+            report.state = "ready"
+
+        for name, result in report.stages.items():
+            if result.status in ("pending", "running"):
+                result.status = "timed_out"
+                logger.warning(f"Warm-up stage '{name}' did not finish within the {budget:g}s budget")
+        done = sum(1 for result in report.stages.values() if result.status == "done")
+        logger.info(f"Warm-up finished in {report.duration_ms:.0f} ms ({done}/{len(report.stages)} stages done)")
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.report.state,
+            "duration_ms": self.report.duration_ms,
+            "stages": {
+                name: {
+                    "status": result.status,
+                    "duration_ms": result.duration_ms,
+                    **({"error": result.error} if result.error else {})
+                }
+                for name, result in self.report.stages.items()
+            }
+        }
+
+    async def _run_stage(self, name: str, stage: Callable[[], Any], result: StageResult) -> None:
+        result.status = "running"
+        started = self._clock()
+        try:
+            if inspect.iscoroutinefunction(stage):
+                result.result = await stage()
+            else:
+                result.result = await io_pool.run(stage)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)
+            logger.error(f"Warm-up stage '{name}' failed: {e}")
+            return
+        finally:
+            result.duration_ms = round((self._clock() - started) * 1000, 1)
+
+        result.status = "done"
+        summary = f" ({result.result})" if result.result is not None else ""
+        logger.info(f"Warm-up stage '{name}' done in {result.duration_ms:.0f} ms{summary}")
+
+
+# Global instance
+startup_warmup = StartupWarmup()
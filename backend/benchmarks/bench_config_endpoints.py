@@ -0,0 +1,145 @@
+"""
+Benchmark: config endpoints with pre-serialized responses vs. per-request models
+
+For each config endpoint, drives the ASGI app directly (no network, no HTTP
+client) and reports requests per second for:
+
+  before       the previous handlers: build the model from the cached dict,
+               .dict() it, and let FastAPI validate and encode response_model
+  after        the current handlers: cached JSON bytes in the response envelope
+  after (304)  the current handlers answering a conditional request
+
+Usage (from backend/):
+    python -m benchmarks.bench_config_endpoints
+    python -m benchmarks.bench_config_endpoints --requests 5000
+    CONTENT_PATH=/srv/page_content python -m benchmarks.bench_config_endpoints
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONTENT_PATH = BACKEND_DIR.parent / "frontend" / "public" / "page_content"
+# Settings are read at import time
+os.environ.setdefault("CONTENT_PATH", str(DEFAULT_CONTENT_PATH))
+
+from fastapi import APIRouter, FastAPI  # noqa: E402
+
+from app.api.v1 import content as content_module  # noqa: E402
+from app.core.error_handlers import register_exception_handlers  # noqa: E402
+from app.models.content import (  # noqa: E402
+    ConfigResponse, LayoutConfig, PersonalInfo, SiteConfig, ThemeConfig
+)
+from app.services.content_service import content_service  # noqa: E402
+
+ENDPOINTS = [
+    ("site-config", "config/site.json", SiteConfig),
+    ("theme-config", "config/theme.json", ThemeConfig),
+    ("layout-config", "config/layout.json", LayoutConfig),
+    ("personal-info", "config/personal/contact-info.json", PersonalInfo)
+]
+
+
+def legacy_router() -> APIRouter:
+    """The config handlers as they were before responses were pre-serialized"""
+    router = APIRouter()
+    for route, relative_path, model in ENDPOINTS:
+        def handler(relative_path=relative_path, model=model):
+            data = content_service.loader.load_json_file(content_service.content_path / relative_path)
+            return ConfigResponse(data=model(**data).model_dump())
+
+        async def endpoint(handler=handler):
+            return handler()
+
+        router.add_api_route(f"/{route}", endpoint, methods=["GET"], response_model=ConfigResponse)
+    return router
+
+
+def build_app(router: APIRouter) -> FastAPI:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(router, prefix="/api/v1/content")
+    return app
+
+
+async def call(app: FastAPI, path: str, headers: List[Tuple[bytes, bytes]]) -> Tuple[int, List[Tuple[bytes, bytes]]]:
+    """One request straight through the ASGI interface"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": headers, "client": ("127.0.0.1", 1), "server": ("test", 80)
+    }
+    status = 0
+    response_headers: List[Tuple[bytes, bytes]] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = message.get("headers", [])
+
+    await app(scope, receive, send)
+    return status, response_headers
+
+
+async def requests_per_second(
+    app: FastAPI,
+    path: str,
+    requests: int,
+    rounds: int,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None
+) -> float:
+    headers = headers or []
+    for _ in range(min(200, requests)):
+        await call(app, path, headers)
+    rates = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, path, headers)
+        rates.append(requests / (time.perf_counter() - started))
+    return statistics.median(rates)
+
+
+async def run(args: argparse.Namespace) -> None:
+    before_app = build_app(legacy_router())
+    after_app = build_app(content_module.router)
+
+    print(f"Content: {content_service.content_path}")
+    header = f"{'endpoint':<16} {'before':>10} {'after':>10} {'speedup':>8} {'after (304)':>12}"
+    print(header)
+    print("-" * len(header))
+    for route, relative_path, _ in ENDPOINTS:
+        path = f"/api/v1/content/{route}"
+        status, response_headers = await call(after_app, path, [])
+        if status != 200:
+            print(f"{route:<16} {'skipped: ' + relative_path + ' not found':>42}")
+            continue
+        etag = dict(response_headers)[b"etag"]
+
+        before = await requests_per_second(before_app, path, args.requests, args.rounds)
+        after = await requests_per_second(after_app, path, args.requests, args.rounds)
+        not_modified = await requests_per_second(
+            after_app, path, args.requests, args.rounds, headers=[(b"if-none-match", etag)]
+        )
+        print(f"{route:<16} {before:>8.0f}/s {after:>8.0f}/s {after / before:>7.1f}x {not_modified:>10.0f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per timed round")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds; the median is reported")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
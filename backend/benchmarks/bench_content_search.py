@@ -0,0 +1,114 @@
+"""
+Benchmark: BM25 inverted-index content search vs. the previous linear scan
+
+Generates a synthetic corpus with a Zipf-like vocabulary and times, per
+query, the old lowercase-substring scan over every item against
+SearchIndex.search (which also ranks and builds snippets).
+
+Usage (from backend/):
+    python -m benchmarks.bench_content_search
+    python -m benchmarks.bench_content_search --docs 50000 --limit 20
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from app.models.content import ContentItem, ContentMetadata
+from app.services.content.search_index import SearchIndex
+
+QUERIES = ["kubernetes", "python fastapi", "machine learning", "infra", "whisper transcri", "zzyzx"]
+SEED_WORDS = [
+    "kubernetes", "python", "fastapi", "machine", "learning", "whisper", "transcription", "infrastructure",
+    "server", "cuda", "react", "typescript", "docker", "postgres", "vector", "embedding", "latency", "cache"
+]
+
+
+def make_corpus(docs: int, words_per_doc: int, vocabulary_size: int, seed: int) -> List[ContentItem]:
+    rng = random.Random(seed)
+    # Real query words are not the most frequent ones: rank them after the filler stop words
+    filler = [f"term{i}" for i in range(vocabulary_size - len(SEED_WORDS))]
+    vocabulary = filler[:200] + SEED_WORDS + filler[200:]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    items = []
+    for i in range(docs):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_doc)
+        items.append(ContentItem(
+            id=f"doc{i}",
+            content=" ".join(words),
+            metadata=ContentMetadata(title=" ".join(rng.choices(vocabulary, weights=weights, k=3)),
+                                     tech=", ".join(rng.sample(SEED_WORDS, 2))),
+            raw_content="",
+            file_path=f"components/projects/doc{i}.md"
+        ))
+    return items
+
+
+def linear_scan(items: List[ContentItem], query: str) -> List[ContentItem]:
+    """The search used before the index: one substring test per item and field"""
+    query_lower = query.lower()
+    return [
+        item for item in items
+        if query_lower in item.content.lower()
+        or (item.metadata.title and query_lower in item.metadata.title.lower())
+        or (item.metadata.tech and query_lower in item.metadata.tech.lower())
+    ]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_calls(call: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=10000, help="Synthetic items in the corpus")
+    parser.add_argument("--words", type=int, default=200, help="Words per item body")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="Distinct words in the corpus")
+    parser.add_argument("--limit", type=int, default=10, help="Hits requested from the index")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    items = make_corpus(args.docs, args.words, args.vocabulary, args.seed)
+    index = SearchIndex()
+    started = time.perf_counter()
+    index.sync(items)
+    print(f"Index: {len(index)} items, {len(index._postings)} terms, "
+          f"built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    header = f"{'query':<20} {'scan hits':>9} {'idx hits':>8} {'scan p50':>9} {'scan p95':>9} {'idx p50':>8} {'idx p95':>8} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    scan_means, index_means = [], []
+    for query in QUERIES:
+        scan_hits = len(linear_scan(items, query))
+        index_hits = len(index.search(query))
+        scan = time_calls(lambda: linear_scan(items, query), args.repeat)
+        ranked = time_calls(lambda: index.search(query, limit=args.limit), args.repeat)
+        scan_means.append(statistics.mean(scan))
+        index_means.append(statistics.mean(ranked))
+        print(f"{query:<20} {scan_hits:>9} {index_hits:>8} {percentile(scan, 50):>8.2f}ms {percentile(scan, 95):>8.2f}ms "
+              f"{percentile(ranked, 50):>7.2f}ms {percentile(ranked, 95):>7.2f}ms "
+              f"{statistics.mean(scan) / statistics.mean(ranked):>7.1f}x")
+
+    print(f"\nMean over queries: scan {statistics.mean(scan_means):.2f} ms, "
+          f"index {statistics.mean(index_means):.2f} ms (limit {args.limit})")
+    print("Hit counts differ by design: the index matches whole words (last word as a prefix) "
+          "and requires every word, the scan matches the query as one substring.")
+
+
+if __name__ == "__main__":
+    main()
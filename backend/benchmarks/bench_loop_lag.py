@@ -0,0 +1,105 @@
+"""
+Benchmark: event loop lag of synchronous vs. async content loading
+
+Loads every markdown file under the content directory with a cold cache,
+concurrently, while a loop lag monitor samples every millisecond. Reports
+wall time and lag percentiles for:
+
+  sync    load_markdown_file called on the event loop (previous endpoints)
+  async   load_markdown_file_async, which reads in the I/O thread pool
+
+A per-open delay simulates a slow or cold disk; with --read-latency-ms 0
+only parsing cost remains.
+
+Usage (from backend/):
+    python -m benchmarks.bench_loop_lag
+    python -m benchmarks.bench_loop_lag --read-latency-ms 20 --rounds 5
+    CONTENT_PATH=/srv/page_content python -m benchmarks.bench_loop_lag
+"""
+
+import argparse
+import asyncio
+import builtins
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONTENT_PATH = BACKEND_DIR.parent / "frontend" / "public" / "page_content"
+# Settings are read at import time
+os.environ.setdefault("CONTENT_PATH", str(DEFAULT_CONTENT_PATH))
+
+from app.core.config import settings  # noqa: E402
+from app.core.io_pool import io_pool  # noqa: E402
+from app.core.loop_monitor import LoopLagMonitor  # noqa: E402
+from app.services.content import content_loader as content_loader_module  # noqa: E402
+from app.services.content.content_cache import ContentCache  # noqa: E402
+from app.services.content.content_loader import ContentLoader  # noqa: E402
+
+
+def slow_open(latency: float):
+    def open_slowly(*args, **kwargs):
+        time.sleep(latency)
+        return builtins.open(*args, **kwargs)
+    return open_slowly
+
+
+async def run_round(mode: str, paths: List[Path], content_path: Path) -> Dict[str, float]:
+    loader = ContentLoader(content_path, ContentCache())
+    monitor = LoopLagMonitor(interval_ms=1, threshold_ms=1, warn_ms=float("inf"))
+    monitor.start()
+    await asyncio.sleep(0.01)
+    monitor.reset()
+
+    async def load_sync(path: Path) -> None:
+        loader.load_markdown_file(path)
+
+    load = load_sync if mode == "sync" else loader.load_markdown_file_async
+    started = time.perf_counter()
+    await asyncio.gather(*(load(path) for path in paths))
+    elapsed = time.perf_counter() - started
+    # One more interval so a trailing stall is sampled
+    await asyncio.sleep(0.005)
+    await monitor.stop()
+
+    stats = monitor.get_stats()
+    return {
+        "wall_ms": elapsed * 1000,
+        "p50": stats["p50_lag_ms"],
+        "p99": stats["p99_lag_ms"],
+        "max": stats["max_lag_ms"],
+        "blocked": stats["blocked"]
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    content_path = Path(settings.CONTENT_PATH)
+    paths = sorted(content_path.rglob("*.md"))
+    if not paths:
+        raise SystemExit(f"No markdown files under {content_path}")
+
+    if args.read_latency_ms > 0:
+        content_loader_module.open = slow_open(args.read_latency_ms / 1000)
+
+    print(f"{len(paths)} files, {args.read_latency_ms} ms per open, "
+          f"{io_pool.max_workers} I/O threads, {args.rounds} rounds\n")
+    print(f"{'mode':<8}{'wall ms':>10}{'p50 lag':>10}{'p99 lag':>10}{'max lag':>10}{'>1 ms':>8}")
+    for mode in ("sync", "async"):
+        rounds = [await run_round(mode, paths, content_path) for _ in range(args.rounds)]
+        row = {key: statistics.median(r[key] for r in rounds) for key in rounds[0]}
+        print(f"{mode:<8}{row['wall_ms']:>10.1f}{row['p50']:>10.2f}{row['p99']:>10.2f}"
+              f"{row['max']:>10.2f}{row['blocked']:>8.0f}")
+    io_pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--read-latency-ms", type=float, default=5.0, help="Simulated delay per file open")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per mode; the median is reported")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
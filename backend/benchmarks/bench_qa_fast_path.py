@@ -0,0 +1,130 @@
+"""
+Benchmark: Q&A fast path vs. full RAG generation on a replay of chat queries
+
+Replays queries through the Q&A question index and reports, for the chosen
+threshold, how many would be answered from a curated pair, the latency with
+and without the fast path, and the LLM tokens saved.
+
+LLM latency is not measured live; misses are charged a fixed simulated
+generation latency (--llm-latency-ms). Tokens are estimated at ~4 characters
+per token over the prompt the LLM would have received.
+
+Usage (from backend/):
+    python -m benchmarks.bench_qa_fast_path
+    python -m benchmarks.bench_qa_fast_path --threshold 0.9 --queries my_queries.txt
+    python -m benchmarks.bench_qa_fast_path --embedder hashing   # offline, no model download
+"""
+
+import argparse
+import asyncio
+import hashlib
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import EmbeddingService, embedding_service
+from app.services.rag.chat_service import ChatService
+from app.services.rag.qa_index import QAIndex
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONTENT_PATH = BACKEND_DIR.parent / "frontend" / "public" / "page_content"
+DEFAULT_QUERIES = Path(__file__).resolve().parent / "data" / "chat_queries.txt"
+
+
+class HashingEmbeddingService(EmbeddingService):
+    """Feature-hashed unigram/bigram embeddings, for running without a model"""
+
+    DIMENSION = 512
+
+    async def generate_embedding(self, text: str) -> Optional[List[float]]:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        if not words:
+            return None
+        vector = np.zeros(self.DIMENSION, dtype=np.float32)
+        for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            vector[int(hashlib.md5(term.encode()).hexdigest(), 16) % self.DIMENSION] += 1.0
+        return vector.tolist()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def load_queries(path: Path) -> List[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    service = HashingEmbeddingService() if args.embedder == "hashing" else embedding_service
+    index = QAIndex(Path(args.content_path), service)
+
+    started = time.perf_counter()
+    await index.build()
+    print(f"Index: {index.size} Q&A pairs built in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({args.embedder} embedder)")
+    if index.size == 0:
+        print("No Q&A pairs indexed; check --content-path and that embeddings are available")
+        return
+
+    system_prompt = ChatService.__new__(ChatService)._create_system_prompt()
+    queries = load_queries(Path(args.queries))
+    llm_latency = args.llm_latency_ms / 1000
+
+    baseline, fast, hits = [], [], []
+    tokens_saved = 0
+
+    for query in queries:
+        t0 = time.perf_counter()
+        query_embedding = await service.generate_embedding(query)
+        match = await index.best_match(query_embedding) if query_embedding else None
+        lookup = time.perf_counter() - t0
+
+        baseline.append(lookup + llm_latency)
+        if match and match.score >= args.threshold:
+            fast.append(lookup)
+            hits.append((query, match))
+            # Prompt the LLM would have seen: system prompt, ~5 retrieved chunks, query, answer
+            context = "\n\n".join([f"{match.pair.question}\n\n{match.pair.answer}"] * args.context_chunks)
+            tokens_saved += estimate_tokens(system_prompt + context + query) + estimate_tokens(match.pair.answer)
+        else:
+            fast.append(lookup + llm_latency)
+
+    print(f"\nReplayed {len(queries)} queries, threshold {args.threshold}, "
+          f"simulated LLM latency {args.llm_latency_ms} ms")
+    print(f"Fast-path hits: {len(hits)} ({len(hits) / len(queries):.0%})")
+    for query, match in hits:
+        print(f"  {match.score:.3f}  {query[:60]!r} -> {match.pair.title}")
+
+    print(f"\n{'':24}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, values in (("full generation", baseline), ("with fast path", fast)):
+        print(f"{label:24}{statistics.mean(values) * 1000:>10.1f}"
+              f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}")
+
+    print(f"\nEstimated LLM tokens saved: {tokens_saved} total, "
+          f"{tokens_saved // max(1, len(hits))} per fast-path hit")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--content-path", default=str(DEFAULT_CONTENT_PATH))
+    parser.add_argument("--queries", default=str(DEFAULT_QUERIES))
+    parser.add_argument("--threshold", type=float, default=settings.QA_FAST_PATH_THRESHOLD)
+    parser.add_argument("--llm-latency-ms", type=int, default=1500)
+    parser.add_argument("--context-chunks", type=int, default=5)
+    parser.add_argument("--embedder", choices=["service", "hashing"], default="service")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
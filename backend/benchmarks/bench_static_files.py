@@ -0,0 +1,137 @@
+"""
+Benchmark: /page_content served by StaticFiles vs. PrecompressedStaticFiles
+
+Replays the frontend's first page load (five config files and the markdown
+files the layout references) straight through the ASGI interface, and
+reports for each file the bytes sent and the time per request for:
+
+  before       plain StaticFiles: uncompressed, mtime-based ETag
+  after        PrecompressedStaticFiles with Accept-Encoding: br, gzip
+               (compressed on the first request, then served from memory)
+  after (304)  the same with the ETag of the previous response
+
+Usage (from backend/):
+    python -m benchmarks.bench_static_files
+    python -m benchmarks.bench_static_files --requests 2000
+    CONTENT_PATH=/srv/page_content python -m benchmarks.bench_static_files
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONTENT_PATH = BACKEND_DIR.parent / "frontend" / "public" / "page_content"
+# Settings are read at import time
+os.environ.setdefault("CONTENT_PATH", str(DEFAULT_CONTENT_PATH))
+
+from starlette.staticfiles import StaticFiles  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.static_files import PrecompressedStaticFiles  # noqa: E402
+from app.services.content.bundle import BundleBuilder, CONFIG_FILES  # noqa: E402
+
+ACCEPT = [(b"accept-encoding", b"br, gzip")]
+
+
+def page_files(content_path: Path) -> List[str]:
+    """Files the frontend fetches to render its first page"""
+    configs = {}
+    for name, relative_path in CONFIG_FILES.items():
+        try:
+            configs[name] = json.loads((content_path / relative_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            configs[name] = None
+    markdown = BundleBuilder._content_paths(None, configs)
+    return [path for path in [*CONFIG_FILES.values(), *markdown] if (content_path / path).is_file()]
+
+
+async def call(app, path: str, headers: List[Tuple[bytes, bytes]]) -> Tuple[int, dict, int]:
+    """One request straight through the ASGI interface; returns status, headers and body size"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "/page_content", "headers": headers, "client": ("127.0.0.1", 1), "server": ("test", 80)
+    }
+    status = 0
+    response_headers: dict = {}
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, response_headers, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = dict(message.get("headers", []))
+        else:
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, response_headers, size
+
+
+async def microseconds_per_request(
+    app,
+    path: str,
+    requests: int,
+    rounds: int,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None
+) -> float:
+    headers = headers or []
+    for _ in range(min(100, requests)):
+        await call(app, path, headers)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, path, headers)
+        timings.append((time.perf_counter() - started) / requests * 1e6)
+    return statistics.median(timings)
+
+
+async def run(args: argparse.Namespace) -> None:
+    content_path = Path(settings.CONTENT_PATH)
+    before_app = StaticFiles(directory=content_path)
+    after_app = PrecompressedStaticFiles(directory=content_path)
+
+    print(f"Content: {content_path}")
+    header = f"{'file':<50} {'bytes before':>12} {'after':>8} {'us before':>10} {'after':>8} {'304':>8}"
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0, 0.0, 0.0, 0.0]
+    for relative_path in page_files(content_path):
+        path = f"/{relative_path}"
+        _, _, before_bytes = await call(before_app, path, ACCEPT)
+        _, response_headers, after_bytes = await call(after_app, path, ACCEPT)
+        etag = response_headers[b"etag"]
+
+        before = await microseconds_per_request(before_app, path, args.requests, args.rounds, ACCEPT)
+        after = await microseconds_per_request(after_app, path, args.requests, args.rounds, ACCEPT)
+        not_modified = await microseconds_per_request(
+            after_app, path, args.requests, args.rounds, [*ACCEPT, (b"if-none-match", etag)]
+        )
+        for i, value in enumerate((before_bytes, after_bytes, before, after, not_modified)):
+            totals[i] += value
+        print(f"{relative_path:<50} {before_bytes:>12} {after_bytes:>8} {before:>10.0f} {after:>8.0f} {not_modified:>8.0f}")
+
+    print("-" * len(header))
+    print(f"{'page load':<50} {totals[0]:>12} {totals[1]:>8} {totals[2]:>10.0f} {totals[3]:>8.0f} {totals[4]:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per timed round")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds; the median is reported")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
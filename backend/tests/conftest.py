@@ -71,3 +71,112 @@ def mock_vector_results() -> list:
             "similarity": 0.85
         }
     ]
+
+
+def _encode_wav(seconds: int, rate: int = 1000) -> bytes:
+    """16-bit mono WAV whose samples hold the index of the second they are in"""
+    import io
+    import struct
+    import wave
+
+    output = io.BytesIO()
+    with wave.open(output, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        for second in range(seconds):
+            writer.writeframes(struct.pack("<h", second) * rate)
+    return output.getvalue()
+
+
+def _flac_crc(data: bytes, poly: int, width: int) -> int:
+    crc, top, mask = 0, 1 << (width - 1), (1 << width) - 1
+    for byte in data:
+        crc ^= byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & mask if crc & top else (crc << 1) & mask
+    return crc
+
+
+def _encode_flac(seconds: int, rate: int = 1000, block_size: int = 250) -> bytes:
+    """
+    8-bit mono FLAC with VERBATIM subframes; samples hold the second index
+
+    Frame numbers are single-byte coded, so keep seconds * rate / block_size under 128.
+    """
+    total = seconds * rate
+    streaminfo = (
+        block_size.to_bytes(2, "big") * 2 + bytes(6)
+        + ((rate << 44) | (0 << 41) | (7 << 36) | total).to_bytes(8, "big")
+        + bytes(16)
+    )
+    data = b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+    for frame_number in range(total // block_size):
+        header = bytes([0xFF, 0xF8, 0x60, 0x02, frame_number, block_size - 1])
+        header += bytes([_flac_crc(header, 0x07, 8)])
+        first_sample = frame_number * block_size
+        samples = bytes((first_sample + i) // rate for i in range(block_size))
+        frame = header + b"\x02" + samples
+        data += frame + _flac_crc(frame, 0x8005, 16).to_bytes(2, "big")
+    return data
+
+
+def _decode_test_audio(data: bytes) -> list:
+    """Second indexes, in order, encoded by make_wav / make_flac audio"""
+    import io
+    import struct
+    import wave
+
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            raw = reader.readframes(reader.getnframes())
+        values = [value for (value,) in struct.iter_unpack("<h", raw)]
+    else:
+        length = int.from_bytes(data[5:8], "big")
+        frames = data[8 + length:]
+        # 7-byte header, 1-byte subframe header, samples, 2-byte CRC
+        frame_size = 7 + 1 + 250 + 2
+        values = []
+        for offset in range(0, len(frames), frame_size):
+            values.extend(frames[offset + 8:offset + 8 + 250])
+
+    seconds = []
+    for value in values:
+        if not seconds or seconds[-1] != value:
+            seconds.append(value)
+    return seconds
+
+
+@pytest.fixture
+def make_wav():
+    """Factory for WAV test audio"""
+    return _encode_wav
+
+
+@pytest.fixture
+def make_flac():
+    """Factory for FLAC test audio"""
+    return _encode_flac
+
+
+@pytest.fixture
+def decode_audio():
+    """Decoder for audio made by make_wav / make_flac"""
+    return _decode_test_audio
+
+
+class FakeClock:
+    """Manually advanced clock, for monotonic and wall-clock time alike"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock that only moves when a test advances clock.now"""
+    return FakeClock()
@@ -0,0 +1,264 @@
+"""
+Integration tests for LLMRouter against local stub OpenAI-compatible servers
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.core.exceptions import ExternalAPIError
+from app.services.rag.llm_router import (
+    CircuitBreaker, LLMProvider, LLMRouter, RateLimitError
+)
+
+
+class StubLLMServer:
+    """OpenAI-compatible chat completions stub with injectable latency and faults"""
+
+    def __init__(self, name: str, latency: float = 0.0, status: int = 200, error_message: str = ""):
+        self.name = name
+        self.latency = latency
+        self.status = status
+        self.error_message = error_message
+        self.hits = 0
+        self.server = None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.hits += 1
+        payload = await request.json()
+        await asyncio.sleep(self.latency)
+
+        if self.status != 200:
+            return web.json_response(
+                {"error": {"message": self.error_message or "stub failure"}},
+                status=self.status
+            )
+
+        answer = f"answer from {self.name}"
+        if not payload.get("stream"):
+            return web.json_response({"choices": [{"message": {"content": answer}}]})
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in answer.split(" "):
+            chunk = {"choices": [{"delta": {"content": word + " "}}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    def provider(self, timeout: float = 5.0) -> LLMProvider:
+        return LLMProvider(
+            name=self.name,
+            api_url=str(self.server.make_url("/v1/chat/completions")),
+            model="stub-model",
+            api_key="test",
+            timeout=timeout
+        )
+
+
+@pytest.fixture
+async def stub_factory():
+    """Start stub servers on demand and shut them down after the test"""
+    servers = []
+
+    async def factory(name: str, **kwargs) -> StubLLMServer:
+        stub = StubLLMServer(name, **kwargs)
+        await stub.start()
+        servers.append(stub)
+        return stub
+
+    yield factory
+
+    for stub in servers:
+        await stub.server.close()
+
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+@pytest.mark.integration
+class TestLLMRouter:
+    """Test LLMRouter failover, circuit breaking and hedging"""
+
+    async def test_complete_from_primary(self, stub_factory):
+        """Test the first healthy provider answers"""
+        primary = await stub_factory("primary")
+        backup = await stub_factory("backup")
+        router = LLMRouter([primary.provider(), backup.provider()])
+
+        result = await router.complete(MESSAGES)
+
+        assert result == "answer from primary"
+        assert backup.hits == 0
+
+    async def test_failover_on_server_error(self, stub_factory):
+        """Test a failing provider falls through to the next one"""
+        primary = await stub_factory("primary", status=500)
+        backup = await stub_factory("backup")
+        router = LLMRouter([primary.provider(), backup.provider()])
+
+        result = await router.complete(MESSAGES)
+
+        assert result == "answer from backup"
+        assert primary.hits == 1
+
+    async def test_failover_on_timeout(self, stub_factory):
+        """Test a provider exceeding its timeout falls through to the next one"""
+        primary = await stub_factory("primary", latency=1.0)
+        backup = await stub_factory("backup")
+        router = LLMRouter([primary.provider(timeout=0.1), backup.provider()])
+
+        result = await router.complete(MESSAGES)
+
+        assert result == "answer from backup"
+
+    async def test_circuit_opens_after_repeated_failures(self, stub_factory):
+        """Test an open circuit stops traffic to a failing provider"""
+        primary = await stub_factory("primary", status=503)
+        backup = await stub_factory("backup")
+        router = LLMRouter([primary.provider(), backup.provider()], failure_threshold=2)
+
+        for _ in range(4):
+            assert await router.complete(MESSAGES) == "answer from backup"
+
+        assert primary.hits == 2
+        assert router.states[0].breaker.state == "open"
+
+    async def test_rate_limit_surfaces_when_all_limited(self, stub_factory):
+        """Test RateLimitError is raised when no provider can answer"""
+        primary = await stub_factory(
+            "primary",
+            status=429,
+            error_message="Rate limit reached on tokens per day (TPD). Please try again in 30s."
+        )
+        router = LLMRouter([primary.provider()])
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await router.complete(MESSAGES)
+
+        assert exc_info.value.limit_type == "TPD"
+        assert exc_info.value.retry_after == 30
+
+    async def test_all_providers_failed(self, stub_factory):
+        """Test ExternalAPIError when every provider fails"""
+        primary = await stub_factory("primary", status=500)
+        backup = await stub_factory("backup", status=502)
+        router = LLMRouter([primary.provider(), backup.provider()])
+
+        with pytest.raises(ExternalAPIError):
+            await router.complete(MESSAGES)
+
+    async def test_hedged_request_beats_slow_primary(self, stub_factory):
+        """Test hedging fires a backup request when the primary is slow"""
+        primary = await stub_factory("primary", latency=2.0)
+        backup = await stub_factory("backup")
+        router = LLMRouter(
+            [primary.provider(), backup.provider()],
+            hedge_enabled=True,
+            hedge_delay=0.1
+        )
+
+        started = time.monotonic()
+        result = await router.complete(MESSAGES)
+        elapsed = time.monotonic() - started
+
+        assert result == "answer from backup"
+        assert elapsed < 1.0
+        assert router.states[0].hedges == 1
+
+    async def test_no_hedge_when_primary_is_fast(self, stub_factory):
+        """Test no backup request is sent when the primary answers in time"""
+        primary = await stub_factory("primary")
+        backup = await stub_factory("backup")
+        router = LLMRouter(
+            [primary.provider(), backup.provider()],
+            hedge_enabled=True,
+            hedge_delay=0.5
+        )
+
+        assert await router.complete(MESSAGES) == "answer from primary"
+        assert backup.hits == 0
+
+    async def test_stream_tokens(self, stub_factory):
+        """Test streaming yields every token from the provider"""
+        primary = await stub_factory("primary")
+        router = LLMRouter([primary.provider()])
+
+        tokens = [token async for token in router.stream(MESSAGES)]
+
+        assert "".join(tokens).strip() == "answer from primary"
+
+    async def test_stream_hedges_on_slow_first_token(self, stub_factory):
+        """Test streaming hedges to the backup when the first token is late"""
+        primary = await stub_factory("primary", latency=2.0)
+        backup = await stub_factory("backup")
+        router = LLMRouter(
+            [primary.provider(), backup.provider()],
+            hedge_enabled=True,
+            hedge_delay=0.1
+        )
+
+        started = time.monotonic()
+        tokens = [token async for token in router.stream(MESSAGES)]
+
+        assert "".join(tokens).strip() == "answer from backup"
+        assert time.monotonic() - started < 1.0
+
+    async def test_slow_provider_is_demoted(self, stub_factory):
+        """Test a provider whose recent p95 is over budget is routed last"""
+        primary = await stub_factory("primary")
+        backup = await stub_factory("backup")
+        router = LLMRouter(
+            [primary.provider(), backup.provider()],
+            slow_p95=1.0,
+            min_latency_samples=3
+        )
+        for _ in range(3):
+            router.states[0].latency.record(5.0)
+
+        assert await router.complete(MESSAGES) == "answer from backup"
+        assert primary.hits == 0
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test CircuitBreaker state transitions"""
+
+    def test_half_open_allows_single_probe(self):
+        """Test the circuit lets one probe through after the reset timeout"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow_request() is False
+
+        now[0] = 11.0
+        assert breaker.state == "half_open"
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        """Test a failed half-open probe opens the circuit again"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        now[0] = 11.0
+        breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
@@ -0,0 +1,229 @@
+"""
+Integration tests for parallel chunked transcription against a local stub Whisper server
+"""
+
+import asyncio
+import io
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.audio_upload import ByteBudget
+from app.services.transcription_cache import TranscriptionCache
+from app.services.transcription_service import TranscriptionService
+
+
+class StubWhisperServer:
+    """
+    OpenAI-compatible transcription stub
+
+    Test audio stores the index of each second in its samples, so the stub
+    "transcribes" a file as one word per second it covers: "w3 w4 w5".
+    """
+
+    def __init__(self, decode, latency: float = 0.0, fail_once: tuple = ()):
+        self.decode = decode
+        self.latency = latency
+        self.fail_once = set(fail_once)
+        self.filenames = []
+        self.active = 0
+        self.max_active = 0
+        self.server = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        upload = form["file"]
+        self.filenames.append(upload.filename)
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+
+        if upload.filename in self.fail_once:
+            self.fail_once.discard(upload.filename)
+            return web.json_response({"error": {"message": "stub failure"}}, status=500)
+
+        data = upload.file.read()
+        if data[:4] not in (b"RIFF", b"fLaC"):
+            return web.json_response({"text": "unsplit audio"})
+        words = [f"w{second}" for second in self.decode(data)]
+        return web.json_response({"text": " ".join(words)})
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_post("/v1/audio/transcriptions", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    def service(self, **kwargs) -> TranscriptionService:
+        options = {"segment_seconds": 5, "overlap_seconds": 2, "max_concurrency": 4, "segment_retries": 1}
+        options.update(kwargs)
+        return TranscriptionService(
+            api_key="test",
+            api_url=str(self.server.make_url("/v1/audio/transcriptions")),
+            **options
+        )
+
+
+@pytest.fixture
+async def whisper_factory(decode_audio):
+    """Start stub Whisper servers on demand and shut them down after the test"""
+    servers = []
+
+    async def factory(**kwargs) -> StubWhisperServer:
+        stub = StubWhisperServer(decode_audio, **kwargs)
+        await stub.start()
+        servers.append(stub)
+        return stub
+
+    yield factory
+
+    for stub in servers:
+        await stub.server.close()
+
+
+EXPECTED = " ".join(f"w{second}" for second in range(12))
+
+
+@pytest.mark.integration
+class TestChunkedTranscription:
+    """Test segmenting, parallel requests and stitching"""
+
+    async def test_wav_is_split_and_stitched(self, whisper_factory, make_wav):
+        """Test overlapping WAV segments stitch back into the full transcript"""
+        stub = await whisper_factory()
+
+        text = await stub.service().transcribe_audio(io.BytesIO(make_wav(12)), "voice.wav")
+
+        assert text == EXPECTED
+        assert len(stub.filenames) == 4
+
+    async def test_flac_is_split_and_stitched(self, whisper_factory, make_flac):
+        """Test FLAC audio is segmented on frame boundaries and stitched"""
+        stub = await whisper_factory()
+
+        text = await stub.service().transcribe_audio(io.BytesIO(make_flac(12)), "voice.flac")
+
+        assert text == EXPECTED
+
+    async def test_segments_run_concurrently_up_to_cap(self, whisper_factory, make_wav):
+        """Test segments overlap in time but never exceed the concurrency cap"""
+        stub = await whisper_factory(latency=0.2)
+
+        started = time.monotonic()
+        await stub.service(max_concurrency=2).transcribe_audio(io.BytesIO(make_wav(12)), "voice.wav")
+        elapsed = time.monotonic() - started
+
+        assert stub.max_active == 2
+        assert elapsed < 4 * 0.2
+
+    async def test_segments_held_within_memory_budget(self, whisper_factory, make_wav):
+        """Test segment bytes count against the audio budget and are released afterwards"""
+        stub = await whisper_factory(latency=0.05)
+        audio = make_wav(12)
+        # Room for one segment at a time
+        budget = ByteBudget(len(audio) // 2)
+
+        text = await stub.service(budget=budget).transcribe_audio(io.BytesIO(audio), "voice.wav")
+
+        assert text == EXPECTED
+        assert stub.max_active == 1
+        assert budget.in_use == 0
+
+    async def test_failed_segment_is_retried(self, whisper_factory, make_wav):
+        """Test one failing segment is retried alone instead of losing the recording"""
+        stub = await whisper_factory(fail_once=("voice.part2.wav",))
+
+        text = await stub.service().transcribe_audio(io.BytesIO(make_wav(12)), "voice.wav")
+
+        assert text == EXPECTED
+        assert stub.filenames.count("voice.part2.wav") == 2
+        assert stub.filenames.count("voice.part0.wav") == 1
+
+    async def test_stream_yields_partial_results(self, whisper_factory, make_wav):
+        """Test segment results stream before the final stitched transcript"""
+        stub = await whisper_factory()
+
+        events = [
+            event async for event in
+            stub.service().transcribe_audio_stream(io.BytesIO(make_wav(12)), "voice.wav")
+        ]
+
+        assert [e["type"] for e in events] == ["segment"] * 4 + ["done"]
+        assert sorted(e["index"] for e in events[:4]) == [0, 1, 2, 3]
+        assert events[-1]["text"] == EXPECTED
+
+    async def test_unsplittable_audio_sent_whole(self, whisper_factory):
+        """Test formats that cannot be split go out as a single request"""
+        stub = await whisper_factory()
+
+        text = await stub.service().transcribe_audio(io.BytesIO(b"\x1a\x45\xdf\xa3" * 100), "voice.webm")
+
+        assert text == "unsplit audio"
+        assert stub.filenames == ["voice.webm"]
+
+
+@pytest.mark.integration
+class TestTranscriptionCaching:
+    """Test repeated uploads are answered from the transcription cache"""
+
+    async def test_repeat_upload_skips_whisper(self, whisper_factory, make_wav):
+        """Test identical audio is transcribed once and then served from the cache"""
+        stub = await whisper_factory(latency=0.2)
+        service = stub.service(cache=TranscriptionCache())
+        audio = make_wav(12)
+
+        first = await service.transcribe_audio(io.BytesIO(audio), "voice.wav")
+        requests_made = len(stub.filenames)
+
+        started = time.monotonic()
+        second = await service.transcribe_audio(io.BytesIO(audio), "retry.wav")
+        elapsed = time.monotonic() - started
+
+        assert first == second == EXPECTED
+        assert len(stub.filenames) == requests_made
+        assert elapsed < 0.05
+        assert service.cache.get_stats()["hits"] == 1
+
+    async def test_concurrent_identical_uploads_share_one_transcription(self, whisper_factory, make_wav):
+        """Test a double-click waits for the in-flight transcription instead of repeating it"""
+        stub = await whisper_factory(latency=0.2)
+        service = stub.service(cache=TranscriptionCache())
+        audio = make_wav(3)
+
+        texts = await asyncio.gather(
+            service.transcribe_audio(io.BytesIO(audio), "voice.wav"),
+            service.transcribe_audio(io.BytesIO(audio), "voice.wav")
+        )
+
+        assert texts[0] == texts[1] == "w0 w1 w2"
+        assert len(stub.filenames) == 1
+
+    async def test_language_is_part_of_the_key(self, whisper_factory, make_wav):
+        """Test the same audio in another language is not served from the cache"""
+        stub = await whisper_factory()
+        service = stub.service(cache=TranscriptionCache())
+        audio = make_wav(3)
+
+        await service.transcribe_audio(io.BytesIO(audio), "voice.wav", language="en")
+        await service.transcribe_audio(io.BytesIO(audio), "voice.wav", language="sv")
+
+        assert len(stub.filenames) == 2
+
+    async def test_failed_transcription_is_not_cached(self, whisper_factory, make_wav):
+        """Test a failed transcription is retried on the next upload"""
+        stub = await whisper_factory(fail_once=("voice.part1.wav",))
+        service = stub.service(cache=TranscriptionCache(), segment_retries=0)
+        audio = make_wav(12)
+
+        with pytest.raises(Exception):
+            await service.transcribe_audio(io.BytesIO(audio), "voice.wav")
+        text = await service.transcribe_audio(io.BytesIO(audio), "voice.wav")
+
+        assert text == EXPECTED
+        assert len(service.cache) == 1
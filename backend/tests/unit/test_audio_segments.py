@@ -0,0 +1,98 @@
+"""
+Unit tests for audio segmentation and transcript stitching
+"""
+
+import io
+
+import pytest
+
+from app.services.audio_segments import (
+    FlacSplitter, WavSplitter, open_splitter, plan_segments, stitch_transcripts
+)
+
+
+@pytest.mark.unit
+class TestPlanSegments:
+    """Test segment layout"""
+
+    def test_short_audio_is_one_segment(self):
+        """Test audio shorter than a segment is not split"""
+        plans = plan_segments(20.0, segment_seconds=30, overlap_seconds=2)
+
+        assert [(p.start, p.end) for p in plans] == [(0.0, 20.0)]
+
+    def test_segments_overlap(self):
+        """Test consecutive segments share the overlap"""
+        plans = plan_segments(12.0, segment_seconds=5, overlap_seconds=2)
+
+        assert [(p.start, p.end) for p in plans] == [(0, 5), (3, 8), (6, 11), (9, 12)]
+
+    def test_sliver_is_merged(self):
+        """Test a final segment no longer than the overlap is merged into the previous one"""
+        plans = plan_segments(10.5, segment_seconds=5, overlap_seconds=2)
+
+        assert plans[-1].end == 10.5
+        assert plans[-1].start == 6
+
+
+@pytest.mark.unit
+class TestSplitters:
+    """Test WAV and FLAC splitting"""
+
+    def test_wav_segments(self, make_wav, decode_audio):
+        """Test WAV segments are standalone files covering their time range"""
+        splitter = open_splitter(io.BytesIO(make_wav(12)), "voice.wav")
+
+        assert isinstance(splitter, WavSplitter)
+        assert splitter.duration == 12.0
+        segment = splitter.read_segment(plan_segments(12.0, 5, 2)[1])
+        assert decode_audio(segment.data) == [3, 4, 5, 6, 7]
+        assert segment.filename == "voice.part1.wav"
+        assert splitter.segment_size(plan_segments(12.0, 5, 2)[1]) == len(segment.data)
+
+    def test_flac_segments(self, make_flac, decode_audio):
+        """Test FLAC segments are cut on frame boundaries with a fresh header"""
+        splitter = open_splitter(io.BytesIO(make_flac(12)), "voice.flac")
+
+        assert isinstance(splitter, FlacSplitter)
+        assert len(splitter.frames) == 49
+        assert splitter.duration == 12.0
+        segment = splitter.read_segment(plan_segments(12.0, 5, 2)[2])
+        assert segment.data[:4] == b"fLaC"
+        assert decode_audio(segment.data) == [6, 7, 8, 9, 10]
+        assert splitter.segment_size(plan_segments(12.0, 5, 2)[2]) == len(segment.data)
+
+    def test_unsplittable_format(self):
+        """Test formats other than WAV and FLAC are not split"""
+        assert open_splitter(io.BytesIO(b"\x1a\x45\xdf\xa3" + bytes(100)), "voice.webm") is None
+
+
+@pytest.mark.unit
+class TestStitchTranscripts:
+    """Test overlap removal between segment transcripts"""
+
+    def test_exact_overlap_removed(self):
+        """Test words repeated across a seam appear once"""
+        text = stitch_transcripts([
+            "I built a k3s cluster at home",
+            "cluster at home with three nodes"
+        ])
+
+        assert text == "I built a k3s cluster at home with three nodes"
+
+    def test_overlap_with_cut_words(self):
+        """Test a seam whose edge words were cut mid-word still lines up"""
+        text = stitch_transcripts([
+            "we deploy with Helm charts and Ar",
+            "and charts and Argo CD every day"
+        ])
+
+        assert text == "we deploy with Helm charts and Argo CD every day"
+
+    def test_no_overlap_concatenates(self):
+        """Test segments with nothing in common are joined as-is"""
+        assert stitch_transcripts(["first part.", "Second part."]) == "first part. Second part."
+
+    def test_empty_segments_skipped(self):
+        """Test silent segments do not break stitching"""
+        assert stitch_transcripts(["one two three", "", "two three four"]) == "one two three four"
@@ -0,0 +1,223 @@
+"""
+Unit tests for streaming audio uploads
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.api.v1 import chat as chat_module
+from app.services.audio_upload import (
+    AudioUploadError, ByteBudget, audio_memory_budget, receive_audio_upload
+)
+
+BOUNDARY = "audio-boundary"
+
+
+def multipart_body(data: bytes, filename: str = "voice.webm", content_type: str = "audio/webm") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def make_request(body: bytes, chunk_size: int = 4096, declare_length: bool = True):
+    """Request whose body arrives in chunks; records how many were read"""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    consumed = []
+
+    async def receive():
+        if len(consumed) < len(chunks):
+            chunk = chunks[len(consumed)]
+            consumed.append(chunk)
+            return {"type": "http.request", "body": chunk, "more_body": len(consumed) < len(chunks)}
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if declare_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers, "query_string": b""}
+    return Request(scope, receive), chunks, consumed
+
+
+@pytest.mark.unit
+class TestByteBudget:
+    """Test the byte-counting semaphore"""
+
+    async def test_waits_until_released(self):
+        """Test a reservation waits for enough of the budget to be freed"""
+        budget = ByteBudget(100)
+        await budget.acquire(80)
+
+        waiter = asyncio.create_task(budget.acquire(50))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        budget.release(80)
+        assert await waiter == 50
+        assert budget.in_use == 50
+
+    async def test_oversized_request_is_clamped(self):
+        """Test a reservation larger than the budget does not wait forever"""
+        budget = ByteBudget(100)
+
+        assert await budget.acquire(500) == 100
+        assert budget.available == 0
+
+    async def test_cancelled_waiter_is_removed(self):
+        """Test a cancelled waiter does not hold up later ones"""
+        budget = ByteBudget(100)
+        await budget.acquire(100)
+        waiter = asyncio.create_task(budget.acquire(100))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        budget.release(100)
+
+        assert await budget.acquire(60) == 60
+
+
+@pytest.mark.unit
+class TestReceiveAudioUpload:
+    """Test streaming multipart parsing"""
+
+    async def test_small_upload_stays_in_memory(self):
+        """Test uploads under the threshold are kept in memory"""
+        budget = ByteBudget(1024 * 1024)
+        request, _, _ = make_request(multipart_body(b"x" * 1000))
+
+        upload = await receive_audio_upload(request, spill_threshold=4096, budget=budget)
+
+        assert upload.size == 1000
+        assert upload.in_memory
+        assert upload.file.read() == b"x" * 1000
+        assert budget.in_use > 0
+        upload.close()
+        assert budget.in_use == 0
+
+    async def test_large_upload_spills_and_releases_budget(self):
+        """Test data past the threshold spills to disk and frees the memory budget"""
+        budget = ByteBudget(1024 * 1024)
+        audio = bytes(range(256)) * 200
+        request, _, _ = make_request(multipart_body(audio))
+
+        async with await receive_audio_upload(request, spill_threshold=4096, budget=budget) as upload:
+            assert not upload.in_memory
+            assert budget.in_use == 0
+            assert upload.file.read() == audio
+
+    async def test_size_limit_enforced_while_reading(self):
+        """Test an oversized upload is rejected before the whole body is read"""
+        budget = ByteBudget(1024 * 1024)
+        request, chunks, consumed = make_request(multipart_body(b"x" * 200_000), declare_length=False)
+
+        with pytest.raises(AudioUploadError) as exc_info:
+            await receive_audio_upload(request, max_bytes=50_000, spill_threshold=4096, budget=budget)
+
+        assert exc_info.value.status_code == 413
+        assert len(consumed) < len(chunks)
+        assert budget.in_use == 0
+
+    async def test_declared_length_rejected_without_reading(self):
+        """Test Content-Length over the limit is rejected up front"""
+        request, _, consumed = make_request(multipart_body(b"x" * 200_000))
+
+        with pytest.raises(AudioUploadError) as exc_info:
+            await receive_audio_upload(request, max_bytes=50_000, budget=ByteBudget(1024))
+
+        assert exc_info.value.status_code == 413
+        assert consumed == []
+
+    async def test_unsupported_type_rejected(self):
+        """Test a non-audio part is rejected"""
+        request, _, _ = make_request(multipart_body(b"MZ", filename="setup.exe", content_type="application/x-msdownload"))
+
+        with pytest.raises(AudioUploadError) as exc_info:
+            await receive_audio_upload(request, budget=ByteBudget(1024))
+
+        assert exc_info.value.status_code == 400
+
+
+@pytest.mark.unit
+class TestTranscribeEndpoint:
+    """Test /transcribe streams the upload to the transcription service"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(chat_module.router, prefix="/api/v1/chat")
+        return httpx.AsyncClient(app=app, base_url="http://test")
+
+    async def test_transcribe_passes_file(self, client, monkeypatch):
+        """Test the service receives a readable file, not a bytes copy"""
+        received = {}
+
+        async def fake_transcribe(audio_file, filename, language="en", content_hash=None):
+            received["data"] = audio_file.read()
+            received["filename"] = filename
+            return "hello world"
+
+        monkeypatch.setattr(chat_module.transcription_service, "transcribe_audio", fake_transcribe)
+
+        async with client:
+            response = await client.post(
+                "/api/v1/chat/transcribe",
+                files={"file": ("voice.webm", b"\x1a\x45\xdf\xa3" * 1000, "audio/webm")}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"text": "hello world", "filename": "voice.webm", "size_bytes": 4000}
+        assert received["data"] == b"\x1a\x45\xdf\xa3" * 1000
+
+    async def test_invalid_type_is_400(self, client):
+        """Test an unsupported upload keeps the existing error response"""
+        async with client:
+            response = await client.post(
+                "/api/v1/chat/transcribe",
+                files={"file": ("notes.txt", b"hello", "text/plain")}
+            )
+
+        assert response.status_code == 400
+        assert "Invalid file type" in response.json()["detail"]
+
+    async def test_transcribe_stream_sends_events(self, client, monkeypatch):
+        """Test /transcribe/stream relays service events as server-sent events"""
+        async def fake_stream(audio_file, filename, language="en", content_hash=None):
+            yield {"type": "segment", "index": 0, "text": "hello"}
+            yield {"type": "done", "text": "hello", "segments": 1, "failed_segments": []}
+
+        monkeypatch.setattr(chat_module.transcription_service, "transcribe_audio_stream", fake_stream)
+
+        async with client:
+            response = await client.post(
+                "/api/v1/chat/transcribe/stream",
+                files={"file": ("voice.wav", b"RIFF" + bytes(100), "audio/wav")}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.index("event: segment") < response.text.index("event: done")
+
+    async def test_stream_never_started_releases_upload(self):
+        """Test the upload is released when the client is gone before the stream starts"""
+        budget = audio_memory_budget
+        request, _, _ = make_request(multipart_body(b"RIFF" + bytes(100), "voice.wav", "audio/wav"))
+        response = await chat_module.transcribe_audio_stream(request)
+        assert budget.in_use > 0
+
+        async def receive():
+            await asyncio.sleep(1)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client disconnected")
+
+        with pytest.raises(OSError):
+            await response({"type": "http"}, receive, send)
+        assert budget.in_use == 0
@@ -0,0 +1,297 @@
+"""
+Unit tests for the cross-worker cache invalidation bus
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import content as content_module
+from app.services import cache_refresh
+from app.services.cache_bus import (
+    CONFIG_CHANGED, CONTENT_CHANGED, CONTENT_REFRESHED, MAX_PAYLOAD_BYTES,
+    CacheBus, InMemoryHub, InvalidationEvent, PostgresTransport
+)
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.content_watcher import ContentChanges
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+
+CHANNEL = "test_invalidation"
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "projects").mkdir()
+    for i in range(3):
+        (tmp_path / "projects" / f"p{i}.md").write_text(f"---\ntitle: Project {i}\n---\n\nBody {i}.\n")
+    return tmp_path
+
+
+class Worker:
+    """One worker: its own content caches, joined to the others by the bus"""
+
+    def __init__(self, name, content_dir, hub):
+        self.service = ContentService()
+        self.service.content_path = content_dir
+        self.service.cache = ContentCache()
+        self.service.loader = ContentLoader(content_dir, self.service.cache)
+        self.service.index = ContentIndex(content_dir, self.service.loader)
+        self.service.configs = ConfigResponseCache(self.service.loader)
+        self.bus = CacheBus(hub.transport(), channel=CHANNEL, origin=name)
+        self.bus.subscribe([CONTENT_CHANGED, CONFIG_CHANGED], lambda event: self.service.apply_changes(event.changes()))
+        self.bus.subscribe(CONTENT_REFRESHED, lambda event: self.service.clear_cache())
+
+    def load(self, *names):
+        for name in names:
+            self.service.get_content_item(f"projects/{name}.md")
+
+    def cached(self, name):
+        key = self.service.loader.cache_key(self.service.content_path / "projects" / f"{name}.md")
+        return self.service.cache.get(key) is not None
+
+
+@pytest.fixture
+async def workers(content_dir):
+    hub = InMemoryHub()
+    workers = [Worker(name, content_dir, hub) for name in ("a", "b", "c")]
+    for worker in workers:
+        await worker.bus.start()
+        worker.load("p0", "p1")
+    yield workers
+    for worker in workers:
+        await worker.bus.stop()
+
+
+async def wait_until(condition, timeout=1.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+class TestMultiWorkerInvalidation:
+    """Test invalidations reach the other workers, and only for the affected keys"""
+
+    async def test_only_affected_keys_on_other_workers(self, workers):
+        """Test other workers drop the changed file, keep the rest, and the delay is measured"""
+        a, b, c = workers
+
+        started = time.perf_counter()
+        event = await a.bus.publish(CONTENT_CHANGED, ["projects/p0.md"])
+        await wait_until(lambda: not b.cached("p0") and not c.cached("p0"))
+        delay = time.perf_counter() - started
+
+        assert event.version == 1
+        assert delay < 0.05
+        assert b.cached("p1") and c.cached("p1")
+        # The publisher already applied its own change
+        assert a.cached("p0")
+        for worker in (b, c):
+            stats = worker.bus.get_stats()
+            assert stats["applied"] == 1
+            assert stats["delay_ms"]["max"] < 50
+        assert a.bus.get_stats()["ignored"] == 1
+
+    async def test_refresh_clears_everything(self, workers):
+        """Test a content refresh empties the caches of the other workers"""
+        a, b, c = workers
+
+        await a.bus.publish(CONTENT_REFRESHED)
+        await wait_until(lambda: len(b.service.cache) == 0 and len(c.service.cache) == 0)
+
+        assert len(a.service.cache) == 2
+
+    async def test_watcher_changes_split_by_kind(self, workers):
+        """Test config and content paths of a watcher batch are published separately"""
+        a, b, _ = workers
+        kinds = []
+        b.bus.subscribe([CONTENT_CHANGED, CONFIG_CHANGED], lambda event: kinds.append((event.kind, event.paths)))
+
+        await a.bus.publish_changes(ContentChanges(modified={"config/site.json", "projects/p1.md"}))
+        await wait_until(lambda: len(kinds) == 2)
+
+        assert sorted(kinds) == [("config", ("config/site.json",)), ("content", ("projects/p1.md",))]
+        assert not b.cached("p1")
+
+    async def test_async_handlers(self, workers):
+        """Test coroutine handlers run on the loop"""
+        a, b, _ = workers
+        done = asyncio.Event()
+
+        async def handler(event):
+            done.set()
+
+        b.bus.subscribe(CONTENT_REFRESHED, handler)
+        await a.bus.publish(CONTENT_REFRESHED)
+        await asyncio.wait_for(done.wait(), 1)
+
+
+@pytest.mark.unit
+class TestRefreshEndpoint:
+    """Test /refresh clears what the other workers clear"""
+
+    async def test_local_refresh_matches_remote(self, monkeypatch):
+        """Test the receiving worker drops content, resume and PDF caches like the bus handler does"""
+        cleared = []
+        monkeypatch.setattr(cache_refresh.content_service, "clear_cache", lambda: cleared.append("content"))
+        monkeypatch.setattr(cache_refresh.resume_aggregator, "reload", lambda *_: cleared.append("resume"))
+        monkeypatch.setattr(cache_refresh.pdf_generator, "clear_cache", lambda *_: cleared.append("pdf"))
+        app = FastAPI()
+        app.include_router(content_module.router, prefix="/api/v1/content")
+
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/api/v1/content/refresh")
+        assert response.status_code == 200
+        local, cleared[:] = list(cleared), []
+
+        cache_refresh.apply_remote_changes(InvalidationEvent(CONTENT_REFRESHED, None, "a", 1, 0.0))
+        assert local == cleared == ["content", "resume", "pdf"]
+
+
+@pytest.mark.unit
+class TestCacheBus:
+    """Test event versions and payloads"""
+
+    async def test_duplicates_and_stale_versions_ignored(self):
+        """Test an event is applied once per origin and version"""
+        bus = CacheBus(InMemoryHub().transport(), channel=CHANNEL, origin="b")
+        applied = []
+        bus.subscribe(CONTENT_CHANGED, applied.append)
+
+        def payload(version):
+            return InvalidationEvent(CONTENT_CHANGED, ("x.md",), "a", version, time.time()).to_payload()
+
+        bus._on_payload(payload(2))
+        bus._on_payload(payload(2))
+        bus._on_payload(payload(1))
+        bus._on_payload("not json")
+
+        assert [event.version for event in applied] == [2]
+        assert bus.get_stats()["ignored"] == 3
+
+    def test_large_path_lists_become_everything(self):
+        """Test payloads above the NOTIFY limit drop the paths"""
+        paths = tuple(f"components/projects/project-{i:05}.md" for i in range(1000))
+        payload = InvalidationEvent(CONTENT_CHANGED, paths, "a", 1, 0.0).to_payload()
+
+        assert len(payload) < MAX_PAYLOAD_BYTES
+        assert InvalidationEvent.from_payload(payload).paths is None
+
+    async def test_publish_requires_running_bus(self):
+        """Test publishing before start() is a no-op"""
+        bus = CacheBus(InMemoryHub().transport(), channel=CHANNEL)
+
+        assert await bus.publish(CONTENT_REFRESHED) is None
+        assert bus.published == 0
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+        self.termination_listeners = []
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.server.listeners.append((self, channel, callback))
+
+    async def remove_listener(self, channel, callback):
+        self.server.listeners.remove((self, channel, callback))
+
+    async def execute(self, query, channel, payload):
+        assert query == "SELECT pg_notify($1, $2)"
+        for connection, listened, callback in list(self.server.listeners):
+            if listened == channel:
+                asyncio.get_running_loop().call_soon(callback, connection, 1, channel, payload)
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+        self.server.listeners = [entry for entry in self.server.listeners if entry[0] is not self]
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+class FakeAcquire:
+    def __init__(self, pool):
+        self.pool = pool
+        self.connection = None
+
+    def __await__(self):
+        return self.pool._acquire().__await__()
+
+    async def __aenter__(self):
+        self.connection = await self.pool._acquire()
+        return self.connection
+
+    async def __aexit__(self, *exc):
+        await self.pool.release(self.connection)
+
+
+class FakePool:
+    """Just enough of an asyncpg pool for LISTEN/NOTIFY"""
+
+    def __init__(self):
+        self.listeners = []
+        self.acquired = []
+
+    def acquire(self):
+        return FakeAcquire(self)
+
+    async def _acquire(self):
+        connection = FakeConnection(self)
+        self.acquired.append(connection)
+        return connection
+
+    async def release(self, connection):
+        pass
+
+
+class FakeRepository:
+    def __init__(self):
+        self.connection_pool = FakePool()
+
+
+@pytest.mark.unit
+class TestPostgresTransport:
+    """Test LISTEN/NOTIFY wiring and recovery from a lost connection"""
+
+    async def test_notify_and_reconnect(self):
+        """Test events travel over pg_notify and a reconnect refreshes local caches"""
+        repository = FakeRepository()
+        a = CacheBus(PostgresTransport(repository, reconnect_seconds=0), channel=CHANNEL, origin="a")
+        b = CacheBus(PostgresTransport(repository, reconnect_seconds=0), channel=CHANNEL, origin="b")
+        received = []
+        b.subscribe([CONTENT_CHANGED, CONTENT_REFRESHED], lambda event: received.append(event))
+        await a.start()
+        await b.start()
+        await wait_until(lambda: a.transport.connected and b.transport.connected)
+
+        await a.publish(CONTENT_CHANGED, ["projects/p0.md"])
+        await wait_until(lambda: len(received) == 1)
+        assert received[0].paths == ("projects/p0.md",)
+        assert json.loads(received[0].to_payload())["origin"] == "a"
+
+        # b started listening last; its connection drops, it listens again and refreshes everything
+        repository.connection_pool.listeners[-1][0].terminate()
+        await wait_until(lambda: len(received) == 2)
+        assert received[1].kind == CONTENT_REFRESHED
+        assert b.transport.connected
+        assert len(repository.connection_pool.listeners) == 2
+
+        await a.stop()
+        await b.stop()
+        assert repository.connection_pool.listeners == []
@@ -0,0 +1,210 @@
+"""
+Unit tests for concurrent batch loading of content items
+"""
+
+import asyncio
+import builtins
+import json
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import content as content_module
+from app.core.config import settings
+from app.core.error_handlers import register_exception_handlers
+from app.services.content import content_loader as content_loader_module
+from app.services.content import document_store as document_store_module
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+
+SLOW_SECONDS = 0.05
+ITEMS = 6
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "projects").mkdir()
+    for i in range(ITEMS):
+        (tmp_path / "projects" / f"p{i}.md").write_text(f"---\ntitle: Project {i}\n---\n\nBody {i}.\n")
+    # A directory with a markdown name cannot be read
+    (tmp_path / "projects" / "broken.md").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def service(content_dir, monkeypatch):
+    service = ContentService()
+    service.content_path = content_dir
+    service.cache = ContentCache()
+    service.loader = ContentLoader(content_dir, service.cache)
+    service.index = ContentIndex(content_dir, service.loader)
+    service.configs = ConfigResponseCache(service.loader)
+    monkeypatch.setattr(content_module, "content_service", service)
+    return service
+
+
+@pytest.fixture
+def slow_open(monkeypatch):
+    """Make every file open take SLOW_SECONDS and record the peak number of concurrent opens"""
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def open_slowly(*args, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            time.sleep(SLOW_SECONDS)
+            return builtins.open(*args, **kwargs)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    # JSON files are read by the loader, markdown by the document store
+    monkeypatch.setattr(content_loader_module, "open", open_slowly, raising=False)
+    monkeypatch.setattr(document_store_module, "open", open_slowly, raising=False)
+    return state
+
+
+@pytest.fixture
+async def client(service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(content_module.router, prefix="/api/v1/content")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        data = next(line for line in block.splitlines() if line.startswith("data: "))
+        events.append(json.loads(data[len("data: "):]))
+    return events
+
+
+@pytest.mark.unit
+class TestBatchLoading:
+    """Test ContentService batch loading"""
+
+    async def test_statuses_in_request_order_with_duplicates_once(self, service):
+        """Test found, missing and error outcomes, deduplicated and ordered"""
+        paths = ["projects/p1.md", "projects/nope.md", "projects/p0.md", "projects/broken.md", "projects/p1.md"]
+
+        items, statuses = await service.get_content_items_async(paths)
+
+        assert [item.id for item in items] == ["p1", "p0"]
+        assert [(s.file_path, s.status) for s in statuses] == [
+            ("projects/p1.md", "found"),
+            ("projects/nope.md", "missing"),
+            ("projects/p0.md", "found"),
+            ("projects/broken.md", "error")
+        ]
+        assert statuses[1].error is None
+        assert "broken.md" in statuses[3].error
+
+    async def test_latency_close_to_slowest_read(self, service, slow_open):
+        """Test uncached reads overlap instead of adding up"""
+        paths = [f"projects/p{i}.md" for i in range(ITEMS)]
+
+        started = time.perf_counter()
+        items, _ = await service.get_content_items_async(paths)
+        elapsed = time.perf_counter() - started
+
+        assert len(items) == ITEMS
+        assert elapsed < SLOW_SECONDS * ITEMS / 2
+
+    async def test_concurrency_cap(self, service, slow_open):
+        """Test no more than max_concurrency files are read at once"""
+        paths = [f"projects/p{i}.md" for i in range(ITEMS)]
+
+        items, _ = await service.get_content_items_async(paths, max_concurrency=2)
+
+        assert len(items) == ITEMS
+        assert slow_open["peak"] == 2
+
+    async def test_early_exit_cancels_pending_loads(self, service, slow_open):
+        """Test abandoning the iterator cancels loads not yet started"""
+        paths = [f"projects/p{i}.md" for i in range(ITEMS)]
+
+        stream = service.iter_content_items(paths, max_concurrency=1)
+        first, _ = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(SLOW_SECONDS * 2)
+
+        assert first.status == "found"
+        # The first read, plus at most the one that had started when we stopped
+        assert len(service.cache) <= 2
+
+
+@pytest.mark.unit
+class TestBatchEndpoint:
+    """Test POST /api/v1/content/items"""
+
+    async def test_json_response(self, client):
+        """Test items and per-path statuses in one response"""
+        response = await client.post(
+            "/api/v1/content/items",
+            json=["projects/p0.md", "projects/p0.md", "projects/missing.md"]
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 1
+        assert [item["id"] for item in body["data"]] == ["p0"]
+        assert [s["status"] for s in body["statuses"]] == ["found", "missing"]
+
+    async def test_stream(self, client):
+        """Test one item event per distinct path, then the counts"""
+        response = await client.post(
+            "/api/v1/content/items?stream=true",
+            json=["projects/p0.md", "projects/p2.md", "projects/broken.md", "projects/p0.md"]
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        items = [event for event in events if event["type"] == "item"]
+        assert sorted(event["file_path"] for event in items) == [
+            "projects/broken.md", "projects/p0.md", "projects/p2.md"
+        ]
+        assert all((event["item"] is None) == (event["status"] != "found") for event in items)
+        assert events[-1] == {"type": "done", "total": 2, "found": 2, "missing": 0, "error": 1}
+
+    async def test_disconnect_stops_pending_loads(self, service, slow_open, monkeypatch):
+        """Test a client leaving mid-stream closes the stream and its loads are finished before the response ends"""
+        monkeypatch.setattr(settings, "CONTENT_BATCH_CONCURRENCY", 1)
+        paths = [f"projects/p{i}.md" for i in range(ITEMS)]
+        response = await content_module.get_content_items(paths, stream=True)
+
+        async def receive():
+            await asyncio.sleep(10)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                raise OSError("client disconnected")
+
+        with pytest.raises(OSError):
+            await response({"type": "http"}, receive, send)
+
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
+        assert pending == []
+        assert len(service.cache) <= 2
+
+    async def test_rejects_empty_and_oversized_batches(self, client, monkeypatch):
+        """Test validation of the path list"""
+        monkeypatch.setattr(settings, "CONTENT_BATCH_MAX_PATHS", 2)
+
+        assert (await client.post("/api/v1/content/items", json=[])).status_code == 422
+        too_many = ["projects/p0.md", "projects/p1.md", "projects/p2.md"]
+        assert (await client.post("/api/v1/content/items", json=too_many)).status_code == 422
+        # Duplicates do not count against the limit
+        duplicates = ["projects/p0.md", "projects/p0.md", "projects/p1.md"]
+        assert (await client.post("/api/v1/content/items", json=duplicates)).status_code == 200
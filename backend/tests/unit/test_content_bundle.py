@@ -0,0 +1,194 @@
+"""
+Unit tests for the content-hashed initial-render bundle
+"""
+
+import gzip
+import json
+import os
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.api.v1 import content as content_module
+from app.core.error_handlers import register_exception_handlers
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL, accepts_encoding
+from app.services.content.bundle import BundleBuilder
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+
+LAYOUT = {
+    "layout": {
+        "sections": [
+            {"id": "hero", "file": "sections/hero.md"},
+            {"id": "skills", "files": ["components/skills/a.md", "components/skills/b.md"]},
+            {"id": "contact", "file": "sections/missing.md"}
+        ]
+    }
+}
+SITE = {"meta": {}, "features": {"chatBot": {"enabled": True, "welcomeFile": "components/welcome.md"}}}
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    for relative_path, data in [
+        ("config/site.json", SITE),
+        ("config/layout.json", LAYOUT),
+        ("config/theme.json", {"themes": {}}),
+        ("personal/contact-info.json", {"name": "Robert"})
+    ]:
+        (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative_path).write_text(json.dumps(data))
+    for relative_path in ["sections/hero.md", "components/skills/a.md", "components/skills/b.md", "components/welcome.md"]:
+        (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative_path).write_text(f"---\ntitle: {relative_path}\n---\n\nText of {relative_path}.\n")
+    (tmp_path / "sections" / "unlisted.md").write_text("---\ntitle: Unlisted\n---\n\nNot rendered first.\n")
+    return tmp_path
+
+
+def make_builder(content_dir):
+    return BundleBuilder(content_dir, ContentLoader(content_dir, ContentCache(revalidate_seconds=0)))
+
+
+@pytest.fixture
+def service(content_dir, monkeypatch):
+    service = ContentService()
+    service.content_path = content_dir
+    service.cache = ContentCache(revalidate_seconds=0)
+    service.loader = ContentLoader(content_dir, service.cache)
+    service.index = ContentIndex(content_dir, service.loader)
+    service.configs = ConfigResponseCache(service.loader)
+    service.bundles = BundleBuilder(content_dir, service.loader)
+    monkeypatch.setattr(content_module, "content_service", service)
+    return service
+
+
+@pytest.fixture
+async def client(service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(content_module.router, prefix="/api/v1/content")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+def edit(path, text):
+    path.write_text(text)
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+@pytest.mark.unit
+class TestBundleBuilder:
+    """Test bundle contents and versioning"""
+
+    def test_contents(self, content_dir):
+        """Test configs and the layout's and chat widget's markdown files are bundled"""
+        bundle = make_builder(content_dir).get()
+        data = json.loads(bundle.body)
+
+        assert data["version"] == bundle.version
+        assert data["configs"]["personal"] == {"name": "Robert"}
+        assert data["configs"]["design"] is None
+        assert list(data["content"]) == [
+            "sections/hero.md", "components/skills/a.md", "components/skills/b.md", "components/welcome.md"
+        ]
+        assert data["content"]["sections/hero.md"]["metadata"]["title"] == "sections/hero.md"
+        assert gzip.decompress(bundle.gzip_body) == bundle.body
+
+    def test_version_is_deterministic(self, content_dir):
+        """Test separate builders (processes) agree on version and bytes"""
+        first, second = make_builder(content_dir).get(), make_builder(content_dir).get()
+
+        assert first.version == second.version
+        assert first.gzip_body == second.gzip_body
+
+    def test_rebuilds_only_on_change(self, content_dir):
+        """Test unchanged files reuse the bundle and an edit replaces it"""
+        builder = make_builder(content_dir)
+        first = builder.get()
+        assert builder.get() is first
+        assert builder.builds == 1
+
+        edit(content_dir / "components" / "welcome.md", "---\ntitle: Hi\n---\n\nWelcome back.\n")
+        second = builder.get()
+
+        assert second.version != first.version
+        assert builder.get_version(first.version) is first
+        assert builder.builds == 2
+
+    def test_unlisted_files_do_not_change_version(self, content_dir):
+        """Test files outside the initial render leave the version alone"""
+        builder = make_builder(content_dir)
+        version = builder.get().version
+
+        edit(content_dir / "sections" / "unlisted.md", "---\ntitle: Changed\n---\n\nChanged.\n")
+        assert builder.get().version == version
+
+    def test_accepts_encoding(self):
+        """Test Accept-Encoding parsing with quality values"""
+        def request(value):
+            return Request({"type": "http", "headers": [(b"accept-encoding", value.encode())]})
+
+        assert accepts_encoding(request("gzip, deflate, br"), "gzip")
+        assert accepts_encoding(request("br;q=1.0, gzip;q=0.8"), "gzip")
+        assert accepts_encoding(request("*"), "gzip")
+        assert not accepts_encoding(request("gzip;q=0"), "gzip")
+        assert not accepts_encoding(request("br"), "gzip")
+        assert not accepts_encoding(Request({"type": "http", "headers": []}), "gzip")
+
+
+@pytest.mark.unit
+class TestBundleEndpoints:
+    """Test the manifest and bundle routes"""
+
+    async def test_manifest_then_bundle(self, client):
+        """Test the manifest URL serves the immutable, precompressed bundle"""
+        manifest = (await client.get("/api/v1/content/bundle")).json()["data"]
+
+        response = await client.get(manifest["url"], headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == f'"{manifest["version"]}"'
+        assert int(response.headers["content-length"]) == manifest["gzip_size"]
+        assert response.json()["version"] == manifest["version"]
+
+    async def test_identity_and_304(self, client, service):
+        """Test clients without gzip get plain JSON, and revalidation gets 304"""
+        bundle = service.bundles.get()
+        url = f"/api/v1/content/bundle/{bundle.version}"
+
+        plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == bundle.body
+
+        revalidated = await client.get(url, headers={"If-None-Match": bundle.etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    async def test_unknown_version(self, client, service):
+        """Test an unknown version is a 404 naming the current one"""
+        current = service.bundles.get()
+
+        response = await client.get("/api/v1/content/bundle/0123456789abcdef")
+
+        assert response.status_code == 404
+        assert current.version in response.text
+
+    async def test_manifest_follows_edits(self, client, content_dir):
+        """Test the manifest points at a new version after an edit"""
+        before = (await client.get("/api/v1/content/bundle")).json()["data"]["version"]
+
+        edit(content_dir / "sections" / "hero.md", "---\ntitle: New\n---\n\nNew hero.\n")
+        after = (await client.get("/api/v1/content/bundle")).json()["data"]["version"]
+
+        assert after != before
+        assert (await client.get(f"/api/v1/content/bundle/{before}")).status_code == 200
@@ -2,6 +2,9 @@
 Unit tests for ContentCache service
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
 from app.services.content.content_cache import ContentCache
@@ -63,3 +66,123 @@ class TestContentCache:
         nonexistent_file = tmp_path / "nonexistent.txt"
 
         assert cache.is_cache_valid("test_key", nonexistent_file) is False
+
+
+@pytest.mark.unit
+class TestContentCacheBounds:
+    """Test LRU eviction, revalidation throttling and counters"""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test the entry read least recently is evicted at the entry limit"""
+        cache = ContentCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_byte_limit(self):
+        """Test entries are evicted to stay within the byte limit"""
+        cache = ContentCache(max_bytes=100)
+        cache.set("a", "x", size=60)
+        cache.set("b", "y", size=60)
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["bytes"] == 60
+
+    def test_oversized_entry_not_cached(self):
+        """Test a value larger than the whole cache is not stored"""
+        cache = ContentCache(max_bytes=10)
+        cache.set("small", "x")
+        cache.set("big", "y" * 100)
+
+        assert cache.get("big") is None
+        assert cache.get("small") == "x"
+
+    def test_revalidation_is_throttled(self, tmp_path, monkeypatch, clock):
+        """Test stat() runs once per revalidation interval, not on every hit"""
+        cache = ContentCache(revalidate_seconds=1.0, clock=clock)
+        test_file = tmp_path / "test.md"
+        test_file.write_text("content")
+        cache.set("key", "value")
+
+        stat_calls = []
+        original = cache._get_file_modified_time
+        monkeypatch.setattr(cache, "_get_file_modified_time", lambda path: stat_calls.append(path) or original(path))
+
+        for _ in range(10):
+            assert cache.is_cache_valid("key", test_file) is True
+        assert len(stat_calls) == 1
+
+        clock.now += 1.5
+        assert cache.is_cache_valid("key", test_file) is True
+        assert len(stat_calls) == 2
+
+    def test_modified_file_is_stale(self, tmp_path, clock):
+        """Test an entry older than its file is dropped once revalidated"""
+        cache = ContentCache(revalidate_seconds=1.0, clock=clock)
+        test_file = tmp_path / "test.md"
+        test_file.write_text("content")
+        cache.set("key", "value")
+        assert cache.is_cache_valid("key", test_file) is True
+
+        test_file.write_text("changed")
+        future = test_file.stat().st_mtime + 10
+        os.utime(test_file, (future, future))
+
+        # Still trusted within the interval
+        assert cache.is_cache_valid("key", test_file) is True
+        clock.now += 1.5
+        assert cache.is_cache_valid("key", test_file) is False
+        assert "key" not in cache
+        assert cache.get_stats()["stale"] == 1
+
+    def test_invalidate(self, tmp_path):
+        """Test an explicit invalidation takes effect before the interval ends"""
+        cache = ContentCache(revalidate_seconds=60)
+        test_file = tmp_path / "test.md"
+        test_file.write_text("content")
+        cache.set("key", "value")
+        assert cache.is_cache_valid("key", test_file) is True
+
+        assert cache.invalidate("key") is True
+        assert cache.is_cache_valid("key", test_file) is False
+        assert cache.get_stats()["bytes"] == 0
+
+    def test_hit_and_miss_counters(self, tmp_path):
+        """Test validity checks are counted as hits and misses"""
+        cache = ContentCache()
+        test_file = tmp_path / "test.md"
+        test_file.write_text("content")
+        cache.set("key", "value")
+
+        cache.is_cache_valid("key", test_file)
+        cache.is_cache_valid("missing", test_file)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_concurrent_access(self, tmp_path):
+        """Test concurrent readers and writers keep the size accounting consistent"""
+        cache = ContentCache(max_entries=50)
+        test_file = tmp_path / "test.md"
+        test_file.write_text("content")
+
+        def worker(n):
+            for i in range(200):
+                key = f"k{(n * 7 + i) % 80}"
+                cache.set(key, "v" * (i % 10 + 1))
+                cache.is_cache_valid(key, test_file)
+                cache.get(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(worker, range(8)))
+
+        stats = cache.get_stats()
+        assert stats["entries"] <= 50
+        assert stats["bytes"] == sum(entry.size for entry in cache._cache.values())
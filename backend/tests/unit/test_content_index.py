@@ -0,0 +1,172 @@
+"""
+Unit tests for the cached content index
+"""
+
+import os
+import time
+
+import pytest
+
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex, categorize
+from app.services.content.content_loader import ContentLoader
+
+ITEM = """---
+title: "{title}"
+order: {order}
+---
+
+Body of {title}.
+"""
+
+
+def write_item(path, title, order):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(ITEM.format(title=title, order=order))
+
+
+def bump_mtime(path):
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    write_item(tmp_path / "sections" / "about.md", "About", 2)
+    write_item(tmp_path / "sections" / "hero.md", "Hero", 1)
+    write_item(tmp_path / "components" / "projects" / "app.md", "App", 1)
+    write_item(tmp_path / "components" / "skills" / "python.md", "Python", 1)
+    write_item(tmp_path / "components" / "contact.md", "Contact", 1)
+    return tmp_path
+
+
+@pytest.fixture
+def index(content_dir, clock):
+    loader = ContentLoader(content_dir, ContentCache())
+    return ContentIndex(content_dir, loader, revalidate_seconds=1.0, clock=clock)
+
+
+@pytest.fixture
+def count_syscalls(monkeypatch):
+    """Count stat() and directory listings made through the os module"""
+    calls = []
+    for name in ("stat", "scandir", "listdir"):
+        original = getattr(os, name)
+
+        def counted(*args, _original=original, _name=name, **kwargs):
+            calls.append(_name)
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(os, name, counted)
+    return calls
+
+
+@pytest.mark.unit
+class TestContentIndex:
+    """Test building, caching and refreshing the content index"""
+
+    def test_categorize(self):
+        """Test files are categorized by their path under the content root"""
+        assert categorize("sections/about.md") == "sections"
+        assert categorize("sections/drafts/old.md") is None
+        assert categorize("components/projects/app.md") == "projects"
+        assert categorize("components/skills/python.md") == "skills"
+        assert categorize("components/contact.md") == "components"
+        assert categorize("config/site.json") is None
+
+    def test_snapshot_is_categorized_and_sorted(self, index):
+        """Test the snapshot matches the layout get_all_content always returned"""
+        content = index.snapshot().as_dict()
+
+        assert [item.id for item in content["sections"]] == ["hero", "about"]
+        assert [item.id for item in content["projects"]] == ["app"]
+        assert [item.id for item in content["skills"]] == ["python"]
+        assert [item.id for item in content["components"]] == ["contact"]
+
+    def test_snapshot_is_immutable(self, index):
+        """Test callers cannot modify the shared snapshot"""
+        snapshot = index.snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.categories["sections"] = ()
+        snapshot.as_dict()["sections"].clear()
+
+        assert len(index.snapshot().categories["sections"]) == 2
+
+    def test_no_syscalls_when_unchanged(self, index, count_syscalls):
+        """Test repeated reads are served from memory"""
+        index.snapshot()
+        count_syscalls.clear()
+
+        for _ in range(100):
+            index.snapshot()
+
+        assert count_syscalls == []
+        assert index.builds == 1
+
+    def test_unchanged_directory_is_not_rebuilt(self, index, clock):
+        """Test a scan that finds no change keeps the snapshot"""
+        first = index.snapshot()
+        clock.now += 2
+
+        assert index.snapshot() is first
+        assert index.scans == 2
+        assert index.builds == 1
+
+    def test_new_file_appears_after_revalidation(self, index, content_dir, clock):
+        """Test added files show up once the revalidation interval passes"""
+        index.snapshot()
+        write_item(content_dir / "sections" / "intro.md", "Intro", 3)
+
+        assert len(index.snapshot().categories["sections"]) == 2
+        clock.now += 2
+        sections = index.snapshot().categories["sections"]
+
+        assert [item.id for item in sections] == ["hero", "about", "intro"]
+        assert index.snapshot().version == 2
+
+    def test_edit_is_picked_up(self, index, content_dir, clock):
+        """Test a modified file is re-read even if the content cache still trusts it"""
+        index.snapshot()
+        index.loader.load_markdown_file(content_dir / "sections" / "about.md")
+        about = content_dir / "sections" / "about.md"
+        write_item(about, "About me", 2)
+        bump_mtime(about)
+        clock.now += 2
+
+        titles = [item.metadata.title for item in index.snapshot().categories["sections"]]
+        assert titles == ["Hero", "About me"]
+
+    def test_watched_index_waits_for_notifications(self, index, content_dir, clock, count_syscalls):
+        """Test a watched index skips scans until invalidated"""
+        index.watched = True
+        index.snapshot()
+        write_item(content_dir / "sections" / "intro.md", "Intro", 3)
+        clock.now += 60
+        count_syscalls.clear()
+
+        assert len(index.snapshot().categories["sections"]) == 2
+        assert count_syscalls == []
+
+        index.invalidate()
+        assert len(index.snapshot().categories["sections"]) == 3
+
+    def test_invalidate_during_rebuild_is_kept(self, index, content_dir, monkeypatch):
+        """Test a change notified while a rebuild is scanning triggers another rebuild"""
+        index.watched = True
+        index.snapshot()
+        original_scan = index._scan
+
+        def scan_then_notified():
+            signature = original_scan()
+            # The watcher reports a file written just after the scan saw the directory
+            write_item(content_dir / "sections" / "intro.md", "Intro", 3)
+            index.invalidate()
+            return signature
+
+        monkeypatch.setattr(index, "_scan", scan_then_notified)
+        index.invalidate()
+        assert len(index.snapshot().categories["sections"]) == 2
+
+        monkeypatch.setattr(index, "_scan", original_scan)
+        assert len(index.snapshot().categories["sections"]) == 3
@@ -0,0 +1,212 @@
+"""
+Unit tests for lexical, semantic and hybrid content search
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import content as content_module
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.content_search import ContentSearch, QueryCache
+from app.services.content_service import ContentService
+
+ITEM = "---\ntitle: {title}\n---\n\n{body}\n"
+
+
+class FakeEmbedder:
+    """Returns a fixed embedding and counts calls"""
+
+    def __init__(self, embedding=(1.0, 0.0)):
+        self.embedding = list(embedding) if embedding else None
+        self.calls = 0
+
+    async def generate_embedding(self, text):
+        self.calls += 1
+        return self.embedding
+
+
+class FakeVectorRepository:
+    """Returns canned chunks, most similar first"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.limits = []
+
+    async def similarity_search(self, query_embedding, limit=5, threshold=0.7, timeout=None):
+        self.limits.append(limit)
+        return [chunk for chunk in self.chunks if chunk["similarity"] > threshold][:limit]
+
+
+def chunk(file_path, similarity, content="chunk text"):
+    return {"content_id": f"{file_path}_0", "file_path": file_path, "content": content,
+            "metadata": {}, "similarity": similarity}
+
+
+@pytest.fixture
+def content(tmp_path):
+    sections = tmp_path / "sections"
+    projects = tmp_path / "components" / "projects"
+    sections.mkdir()
+    projects.mkdir(parents=True)
+    (sections / "about.md").write_text(ITEM.format(title="About", body="I run Kubernetes at home."))
+    (projects / "cluster.md").write_text(ITEM.format(title="Homelab Cluster", body="Kubernetes, Kubernetes, Helm."))
+    (projects / "speech.md").write_text(ITEM.format(title="Speech", body="Evaluating Whisper models."))
+
+    service = ContentService()
+    service.content_path = tmp_path
+    service.cache = ContentCache()
+    service.loader = ContentLoader(tmp_path, service.cache)
+    service.index = ContentIndex(tmp_path, service.loader)
+    return service
+
+
+@pytest.fixture
+def vectors():
+    return FakeVectorRepository([
+        chunk("components/projects/speech.md", 0.9, "Evaluating **Whisper** <models>"),
+        chunk("components/projects/speech.md", 0.8),
+        chunk("config/qa/unlisted.md", 0.7),
+        chunk("sections/about.md", 0.6)
+    ])
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+@pytest.fixture
+def search(content, vectors, embedder, monkeypatch):
+    monkeypatch.setenv("RAG_ENABLED", "true")
+    return ContentSearch(content, vectors, embedder, QueryCache(max_entries=8, ttl_seconds=60), threshold=0.3)
+
+
+def ids(hits):
+    return [hit.item.id for hit in hits]
+
+
+@pytest.mark.unit
+class TestContentSearch:
+    """Test search modes, grouping and caching"""
+
+    async def test_lexical(self, search, embedder):
+        """Test lexical mode ranks with BM25 and never embeds"""
+        hits, mode = await search.search("kubernetes")
+
+        assert mode == "lexical"
+        assert ids(hits) == ["cluster", "about"]
+        assert embedder.calls == 0
+
+    async def test_semantic_groups_chunks_by_file(self, search):
+        """Test chunks of one file become one item scored by its best chunk"""
+        hits, mode = await search.search("voice transcription", mode="semantic", limit=5)
+
+        assert mode == "semantic"
+        assert ids(hits) == ["speech", "about"]
+        assert hits[0].score == 0.9
+        assert hits[0].snippet == "Evaluating Whisper &lt;models&gt;"
+
+    async def test_semantic_fetches_extra_chunks(self, search, vectors):
+        """Test enough chunks are fetched to fill the limit after grouping"""
+        await search.search("anything", mode="semantic", limit=2)
+
+        assert vectors.limits == [2 * ContentSearch.CHUNKS_PER_ITEM]
+
+    async def test_hybrid_fuses_rankings(self, search):
+        """Test items found by both rankings rank above items found by one"""
+        hits, mode = await search.search("kubernetes", mode="hybrid")
+
+        assert mode == "hybrid"
+        assert ids(hits) == ["about", "cluster", "speech"]
+        assert "<mark>Kubernetes</mark>" in hits[0].snippet
+
+    async def test_falls_back_to_lexical_without_rag(self, search, embedder, monkeypatch):
+        """Test semantic search degrades to lexical and is not cached"""
+        monkeypatch.setenv("RAG_ENABLED", "false")
+
+        hits, mode = await search.search("kubernetes", mode="semantic")
+
+        assert mode == "lexical"
+        assert ids(hits) == ["cluster", "about"]
+        assert embedder.calls == 0
+        assert len(search.cache) == 0
+
+    async def test_falls_back_when_embedding_fails(self, search, embedder):
+        """Test a missing query embedding degrades to lexical"""
+        embedder.embedding = None
+
+        hits, mode = await search.search("whisper", mode="hybrid")
+
+        assert mode == "lexical"
+        assert ids(hits) == ["speech"]
+
+    async def test_results_cached_per_query(self, search, embedder):
+        """Test a repeated query, modulo case and spacing, is served from the cache"""
+        first = await search.search("Voice  transcription", mode="semantic")
+        second = await search.search("voice transcription", mode="semantic")
+
+        assert second is first
+        assert embedder.calls == 1
+        assert search.get_stats()["hits"] == 1
+
+    def test_injected_cache_is_used(self, content, vectors, embedder):
+        """Test an empty cache passed in is kept rather than replaced by a default one"""
+        cache = QueryCache(max_entries=8, ttl_seconds=60)
+
+        assert ContentSearch(content, vectors, embedder, cache).cache is cache
+
+    async def test_cache_follows_content_version(self, search, content, embedder):
+        """Test a content change and an explicit invalidation both bypass cached results"""
+        await search.search("whisper", mode="semantic")
+        content.index.invalidate()
+        (content.content_path / "sections" / "new.md").write_text(ITEM.format(title="New", body="Whisper too."))
+
+        await search.search("whisper", mode="semantic")
+        search.invalidate()
+        await search.search("whisper", mode="semantic")
+
+        assert embedder.calls == 3
+
+
+@pytest.mark.unit
+class TestQueryCache:
+    """Test the per-query result cache"""
+
+    def test_expires_and_evicts(self):
+        """Test entries expire after the TTL and the least recently used are evicted"""
+        now = [0.0]
+        cache = QueryCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        now[0] = 11
+        assert cache.get("c") is None
+
+
+@pytest.mark.unit
+class TestSearchEndpoint:
+    """Test GET /content/search"""
+
+    async def test_mode_parameter(self, search, monkeypatch):
+        """Test the mode is passed through and reported"""
+        monkeypatch.setattr(content_module, "content_search", search)
+        app = FastAPI()
+        app.include_router(content_module.router, prefix="/api/v1/content")
+
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/v1/content/search", params={"q": "kubernetes", "mode": "hybrid"})
+            invalid = await client.get("/api/v1/content/search", params={"q": "kubernetes", "mode": "fuzzy"})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["mode"] == "hybrid"
+        assert [item["id"] for item in body["data"]] == ["about", "cluster", "speech"]
+        assert [hit["id"] for hit in body["hits"]] == ["about", "cluster", "speech"]
+        assert invalid.status_code == 422
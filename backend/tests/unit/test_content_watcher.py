@@ -0,0 +1,189 @@
+"""
+Unit tests for the content directory watcher
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import rag_service as rag_service_module
+from app.services.rag import content_processor as processor_module
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_loader import ContentLoader
+from app.services.content.content_watcher import ContentChanges, ContentWatcher
+from app.services.content_service import ContentService
+from app.services.rag_service import RAGService
+
+ITEM = """---
+title: "{title}"
+order: 1
+---
+
+Body of {title}.
+"""
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "sections" / "about.md").write_text(ITEM.format(title="About"))
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "site.json").write_text('{"title": "Site"}')
+    return tmp_path
+
+
+async def wait_for(condition, timeout: float = 2.0) -> float:
+    """Wait until condition() is true; return the seconds it took"""
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.02)
+    return time.monotonic() - started
+
+
+def touch_later(path: Path, text: str) -> None:
+    """Rewrite a file with an mtime distinct from the previous write"""
+    path.write_text(text)
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+@pytest.mark.unit
+class TestContentChanges:
+    """Test merging change batches"""
+
+    def test_latest_change_wins(self):
+        """Test a file deleted then recreated counts as modified"""
+        changes = ContentChanges(deleted={"a.md"})
+        changes.merge(ContentChanges(modified={"a.md", "b.json"}))
+
+        assert changes.modified == {"a.md", "b.json"}
+        assert changes.deleted == set()
+        assert changes.markdown() == (["a.md"], [])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("force_polling", [True, False], ids=["polling", "watchfiles"])
+class TestContentWatcher:
+    """Test change detection with both backends"""
+
+    async def test_edit_is_reported(self, content_dir, force_polling):
+        """Test an edit is handed to subscribers within a second"""
+        watcher = ContentWatcher(content_dir, debounce_ms=100, poll_interval=0.05, force_polling=force_polling)
+        batches = []
+        watcher.subscribe(batches.append)
+        await watcher.start()
+        try:
+            await asyncio.sleep(0.1)
+            touch_later(content_dir / "sections" / "about.md", ITEM.format(title="Changed"))
+            elapsed = await wait_for(lambda: batches)
+        finally:
+            await watcher.stop()
+
+        assert batches[0].modified == {"sections/about.md"}
+        assert elapsed < 1.0
+
+    async def test_burst_is_debounced(self, content_dir, force_polling):
+        """Test a burst of edits arrives as one batch"""
+        watcher = ContentWatcher(content_dir, debounce_ms=200, poll_interval=0.05, force_polling=force_polling)
+        batches = []
+        watcher.subscribe(batches.append)
+        await watcher.start()
+        try:
+            await asyncio.sleep(0.1)
+            for i in range(5):
+                (content_dir / "sections" / f"new{i}.md").write_text(ITEM.format(title=f"New {i}"))
+                await asyncio.sleep(0.03)
+            await wait_for(lambda: batches)
+            await asyncio.sleep(0.4)
+        finally:
+            await watcher.stop()
+
+        assert len(batches) == 1
+        assert batches[0].modified == {f"sections/new{i}.md" for i in range(5)}
+
+    async def test_delete_is_reported(self, content_dir, force_polling):
+        """Test removed files are reported as deleted"""
+        watcher = ContentWatcher(content_dir, debounce_ms=50, poll_interval=0.05, force_polling=force_polling)
+        batches = []
+        watcher.subscribe(batches.append)
+        await watcher.start()
+        try:
+            await asyncio.sleep(0.1)
+            (content_dir / "sections" / "about.md").unlink()
+            await wait_for(lambda: batches)
+        finally:
+            await watcher.stop()
+
+        assert batches[0].deleted == {"sections/about.md"}
+
+
+@pytest.mark.unit
+class TestChangeHandlers:
+    """Test what subscribers do with a batch"""
+
+    def test_only_changed_cache_keys_are_invalidated(self, content_dir):
+        """Test readers see the edit without a full cache flush"""
+        service = ContentService()
+        service.content_path = content_dir
+        service.cache = ContentCache(revalidate_seconds=3600)
+        service.loader = ContentLoader(content_dir, service.cache)
+
+        assert service.get_content_item("sections/about.md").metadata.title == "About"
+        # The first cached read checks the file, later ones trust the entry
+        service.get_content_item("sections/about.md")
+        service.loader.load_json_file(content_dir / "config" / "site.json")
+        touch_later(content_dir / "sections" / "about.md", ITEM.format(title="Changed"))
+
+        # Trusted without a stat() until invalidated
+        assert service.get_content_item("sections/about.md").metadata.title == "About"
+
+        removed = service.apply_changes(ContentChanges(modified={"sections/about.md"}))
+
+        assert removed == 1
+        assert service.get_content_item("sections/about.md").metadata.title == "Changed"
+        assert service.loader.cache_key(content_dir / "config" / "site.json") in service.cache
+
+    async def test_reindex_embeds_only_changed_markdown(self, content_dir, monkeypatch):
+        """Test the RAG handler re-embeds changed files and drops deleted ones"""
+        monkeypatch.setenv("RAG_ENABLED", "true")
+        monkeypatch.setattr(rag_service_module.settings, "CONTENT_PATH", str(content_dir))
+        monkeypatch.setattr(rag_service_module.settings, "CONTENT_WATCH_REEMBED", True)
+        monkeypatch.setattr(processor_module.settings, "CONTENT_PATH", str(content_dir))
+        monkeypatch.setattr(
+            processor_module.embedding_service,
+            "generate_embedding",
+            AsyncMock(return_value=[0.1, 0.2])
+        )
+
+        service = RAGService()
+        service.initialize = AsyncMock()
+        vector_repo = MagicMock()
+        vector_repo.store_embedding = AsyncMock(return_value=True)
+        vector_repo.delete_file_embeddings = AsyncMock(return_value=1)
+        service.content_processor.vector_repo = vector_repo
+
+        service.schedule_reindex(ContentChanges(
+            modified={"sections/about.md", "config/site.json"},
+            deleted={"sections/old.md"}
+        ))
+        await service._reindex_task
+
+        stored_files = {call.args[0].file_path for call in vector_repo.store_embedding.call_args_list}
+        assert stored_files == {"sections/about.md"}
+        deleted_calls = [call.args[0] for call in vector_repo.delete_file_embeddings.call_args_list]
+        assert sorted(deleted_calls) == ["sections/about.md", "sections/old.md"]
+
+    async def test_reindex_skipped_when_rag_disabled(self, monkeypatch):
+        """Test no re-embedding is scheduled when RAG is off"""
+        monkeypatch.setenv("RAG_ENABLED", "false")
+        service = RAGService()
+
+        service.schedule_reindex(ContentChanges(modified={"sections/about.md"}))
+
+        assert service._reindex_task is None
@@ -0,0 +1,159 @@
+"""
+Unit tests for ConversationMemory service
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.repositories.conversation_repository import conversation_uuid
+from app.services.rag.conversation_memory import ConversationMemory
+
+
+class FakeConversationRepository:
+    """In-memory stand-in for ConversationRepository"""
+
+    def __init__(self):
+        self.batches = []
+        self.deleted = []
+        self.stored = {}
+        self.fail_writes = False
+
+    async def save_batch(self, conversations, messages):
+        if self.fail_writes:
+            raise ConnectionError("database unavailable")
+        self.batches.append((conversations, messages))
+        for conv_id, role, content, _, timestamp in messages:
+            self.stored.setdefault(conv_id, []).append(
+                {"role": role, "content": content, "timestamp": timestamp}
+            )
+
+    async def load_recent(self, conv_id, limit, timeout=None):
+        return "", self.stored.get(conv_id, [])[-limit:]
+
+    async def delete(self, conv_id):
+        self.deleted.append(conv_id)
+        self.stored.pop(conv_id, None)
+
+
+@pytest.mark.unit
+class TestConversationMemory:
+    """Test ConversationMemory service"""
+
+    @pytest.fixture
+    def repository(self):
+        return FakeConversationRepository()
+
+    @pytest.fixture
+    def memory(self, repository):
+        return ConversationMemory(repository, recent_messages=4, flush_interval=60)
+
+    async def test_append_then_history(self, memory):
+        """Test appended exchanges are returned as chat messages"""
+        memory.append_exchange("conv-1", "Hi", "Hello!")
+
+        history = await memory.get_history("conv-1")
+
+        assert history.to_chat_messages() == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello!"}
+        ]
+        await memory.close()
+
+    async def test_append_is_write_behind(self, memory, repository):
+        """Test appends do not write to the database until flushed"""
+        memory.append_exchange("conv-1", "Q1", "A1")
+        memory.append_exchange("conv-2", "Q2", "A2")
+
+        assert repository.batches == []
+
+        written = await memory.flush()
+
+        assert written == 4
+        assert len(repository.batches) == 1
+        # Written to TIMESTAMPTZ columns, so never naive local time
+        assert all(message[4].utcoffset() == timedelta(0) for message in repository.batches[0][1])
+        await memory.close()
+
+    async def test_old_turns_fold_into_summary(self, memory):
+        """Test turns beyond the recent window become a bounded summary"""
+        for i in range(5):
+            memory.append_exchange("conv-1", f"Question {i}?", f"Answer {i}. More detail.")
+
+        history = await memory.get_history("conv-1")
+
+        assert len(history.messages) == 4
+        assert "Visitor asked: Question 0?" in history.summary
+        assert "Assistant answered: Answer 0." in history.summary
+        assert "More detail" not in history.summary
+        assert history.to_chat_messages()[0]["role"] == "system"
+        await memory.close()
+
+    async def test_summary_is_bounded(self, repository):
+        """Test the rolling summary never exceeds its size cap"""
+        memory = ConversationMemory(repository, recent_messages=2, summary_max_chars=200)
+        for i in range(50):
+            memory.append_exchange("conv-1", f"Question number {i}?", f"Answer number {i}.")
+
+        history = await memory.get_history("conv-1")
+
+        assert len(history.summary) <= 200
+        assert "Question number 48?" in history.summary
+        await memory.close()
+
+    async def test_failed_flush_keeps_messages(self, memory, repository):
+        """Test messages survive a failed write and are retried"""
+        memory.append_exchange("conv-1", "Q", "A")
+        repository.fail_writes = True
+
+        with pytest.raises(ConnectionError):
+            await memory.flush()
+
+        repository.fail_writes = False
+        assert await memory.flush() == 2
+        await memory.close()
+
+    async def test_clear_removes_everything(self, memory, repository):
+        """Test clearing drops memory, pending writes and stored rows"""
+        memory.append_exchange("conv-1", "Q", "A")
+
+        await memory.clear("conv-1")
+        await memory.flush()
+
+        assert repository.deleted == [conversation_uuid("conv-1")]
+        assert repository.batches == []
+        history = await memory.get_history("conv-1")
+        assert history.is_empty
+        await memory.close()
+
+    async def test_cache_miss_loads_from_repository(self, memory, repository):
+        """Test an unknown conversation is loaded from the database"""
+        memory.append_exchange("conv-1", "Q", "A")
+        await memory.flush()
+
+        fresh = ConversationMemory(repository, recent_messages=4)
+        history = await fresh.get_history("conv-1")
+
+        assert [turn.content for turn in history.messages] == ["Q", "A"]
+        await memory.close()
+
+    async def test_cache_hit_is_sub_millisecond(self, memory):
+        """Test history lookups on a cache hit stay well under a millisecond"""
+        memory.append_exchange("conv-1", "Q", "A")
+        await memory.get_history("conv-1")
+
+        iterations = 1000
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await memory.get_history("conv-1")
+        per_call = (time.perf_counter() - started) / iterations
+
+        assert per_call < 0.001
+        await memory.close()
+
+    def test_conversation_uuid_is_stable(self):
+        """Test non-UUID conversation IDs map to a stable UUID"""
+        assert conversation_uuid("conv_123") == conversation_uuid("conv_123")
+        assert str(conversation_uuid("6f1c8a52-3d0e-4b8e-9a57-2b1f0c4d7e91")) == \
+            "6f1c8a52-3d0e-4b8e-9a57-2b1f0c4d7e91"
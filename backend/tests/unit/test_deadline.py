@@ -0,0 +1,178 @@
+"""
+Unit tests for request deadlines and chat pipeline degradation
+"""
+
+import asyncio
+import time
+
+import asyncpg
+import httpx
+import pytest
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.v1 import chat as chat_module
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError
+from app.repositories.vector_repository import VectorRepository
+from app.services import rag_service as rag_service_module
+from app.services.rag.context_builder import ContextBuilder
+from app.services.rag_service import RAGService
+
+
+async def sleep_then(seconds, value):
+    await asyncio.sleep(seconds)
+    return value
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Test Deadline budget accounting"""
+
+    def test_remaining_excludes_reserve(self):
+        """Test the reserve is held back from the working budget"""
+        now = [100.0]
+        deadline = Deadline(2.0, reserve=0.5, clock=lambda: now[0])
+
+        assert deadline.remaining() == pytest.approx(1.5)
+        now[0] += 1.0
+        assert deadline.remaining() == pytest.approx(0.5)
+        now[0] += 1.0
+        assert deadline.remaining() == 0
+        assert deadline.expired
+
+    def test_share_is_capped(self):
+        """Test a stage share never exceeds its cap"""
+        deadline = Deadline(10.0, clock=lambda: 0.0)
+
+        assert deadline.share(0.5) == pytest.approx(5.0)
+        assert deadline.share(0.5, cap=2.0) == pytest.approx(2.0)
+
+    async def test_run_times_out(self):
+        """Test a stage running past its share raises DeadlineExceededError"""
+        deadline = Deadline(0.05)
+
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            await deadline.run(sleep_then(1.0, "late"), "retrieval")
+
+        assert exc_info.value.stage == "retrieval"
+
+    async def test_run_expired_does_not_start(self):
+        """Test an expired deadline fails immediately"""
+        deadline = Deadline(0.0)
+
+        with pytest.raises(DeadlineExceededError):
+            await deadline.run(sleep_then(0, "never"), "generation")
+
+
+@pytest.mark.unit
+class TestChatDegradation:
+    """Test the RAG pipeline falls back in steps as the budget runs out"""
+
+    @pytest.fixture
+    def context_results(self, mock_vector_results):
+        return [
+            {**result, "content": f"### Q1: Topic\n**Question?**\n\n{result['content']} answer."}
+            for result in mock_vector_results
+        ]
+
+    @pytest.fixture
+    def service(self, monkeypatch, context_results):
+        monkeypatch.setattr(rag_service_module.settings, "QA_FAST_PATH_ENABLED", False)
+        monkeypatch.setattr(rag_service_module.settings, "CHAT_MIN_LLM_SECONDS", 0.01)
+        monkeypatch.setattr(
+            rag_service_module.embedding_service,
+            "generate_embedding",
+            AsyncMock(return_value=[0.1, 0.2, 0.3])
+        )
+
+        vector_repo = MagicMock()
+        vector_repo.similarity_search = AsyncMock(return_value=context_results)
+
+        service = RAGService()
+        service.context_builder = ContextBuilder(vector_repo)
+        service.chat_service = MagicMock()
+        service.chat_service.generate_response = AsyncMock(return_value="LLM answer")
+        return service
+
+    async def test_within_budget(self, service):
+        """Test a fast pipeline is not degraded"""
+        result = await service.chat("What does Robert do?", deadline=Deadline(1.0))
+
+        assert result["response"] == "LLM answer"
+        assert result["degraded"] is None
+
+    async def test_slow_retrieval_is_skipped(self, service):
+        """Test retrieval past its share is skipped and the LLM still answers"""
+        async def slow_search(*args, **kwargs):
+            return await sleep_then(5.0, [])
+        service.context_builder.vector_repo.similarity_search = slow_search
+
+        result = await service.chat("What does Robert do?", deadline=Deadline(0.5))
+
+        assert result["response"] == "LLM answer"
+        assert result["degraded"] == "retrieval_skipped"
+        assert result["sources"] == []
+
+    async def test_slow_llm_answers_from_context(self, service):
+        """Test a slow LLM falls back to an answer built from retrieved chunks"""
+        async def slow_llm(*args, deadline=None, **kwargs):
+            return await deadline.run(sleep_then(5.0, "late"), "generation")
+        service.chat_service.generate_response = slow_llm
+
+        started = time.monotonic()
+        result = await service.chat("What does Robert do?", deadline=Deadline(0.3, reserve=0.05))
+
+        assert time.monotonic() - started < 0.3
+        assert result["degraded"] == "context_answer"
+        assert "Test content 1 answer." in result["response"]
+        assert "`test.md`" in result["response"]
+
+    async def test_no_context_uses_basic_response(self, service):
+        """Test the keyword response is the last fallback"""
+        service.context_builder.vector_repo.similarity_search = AsyncMock(return_value=[])
+        service.chat_service.generate_response = AsyncMock(
+            side_effect=DeadlineExceededError("generation")
+        )
+
+        result = await service.chat("How can I contact Robert?", deadline=Deadline(1.0))
+
+        assert result["degraded"] == "basic_response"
+        assert "robert.zeijlon.92@gmail.com" in result["response"]
+
+
+@pytest.mark.unit
+class TestHistoryDeadline:
+    """Test database setup and history lookup stay within the chat budget"""
+
+    async def test_slow_database_answers_without_history(self, monkeypatch):
+        """Test a hanging database costs only the history share and the answer has no history"""
+        monkeypatch.setenv("RAG_ENABLED", "true")
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+        monkeypatch.setattr(chat_module.settings, "CHAT_SLO_SECONDS", 0.5)
+        monkeypatch.setattr(chat_module.rag_service, "initialize", lambda: sleep_then(5.0, None))
+        chat = AsyncMock(return_value={"response": "Hi", "sources": [], "degraded": None})
+        monkeypatch.setattr(chat_module.rag_service, "chat", chat)
+        monkeypatch.setattr(chat_module.conversation_memory, "append_exchange", lambda *args: None)
+
+        app = FastAPI()
+        app.include_router(chat_module.router, prefix="/api/v1/chat")
+        started = time.monotonic()
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/api/v1/chat/message", json={"message": "Hello", "use_rag": True})
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Hi"
+        assert time.monotonic() - started < 0.3
+        assert chat.await_args.kwargs["history"] == []
+
+    async def test_pool_created_once(self, monkeypatch):
+        """Test initialize() builds the connection pool only on the first call"""
+        create_pool = AsyncMock(return_value=MagicMock())
+        monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+        repository = VectorRepository()
+
+        await asyncio.gather(repository.initialize(), repository.initialize())
+        await repository.initialize()
+
+        assert create_pool.await_count == 1
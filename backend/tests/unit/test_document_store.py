@@ -0,0 +1,174 @@
+"""
+Unit tests for the shared markdown document store
+"""
+
+import builtins
+import os
+
+import pytest
+
+from app.services.content import document_store as document_store_module
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_loader import ContentLoader
+from app.services.content.content_watcher import ContentChanges
+from app.services.content.document_store import ContentFileNotFoundError, DocumentStore
+from app.services.embedding_service import embedding_service
+from app.services.resume_service import ResumeDataAggregator
+
+PROJECT = "---\ntitle: Robot\norder: 2\nfeatured: true\n---\n\nBuilds things.\n"
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "components" / "projects").mkdir(parents=True)
+    (tmp_path / "components" / "projects" / "robot.md").write_text(PROJECT)
+    return tmp_path
+
+
+@pytest.fixture
+def counted_open(monkeypatch):
+    """Count the files the document store opens"""
+    opened = []
+
+    def open_counting(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return builtins.open(path, *args, **kwargs)
+
+    monkeypatch.setattr(document_store_module, "open", open_counting, raising=False)
+    return opened
+
+
+def touch(path, text):
+    """Rewrite a file with a later mtime, so the change is seen whatever the clock resolution"""
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.unit
+class TestDocumentStore:
+    """Test parsing, revalidation and change notification"""
+
+    def test_parse_once(self, content_dir, counted_open):
+        """Test every spelling of a path reads the file once and returns one document"""
+        store = DocumentStore(content_dir)
+
+        first = store.get("components/projects/robot.md")
+        second = store.get(content_dir / "components" / "projects" / "robot.md", revalidate=True)
+
+        assert first is second
+        assert counted_open == ["robot.md"]
+        assert first.path == "components/projects/robot.md"
+        assert dict(first.metadata) == {"title": "Robot", "order": 2, "featured": True}
+        assert first.body == "Builds things."
+        with pytest.raises(TypeError):
+            first.metadata["title"] = "Changed"
+
+    def test_trusted_within_revalidate_window(self, content_dir, clock):
+        """Test a document is re-checked only after revalidate_seconds"""
+        store = DocumentStore(content_dir, revalidate_seconds=1, clock=clock)
+        path = content_dir / "components" / "projects" / "robot.md"
+
+        first = store.get(path)
+        touch(path, PROJECT.replace("Robot", "Rover"))
+        assert store.get(path) is first
+
+        clock.now += 2
+        assert store.get(path).metadata["title"] == "Rover"
+
+    def test_change_notifies_subscribers(self, content_dir):
+        """Test subscribers hear about changed content, not about unchanged re-reads"""
+        store = DocumentStore(content_dir)
+        path = content_dir / "components" / "projects" / "robot.md"
+        changed = []
+        store.subscribe(changed.append)
+
+        store.get(path)
+        touch(path, PROJECT)
+        store.get(path, revalidate=True)
+        assert changed == []
+
+        touch(path, PROJECT.replace("Robot", "Rover"))
+        store.get(path, revalidate=True)
+        assert changed == ["components/projects/robot.md"]
+
+    def test_apply_changes(self, content_dir, counted_open):
+        """Test watcher changes drop the documents and notify subscribers"""
+        store = DocumentStore(content_dir)
+        changed = []
+        store.subscribe(changed.append)
+        store.get("components/projects/robot.md")
+
+        forgotten = store.apply_changes(ContentChanges(modified={"components/projects/robot.md"}))
+        store.get("components/projects/robot.md")
+
+        assert forgotten == 1
+        assert changed == ["components/projects/robot.md"]
+        assert counted_open == ["robot.md", "robot.md"]
+
+    def test_missing_file(self, content_dir):
+        """Test a missing or deleted file raises ContentFileNotFoundError"""
+        store = DocumentStore(content_dir)
+        path = content_dir / "components" / "projects" / "robot.md"
+        store.get(path)
+        path.unlink()
+
+        with pytest.raises(ContentFileNotFoundError):
+            store.get(path, revalidate=True)
+        with pytest.raises(ContentFileNotFoundError):
+            store.get("components/projects/nope.md")
+        assert len(store) == 0
+
+    async def test_get_async(self, content_dir):
+        """Test the async variant returns the shared document"""
+        store = DocumentStore(content_dir)
+
+        document = await store.get_async("components/projects/robot.md")
+
+        assert document is store.get("components/projects/robot.md")
+
+
+@pytest.mark.unit
+class TestSharedDocuments:
+    """Test content, resume and RAG ingestion agree on one parse"""
+
+    def test_consumers_share_one_read(self, content_dir, counted_open):
+        """Test the loader, resume aggregator and embedding metadata use the same document"""
+        store = DocumentStore(content_dir)
+        loader = ContentLoader(content_dir, ContentCache(), store)
+        aggregator = ResumeDataAggregator(str(content_dir), documents=store)
+
+        item = loader.load_markdown_file(content_dir / "components" / "projects" / "robot.md")
+        projects = aggregator.get_projects()
+        document = store.get("components/projects/robot.md")
+        metadata = embedding_service.extract_metadata_from_content(
+            document.raw, document.path, frontmatter=document.metadata
+        )
+
+        assert counted_open == ["robot.md"]
+        assert item.metadata.title == projects[0]["title"] == metadata["title"] == "Robot"
+        assert metadata["order"] == item.metadata.order == 2
+        assert metadata["type"] == "project"
+
+    def test_embedding_metadata_without_document(self):
+        """Test metadata is parsed with the shared frontmatter parser when not given"""
+        metadata = embedding_service.extract_metadata_from_content(PROJECT, "components/projects/robot.md")
+
+        assert metadata["title"] == "Robot"
+        assert metadata["order"] == 2
+        assert metadata["featured"] is True
+        assert metadata["file_path"] == "components/projects/robot.md"
+
+    def test_resume_rebuilt_on_document_change(self, content_dir, clock):
+        """Test a changed document resets the aggregated resume sections"""
+        store = DocumentStore(content_dir, revalidate_seconds=1, clock=clock)
+        aggregator = ResumeDataAggregator(str(content_dir), documents=store)
+        path = content_dir / "components" / "projects" / "robot.md"
+
+        assert aggregator.get_complete_resume_data()["projects"][0]["title"] == "Robot"
+
+        touch(path, PROJECT.replace("Robot", "Rover"))
+        assert aggregator.get_complete_resume_data()["projects"][0]["title"] == "Robot"
+
+        clock.now += 2
+        assert aggregator.get_complete_resume_data()["projects"][0]["title"] == "Rover"
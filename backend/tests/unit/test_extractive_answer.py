@@ -0,0 +1,145 @@
+"""
+Unit tests for extractive fallback answers
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.deadline import Deadline
+from app.core.exceptions import ExternalAPIError
+from app.services import rag_service as rag_service_module
+from app.services.rag.context_builder import ContextBuilder
+from app.services.rag.extractive_answer import ExtractiveAnswerGenerator, split_sentences
+from app.services.rag.llm_router import RateLimitError
+from app.services.rag_service import RAGService
+
+KUBERNETES_CHUNK = """### Q12: Kubernetes & Container Orchestration
+**Describe your Kubernetes experience.**
+
+I run a k3s high-availability cluster with three control-plane nodes at home. Workloads are deployed with Helm charts and Argo CD. I also enjoy hiking on weekends.
+"""
+
+PROJECT_CHUNK = """### Q20: Transcriptomatic
+**What is Transcriptomatic?**
+
+Transcriptomatic is a speech-to-text evaluation platform. It compares Whisper models on word error rate and latency.
+"""
+
+
+@pytest.fixture
+def context_results():
+    return [
+        {"content": KUBERNETES_CHUNK, "file_path": "rag-knowledge-base/02-technical.md", "similarity": 0.62},
+        {"content": PROJECT_CHUNK, "file_path": "rag-knowledge-base/03-projects.md", "similarity": 0.41}
+    ]
+
+
+@pytest.mark.unit
+class TestExtractiveAnswerGenerator:
+    """Test sentence selection and formatting"""
+
+    def test_split_sentences_skips_markup(self):
+        """Test headings and bold question lines are not sentences"""
+        sentences = split_sentences(KUBERNETES_CHUNK)
+
+        assert sentences[0].startswith("I run a k3s")
+        assert not any(s.startswith(("#", "**")) for s in sentences)
+        assert len(sentences) == 3
+
+    def test_picks_relevant_sentences(self, context_results):
+        """Test the sentences closest to the query are chosen"""
+        generator = ExtractiveAnswerGenerator(max_sentences=1)
+
+        answer = generator.generate("Which models does Transcriptomatic compare?", context_results)
+
+        assert "compares Whisper models" in answer
+        assert "hiking" not in answer
+        assert "`rag-knowledge-base/03-projects.md`" in answer
+
+    def test_markdown_with_sources_and_note(self, context_results):
+        """Test the answer lists sentences, sources and the note"""
+        generator = ExtractiveAnswerGenerator(max_sentences=3)
+
+        answer = generator.generate("Kubernetes k3s cluster", context_results, note="Quoted directly.")
+
+        assert answer.startswith("Here's what I found")
+        assert "- I run a k3s high-availability cluster" in answer
+        assert "**Sources:** `rag-knowledge-base/02-technical.md`" in answer
+        assert answer.endswith("*Quoted directly.*")
+
+    def test_no_context(self):
+        """Test an empty string is returned without usable chunks"""
+        assert ExtractiveAnswerGenerator().generate("anything", []) == ""
+
+    def test_runs_under_ten_milliseconds(self, context_results):
+        """Test five full-size chunks are answered well under 10 ms"""
+        generator = ExtractiveAnswerGenerator()
+        chunks = [
+            {**result, "content": result["content"] + KUBERNETES_CHUNK.split("\n\n")[1] * 8}
+            for result in context_results * 3
+        ][:5]
+        generator.generate("warm up", chunks)
+
+        iterations = 50
+        started = time.perf_counter()
+        for _ in range(iterations):
+            generator.generate("How do you deploy workloads on Kubernetes?", chunks)
+        per_call = (time.perf_counter() - started) / iterations
+
+        assert per_call < 0.010
+
+
+@pytest.mark.unit
+class TestLLMFallback:
+    """Test the RAG pipeline answers extractively when the LLM is unusable"""
+
+    @pytest.fixture
+    def service(self, monkeypatch, context_results):
+        monkeypatch.setattr(rag_service_module.settings, "QA_FAST_PATH_ENABLED", False)
+        monkeypatch.setattr(
+            rag_service_module.embedding_service,
+            "generate_embedding",
+            AsyncMock(return_value=[0.1, 0.2, 0.3])
+        )
+
+        vector_repo = MagicMock()
+        vector_repo.similarity_search = AsyncMock(return_value=context_results)
+
+        service = RAGService()
+        service.context_builder = ContextBuilder(vector_repo)
+        service.chat_service = MagicMock()
+        return service
+
+    async def test_daily_rate_limit(self, service):
+        """Test a TPD limit produces an extractive answer instead of an error"""
+        service.chat_service.generate_response = AsyncMock(
+            side_effect=RateLimitError("Limit tokens per day (TPD)", "TPD")
+        )
+
+        result = await service.chat("Tell me about Kubernetes", deadline=Deadline(5.0))
+
+        assert result["degraded"] == "context_answer"
+        assert "k3s" in result["response"]
+        assert "daily limit" in result["response"]
+
+    async def test_short_rate_limit_is_raised(self, service):
+        """Test per-minute limits are still surfaced to the caller"""
+        service.chat_service.generate_response = AsyncMock(
+            side_effect=RateLimitError("Limit requests per minute (RPM)", "RPM", retry_after=20)
+        )
+
+        with pytest.raises(RateLimitError):
+            await service.chat("Tell me about Kubernetes", deadline=Deadline(5.0))
+
+    async def test_provider_outage(self, service):
+        """Test an outage of every provider produces an extractive answer"""
+        service.chat_service.generate_response = AsyncMock(
+            side_effect=ExternalAPIError("LLM", message="No provider produced a response")
+        )
+
+        result = await service.chat("Tell me about Kubernetes", deadline=Deadline(5.0))
+
+        assert result["degraded"] == "context_answer"
+        assert "unavailable" in result["response"]
@@ -0,0 +1,198 @@
+"""
+Unit tests for HTTP conditional caching of content and theme endpoints
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.api.v1 import content as content_module
+from app.api.v1 import theme as theme_module
+from app.core import http_cache
+from app.core.config import settings
+from app.core.error_handlers import register_exception_handlers
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+
+THEMES = {
+    "themes": {"dark": {"name": "Dark", "colors": {"bg": "#000"}, "effects": {}}},
+    "customization": {}
+}
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/content/all",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    })
+
+
+def make_service(content_path):
+    service = ContentService()
+    service.content_path = content_path
+    # Revalidate on every read so edits are seen without a watcher
+    service.cache = ContentCache(revalidate_seconds=0)
+    service.loader = ContentLoader(content_path, service.cache)
+    service.index = ContentIndex(content_path, service.loader)
+    service.configs = ConfigResponseCache(service.loader)
+    return service
+
+
+def bump_mtime(path):
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "site.json").write_text(json.dumps({"meta": {}, "features": {}, "version": "1"}))
+    (tmp_path / "config" / "theme.json").write_text(json.dumps(THEMES))
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "sections" / "about.md").write_text("---\ntitle: About\n---\n\nHello.\n")
+    return tmp_path
+
+
+@pytest.fixture
+def service(content_dir, monkeypatch):
+    service = make_service(content_dir)
+    monkeypatch.setattr(content_module, "content_service", service)
+    monkeypatch.setattr(theme_module, "content_service", service)
+    return service
+
+
+@pytest.fixture
+async def client(service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(content_module.router, prefix="/api/v1/content")
+    app.include_router(theme_module.router, prefix="/api/v1/theme")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.unit
+class TestConditionalHelpers:
+    """Test validator matching and Cache-Control lookup"""
+
+    def test_if_none_match(self):
+        """Test ETag lists, weak tags and * all match"""
+        etag = '"abc"'
+
+        assert http_cache.is_not_modified(make_request(if_none_match='"abc"'), etag)
+        assert http_cache.is_not_modified(make_request(if_none_match='"x", W/"abc"'), etag)
+        assert http_cache.is_not_modified(make_request(if_none_match="*"), etag)
+        assert not http_cache.is_not_modified(make_request(if_none_match='"abcd"'), etag)
+        assert not http_cache.is_not_modified(make_request(), etag)
+
+    def test_if_modified_since(self):
+        """Test dates compare at second resolution"""
+        modified = datetime(2025, 3, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+        assert http_cache.is_not_modified(make_request(if_modified_since="Sat, 01 Mar 2025 12:00:00 GMT"), '"a"', modified)
+        assert not http_cache.is_not_modified(make_request(if_modified_since="Sat, 01 Mar 2025 11:59:59 GMT"), '"a"', modified)
+        assert not http_cache.is_not_modified(make_request(if_modified_since="yesterday"), '"a"', modified)
+
+    def test_if_none_match_takes_precedence(self):
+        """Test a stale ETag wins over a current date"""
+        modified = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        request = make_request(if_none_match='"old"', if_modified_since="Sat, 01 Mar 2025 12:00:00 GMT")
+
+        assert not http_cache.is_not_modified(request, '"new"', modified)
+
+    def test_cache_control_per_route(self, monkeypatch):
+        """Test the longest configured prefix wins"""
+        monkeypatch.setattr(settings, "HTTP_CACHE_CONTROL", "no-store")
+        monkeypatch.setattr(settings, "HTTP_CACHE_CONTROL_ROUTES", {
+            "/api/v1/theme": "public, max-age=60",
+            "/api/v1/theme/list": "public, max-age=3600"
+        })
+
+        assert http_cache.cache_control_for("/api/v1/theme/list") == "public, max-age=3600"
+        assert http_cache.cache_control_for("/api/v1/theme/dark") == "public, max-age=60"
+        assert http_cache.cache_control_for("/api/v1/content/all") == "no-store"
+
+
+@pytest.mark.unit
+class TestConditionalEndpoints:
+    """Test content and theme endpoints answer conditional requests"""
+
+    async def test_revalidation_returns_304_without_building(self, client, service, monkeypatch):
+        """Test a matching ETag skips building the response"""
+        first = await client.get("/api/v1/content/site-config")
+        builds = []
+        original = service.get_site_config
+        monkeypatch.setattr(service, "get_site_config", lambda: builds.append(1) or original())
+
+        second = await client.get("/api/v1/content/site-config", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200
+        assert first.headers["etag"].startswith('"')
+        assert first.headers["cache-control"] == settings.HTTP_CACHE_CONTROL
+        assert "last-modified" in first.headers
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+        assert builds == []
+
+    async def test_edit_changes_etag(self, client, content_dir):
+        """Test an edited file no longer matches the old ETag"""
+        first = await client.get("/api/v1/content/site-config")
+        site = content_dir / "config" / "site.json"
+        site.write_text(json.dumps({"meta": {}, "features": {}, "version": "2"}))
+        bump_mtime(site)
+
+        second = await client.get("/api/v1/content/site-config", headers={"If-None-Match": first.headers["etag"]})
+
+        assert second.status_code == 200
+        assert second.json()["data"]["version"] == "2"
+        assert second.headers["etag"] != first.headers["etag"]
+
+    async def test_all_content_etag_is_stable_across_processes(self, client, content_dir):
+        """Test the snapshot ETag depends on content, not on a per-process counter"""
+        response = await client.get("/api/v1/content/all")
+        other = make_service(content_dir).get_snapshot()
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == other.etag
+        revalidated = await client.get("/api/v1/content/all", headers={"If-None-Match": other.etag})
+        assert revalidated.status_code == 304
+
+    async def test_item_if_modified_since(self, client):
+        """Test Last-Modified round-trips through If-Modified-Since"""
+        first = await client.get("/api/v1/content/item/sections/about.md")
+
+        second = await client.get(
+            "/api/v1/content/item/sections/about.md",
+            headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+
+        assert first.json()["data"]["id"] == "about"
+        assert second.status_code == 304
+
+    async def test_theme_routes(self, client):
+        """Test theme routes share the theme file's validators and still 404"""
+        listing = await client.get("/api/v1/theme/list")
+        details = await client.get("/api/v1/theme/dark", headers={"If-None-Match": listing.headers["etag"]})
+        missing = await client.get("/api/v1/theme/light")
+
+        assert listing.json()["data"]["total"] == 1
+        assert details.status_code == 304
+        assert missing.status_code == 404
+
+    async def test_missing_file_is_404(self, client):
+        """Test a missing config file is still reported as not found"""
+        response = await client.get("/api/v1/content/layout-config")
+
+        assert response.status_code == 404
@@ -0,0 +1,182 @@
+"""
+Unit tests for off-loop file I/O in the async content endpoints
+"""
+
+import asyncio
+import builtins
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import content as content_module
+from app.core.error_handlers import register_exception_handlers
+from app.core.io_pool import IOPool
+from app.core.loop_monitor import LoopLagMonitor
+from app.services.content import content_loader as content_loader_module
+from app.services.content import document_store as document_store_module
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+
+# Simulated cold-disk read latency
+SLOW_SECONDS = 0.05
+ITEMS = 8
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "site.json").write_text(json.dumps({"meta": {}, "features": {}, "version": "1"}))
+    (tmp_path / "projects").mkdir()
+    for i in range(ITEMS):
+        (tmp_path / "projects" / f"p{i}.md").write_text(f"---\ntitle: Project {i}\n---\n\nBody {i}.\n")
+    return tmp_path
+
+
+@pytest.fixture
+def slow_open(monkeypatch):
+    """Make every content file open take SLOW_SECONDS"""
+    def open_slowly(*args, **kwargs):
+        time.sleep(SLOW_SECONDS)
+        return builtins.open(*args, **kwargs)
+
+    # JSON files are read by the loader, markdown by the document store
+    monkeypatch.setattr(content_loader_module, "open", open_slowly, raising=False)
+    monkeypatch.setattr(document_store_module, "open", open_slowly, raising=False)
+
+
+@pytest.fixture
+def service(content_dir, monkeypatch):
+    service = ContentService()
+    service.content_path = content_dir
+    service.cache = ContentCache()
+    service.loader = ContentLoader(content_dir, service.cache)
+    service.index = ContentIndex(content_dir, service.loader)
+    service.configs = ConfigResponseCache(service.loader)
+    monkeypatch.setattr(content_module, "content_service", service)
+    return service
+
+
+@pytest.fixture
+async def client(service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(content_module.router, prefix="/api/v1/content")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def monitor():
+    monitor = LoopLagMonitor(interval_ms=1, threshold_ms=1, warn_ms=1000)
+    monitor.start()
+    # Let the sampler take its first measurement
+    await asyncio.sleep(0.01)
+    monitor.reset()
+    yield monitor
+    await monitor.stop()
+
+
+@pytest.mark.unit
+class TestLoopLagMonitor:
+    """Test lag sampling and statistics"""
+
+    def test_record_stats(self):
+        """Test percentiles, maximum and blocked count"""
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=1, warn_ms=1000)
+        for lag in [0.1, 0.2, 0.3, 5.0]:
+            monitor.record(lag)
+
+        stats = monitor.get_stats()
+        assert stats["samples"] == 4
+        assert stats["p50_lag_ms"] == 0.2
+        assert stats["max_lag_ms"] == 5.0
+        assert stats["blocked"] == 1
+        assert stats["running"] is False
+
+    async def test_detects_blocking_call(self, monitor):
+        """Test a synchronous sleep on the loop shows up as lag"""
+        time.sleep(SLOW_SECONDS)
+        await asyncio.sleep(0.01)
+
+        assert monitor.get_stats()["max_lag_ms"] >= SLOW_SECONDS * 1000 * 0.8
+
+
+@pytest.mark.unit
+class TestIOPool:
+    """Test the bounded I/O thread pool"""
+
+    async def test_run_returns_result_and_raises(self):
+        """Test results and exceptions cross the thread boundary"""
+        pool = IOPool(max_workers=2)
+        try:
+            assert await pool.run(sum, [1, 2, 3]) == 6
+            with pytest.raises(ValueError):
+                await pool.run(int, "not a number")
+            assert pool.get_stats() == {"max_workers": 2, "submitted": 2, "in_flight": 0}
+        finally:
+            pool.shutdown()
+
+
+@pytest.mark.unit
+class TestNonBlockingLoader:
+    """Test async loader variants keep file access off the event loop"""
+
+    def test_is_fresh_never_stats(self, content_dir, monkeypatch):
+        """Test is_fresh answers from memory and expires with the revalidation interval"""
+        now = [0.0]
+        cache = ContentCache(revalidate_seconds=1, clock=lambda: now[0])
+        loader = ContentLoader(content_dir, cache)
+        path = content_dir / "projects" / "p0.md"
+        key = loader.cache_key(path)
+
+        assert not cache.is_fresh(key)
+        loader.load_markdown_file(path)
+        # New entries are trusted only after their first freshness check
+        assert not cache.is_fresh(key)
+        assert cache.is_cache_valid(key, path)
+
+        monkeypatch.setattr(ContentCache, "_get_file_modified_time", lambda *_: pytest.fail("stat() called"))
+        assert cache.is_fresh(key)
+        now[0] = 1.0
+        assert not cache.is_fresh(key)
+
+    async def test_sync_load_blocks_the_loop(self, content_dir, slow_open, monitor):
+        """Test the baseline: a synchronous read stalls every other task"""
+        loader = ContentLoader(content_dir, ContentCache())
+        loader.load_markdown_file(content_dir / "projects" / "p0.md")
+        await asyncio.sleep(0.01)
+
+        assert monitor.get_stats()["max_lag_ms"] >= SLOW_SECONDS * 1000 * 0.8
+
+    async def test_async_load_matches_sync(self, content_dir):
+        """Test the async variants return the same content"""
+        loader = ContentLoader(content_dir, ContentCache())
+        path = content_dir / "projects" / "p1.md"
+
+        item = await loader.load_markdown_file_async(path)
+        assert item == loader.load_markdown_file(path)
+        assert await loader.file_version_async(path) == loader.file_version(path)
+
+    async def test_concurrent_requests_do_not_block(self, client, slow_open, monitor):
+        """Test slow reads behind concurrent endpoint calls leave the loop responsive"""
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            client.get("/api/v1/content/site-config"),
+            *[client.get(f"/api/v1/content/item/projects/p{i}.md") for i in range(ITEMS)]
+        )
+        elapsed = time.perf_counter() - started
+        responses.append(await client.get("/api/v1/content/all"))
+
+        assert [response.status_code for response in responses] == [200] * (ITEMS + 2)
+        stats = monitor.get_stats()
+        assert stats["samples"] > 0
+        # Blocking reads would lag the loop by SLOW_SECONDS each; what remains is request handling
+        assert stats["max_lag_ms"] < SLOW_SECONDS * 1000 / 2
+        # Reads overlap in the pool instead of queueing on the loop
+        assert elapsed < SLOW_SECONDS * (ITEMS + 1) / 2
@@ -0,0 +1,126 @@
+"""
+Unit tests for the Q&A fast-path index
+"""
+
+import re
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+from app.services.rag.qa_index import QAIndex, parse_qa_pairs
+
+KNOWLEDGE_BASE = """# Core Professional Identity
+*RAG Chunk: Primary professional identity*
+
+## Professional Summary
+
+### Q1: Professional Identity Definition
+**How do you define yourself professionally?**
+
+I am an AI/ML Engineer who builds self-hosted systems.
+
+### Q2: Core Expertise Areas
+**What are your core areas of expertise?**
+
+Deep learning, infrastructure and full-stack development.
+
+## Next Section
+"""
+
+
+class BagOfWordsEmbeddingService(EmbeddingService):
+    """Deterministic embeddings from word counts over a small vocabulary"""
+
+    VOCABULARY = [
+        "define", "yourself", "professionally", "identity", "core", "areas",
+        "expertise", "what", "how", "you", "your", "are", "weather"
+    ]
+
+    async def generate_embedding(self, text):
+        words = re.findall(r"[a-z]+", text.lower())
+        vector = np.array([words.count(term) for term in self.VOCABULARY], dtype=float)
+        return vector.tolist() if vector.any() else None
+
+
+@pytest.mark.unit
+class TestQAIndex:
+    """Test Q&A pair parsing and matching"""
+
+    @pytest.fixture
+    def content_path(self, tmp_path):
+        kb_path = tmp_path / "rag-knowledge-base"
+        kb_path.mkdir()
+        (kb_path / "01-identity.md").write_text(KNOWLEDGE_BASE)
+        return tmp_path
+
+    def test_parse_qa_pairs(self):
+        """Test questions and answers are split out of the chunk"""
+        pairs = parse_qa_pairs(KNOWLEDGE_BASE, "rag-knowledge-base/01-identity.md")
+
+        assert len(pairs) == 2
+        assert pairs[0].title == "Professional Identity Definition"
+        assert pairs[0].question == "How do you define yourself professionally?"
+        assert pairs[0].answer == "I am an AI/ML Engineer who builds self-hosted systems."
+        assert pairs[1].answer == "Deep learning, infrastructure and full-stack development."
+
+    async def test_exact_question_matches(self, content_path):
+        """Test a verbatim curated question scores as a near-perfect match"""
+        index = QAIndex(content_path, BagOfWordsEmbeddingService())
+        service = index.service
+
+        query = await service.generate_embedding("What are your core areas of expertise?")
+        match = await index.best_match(query)
+
+        assert index.size == 2
+        assert match.pair.title == "Core Expertise Areas"
+        assert match.score > 0.99
+
+    async def test_unrelated_question_scores_low(self, content_path):
+        """Test an unrelated question stays below a high threshold"""
+        index = QAIndex(content_path, BagOfWordsEmbeddingService())
+
+        query = await index.service.generate_embedding("How is the weather?")
+        match = await index.best_match(query)
+
+        assert match.score < 0.9
+
+    async def test_empty_knowledge_base(self, tmp_path):
+        """Test an empty index returns no match"""
+        index = QAIndex(tmp_path, BagOfWordsEmbeddingService())
+
+        assert await index.best_match([1.0] * 13) is None
+
+    async def test_rebuilt_only_for_knowledge_base_changes(self, content_path):
+        """Test re-embedding other files keeps the index and knowledge-base edits rebuild it"""
+        index = QAIndex(content_path, BagOfWordsEmbeddingService())
+        await index.ensure_built()
+
+        index.invalidate(["components/projects/app.md", "sections/about.md"])
+        assert index.built
+
+        index.invalidate(["sections/about.md", "rag-knowledge-base/01-identity.md"])
+        assert not index.built
+        await index.ensure_built()
+
+        index.invalidate()
+        assert not index.built
+
+    async def test_invalidate_during_build_is_kept(self, content_path):
+        """Test a knowledge-base change notified while embedding triggers another build"""
+        index = QAIndex(content_path, BagOfWordsEmbeddingService())
+        embed = index.service.generate_embeddings_batch
+
+        async def embed_then_notified(texts):
+            embeddings = await embed(texts)
+            index.invalidate(["rag-knowledge-base/01-identity.md"])
+            return embeddings
+
+        index.service.generate_embeddings_batch = embed_then_notified
+        await index.ensure_built()
+        assert index.size == 2
+        assert not index.built
+
+        index.service.generate_embeddings_batch = embed
+        await index.ensure_built()
+        assert index.built
@@ -0,0 +1,103 @@
+"""
+Unit tests for pre-serialized config responses
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.models.content import ConfigResponse, SiteConfig
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+
+SITE = {"meta": {"title": "Portfolio – Röbert"}, "features": {"chat": True}, "version": "1.0"}
+REAL_CONTENT = Path(__file__).resolve().parents[3] / "frontend" / "public" / "page_content"
+
+
+@pytest.fixture
+def site_file(tmp_path):
+    (tmp_path / "config").mkdir()
+    path = tmp_path / "config" / "site.json"
+    path.write_text(json.dumps(SITE), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def configs(tmp_path):
+    return ConfigResponseCache(ContentLoader(tmp_path, ContentCache(revalidate_seconds=0)))
+
+
+def without_timestamp(body: bytes) -> dict:
+    data = json.loads(body)
+    data.pop("timestamp")
+    return data
+
+
+@pytest.mark.unit
+class TestConfigResponseCache:
+    """Test config files are validated and serialized once per version"""
+
+    def test_body_matches_response_model(self, configs, site_file):
+        """Test the cached bytes match what the ConfigResponse route used to send"""
+        entry = configs.get(site_file, SiteConfig)
+        expected = jsonable_encoder(ConfigResponse(data=SiteConfig(**SITE).dict()))
+        expected.pop("timestamp")
+
+        assert without_timestamp(entry.body()) == expected
+        assert isinstance(entry.model, SiteConfig)
+
+    def test_timestamp_is_per_response(self, configs, site_file):
+        """Test each response is stamped when it is sent"""
+        entry = configs.get(site_file, SiteConfig)
+
+        first = json.loads(entry.body())["timestamp"]
+        time.sleep(0.002)
+        second = json.loads(entry.body())["timestamp"]
+
+        assert first != second
+
+    def test_built_once_per_version(self, configs, site_file):
+        """Test repeated reads reuse the entry and edits rebuild it"""
+        first = configs.get(site_file, SiteConfig)
+        assert configs.get(site_file, SiteConfig) is first
+
+        site_file.write_text(json.dumps({**SITE, "version": "2.0"}), encoding="utf-8")
+        future = time.time() + 5
+        os.utime(site_file, (future, future))
+        second = configs.get(site_file, SiteConfig)
+
+        assert configs.builds == 2
+        assert second.model.version == "2.0"
+        assert second.etag != first.etag
+
+    def test_invalid_config_raises_value_error(self, configs, site_file):
+        """Test a config that does not validate is reported like a load failure"""
+        site_file.write_text(json.dumps({"meta": {}}), encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            configs.get(site_file, SiteConfig)
+
+    @pytest.mark.skipif(not REAL_CONTENT.exists(), reason="portfolio content not checked out")
+    def test_real_configs_round_trip(self):
+        """Test every shipped config serializes exactly as the model route did"""
+        from app.models.content import LayoutConfig, PersonalInfo, ThemeConfig
+
+        configs = ConfigResponseCache(ContentLoader(REAL_CONTENT, ContentCache()))
+        for relative_path, model in [
+            ("config/site.json", SiteConfig),
+            ("config/theme.json", ThemeConfig),
+            ("config/layout.json", LayoutConfig),
+            ("config/personal/contact-info.json", PersonalInfo)
+        ]:
+            if not (REAL_CONTENT / relative_path).exists():
+                continue
+            data = json.loads((REAL_CONTENT / relative_path).read_text(encoding="utf-8"))
+            expected = jsonable_encoder(ConfigResponse(data=model(**data).dict()))
+            expected.pop("timestamp")
+
+            assert without_timestamp(configs.get(REAL_CONTENT / relative_path, model).body()) == expected
@@ -0,0 +1,207 @@
+"""
+Unit tests for cached, off-loop resume PDF rendering
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import resume as resume_module
+from app.core.process_pool import ProcessPool
+from app.core.tiered_cache import BYTES_CODEC, InMemoryStore, TieredCache
+from app.services import pdf_generator as pdf_module
+from app.services.pdf_generator import PDFGenerator
+
+
+class FakeRenderer:
+    """Stands in for the WeasyPrint render, slow enough for requests to overlap"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, templates_dir, portfolio_url, template_name, resume_data):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return f"%PDF {template_name} {portfolio_url} {resume_data['summary']}".encode()
+
+
+@pytest.fixture
+def resume_data(monkeypatch):
+    data = {"personal": {"name": "Robert Zeijlon"}, "summary": "AI engineer"}
+    monkeypatch.setattr(
+        pdf_module.resume_aggregator,
+        "get_complete_resume_data",
+        lambda: {**data, "generated_at": str(time.time())}
+    )
+    return data
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    renderer = FakeRenderer()
+    monkeypatch.setattr(pdf_module, "render_resume_pdf", renderer)
+    return renderer
+
+
+@pytest.fixture
+def generator(tmp_path, resume_data, renderer):
+    return PDFGenerator(
+        templates_dir=str(tmp_path),
+        cache=TieredCache("pdf", BYTES_CODEC, max_entries=4),
+        pool=ProcessPool(max_workers=0)
+    )
+
+
+@pytest.fixture
+async def client(monkeypatch, generator):
+    monkeypatch.setattr(resume_module, "pdf_generator", generator)
+    app = FastAPI()
+    app.include_router(resume_module.router, prefix="/api/v1/resume")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.unit
+class TestPDFGenerator:
+    """Test single-flight rendering and the cache key"""
+
+    async def test_concurrent_requests_share_one_render(self, generator, renderer):
+        """Test requests for the same PDF wait for one render"""
+        results = await asyncio.gather(*(generator.get_resume_pdf() for _ in range(5)))
+
+        assert len(set(results)) == 1
+        assert renderer.calls == 1
+        assert generator.shared_renders == 4
+        assert generator.get_stats()["in_flight"] == 0
+
+    async def test_key_follows_resume_content(self, generator, renderer, resume_data):
+        """Test a PDF is rendered again only for other content, template or URL"""
+        first = await generator.prepare()
+        await generator.get_resume_pdf()
+        await generator.get_resume_pdf()
+        assert renderer.calls == 1
+        # generated_at differs on every read and is not part of the key
+        assert (await generator.prepare()).key == first.key
+
+        await generator.get_resume_pdf(portfolio_url="https://example.com")
+        resume_data["summary"] = "AI and infrastructure engineer"
+        changed = await generator.get_resume_pdf()
+
+        assert renderer.calls == 3
+        assert b"infrastructure" in changed
+        assert (await generator.prepare()).etag != first.etag
+
+    async def test_key_follows_templates(self, tmp_path, resume_data, renderer):
+        """Test an edited template or stylesheet changes the key and the ETag"""
+        (tmp_path / "resume_technical.html").write_text("<h1>{{ personal.name }}</h1>")
+        (tmp_path / "resume_base.css").write_text("h1 { color: black; }")
+
+        def generator():
+            return PDFGenerator(templates_dir=str(tmp_path), pool=ProcessPool(max_workers=0))
+
+        first = await generator().prepare()
+        assert (await generator().prepare()).key == first.key
+
+        (tmp_path / "resume_technical.html").write_text("<h2>{{ personal.name }}</h2>")
+        edited = await generator().prepare()
+        assert edited.key != first.key
+        assert edited.etag != first.etag
+
+        (tmp_path / "resume_base.css").write_text("h2 { color: navy; }")
+        assert (await generator().prepare()).etag != edited.etag
+
+    async def test_injected_shared_cache_is_used(self, tmp_path, resume_data, renderer):
+        """Test a PDF rendered by one worker is served to another through the injected L2 cache"""
+        store = InMemoryStore()
+        workers = [
+            PDFGenerator(
+                templates_dir=str(tmp_path),
+                cache=TieredCache("pdf", BYTES_CODEC, max_entries=4, ttl_seconds=60, l2=store),
+                pool=ProcessPool(max_workers=0)
+            )
+            for _ in range(2)
+        ]
+        assert workers[0].cache.l2 is store
+        assert workers[0].cache.ttl_seconds == 60
+
+        first = await workers[0].get_resume_pdf()
+        assert await workers[1].get_resume_pdf() == first
+        assert renderer.calls == 1
+        assert workers[1].cache.get_stats()["l2_hits"] == 1
+
+    async def test_abandoned_request_does_not_cancel_render(self, generator, renderer):
+        """Test a render started for a caller that went away still completes for the others"""
+        first = asyncio.ensure_future(generator.get_resume_pdf())
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(generator.get_resume_pdf())
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second).startswith(b"%PDF")
+        assert renderer.calls == 1
+
+    async def test_failed_render_is_not_cached(self, generator, monkeypatch):
+        """Test a render error answers None and the next request tries again"""
+        def broken(*args):
+            raise RuntimeError("render process crashed")
+
+        monkeypatch.setattr(pdf_module, "render_resume_pdf", broken)
+        assert await generator.get_resume_pdf() is None
+        assert len(generator.cache) == 0
+
+
+@pytest.mark.unit
+class TestGenerateEndpoint:
+    """Test conditional requests for the PDF"""
+
+    async def test_etag_and_not_modified(self, client, renderer, resume_data):
+        """Test a client holding the current PDF gets a 304 without a render"""
+        response = await client.get("/api/v1/resume/generate")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["etag"].startswith('W/"')
+        etag = response.headers["etag"]
+
+        response = await client.get("/api/v1/resume/generate", headers={"if-none-match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        resume_data["summary"] = "AI and infrastructure engineer"
+        response = await client.get("/api/v1/resume/generate", headers={"if-none-match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert renderer.calls == 2
+
+    async def test_render_failure(self, client, monkeypatch):
+        """Test a failed render is a 500"""
+        monkeypatch.setattr(pdf_module, "render_resume_pdf", lambda *args: None)
+
+        response = await client.get("/api/v1/resume/generate", params={"format": "onepage"})
+        assert response.status_code == 500
+
+
+@pytest.mark.unit
+class TestProcessPool:
+    """Test renders run in separate processes"""
+
+    async def test_runs_in_another_process(self):
+        """Test calls run in a spawned process and the pool restarts after a crash"""
+        pool = ProcessPool(max_workers=1)
+        try:
+            assert await pool.run(os.getpid) != os.getpid()
+
+            with pytest.raises(BrokenProcessPool):
+                await pool.run(os._exit, 1)
+            assert pool.restarts == 1
+            assert await pool.run(os.getpid) != os.getpid()
+            assert pool.get_stats()["in_flight"] == 0
+        finally:
+            pool.shutdown()
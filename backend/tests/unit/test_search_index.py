@@ -0,0 +1,182 @@
+"""
+Unit tests for BM25 content search
+"""
+
+import pytest
+
+from app.models.content import ContentItem, ContentMetadata
+from app.services.content.search_index import SearchIndex, plain_text, tokenize
+
+
+def make_item(file_path: str, title: str, content: str, tech: str = None) -> ContentItem:
+    return ContentItem(
+        id=file_path.rsplit("/", 1)[-1].replace(".md", ""),
+        content=content,
+        metadata=ContentMetadata(title=title, tech=tech),
+        raw_content=content,
+        file_path=file_path
+    )
+
+
+@pytest.fixture
+def items():
+    return [
+        make_item(
+            "components/projects/transcriptomatic.md", "Transcriptomatic",
+            "Speech evaluation platform comparing **Whisper** models. Runs on Kubernetes.",
+            tech="Python, FastAPI, Whisper"
+        ),
+        make_item(
+            "components/projects/ai-server.md", "AI Server Build",
+            "Custom server with CUDA for local inference. See [the build log](https://example.com).",
+            tech="CUDA, Linux"
+        ),
+        make_item(
+            "components/skills/infrastructure.md", "Infrastructure",
+            "Kubernetes clusters, Kubernetes operators and Helm charts for every service.",
+            tech="Kubernetes, Helm"
+        ),
+        make_item(
+            "sections/about.md", "About",
+            "I build AI systems in Python and C++ and write about self-hosting."
+        )
+    ]
+
+
+@pytest.fixture
+def index(items):
+    search_index = SearchIndex()
+    search_index.sync(items)
+    return search_index
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """Test tokenization helpers"""
+
+    def test_tokenize_keeps_language_names(self):
+        """Test c++ and c# survive tokenization"""
+        assert tokenize("Python, C++ and C#!") == ["python", "c++", "and", "c#"]
+
+    def test_tokenize_non_ascii(self):
+        """Test words with non-ASCII letters stay whole and are case-folded"""
+        assert tokenize("Göteborg och MALMÖ, Straße") == ["göteborg", "och", "malmö", "strasse"]
+
+    def test_plain_text_strips_markdown(self):
+        """Test snippets are built from text without markdown syntax"""
+        assert plain_text("## Title\n> **bold** [link](http://x) a > b") == "Title bold link a > b"
+
+
+@pytest.mark.unit
+class TestSearchIndex:
+    """Test ranking, prefix matching, snippets and updates"""
+
+    def test_ranked_by_relevance(self, index):
+        """Test the item most about the term ranks first"""
+        hits = index.search("kubernetes", prefix=False)
+
+        assert [hit.item.id for hit in hits] == ["infrastructure", "transcriptomatic"]
+        assert hits[0].score > hits[1].score
+
+    def test_all_words_must_match(self, index):
+        """Test multi-word queries match items containing every word"""
+        hits = index.search("whisper kubernetes", prefix=False)
+
+        assert [hit.item.id for hit in hits] == ["transcriptomatic"]
+
+    def test_title_outweighs_body(self, index):
+        """Test a title match ranks above the same word in the body"""
+        index.add("sections/server.md", make_item("sections/server.md", "Homelab", "A server rack in my closet."))
+
+        hits = index.search("server", prefix=False)
+
+        assert hits[0].item.id == "ai-server"
+
+    def test_prefix_match_for_typeahead(self, index):
+        """Test the last word matches as a prefix"""
+        assert [hit.item.id for hit in index.search("transcripto")] == ["transcriptomatic"]
+        assert index.search("transcripto", prefix=False) == []
+        assert index.search("helm pyth") == []
+        assert [hit.item.id for hit in index.search("whisper kube")] == ["transcriptomatic"]
+
+    def test_snippet_highlights_matches(self, index):
+        """Test snippets mark the matched words and escape HTML"""
+        index.add("sections/html.md", make_item("sections/html.md", "HTML", "Use <script> tags with Helm."))
+
+        snippet = index.search("helm", prefix=False)
+        by_id = {hit.item.id: hit.snippet for hit in snippet}
+
+        assert "<mark>Helm</mark>" in by_id["infrastructure"]
+        assert "&lt;script&gt;" in by_id["html"]
+        assert "<mark>Helm</mark>" in by_id["html"]
+
+    def test_prefix_highlight_covers_whole_word(self, index):
+        """Test a prefix query highlights the full matched word"""
+        hit = index.search("kuber")[0]
+
+        assert "<mark>Kubernetes</mark>" in hit.snippet
+        assert hit.matched_terms == ["kubernetes"]
+
+    def test_non_ascii_words_are_searchable(self, items):
+        """Test queries match words with non-ASCII letters regardless of case"""
+        items.append(make_item("sections/location.md", "Location", "Based in Göteborg, often in Malmö."))
+        search_index = SearchIndex()
+        search_index.sync(items)
+
+        hits = search_index.search("GÖTEBORG malmö")
+        assert [hit.item.id for hit in hits] == ["location"]
+        assert "<mark>Göteborg</mark>" in hits[0].snippet
+        assert [hit.item.id for hit in search_index.search("malm")] == ["location"]
+
+    def test_limit(self, index):
+        """Test limit keeps the best hits"""
+        hits = index.search("kubernetes", limit=1)
+
+        assert [hit.item.id for hit in hits] == ["infrastructure"]
+
+    def test_sync_reindexes_only_changed_items(self, index, items):
+        """Test unchanged items are kept and removed ones dropped"""
+        changed = make_item("sections/about.md", "About", "Now I write about Rust.")
+
+        indexed, removed = index.sync([items[0], items[1], changed])
+
+        assert (indexed, removed) == (1, 1)
+        assert index.search("rust", prefix=False)[0].item.id == "about"
+        assert index.search("python", prefix=False)[0].item.id == "transcriptomatic"
+        assert index.search("helm", prefix=False) == []
+        assert "helm" not in index._postings
+
+    def test_empty_query(self, index):
+        """Test a query without words returns nothing"""
+        assert index.search("  !! ") == []
+
+
+@pytest.mark.unit
+class TestContentServiceSearch:
+    """Test the content service keeps its search index in line with content"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        from app.services.content.content_cache import ContentCache
+        from app.services.content.content_index import ContentIndex
+        from app.services.content.content_loader import ContentLoader
+        from app.services.content_service import ContentService
+
+        (tmp_path / "sections").mkdir()
+        (tmp_path / "sections" / "about.md").write_text("---\ntitle: About\n---\n\nI like Rust.\n")
+        service = ContentService()
+        service.content_path = tmp_path
+        service.cache = ContentCache()
+        service.loader = ContentLoader(tmp_path, service.cache)
+        service.index = ContentIndex(tmp_path, service.loader)
+        return service
+
+    def test_search_follows_content_changes(self, service, tmp_path):
+        """Test new content is searchable once the index is invalidated"""
+        assert [item.id for item in service.search_content("rust")] == ["about"]
+
+        (tmp_path / "sections" / "hobbies.md").write_text("---\ntitle: Hobbies\n---\n\nRust and climbing.\n")
+        service.index.invalidate()
+
+        assert [hit.item.id for hit in service.search("climb")] == ["hobbies"]
+        assert service.search_index.sync(service.index.snapshot().items()) == (0, 0)
@@ -0,0 +1,213 @@
+"""
+Unit tests for precompressed, range-capable static file serving
+"""
+
+import asyncio
+import gzip
+import json
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL
+from app.core.static_files import PrecompressedStaticFiles, parse_range, precompress_directory
+
+SITE = json.dumps({"meta": {"title": "Portfolio " * 200}, "features": {}}).encode()
+IMAGE = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "site.json").write_bytes(SITE)
+    (tmp_path / "config" / "tiny.json").write_text("{}")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "profile.jpg").write_bytes(IMAGE)
+    (tmp_path / "assets" / "logo.3f2a9c1b.svg").write_text("<svg>" + "<g/>" * 500 + "</svg>")
+    return tmp_path
+
+
+@pytest.fixture
+def static(content_dir):
+    return PrecompressedStaticFiles(directory=content_dir)
+
+
+@pytest.fixture
+async def client(static):
+    app = FastAPI()
+    app.mount("/page_content", static, name="page_content")
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def get(client, path, **headers):
+    # Identity unless a test asks otherwise; httpx decodes compressed bodies
+    return await client.get(f"/page_content/{path}", headers={"accept-encoding": "identity", **headers})
+
+
+@pytest.mark.unit
+class TestContentNegotiation:
+    """Test compressed representations and their validators"""
+
+    async def test_brotli_preferred_and_compressed_once(self, client, static):
+        """Test br is chosen over gzip and compressed on the first request only"""
+        first = await get(client, "config/site.json", **{"accept-encoding": "gzip, br"})
+        second = await get(client, "config/site.json", **{"accept-encoding": "gzip, br"})
+
+        assert first.headers["content-encoding"] == "br"
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert int(first.headers["content-length"]) < len(SITE)
+        assert first.headers["etag"].endswith('-br"')
+        assert second.headers["etag"] == first.headers["etag"]
+        assert static.compressions == 1
+        assert static.memory_hits == 1
+
+    async def test_gzip_and_identity(self, client):
+        """Test each coding has its own strong ETag"""
+        gzipped = await get(client, "config/site.json", **{"accept-encoding": "gzip"})
+        identity = await get(client, "config/site.json")
+
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert int(gzipped.headers["content-length"]) == len(gzip.compress(SITE, compresslevel=9, mtime=0))
+        assert gzipped.content == SITE
+        assert "content-encoding" not in identity.headers
+        assert identity.content == SITE
+        assert identity.headers["etag"] != gzipped.headers["etag"]
+        assert not identity.headers["etag"].startswith("W/")
+
+    async def test_precompressed_file_used_when_fresh(self, client, static, content_dir):
+        """Test build-time .br files are served as they are, and ignored once stale"""
+        assert precompress_directory(content_dir) == 4
+        site = content_dir / "config" / "site.json"
+        size = (content_dir / "config" / "site.json.br").stat().st_size
+
+        response = await get(client, "config/site.json", **{"accept-encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        assert int(response.headers["content-length"]) == size
+        assert response.content == SITE
+        assert static.precompressed_hits == 1
+        assert static.compressions == 0
+
+        stat = site.stat()
+        site.write_bytes(SITE.replace(b"Portfolio", b"Resume"))
+        os.utime(site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        response = await get(client, "config/site.json", **{"accept-encoding": "br"})
+        assert response.content == SITE.replace(b"Portfolio", b"Resume")
+        assert static.compressions == 1
+
+    async def test_concurrent_first_requests_compress_once(self, client, static):
+        """Test requests arriving while a file is being compressed wait for that compression"""
+        responses = await asyncio.gather(*(
+            get(client, "config/site.json", **{"accept-encoding": "br"}) for _ in range(5)
+        ))
+
+        assert {response.headers["content-encoding"] for response in responses} == {"br"}
+        assert all(response.content == SITE for response in responses)
+        assert static.compressions == 1
+        assert static.shared_compressions >= 1
+        assert static.shared_compressions + static.memory_hits == 4
+
+    async def test_files_larger_than_cache_sent_uncompressed(self, content_dir):
+        """Test a file that could not be kept compressed is not compressed on every request"""
+        static = PrecompressedStaticFiles(directory=content_dir, cache_max_bytes=len(SITE) - 1)
+        app = FastAPI()
+        app.mount("/page_content", static, name="page_content")
+
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await get(client, "config/site.json", **{"accept-encoding": "br"})
+            assert "content-encoding" not in response.headers
+            assert response.content == SITE
+            assert static.compressions == 0
+
+            precompress_directory(content_dir)
+            response = await get(client, "config/site.json", **{"accept-encoding": "br"})
+            assert response.headers["content-encoding"] == "br"
+
+    async def test_small_and_binary_files_not_compressed(self, client):
+        """Test files below the threshold and images are sent as they are"""
+        tiny = await get(client, "config/tiny.json", **{"accept-encoding": "br, gzip"})
+        image = await get(client, "assets/profile.jpg", **{"accept-encoding": "br, gzip"})
+
+        assert "content-encoding" not in tiny.headers
+        assert "content-encoding" not in image.headers
+        assert "vary" not in image.headers
+        assert image.content == IMAGE
+
+    async def test_not_modified(self, client):
+        """Test If-None-Match with the negotiated ETag answers 304"""
+        first = await get(client, "config/site.json", **{"accept-encoding": "gzip"})
+
+        response = await get(
+            client, "config/site.json",
+            **{"accept-encoding": "gzip", "if-none-match": first.headers["etag"]}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        # The identity representation has another ETag
+        response = await get(client, "config/site.json", **{"if-none-match": first.headers["etag"]})
+        assert response.status_code == 200
+
+    async def test_cache_control(self, client):
+        """Test hashed names are immutable and other files revalidate"""
+        hashed = await get(client, "assets/logo.3f2a9c1b.svg")
+        plain = await get(client, "assets/profile.jpg")
+
+        assert hashed.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert plain.headers["cache-control"] == "public, no-cache"
+
+    async def test_missing_file(self, client):
+        """Test unknown files are still 404"""
+        assert (await get(client, "config/nope.json")).status_code == 404
+
+
+@pytest.mark.unit
+class TestRanges:
+    """Test byte range requests"""
+
+    async def test_partial_content(self, client):
+        """Test a single range is served with 206 and Content-Range"""
+        response = await get(client, "assets/profile.jpg", range="bytes=100-199")
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-199/{len(IMAGE)}"
+        assert response.headers["content-length"] == "100"
+        assert response.content == IMAGE[100:200]
+
+    async def test_suffix_and_open_ranges(self, client):
+        """Test bytes=-N and bytes=N- forms"""
+        suffix = await get(client, "assets/profile.jpg", range="bytes=-10")
+        tail = await get(client, "assets/profile.jpg", range=f"bytes={len(IMAGE) - 5}-")
+
+        assert suffix.content == IMAGE[-10:]
+        assert tail.content == IMAGE[-5:]
+
+    async def test_unsatisfiable(self, client):
+        """Test a range past the end answers 416"""
+        response = await get(client, "assets/profile.jpg", range=f"bytes={len(IMAGE)}-")
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(IMAGE)}"
+
+    async def test_if_range(self, client):
+        """Test a stale If-Range gets the whole file"""
+        full = await get(client, "assets/profile.jpg")
+        assert full.headers["accept-ranges"] == "bytes"
+
+        fresh = await get(client, "assets/profile.jpg", range="bytes=0-9", **{"if-range": full.headers["etag"]})
+        stale = await get(client, "assets/profile.jpg", range="bytes=0-9", **{"if-range": '"outdated"'})
+
+        assert fresh.status_code == 206
+        assert stale.status_code == 200
+        assert stale.content == IMAGE
+
+    def test_parse_range(self):
+        """Test range header parsing"""
+        assert parse_range("bytes=0-0", 10) == (0, 0)
+        assert parse_range("bytes=5-100", 10) == (5, 9)
+        assert parse_range("bytes=-100", 10) == (0, 9)
+        assert parse_range("bytes=10-", 10) is False
+        assert parse_range("bytes=0-1,4-5", 10) is None
+        assert parse_range("bytes=5-1", 10) is None
+        assert parse_range("items=0-1", 10) is None
@@ -0,0 +1,308 @@
+"""
+Unit tests for the two-tier (in-process + shared) cache
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.resp_client import RespClient, RespError, read_reply
+from app.core.tiered_cache import (
+    JSON_CODEC, TEXT_CODEC, VECTOR_CODEC, ZLIB, InMemoryStore, RespStore, TieredCache
+)
+from app.services.embedding_service import EmbeddingService
+from app.services.rag.chat_service import ChatService
+from app.services.transcription_cache import TranscriptionCache
+
+
+def worker_caches(store, **kwargs):
+    """The same cache in two workers sharing one store"""
+    return (
+        TieredCache("test", JSON_CODEC, l2=store, **kwargs),
+        TieredCache("test", JSON_CODEC, l2=store, **kwargs)
+    )
+
+
+@pytest.mark.unit
+class TestTieredCache:
+    """Test lookups through L1 and L2"""
+
+    async def test_other_worker_hits_l2_then_l1(self):
+        """Test a value set by one worker is found in L2 by another, then in its L1"""
+        a, b = worker_caches(InMemoryStore())
+        await a.set("k", {"answer": 42})
+
+        assert await b.get("k") == {"answer": 42}
+        assert await b.get("k") == {"answer": 42}
+        assert await b.get("other") is None
+
+        stats = b.get_stats()
+        assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["l2_hit_rate"] == 0.5
+        assert stats["hit_rate"] == round(2 / 3, 3)
+        assert stats["l2"] == "memory"
+
+    async def test_get_many_is_one_round_trip(self):
+        """Test the L1 misses of a batch are fetched with one MGET"""
+        store = InMemoryStore()
+        a, b = worker_caches(store)
+        await a.set_many({"k1": 1, "k2": 2, "k3": 3})
+        b.set_local("k1", 1)
+        round_trips = store.round_trips
+
+        found = await b.get_many(["k1", "k2", "k3", "k4"])
+
+        assert found == {"k1": 1, "k2": 2, "k3": 3}
+        assert store.round_trips == round_trips + 1
+        assert (b.l1_hits, b.l2_hits, b.misses) == (1, 2, 1)
+
+    async def test_l1_only_without_store(self, clock):
+        """Test the cache works as a plain LRU with expiry when there is no L2"""
+        cache = TieredCache("test", JSON_CODEC, max_entries=2, ttl_seconds=10, clock=clock)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+
+        assert await cache.get("a") is None
+        assert await cache.get("c") == "c"
+        clock.now += 11
+        assert await cache.get("c") is None
+        assert cache.get_stats()["l2"] is None
+
+    async def test_compact_values(self):
+        """Test large values are compressed and vectors stored as float32"""
+        store = InMemoryStore()
+        cache = TieredCache("test", JSON_CODEC, l2=store, compress_min_bytes=100)
+        vectors = TieredCache("vectors", VECTOR_CODEC, l2=store)
+        await cache.set("large", [{"content": "Robert builds AI systems. " * 20}] * 5)
+        await cache.set("small", {"a": 1})
+        await vectors.set("v", [0.5, -0.25, 1.0])
+
+        raw = {key.rsplit(":", 1)[-1]: value for key, (value, _) in store._entries.items()}
+        assert raw["large"][:1] == ZLIB
+        assert len(raw["large"]) < 200
+        assert raw["small"] == b'\x00{"a":1}'
+        assert len(raw["v"]) == 1 + 3 * 4
+
+        fresh = TieredCache("vectors", VECTOR_CODEC, l2=store)
+        assert await fresh.get("v") == [0.5, -0.25, 1.0]
+
+    async def test_versioned_clear_reaches_other_workers(self):
+        """Test clear() on one worker retires every worker's L2 entries"""
+        a, b = worker_caches(InMemoryStore(), versioned=True)
+        await a.set("q", ["old"])
+        assert await b.get("q") == ["old"]
+
+        await a.clear()
+        # What the cache bus does on the other workers
+        b.invalidate_local()
+
+        assert await b.get("q") is None
+        await a.set("q", ["new"])
+        assert await b.get("q") == ["new"]
+
+    async def test_generation_change_drops_stale_l1(self):
+        """Test a worker that missed the bus event catches up on its next L2 lookup"""
+        a, b = worker_caches(InMemoryStore(), versioned=True)
+        await a.set("q1", ["old"])
+        assert await b.get("q1") == ["old"]
+
+        await a.clear()
+        assert await b.get("q2") is None
+        assert await b.get("q1") is None
+
+
+class FakeRespServer:
+    """Just enough of a Redis server: AUTH, SELECT, GET, MGET, SET PX, INCR"""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await read_reply(reader)
+                name = command[0].upper()
+                self.commands.append(name)
+                if name == b"AUTH":
+                    authenticated = command[-1].decode() == self.password
+                    writer.write(b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n")
+                elif not authenticated:
+                    writer.write(b"-NOAUTH Authentication required.\r\n")
+                elif name == b"SELECT":
+                    writer.write(b"+OK\r\n")
+                elif name == b"MGET":
+                    writer.write(b"*%d\r\n" % (len(command) - 1))
+                    for key in command[1:]:
+                        value = self.data.get(key)
+                        writer.write(b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value))
+                elif name == b"SET":
+                    assert command[3] == b"PX"
+                    self.data[command[1]] = command[2]
+                    writer.write(b"+OK\r\n")
+                elif name == b"INCR":
+                    value = int(self.data.get(command[1], b"0")) + 1
+                    self.data[command[1]] = b"%d" % value
+                    writer.write(b":%d\r\n" % value)
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.unit
+class TestRespStore:
+    """Test the RESP client and the store on top of it"""
+
+    async def test_two_workers_through_server(self):
+        """Test values cross workers through a Redis-protocol server, batched and binary-safe"""
+        server = FakeRespServer(password="s3cret")
+        port = await server.start()
+        stores = [
+            RespStore(RespClient.from_url(f"redis://:s3cret@127.0.0.1:{port}/2", timeout=1))
+            for _ in range(2)
+        ]
+        a = TieredCache("test", VECTOR_CODEC, l2=stores[0])
+        b = TieredCache("test", VECTOR_CODEC, l2=stores[1])
+
+        await a.set_many({"x": [1.0, 2.0], "y": [0.0, -1.5]})
+        assert await b.get_many(["x", "y", "z"]) == {"x": [1.0, 2.0], "y": [0.0, -1.5]}
+        assert await stores[0].incr("counter") == 1
+
+        assert server.commands.count(b"MGET") == 1
+        assert server.commands.count(b"SELECT") == 2
+        assert stores[1].get_stats()["errors"] == 0
+        for store in stores:
+            await store.close()
+        await server.stop()
+
+    async def test_error_reply_raised(self):
+        """Test error replies are raised and the connection stays usable"""
+        server = FakeRespServer(password="s3cret")
+        port = await server.start()
+        client = RespClient("127.0.0.1", port, password="wrong", timeout=1)
+
+        with pytest.raises(RespError, match="WRONGPASS"):
+            await client.execute("GET", "k")
+
+        client.password = "s3cret"
+        with pytest.raises(RespError, match="unknown command"):
+            await client.execute("FLUSHALL")
+        assert await client.execute("INCR", "n") == 1
+        await client.close()
+        await server.stop()
+
+    async def test_garbled_reply_is_a_miss(self):
+        """Test an unparsable length in a reply counts as an L2 error, not a failed request"""
+        async def garble(reader, writer):
+            await read_reply(reader)
+            writer.write(b"*2\r\n$x1\r\n")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(garble, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        store = RespStore(RespClient("127.0.0.1", port, timeout=1))
+        cache = TieredCache("test", JSON_CODEC, l2=store)
+
+        assert await cache.get("k") is None
+        assert store.get_stats()["errors"] == 1
+        server.close()
+        await server.wait_closed()
+
+    async def test_unreachable_server_is_a_miss(self, clock):
+        """Test lookups fall back to misses and the server is not retried at once"""
+        server = FakeRespServer()
+        port = await server.start()
+        await server.stop()
+        store = RespStore(RespClient("127.0.0.1", port, timeout=1), retry_seconds=5, clock=clock)
+        cache = TieredCache("test", JSON_CODEC, l2=store)
+
+        await cache.set("k", 1)
+        cache.invalidate_local()
+        assert await cache.get("k") is None
+        assert await cache.get("j") is None
+
+        assert store.round_trips == 1
+        assert store.get_stats()["available"] is False
+        assert cache.get_stats()["l2_errors"] == 3
+        clock.now += 5
+        assert store.get_stats()["available"] is True
+
+
+class CountingEmbeddingService(EmbeddingService):
+    """Embeddings from text length, counting how many were computed"""
+
+    def __init__(self, cache):
+        super().__init__(cache=cache)
+        self.computed = 0
+
+    async def _embed(self, text):
+        self.computed += 1
+        return [float(len(text)), 1.0]
+
+
+@pytest.mark.unit
+class TestSharedServiceCaches:
+    """Test a new worker starts warm with what others computed"""
+
+    async def test_embeddings(self):
+        """Test a second worker embeds nothing and looks the batch up once"""
+        store = InMemoryStore()
+        first = CountingEmbeddingService(TieredCache("embeddings", VECTOR_CODEC, l2=store))
+        second = CountingEmbeddingService(TieredCache("embeddings", VECTOR_CODEC, l2=store))
+        texts = ["alpha", "beta", "gamma"]
+
+        assert await first.generate_embedding("alpha") == [5.0, 1.0]
+        expected = await first.generate_embeddings_batch(texts)
+        round_trips = store.round_trips
+
+        assert await second.generate_embeddings_batch(texts) == expected
+        assert first.computed == 3
+        assert second.computed == 0
+        assert store.round_trips == round_trips + 1
+
+    async def test_llm_responses(self):
+        """Test the same question over the same context is answered once"""
+        store = InMemoryStore()
+        router = MagicMock(has_providers=True)
+        router.complete = AsyncMock(return_value="Robert builds AI systems.")
+        workers = [
+            ChatService(router=router, cache=TieredCache("llm_responses", TEXT_CODEC, l2=store))
+            for _ in range(2)
+        ]
+
+        for worker in workers:
+            assert await worker.generate_response("What does Robert do?", "context") == "Robert builds AI systems."
+        await workers[1].generate_response("What does Robert do?", "other context")
+
+        assert router.complete.await_count == 2
+
+    async def test_transcriptions(self):
+        """Test a transcript stored by one worker is found by another"""
+        store = InMemoryStore()
+        workers = [
+            TranscriptionCache(shared=TieredCache("transcriptions", TEXT_CODEC, max_entries=0, l2=store))
+            for _ in range(2)
+        ]
+        await workers[0].set("audio", "hello world")
+
+        assert await workers[1].get("audio") == "hello world"
+        assert await workers[1].get("audio") == "hello world"
+        stats = workers[1].get_stats()
+        assert (stats["hits"], stats["shared_hits"]) == (2, 1)
@@ -0,0 +1,108 @@
+"""
+Unit tests for the transcription cache
+"""
+
+import io
+
+import pytest
+
+from app.services.transcription_cache import TranscriptionCache, cache_key, hash_audio_file
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    """Test content hashing and cache keys"""
+
+    def test_hash_rewinds_file(self):
+        """Test hashing leaves the file at the start for the upload"""
+        audio = io.BytesIO(b"RIFF" + bytes(200_000))
+        audio.seek(10)
+
+        digest = hash_audio_file(audio)
+
+        assert len(digest) == 64
+        assert audio.tell() == 0
+        assert hash_audio_file(io.BytesIO(b"RIFF" + bytes(200_000))) == digest
+
+    def test_key_depends_on_model_and_language(self):
+        """Test the same audio under another model or language gets another key"""
+        key = cache_key("abc", "whisper-large-v3-turbo", "en")
+
+        assert key == cache_key("abc", "whisper-large-v3-turbo", "en")
+        assert key != cache_key("abc", "whisper-large-v3", "en")
+        assert key != cache_key("abc", "whisper-large-v3-turbo", "sv")
+        assert key != cache_key("abd", "whisper-large-v3-turbo", "en")
+
+
+@pytest.mark.unit
+class TestTranscriptionCache:
+    """Test LRU eviction, expiry and disk spill"""
+
+    async def test_hit_and_miss_are_counted(self):
+        """Test lookups update the hit rate"""
+        cache = TranscriptionCache()
+        await cache.set("a", "hello")
+
+        assert await cache.get("a") == "hello"
+        assert await cache.get("b") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    async def test_least_recently_used_is_evicted(self):
+        """Test the entry not read for longest is dropped first"""
+        cache = TranscriptionCache(max_entries=2)
+        await cache.set("a", "first")
+        await cache.set("b", "second")
+        await cache.get("a")
+        await cache.set("c", "third")
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "first"
+        assert await cache.get("c") == "third"
+        assert cache.get_stats()["evictions"] == 1
+
+    async def test_entries_expire(self, clock):
+        """Test entries are not returned after the TTL"""
+        cache = TranscriptionCache(ttl_seconds=60, clock=clock)
+        await cache.set("a", "hello")
+
+        clock.now += 59
+        assert await cache.get("a") == "hello"
+        clock.now += 2
+        assert await cache.get("a") is None
+        assert len(cache) == 0
+
+    async def test_evicted_entries_spill_to_disk(self, tmp_path):
+        """Test evicted entries are served from disk and promoted back"""
+        cache = TranscriptionCache(max_entries=1, disk_path=tmp_path)
+        await cache.set("a", "first")
+        await cache.set("b", "second")
+
+        assert (tmp_path / "a.json").exists()
+        assert await cache.get("a") == "first"
+        assert cache.get_stats()["disk_hits"] == 1
+
+        # Survives a restart
+        reopened = TranscriptionCache(max_entries=1, disk_path=tmp_path)
+        assert await reopened.get("a") == "first"
+
+    async def test_expired_disk_entries_are_removed(self, tmp_path, clock):
+        """Test a stale disk entry is deleted instead of returned"""
+        cache = TranscriptionCache(max_entries=1, ttl_seconds=60, disk_path=tmp_path, clock=clock)
+        await cache.set("a", "first")
+        await cache.set("b", "second")
+
+        clock.now += 120
+        assert await cache.get("a") is None
+        assert not (tmp_path / "a.json").exists()
+
+    async def test_disk_is_pruned(self, tmp_path):
+        """Test the disk tier keeps at most disk_max_entries files"""
+        cache = TranscriptionCache(max_entries=1, disk_path=tmp_path, disk_max_entries=2)
+        for key in "abcde":
+            await cache.set(key, key * 3)
+
+        assert len(list(tmp_path.glob("*.json"))) == 2
@@ -0,0 +1,203 @@
+"""
+Unit tests for the one-shot voice chat endpoint and streaming RAG
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.v1 import chat as chat_module
+from app.core.deadline import Deadline
+from app.core.exceptions import ExternalAPIError
+from app.services import rag_service as rag_service_module
+from app.services.rag.context_builder import ContextBuilder
+from app.services.rag.conversation_memory import ConversationHistory
+from app.services.rag_service import RAGService
+
+CONTEXT_RESULTS = [
+    {
+        "content": "I run a k3s cluster at home for my own services. Deployments are managed with Helm charts.",
+        "file_path": "rag-knowledge-base/02-technical.md",
+        "similarity": 0.62
+    }
+]
+
+
+def parse_events(body: str):
+    """Split a server-sent event stream into (event, data) pairs"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def rag_service():
+    service = RAGService()
+    vector_repo = MagicMock()
+    vector_repo.similarity_search = AsyncMock(return_value=CONTEXT_RESULTS)
+    service.context_builder = ContextBuilder(vector_repo)
+    service.chat_service = MagicMock()
+    return service
+
+
+@pytest.fixture(autouse=True)
+def no_fast_path(monkeypatch):
+    monkeypatch.setattr(rag_service_module.settings, "QA_FAST_PATH_ENABLED", False)
+    monkeypatch.setattr(
+        rag_service_module.embedding_service,
+        "generate_embedding",
+        AsyncMock(return_value=[0.1, 0.2, 0.3])
+    )
+
+
+@pytest.mark.unit
+class TestChatStream:
+    """Test RAGService.chat_stream"""
+
+    async def test_tokens_follow_sources(self, rag_service):
+        """Test sources are sent first, then tokens, then the joined response"""
+        async def fake_stream(query, context, history=None, deadline=None):
+            for token in ["I run ", "k3s", "."]:
+                yield token
+
+        rag_service.chat_service.stream_response = fake_stream
+
+        events = [event async for event in rag_service.chat_stream("Kubernetes?", deadline=Deadline(5.0))]
+
+        assert [e["type"] for e in events] == ["sources", "token", "token", "token", "done"]
+        assert events[0]["sources"][0]["file_path"] == "rag-knowledge-base/02-technical.md"
+        assert events[-1]["response"] == "I run k3s."
+        assert events[-1]["degraded"] is None
+
+    async def test_outage_before_first_token_falls_back(self, rag_service):
+        """Test an outage before any token produces the extractive answer as one token"""
+        async def failing_stream(query, context, history=None, deadline=None):
+            raise ExternalAPIError("LLM", "No provider produced a response")
+            yield
+
+        rag_service.chat_service.stream_response = failing_stream
+
+        events = [event async for event in rag_service.chat_stream("Kubernetes?", deadline=Deadline(5.0))]
+
+        assert [e["type"] for e in events] == ["sources", "token", "done"]
+        assert "k3s" in events[1]["text"]
+        assert events[-1]["degraded"] == "context_answer"
+
+    async def test_interrupted_stream_keeps_partial_response(self, rag_service):
+        """Test a provider dropping mid-response keeps what was already sent"""
+        async def broken_stream(query, context, history=None, deadline=None):
+            yield "I run "
+            raise ConnectionResetError("peer closed")
+
+        rag_service.chat_service.stream_response = broken_stream
+
+        events = [event async for event in rag_service.chat_stream("Kubernetes?", deadline=Deadline(5.0))]
+
+        assert events[-1]["response"] == "I run "
+        assert events[-1]["degraded"] == "partial_response"
+
+
+@pytest.mark.unit
+class TestVoiceEndpoint:
+    """Test POST /chat/voice"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(chat_module.router, prefix="/api/v1/chat")
+        return httpx.AsyncClient(app=app, base_url="http://test")
+
+    @pytest.fixture
+    def exchanges(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            chat_module.conversation_memory,
+            "append_exchange",
+            lambda *args: recorded.append(args)
+        )
+        return recorded
+
+    async def post_audio(self, client, **params):
+        async with client:
+            return await client.post(
+                "/api/v1/chat/voice",
+                params=params,
+                files={"file": ("voice.webm", b"\x1a\x45\xdf\xa3" * 100, "audio/webm")}
+            )
+
+    async def test_transcript_then_answer(self, client, exchanges, monkeypatch):
+        """Test one request returns the transcript followed by the streamed answer"""
+        monkeypatch.setenv("RAG_ENABLED", "true")
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+        timeline = []
+
+        async def fake_transcribe(audio_file, filename, language="en", content_hash=None):
+            await asyncio.sleep(0.05)
+            timeline.append("transcribed")
+            yield {"type": "done", "text": "What about Kubernetes?", "segments": 1, "failed_segments": []}
+
+        async def fake_history(conversation_id, is_new=False):
+            timeline.append("history")
+            return ConversationHistory(summary="", messages=[])
+
+        async def fake_chat_stream(query, history=None, deadline=None):
+            timeline.append(f"rag:{query}")
+            yield {"type": "sources", "sources": [], "fast_path": False}
+            yield {"type": "token", "text": "He runs "}
+            yield {"type": "token", "text": "k3s."}
+            yield {"type": "done", "response": "He runs k3s.", "sources": [], "fast_path": False, "degraded": None}
+
+        monkeypatch.setattr(chat_module.transcription_service, "transcribe_audio_stream", fake_transcribe)
+        monkeypatch.setattr(chat_module.rag_service, "initialize", AsyncMock())
+        monkeypatch.setattr(chat_module.rag_service, "chat_stream", fake_chat_stream)
+        monkeypatch.setattr(chat_module.conversation_memory, "get_history", fake_history)
+
+        response = await self.post_audio(client, conversation_id="abc")
+
+        events = parse_events(response.text)
+        assert [name for name, _ in events] == ["transcript", "sources", "token", "token", "done"]
+        assert events[0][1]["text"] == "What about Kubernetes?"
+        assert events[-1][1]["message"] == "He runs k3s."
+        assert events[-1][1]["conversation_id"] == "abc"
+        # History loads while the audio is transcribed
+        assert timeline == ["history", "transcribed", "rag:What about Kubernetes?"]
+        assert exchanges == [("abc", "What about Kubernetes?", "He runs k3s.", None)]
+
+    async def test_basic_response_without_rag(self, client, exchanges, monkeypatch):
+        """Test the keyword answer is streamed when RAG is disabled"""
+        monkeypatch.setenv("RAG_ENABLED", "false")
+
+        async def fake_transcribe(audio_file, filename, language="en", content_hash=None):
+            yield {"type": "done", "text": "How can I contact him?", "segments": 1, "failed_segments": []}
+
+        monkeypatch.setattr(chat_module.transcription_service, "transcribe_audio_stream", fake_transcribe)
+
+        response = await self.post_audio(client)
+
+        events = parse_events(response.text)
+        assert [name for name, _ in events] == ["transcript", "token", "done"]
+        assert events[-1][1]["message"] == events[1][1]["text"]
+        assert len(exchanges) == 1
+
+    async def test_transcription_failure_ends_stream(self, client, exchanges, monkeypatch):
+        """Test a failed transcription sends an error event and no answer"""
+        monkeypatch.setenv("RAG_ENABLED", "false")
+
+        async def failing_transcribe(audio_file, filename, language="en", content_hash=None):
+            raise Exception("whisper down")
+            yield
+
+        monkeypatch.setattr(chat_module.transcription_service, "transcribe_audio_stream", failing_transcribe)
+
+        response = await self.post_audio(client)
+
+        events = parse_events(response.text)
+        assert [name for name, _ in events] == ["error"]
+        assert "whisper down" in events[0][1]["detail"]
+        assert exchanges == []
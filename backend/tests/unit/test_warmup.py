@@ -0,0 +1,145 @@
+"""
+Unit tests for startup warm-up
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services.content.content_cache import ContentCache
+from app.services.content.content_index import ContentIndex
+from app.services.content.content_loader import ContentLoader
+from app.services.content.response_cache import ConfigResponseCache
+from app.services.content_service import ContentService
+from app.services.resume_service import ResumeDataAggregator
+from app.services.warmup import StartupWarmup
+
+
+def sleeper(seconds, result=None):
+    def stage():
+        time.sleep(seconds)
+        return result
+    return stage
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "site.json").write_text(json.dumps({"meta": {}, "features": {}, "version": "1"}))
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "sections" / "about.md").write_text("---\ntitle: About\n---\n\nFirst.\n\nSecond.\n\nThird.\n")
+    (tmp_path / "components" / "projects").mkdir(parents=True)
+    (tmp_path / "components" / "projects" / "robot.md").write_text("---\ntitle: Robot\norder: 1\n---\n\nBuilds things.\n")
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "draft.md").write_text("---\ntitle: Draft\n---\n\nUnlisted.\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestStartupWarmup:
+    """Test stage scheduling, budget and reporting"""
+
+    async def test_stages_run_concurrently(self):
+        """Test blocking stages overlap and report their own timings"""
+        warmup = StartupWarmup()
+
+        started = time.perf_counter()
+        report = await warmup.run({"a": sleeper(0.05, 3), "b": sleeper(0.05), "c": sleeper(0.05)}, budget_seconds=5)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.12
+        assert report.state == "ready"
+        assert {name: result.status for name, result in report.stages.items()} == {"a": "done", "b": "done", "c": "done"}
+        assert report.stages["a"].result == 3
+        assert all(result.duration_ms >= 45 for result in report.stages.values())
+
+    async def test_budget(self):
+        """Test slow stages are reported as timed out and do not hold readiness"""
+        warmup = StartupWarmup()
+
+        report = await warmup.run({"fast": sleeper(0), "slow": sleeper(0.3)}, budget_seconds=0.05)
+
+        assert report.stages["fast"].status == "done"
+        assert report.stages["slow"].status == "timed_out"
+        assert report.duration_ms < 200
+        assert warmup.ready
+
+    async def test_failed_stage(self):
+        """Test a failing stage is reported without stopping the others"""
+        def broken():
+            raise RuntimeError("no templates")
+
+        async def async_stage():
+            return "ok"
+
+        warmup = StartupWarmup()
+        report = await warmup.run({"broken": broken, "async": async_stage}, budget_seconds=1)
+
+        stats = warmup.get_stats()
+        assert stats["stages"]["broken"] == {"status": "failed", "duration_ms": report.stages["broken"].duration_ms, "error": "no templates"}
+        assert stats["stages"]["async"]["status"] == "done"
+        assert report.stages["async"].result == "ok"
+
+    async def test_not_ready_while_warming(self):
+        """Test readiness flips once the background run finishes"""
+        warmup = StartupWarmup()
+        assert warmup.ready
+
+        warmup.start({"slow": sleeper(0.05)}, budget_seconds=1)
+        assert not warmup.ready
+        assert warmup.get_stats()["state"] == "warming"
+
+        await warmup.wait()
+        assert warmup.ready
+        assert warmup.get_stats()["stages"]["slow"]["status"] == "done"
+
+    async def test_stop(self):
+        """Test stopping a run in progress"""
+        warmup = StartupWarmup()
+        warmup.start({"slow": sleeper(0.2)}, budget_seconds=5)
+        await asyncio.sleep(0)
+
+        await warmup.stop()
+        assert warmup.ready
+
+
+@pytest.mark.unit
+class TestWarmStages:
+    """Test the content and resume warm-up stages"""
+
+    def test_warm_content_and_configs(self, content_dir):
+        """Test every file is cached and the indexes are built"""
+        service = ContentService()
+        service.content_path = content_dir
+        service.cache = ContentCache()
+        service.loader = ContentLoader(content_dir, service.cache)
+        service.index = ContentIndex(content_dir, service.loader)
+        service.configs = ConfigResponseCache(service.loader)
+
+        assert service.warm_content() == 3
+        assert service.warm_configs() == 1
+        assert len(service.cache) == 4
+        assert service.configs.builds == 1
+        scans = service.index.scans
+        assert [hit.item.id for hit in service.search("robot")] == ["robot"]
+        assert service.index.scans == scans
+
+    def test_resume_sections_aggregated_once(self, content_dir, monkeypatch):
+        """Test warm() aggregates once and reload() forces a rebuild"""
+        aggregator = ResumeDataAggregator(str(content_dir))
+        calls = []
+        original = aggregator.get_projects
+        monkeypatch.setattr(aggregator, "get_projects", lambda: calls.append(1) or original())
+
+        aggregator.warm()
+        first = aggregator.get_complete_resume_data()
+        second = aggregator.get_complete_resume_data()
+        assert len(calls) == 1
+        assert first["summary"] == "First.\n\nSecond."
+        assert [project["title"] for project in second["projects"]] == ["Robot"]
+
+        aggregator.reload()
+        aggregator.get_complete_resume_data()
+        assert len(calls) == 2